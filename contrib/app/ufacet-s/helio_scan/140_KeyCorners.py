@@ -8,12 +8,12 @@ Finding heliostat facet corners in key frames of a UFACET scan video.
 import copy
 from cv2 import cv2 as cv
 import logging
-from multiprocessing import Pool
 import os
 import sys
 
 import lib.DEPRECATED_specifications as Dspec  # ?? SCAFFOLDING RCB -- TEMPORARY
 
+import opencsp.common.lib.process.TaskRunner as tr
 import opencsp.common.lib.tool.dict_tools as dt
 import opencsp.common.lib.tool.file_tools as ft
 import lib.FrameNameXyList as fnxl
@@ -158,17 +158,19 @@ class KeyCorners:
                 key_frame_ids_to_process = self.specific_frame_ids
 
             # Process each key frame_id.
+            # Per-key-frame results are checkpointed, so that a rerun after a crash skips finished key frames.
+            runner = tr.TaskRunner(
+                num_workers=(1 if self.single_processor else 36),
+                checkpoint_dir=os.path.join(self.output_construction_dir, '_key_corners_checkpoints'),
+                description='key frames',
+            )
             if self.single_processor:
                 print('In KeyCorners.search_key_frames(), starting key frame corner search (single processor)...')
-                list_of_result_dicts = []
-                for key_frame_id in key_frame_ids_to_process:
-                    list_of_result_dicts.append(self.search_key_frame(key_frame_id))
             else:
                 print('In KeyCorners.search_key_frames(), starting key frame corner search (multi-processor)...')
                 logger = logt.multiprocessing_logger(self.log_dir_body_ext, level=logging.INFO)
                 logger.info('================================= Execution =================================')
-                with Pool(36) as pool:
-                    list_of_result_dicts = pool.map(self.search_key_frame, key_frame_ids_to_process)
+            list_of_result_dicts = runner.map(self.search_key_frame, key_frame_ids_to_process)
 
             # Remove "None" entries.
             list_of_fnxl_or_None_results = [
@@ -218,6 +220,9 @@ class KeyCorners:
             # Write summary information.
             self.save_data(all_key_frames_corners_fnxl, mismatched_key_frame_ids)
 
+            # The results are saved, so the per-key-frame checkpoints are no longer needed.
+            runner.clear_checkpoints()
+
             # Record that we generated the key corners.
             self.generated_key_corners = True
 
@@ -6,14 +6,15 @@ Tracking heliostat facet corners previously found in key frames of a UFACET scan
 """
 
 import logging
-from multiprocessing import Pool
 import os
 import sys
 
 import lib.DEPRECATED_specifications as Dspec  # ?? SCAFFOLDING RCB -- TEMPORARY
 
+import opencsp.common.lib.process.TaskRunner as tr
 import opencsp.common.lib.tool.dict_tools as dt
 import opencsp.common.lib.tool.file_tools as ft
+import lib.FrameFeatureCache as ffc
 import lib.FrameNameXyList as fnxl
 import lib.KeyFrameTrackSearch as kfts
 import opencsp.common.lib.tool.log_tools as logt
@@ -47,8 +48,10 @@ class KeyTracks:
         output_render_dir,  # Where to save the resulting plots showing final found corners.
         output_construction_dir,  # Where to save the detailed image processing step-by-step plots.
         # Render control.
-        render_control,
-    ):  # Flags to control rendering on this run.
+        render_control,  # Flags to control rendering on this run.
+        # Memory control.
+        feature_cache_bytes=8e9,  # Memory for cached frames and edge maps, split evenly between the worker processes.
+    ):
         # Check input.
         if (input_video_dir_body_ext == None) or (len(input_video_dir_body_ext) == 0):
             raise ValueError('In KeyTracks.__init__(), null input_video_dir_body_ext encountered.')
@@ -65,6 +68,7 @@ class KeyTracks:
         self.force_construction = force_construction
         self.specific_frame_ids = specific_frame_ids
         self.single_processor = single_processor
+        self.num_workers = 1 if single_processor else 25
         self.log_dir_body_ext = log_dir_body_ext
         # Input/output sources.
         self.input_video_dir_body_ext = input_video_dir_body_ext
@@ -80,6 +84,8 @@ class KeyTracks:
         self.output_construction_dir = output_construction_dir
         # Render control.
         self.render_control = render_control
+        # Memory control.
+        self.feature_cache_bytes = feature_cache_bytes
 
         # Found key tracks file names.
         self.key_frame_projected_tracks_dir = os.path.join(self.output_data_dir, 'key_frame_projected_tracks')
@@ -208,17 +214,19 @@ class KeyTracks:
             )  # Already pruned to key frame ids of interest.
 
             # Process each key frame_id.
+            # Per-key-frame results are checkpointed, so that a rerun after a crash skips finished key frames.
+            runner = tr.TaskRunner(
+                num_workers=self.num_workers,
+                checkpoint_dir=os.path.join(self.output_construction_dir, '_key_tracks_checkpoints'),
+                description='key frames',
+            )
             if self.single_processor:
                 print('In KeyTracks.search_key_tracks(), starting key frame corner tracking (single processor)...')
-                list_of_result_dicts = []
-                for key_frame_id in key_frame_ids_to_process:
-                    list_of_result_dicts.append(self.search_key_track(key_frame_id))
             else:
                 print('In KeyTracks.search_key_tracks(), starting key frame corner tracking (multi-processor)...')
                 logger = logt.multiprocessing_logger(self.log_dir_body_ext, level=logging.INFO)
                 logger.info('================================= Execution =================================')
-                with Pool(25) as pool:
-                    list_of_result_dicts = pool.map(self.search_key_track, key_frame_ids_to_process)
+            list_of_result_dicts = runner.map(self.search_key_track, key_frame_ids_to_process)
 
             print(
                 'In KeyTracks.search_key_tracks(), key frame corner tracking done.  len(list_of_result_dicts) =',
@@ -250,6 +258,9 @@ class KeyTracks:
             # Write summary information.
             self.save_data(list_of_result_dicts)
 
+            # The results are saved, so the per-key-frame checkpoints are no longer needed.
+            runner.clear_checkpoints()
+
             # Record that we generated the key corners.
             self.generated_key_tracks = True
 
@@ -325,6 +336,8 @@ class KeyTracks:
                 output_construction_dir=self.output_construction_dir,
                 # Render control.
                 draw_track_images=True,
+                # Execution control.
+                feature_cache=ffc.shared_cache(self.feature_cache_bytes / self.num_workers),
             )
 
             logt.info(
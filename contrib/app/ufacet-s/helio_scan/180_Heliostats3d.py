@@ -9,13 +9,13 @@ import copy
 import csv
 from cv2 import cv2 as cv
 import logging
-from multiprocessing import Pool
 import numpy as np
 import os
 import subprocess
 
 import lib.DEPRECATED_specifications as Dspec  # ?? SCAFFOLDING RCB -- TEMPORARY
 
+import opencsp.common.lib.process.TaskRunner as tr
 import opencsp.common.lib.tool.dict_tools as dt
 import opencsp.common.lib.tool.file_tools as ft
 import opencsp.common.lib.tool.list_tools as lt
@@ -426,21 +426,24 @@ class Heliostats3d:
             list_of_infer_dicts.append(infer_dict)
 
         # Call execute_heliostat_3d_inference() for each problem specification.
+        # Per-heliostat results are checkpointed, so that a rerun after a crash skips finished heliostats.
+        runner = tr.TaskRunner(
+            num_workers=(1 if self.single_processor else 25),
+            checkpoint_dir=os.path.join(output_construct_corners_3d_dir, '_heliostats_3d_checkpoints'),
+            description='heliostats',
+        )
         if self.single_processor:
             print(
                 'In Heliostats3d.construct_and_save_heliostat_corners_3d_aux(), starting heliostat 3-d inference (single processor)...'
             )
-            list_of_result_hi3ds = []
-            for infer_dict in list_of_infer_dicts:
-                list_of_result_hi3ds.append(self.execute_heliostat_3d_inference(infer_dict))
         else:
             print(
                 'In Heliostats3d.construct_and_save_heliostat_corners_3d_aux(), starting heliostat 3-d inference (multi-processor)...'
             )
             logger = logt.multiprocessing_logger(self.log_dir_body_ext, level=logging.INFO)
             logger.info('================================= Execution =================================')
-            with Pool(25) as pool:
-                list_of_result_hi3ds = pool.map(self.execute_heliostat_3d_inference, list_of_infer_dicts)
+        hel_names = [infer_dict['hel_name'] for infer_dict in list_of_infer_dicts]
+        list_of_result_hi3ds = runner.map(self.execute_heliostat_3d_inference, list_of_infer_dicts, task_ids=hel_names)
 
         print('In Heliostats3d.construct_and_save_heliostat_corners_3d_aux(), heliostat 3-d inference done.')
 
@@ -456,6 +459,9 @@ class Heliostats3d:
                     output_corners_3d_dir,
                 )
 
+        # The results are saved, so the per-heliostat checkpoints are no longer needed.
+        runner.clear_checkpoints()
+
     def execute_heliostat_3d_inference(self, infer_dict):
         # Extract problem specfication components.
         hel_name = infer_dict['hel_name']
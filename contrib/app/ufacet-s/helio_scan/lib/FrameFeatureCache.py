@@ -0,0 +1,188 @@
+"""Per-frame image features (blurred image, HSV, sky masks, Canny edges), computed once and cached."""
+
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from cv2 import cv2 as cv
+import numpy as np
+
+import opencsp.common.lib.tool.log_tools as logt
+from .DEPRECATED_utils import CannyImg, SKY_THRESHOLD
+
+
+class FrameFeatures:
+    """
+    The image features of a single frame that are used by the key frame corner and track searches.
+
+    Every feature is computed lazily, the first time it is requested, and then
+    kept for as long as this object is alive. All edge maps are computed from
+    the blurred image, matching what KeyFrameCornerSearch and KeyFrameTrackSearch
+    have always done.
+
+    The returned arrays are shared between all users of this object. Treat
+    them as read-only.
+    """
+
+    def __init__(self, img: np.ndarray):
+        self.img = img
+        """ The original (BGR) frame image. """
+        self._blurred: np.ndarray = None
+        self._hsv: np.ndarray = None
+        self._sky: dict[float, np.ndarray] = {}
+        self._sky_hsv: tuple[np.ndarray, np.ndarray] = None
+        self._edges: dict[Hashable, np.ndarray] = {}
+
+    @property
+    def blurred(self) -> np.ndarray:
+        """The frame image with a 5x5 Gaussian blur applied, as used for edge detection."""
+        if self._blurred is None:
+            self._blurred = cv.GaussianBlur(self.img, (5, 5), 0)
+        return self._blurred
+
+    @property
+    def hsv(self) -> np.ndarray:
+        """The frame image, converted to HSV."""
+        if self._hsv is None:
+            self._hsv = cv.cvtColor(self.img, cv.COLOR_BGR2HSV)
+        return self._hsv
+
+    def sky(self, threshold: float = SKY_THRESHOLD) -> np.ndarray:
+        """Integer mask that is 1 where the normalized b+g+r brightness of the (unblurred) image is above threshold."""
+        if threshold not in self._sky:
+            # same arithmetic as KeyFrameCornerSearch.sky() has always used, so that the mask is identical
+            b = self.img[:, :, 0] / 255.0
+            g = self.img[:, :, 1] / 255.0
+            r = self.img[:, :, 2] / 255.0
+            self._sky[threshold] = (b + g + r > threshold).astype('int')
+        return self._sky[threshold]
+
+    def sky_hsv(self) -> tuple[np.ndarray, np.ndarray]:
+        """The same (sky, sky_img) as DEPRECATED_utils.sky_with_hsv(img, rgb=False), but using the cached HSV image."""
+        if self._sky_hsv is None:
+            light_sky = (100, 30, 100)
+            dark_sky = (150, 140, 255)
+            sky = cv.inRange(self.hsv, light_sky, dark_sky)
+            img_rgb = cv.cvtColor(self.img, cv.COLOR_BGR2RGB)
+            sky_img = cv.bitwise_and(img_rgb, img_rgb, mask=sky)
+            self._sky_hsv = (sky, sky_img)
+        return self._sky_hsv
+
+    def edges(self, canny_type: str = 'normal', lower: int = None, upper: int = None) -> np.ndarray:
+        """The Canny edges of the blurred image, for the given canny_type or explicit lower/upper thresholds.
+
+        See DEPRECATED_utils.CannyImg() for the available canny types.
+        """
+        key = (lower, upper) if (lower is not None and upper is not None) else canny_type
+        if key not in self._edges:
+            self._edges[key] = CannyImg(self.blurred, canny_type=canny_type, lower=lower, upper=upper)
+        return self._edges[key]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by this frame's image and its computed features."""
+        arrays = [self.img, self._blurred, self._hsv]
+        arrays += list(self._sky.values()) + list(self._edges.values())
+        if self._sky_hsv is not None:
+            arrays += list(self._sky_hsv)
+        return sum([arr.nbytes for arr in arrays if arr is not None])
+
+
+class FrameFeatureCache:
+    """
+    Least-recently-used cache of FrameFeatures, bounded by memory.
+
+    One cache can be shared by all KeyFrameTrackSearch instances in a process,
+    so that each frame is loaded and has its edge maps computed at most once
+    while it stays in the cache. Frames are keyed by the full path of their
+    image file, so that frames with the same id from different videos or
+    directories don't collide.
+
+    Example usage::
+
+        feature_cache = FrameFeatureCache(max_bytes=4e9)
+        features = feature_cache.get(frame_dir_body_ext, loader=lambda: cv.imread(frame_dir_body_ext))
+        edges = features.edges('light')
+    """
+
+    def __init__(self, max_bytes: float = 2e9):
+        """
+        Args:
+        -----
+            max_bytes (float): Soft limit on the memory used by cached frames. When exceeded, the least recently
+                used frames are dropped. The most recently requested frame is always kept. Defaults to 2 GB.
+        """
+        self.max_bytes = max_bytes
+        self._frames: OrderedDict[Hashable, FrameFeatures] = OrderedDict()
+        self.hits = 0
+        """ How many calls to get() found their frame in the cache. """
+        self.misses = 0
+        """ How many calls to get() had to load or add their frame. """
+
+    def __contains__(self, frame_key: Hashable) -> bool:
+        return frame_key in self._frames
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by all cached frames."""
+        return sum([features.nbytes for features in self._frames.values()])
+
+    def get(
+        self, frame_key: Hashable, img: np.ndarray = None, loader: Callable[[], np.ndarray] = None
+    ) -> FrameFeatures | None:
+        """Get the features for the given frame, adding the frame to the cache if necessary.
+
+        Args:
+        -----
+            frame_key (Hashable): Uniquely identifies the frame, typically the full path of its image file.
+            img (np.ndarray): The frame image, if it is already loaded. Only used on a cache miss.
+            loader (Callable): Function that loads the frame image. Only called on a cache miss when img is None.
+
+        Returns:
+        --------
+            FrameFeatures: The cached features. None if the frame isn't cached and no image could be loaded.
+        """
+        if frame_key in self._frames:
+            self.hits += 1
+            self._frames.move_to_end(frame_key)
+        else:
+            self.misses += 1
+            if img is None and loader is not None:
+                img = loader()
+            if img is None:
+                return None
+            self._frames[frame_key] = FrameFeatures(img)
+
+        # Frames grow as their features are computed, so check the memory limit on every access.
+        self._evict()
+        return self._frames[frame_key]
+
+    def _evict(self):
+        total = self.nbytes
+        while total > self.max_bytes and len(self._frames) > 1:
+            frame_key, features = self._frames.popitem(last=False)
+            total -= features.nbytes
+            logt.debug(f"In FrameFeatureCache._evict(), dropped frame {frame_key}")
+
+    def clear(self):
+        self._frames.clear()
+
+
+_shared_cache: FrameFeatureCache = None
+
+
+def shared_cache(max_bytes: float = None) -> FrameFeatureCache:
+    """The default FrameFeatureCache for this process, shared by all track searches that don't specify one.
+
+    Every process has its own shared cache. When running several worker
+    processes, pass each of them its share of the total memory budget as
+    max_bytes, which then replaces the limit of the shared cache.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = FrameFeatureCache()
+    if max_bytes is not None:
+        _shared_cache.max_bytes = max_bytes
+    return _shared_cache
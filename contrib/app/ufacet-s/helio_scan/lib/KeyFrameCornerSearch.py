@@ -17,6 +17,8 @@ import opencsp.common.lib.geometry.geometry_2d as g2d
 from DEPRECATED_utils import *  # ?? SCAFFOLDING RCB -- ELIMINATE THIS
 from DEPRECATED_save_read import *  # ?? SCAFFOLDING RCB -- ELIMINATE THIS
 import FrameNameXyList as fnxl
+from . import FrameFeatureCache as ffc
+from . import ufacet_corner_confirmation as ucc
 from opencsp.common.lib.render_control.RenderControlKeyCorners import RenderControlKeyCorners
 
 Component = NewType("Component", dict[str, Union[str, list[int], list[float], list[list[int]]]])
@@ -41,8 +43,10 @@ class KeyFrameCornerSearch:
         output_construction_dir,  # Where to save the detailed image processing step-by-step plots.
         solvePnPtype,  # how to solve PnP.  Values are 'pnp' and 'calib'
         # Render control.
-        render_control: RenderControlKeyCorners,
-    ):  # Flags to control rendering on this run.
+        render_control: RenderControlKeyCorners,  # Flags to control rendering on this run.
+        # Execution control.
+        feature_cache: ffc.FrameFeatureCache = None,  # Cache of edge maps etc., keyed by (output_construction_dir, key_frame_id_str).  None for a private cache.
+    ):
         """Search the given key_frame_img for one heliostat per list_of_name_polygons.
         The results can be accessed by:
             First check successful(), then
@@ -61,6 +65,11 @@ class KeyFrameCornerSearch:
         self.solvePnPtype = solvePnPtype
         self.render_control = render_control
 
+        # Blur, HSV, sky and Canny edges are computed at most once for the key frame,
+        # no matter how many canny levels and iterations project_and_confirm() runs.
+        self.feature_cache = feature_cache if feature_cache is not None else ffc.FrameFeatureCache()
+        self.features = self.feature_cache.get((output_construction_dir, key_frame_id_str), img=key_frame_img)
+
         self.frame = {  # ?? SCAFFOLDING RCB -- DO WE STILL NEED THIS FRAME DATA STRUCTURE?  SHOULD WE STORE IN SELF INSTEAD?
             'key_frame_img': key_frame_img,  # ?? SCAFFOLDING RCB -- DO WE STILL NEED THIS FRAME DATA STRUCTURE?  SHOULD WE STORE IN SELF INSTEAD?
             "output_construction_dir": output_construction_dir,  # ?? SCAFFOLDING RCB -- DO WE STILL NEED THIS FRAME DATA STRUCTURE?  SHOULD WE STORE IN SELF INSTEAD?
@@ -185,16 +194,11 @@ class KeyFrameCornerSearch:
     def canny(self, img=None):
         print('In KeyFrameCornerSearch.canny()...')  # ?? SCAFFOLDING RCB -- TEMPORARY
         if img is None:
-            img = self.frame[
-                'key_frame_img'
-            ]  # ?? SCAFFOLDING RCB -- SEE CANNY() AND CONFIRM() ROUTINES FOR DUPLICATE PLACES WHERE THIS CODE IS PLACED.  MUST KEEP CONSISTENT.
-            img = cv.GaussianBlur(
-                img, (5, 5), 0
-            )  # ?? SCAFFOLDING RCB -- SEE CANNY() AND CONFIRM() ROUTINES FOR DUPLICATE PLACES WHERE THIS CODE IS PLACED.  MUST KEEP CONSISTENT.
-
-        edges = CannyImg(
-            img=img, canny_type='auto'
-        )  # ! auto  # ?? SCAFFOLDING RCB -- ORIGINAL CODE was 'light'  # ?? SCAFFOLDING RCB -- SEE CANNY() AND CONFIRM() ROUTINES FOR DUPLICATE PLACES WHERE THIS CODE IS PLACED.  MUST KEEP CONSISTENT.
+            # The blur and edge detection are shared with confirm() through the feature cache.
+            img = self.features.blurred
+            edges = self.features.edges(canny_type='auto')  # ! auto  # ?? SCAFFOLDING RCB -- ORIGINAL CODE was 'light'
+        else:
+            edges = CannyImg(img=img, canny_type='auto')
         # edges = CannyImg(img=img, canny_type='light') # ! auto  # ?? SCAFFOLDING RCB -- ORIGINAL CODE
         row, col = np.nonzero(edges)
         edges = np.zeros((img.shape[0], img.shape[1])).astype('int')
@@ -235,8 +239,7 @@ class KeyFrameCornerSearch:
 
     def skyhsv(self):
         print('In KeyFrameCornerSearch.skyhsv()...')  # ?? SCAFFOLDING RCB -- TEMPORARY
-        img = self.frame['key_frame_img']
-        sky, sky_img = sky_with_hsv(img=img, rgb=False)
+        sky, sky_img = self.features.sky_hsv()
 
         # img_rgb         = cv.cvtColor(img, cv.COLOR_BGR2RGB)
         # hsv_img         = cv.cvtColor(img_rgb, cv.COLOR_RGB2HSV)
@@ -277,13 +280,9 @@ class KeyFrameCornerSearch:
         img = self.frame['key_frame_img']
         sky_img = img.copy()
 
-        b = sky_img[:, :, 0] / 255.0
-        g = sky_img[:, :, 1] / 255.0
-        r = sky_img[:, :, 2] / 255.0
         # Identify sky
-        sky_x, sky_y = np.nonzero(b + g + r > SKY_THRESHOLD)
-        sky = np.zeros((img.shape[0], img.shape[1])).astype('int')
-        sky[sky_x, sky_y] = 1
+        sky = self.features.sky(SKY_THRESHOLD)
+        sky_x, sky_y = np.nonzero(sky)
 
         sky_img[sky_x, sky_y, 0] = SKY_COLOR[0]
         sky_img[sky_x, sky_y, 1] = SKY_COLOR[1]
@@ -1765,84 +1764,6 @@ class KeyFrameCornerSearch:
         iterations=5,
     ):
         h, w = self.frame['key_frame_img'].shape[:2]
-        max_row = self.frame['key_frame_img'].shape[0]
-        max_col = self.frame['key_frame_img'].shape[1]
-
-        def confirm_facets(expected_corners, edges, tolerance, pixels):
-            confirmed_facets = {}
-            for indx in range(0, len(expected_corners), self.specifications.corners_per_facet):
-                facet_id = indx // self.specifications.corners_per_facet
-                corners = [expected_corners[indx + i] for i in range(0, self.specifications.corners_per_facet)]
-                for corner_indx in range(0, len(corners)):
-                    corner = corners[corner_indx]
-                    if corner[0] >= max_col or corner[0] < 0 or corner[1] >= max_row or corner[1] < 0:
-                        corners[corner_indx] = None
-
-                confirmed_facets[facet_id] = {'edges': confirm_facet_edges(corners, edges, tolerance, pixels)}
-            return confirmed_facets
-
-        def confirm_facet_edges(corners, edges, tolerance, pixels):
-            confirmed_edges = []
-            corners.append(corners[0])  # cyclic
-            for indx in range(0, len(corners) - 1):
-                corner1 = corners[indx]
-                corner2 = corners[indx + 1]
-                if corner1 is None or corner2 is None:
-                    confirmed_edges.append(None)
-                    continue
-                # edge coefficients
-                A, B, C = find_hom_line_2points(corner1, corner2)
-                if A is None:
-                    continue
-                min_col, max_col, min_row, max_row = min_max_col_row(edges, corner1, corner2)
-                edge_pixels = []
-                # confirming
-                if indx % 2 == 0:
-                    for row in range(min_row, max_row):
-                        for col in range(min_col, max_col):
-                            dist = abs(A * col + B * row + C)
-                            if edges[row][col] and dist <= tolerance:
-                                cnt = 0
-                                edge_pixels.append([col, row])
-                else:
-                    for col in range(min_col, max_col):
-                        for row in range(min_row, max_row):
-                            dist = abs(A * col + B * row + C)
-                            if edges[row][col] and dist <= tolerance:
-                                cnt = 0
-                                edge_pixels.append([col, row])
-                if len(edge_pixels) < pixels:
-                    confirmed_edges.append(None)  # edge was not confirmed
-                    continue
-
-                # confirmed edge
-                edge_coeff = fit_line_pixels(edge_pixels)
-                edge_inliers_coeff = fit_line_inliers_pixels(edge_pixels, edge_coeff)
-                confirmed_edges.append(edge_inliers_coeff)
-
-            return confirmed_edges
-
-        def find_corners(confirmed_facets):
-            hel_corners = [None for _ in range(0, self.specifications.corners_per_heliostat)]
-            for facet_indx, facet in confirmed_facets.items():
-                corners = []
-                edges = facet['edges']
-                edges.append(edges[0])  # cyclic
-                for edge_indx in range(0, len(edges) - 1):
-                    edge0 = edges[edge_indx]
-                    edge1 = edges[edge_indx + 1]
-                    if edge0 is not None and edge1 is not None:
-                        corners.append(findIntersectionLines(edge0, edge1))
-                    else:
-                        corners.append(None)
-                corners.insert(0, corners.pop())
-                indx = facet_indx * self.specifications.corners_per_facet
-                for i, j in zip(
-                    range(indx, indx + self.specifications.corners_per_facet),
-                    range(0, self.specifications.corners_per_facet),
-                ):
-                    hel_corners[i] = corners[j]
-            return hel_corners
 
         def construct_points(confirmed_corners, corners3d):
             imgcorners = []
@@ -1861,18 +1782,17 @@ class KeyFrameCornerSearch:
         for i in range(0, iterations):
             flag_break = False
             for canny_type in canny_types:
-                img = self.frame[
-                    'key_frame_img'
-                ]  # ?? SCAFFOLDING RCB -- SEE CANNY() AND CONFIRM() ROUTINES FOR DUPLICATE PLACES WHERE THIS CODE IS PLACED.  MUST KEEP CONSISTENT.  # ?? SCAFFOLDING RCB -- REDUNDANT IMAGE LOAD, BLUR, AND EDGE FINDING.  COMPUTE ONCE, CACHE AND COMMUNICATE.
-                img = cv.GaussianBlur(
-                    img, (5, 5), 0
-                )  # ?? SCAFFOLDING RCB -- SEE CANNY() AND CONFIRM() ROUTINES FOR DUPLICATE PLACES WHERE THIS CODE IS PLACED.  MUST KEEP CONSISTENT.  # ?? SCAFFOLDING RCB -- REDUNDANT IMAGE LOAD, BLUR, AND EDGE FINDING.  COMPUTE ONCE, CACHE AND COMMUNICATE.
-                edges = CannyImg(
-                    img, canny_type=canny_type
-                )  # ?? SCAFFOLDING RCB -- SEE CANNY() AND CONFIRM() ROUTINES FOR DUPLICATE PLACES WHERE THIS CODE IS PLACED.  MUST KEEP CONSISTENT.  # ?? SCAFFOLDING RCB -- REDUNDANT IMAGE LOAD, BLUR, AND EDGE FINDING.  COMPUTE ONCE, CACHE AND COMMUNICATE.
+                # Cached, so each canny level is only computed once per key frame.
+                edges = self.features.edges(canny_type=canny_type)
                 # edges                           = CannyImg(self.frame['sky'], canny_type=canny_type)  # ?? SCAFFOLDING RCB -- ORIGINAL CODE, MULTIPLE FAILURE IMPLICATIONS:  (1) USING SKY, WHEN SKY WAS NOT USERED PREVIOUSLY.  (2) CAUSES OPENCV TO CRASH.  (THANKFULLY; OTHERWISE I WOULDN'T HAVE FOUND THE OTHER BUG.)
-                confirmed_facets = confirm_facets(expected_corners, edges, tolerance, pixels)
-                confirmed_corners = find_corners(confirmed_facets)
+                confirmed_facets = ucc.confirm_facets(
+                    expected_corners, edges, tolerance, pixels, self.specifications.corners_per_facet
+                )
+                confirmed_corners = ucc.find_corners(
+                    confirmed_facets,
+                    self.specifications.corners_per_facet,
+                    self.specifications.corners_per_heliostat,
+                )
                 flag_break = True
                 for corner in confirmed_corners:
                     flag_break *= corner is None
@@ -14,7 +14,9 @@ import csv
 import opencsp.common.lib.tool.file_tools as ft
 from .DEPRECATED_utils import *  # ?? SCAFFOLDING RCB -- ELIMINATE THIS
 from .DEPRECATED_save_read import *  # ?? SCAFFOLDING RCB -- ELIMINATE THIS
+from . import FrameFeatureCache as ffc
 from . import FrameNameXyList as fnxl
+from . import ufacet_corner_confirmation as ucc
 from . import ufacet_pipeline_frame as upf
 
 
@@ -45,6 +47,8 @@ class KeyFrameTrackSearch:
         output_construction_dir: str,  # Output directory to store results into
         # Render control.
         draw_track_images: bool,  # Also output the human-consumable images
+        # Execution control.
+        feature_cache: ffc.FrameFeatureCache = None,  # Cache of frames and edge maps.  None to use the cache shared by all searches in this process.
     ):
         # Execution control.
         self.iterations = iterations
@@ -63,6 +67,8 @@ class KeyFrameTrackSearch:
         self.output_construction_dir = output_construction_dir
         # Render control.
         self.draw_track_images = draw_track_images
+        # Frames and their edge maps, kept across frames, tracking directions, and key frames.
+        self.feature_cache = feature_cache if feature_cache is not None else ffc.shared_cache()
 
         # Tracking exit control.
         self.minimum_fraction_of_confirmed_corners = MINIMUM_FRACTION_OF_CONFIRMED_CORNERS
@@ -200,12 +206,13 @@ class KeyFrameTrackSearch:
         """Tracking"""
         for frame_id_str in frame_id_str_sequence[2:]:
             # print('In KeyFrameTrackSearch.PredictConfirm(), for key_frame_id='+self.key_frame_id_str_1+', '+str(tracking_direction)+' tracking corners into image: '+frame_id_str)
-            img = None
             frame_body_ext = upf.frame_file_body_ext_given_frame_id_str(self.input_video_body, frame_id_str)
             frame_dir_body_ext = os.path.join(self.input_frame_dir, frame_body_ext)
-            if os.path.exists(frame_dir_body_ext):
-                img = cv.imread(frame_dir_body_ext)
-            if img is None:  # you skip that image
+            features = self.feature_cache.get(
+                frame_dir_body_ext,
+                loader=lambda: cv.imread(frame_dir_body_ext) if os.path.exists(frame_dir_body_ext) else None,
+            )
+            if features is None:  # you skip that image
                 print(
                     'In KeyFrameTrackSearch.PredictConfirm(), Unexpected null image encountered.'
                 )  # ?? SCAFFOLDING RCB -- WE DON'T KNOW WHY THIS IS HERE.  CAN THIS HAPPEN?  WHY IS IT ALLOWED?
@@ -229,7 +236,7 @@ class KeyFrameTrackSearch:
                             velocity[hel_indx][vel_indx] = new_vel
 
             """Edge Detection based on Image"""
-            img = cv.GaussianBlur(img, (5, 5), 0)
+            img = features.blurred
             cnt = 0
 
             projected_list_of_name_xy_lists = []  # For adding to the FrameNameXyList object.
@@ -252,6 +259,7 @@ class KeyFrameTrackSearch:
                     iterations=self.iterations,
                     canny_levels=self.canny_levels,
                     confirm_type=self.confirm_type,
+                    features=features,
                 )
                 confirmed_ratio = num_non_None_confirmed_corners / float(
                     n_inside
@@ -421,80 +429,16 @@ class KeyFrameTrackSearch:
         return cnt
 
     def confirm_corners(
-        self, img, predicted_corners, canny_levels, iterations, confirm_type='', tolerance=3, pixels=100
+        self,
+        img,
+        predicted_corners,
+        canny_levels,
+        iterations,
+        confirm_type='',
+        tolerance=3,
+        pixels=100,
+        features: ffc.FrameFeatures = None,  # If given, edge maps are taken from (and kept in) the frame's cached features.
     ):
-        def confirm_facets(expected_corners, edges, tolerance, pixels):
-            confirmed_facets = {}
-            for indx in range(0, len(expected_corners), self.specifications.corners_per_facet):
-                facet_id = indx // self.specifications.corners_per_facet
-                corners = [expected_corners[indx + i] for i in range(0, self.specifications.corners_per_facet)]
-                for corner_indx in range(0, len(corners)):
-                    corner = corners[corner_indx]
-                    if corner[0] >= max_col or corner[0] < 0 or corner[1] >= max_row or corner[1] < 0:
-                        corners[corner_indx] = None
-                confirmed_facets[facet_id] = {'edges': confirm_facet_edges(corners, edges, tolerance, pixels)}
-            return confirmed_facets
-
-        def confirm_facet_edges(corners, edges, tolerance, pixels):
-            confirmed_edges = []
-            corners.append(corners[0])  # cyclic
-            for indx in range(0, len(corners) - 1):
-                corner1 = corners[indx]
-                corner2 = corners[indx + 1]
-                if corner1 is None or corner2 is None:
-                    confirmed_edges.append(None)
-                    continue
-                # edge coefficients
-                A, B, C = find_hom_line_2points(corner1, corner2)
-                if A is None:
-                    continue
-                min_col, max_col, min_row, max_row = min_max_col_row(edges, corner1, corner2)
-                edge_pixels = []
-                # confirming
-                if indx % 2 == 0:
-                    for row in range(min_row, max_row):
-                        for col in range(min_col, max_col):
-                            dist = abs(A * col + B * row + C)
-                            if edges[row][col] and dist <= tolerance:
-                                edge_pixels.append([col, row])
-                else:
-                    for col in range(min_col, max_col):
-                        for row in range(min_row, max_row):
-                            dist = abs(A * col + B * row + C)
-                            if edges[row][col] and dist <= tolerance:
-                                edge_pixels.append([col, row])
-                if len(edge_pixels) < pixels:
-                    confirmed_edges.append(None)  # edge was not confirmed
-                    continue
-
-                # confirmed edge
-                edge_coeff = fit_line_pixels(edge_pixels)
-                edge_inliers_coeff = fit_line_inliers_pixels(edge_pixels, edge_coeff)
-                confirmed_edges.append(edge_inliers_coeff)
-            return confirmed_edges
-
-        def find_corners(confirmed_facets):
-            hel_corners = [None for _ in range(0, self.specifications.corners_per_heliostat)]
-            for facet_indx, facet in confirmed_facets.items():
-                corners = []
-                edges = facet['edges']
-                edges.append(edges[0])  # cyclic
-                for edge_indx in range(0, len(edges) - 1):
-                    edge0 = edges[edge_indx]
-                    edge1 = edges[edge_indx + 1]
-                    if edge0 is not None and edge1 is not None:
-                        corners.append(findIntersectionLines(edge0, edge1))
-                    else:
-                        corners.append(None)
-                corners.insert(0, corners.pop())
-                indx = facet_indx * self.specifications.corners_per_facet
-                for i, j in zip(
-                    range(indx, indx + self.specifications.corners_per_facet),
-                    range(0, self.specifications.corners_per_facet),
-                ):
-                    hel_corners[i] = corners[j]
-            return hel_corners
-
         def construct_points(confirmed_corners, corners3d):
             imgcorners = []
             objcorners = []
@@ -509,8 +453,6 @@ class KeyFrameTrackSearch:
             return points3d, points2d
 
         h, w = img.shape[:2]
-        max_row = img.shape[0]
-        max_col = img.shape[1]
         expected_corners = predicted_corners
         canny_types = canny_levels
         corners3d = self.corners3d
@@ -529,7 +471,10 @@ class KeyFrameTrackSearch:
             for step in range(0, canny_steps + 1):
                 upper = upper - step * upper_step
                 lower = lower - step * lower_step
-                edges_list.append(CannyImg(img, lower=lower, upper=upper))
+                if features is not None:
+                    edges_list.append(features.edges(lower=lower, upper=upper))
+                else:
+                    edges_list.append(CannyImg(img, lower=lower, upper=upper))
         for ite in range(0, iterations):
             if confirm_type == 'iterative':
                 inner_loop_range = len(edges_list)
@@ -538,13 +483,21 @@ class KeyFrameTrackSearch:
             for i in range(0, inner_loop_range):  # levels of canny
                 if confirm_type == 'iterative':
                     edges = edges_list[i]
+                elif features is not None:
+                    edges = features.edges(canny_type=canny_types[i])
                 else:
                     edges = CannyImg(
                         img, canny_type=canny_types[i]
                     )  # ?? SCAFFOLDING RCB -- CHANGE THIS VARIABLE NAME TO "edge_image"
 
-                confirmed_facets = confirm_facets(expected_corners, edges, tolerance, pixels)
-                confirmed_corners = find_corners(confirmed_facets)
+                confirmed_facets = ucc.confirm_facets(
+                    expected_corners, edges, tolerance, pixels, self.specifications.corners_per_facet
+                )
+                confirmed_corners = ucc.find_corners(
+                    confirmed_facets,
+                    self.specifications.corners_per_facet,
+                    self.specifications.corners_per_heliostat,
+                )
                 flag_break = True
                 flag_less_than_6 = False
                 for corner in confirmed_corners:  # not confirmed corner
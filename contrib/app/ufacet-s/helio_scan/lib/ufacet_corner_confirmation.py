@@ -0,0 +1,197 @@
+"""Confirmation of predicted facet corners against an edge image, shared by the key frame corner and track searches."""
+
+import numpy as np
+
+from .DEPRECATED_utils import find_hom_line_2points, min_max_col_row, fit_line_pixels
+from .DEPRECATED_utils import findIntersectionLines
+
+
+def edge_support_pixels(edges: np.ndarray, segments: list[tuple], tolerance: float) -> list[np.ndarray]:
+    """Find the edge pixels that support each of the given line segments, with a single gather from the edge image.
+
+    For each segment, every pixel in the segment's bounding box (see
+    DEPRECATED_utils.min_max_col_row()) is checked for being an edge pixel
+    within tolerance of the segment's line. The windows for all segments are
+    rasterized into one pair of index arrays, so that the edge image is
+    sampled once and the tests are evaluated as NumPy array operations.
+
+    Args:
+    -----
+        edges (np.ndarray): The edge image. Non-zero pixels are edges.
+        segments (list[tuple]): Tuples (corner1, corner2, A, B, C, col_major), where A, B, C are the normalized line
+            coefficients for the segment from corner1 to corner2 and col_major selects the order that pixels are
+            visited in (col_major=False: row by row, col_major=True: column by column).
+        tolerance (float): Maximum distance from the line for a pixel to count.
+
+    Returns:
+    --------
+        list[np.ndarray]: For each segment, an Nx2 array of [col, row] supporting pixels, in visiting order.
+    """
+    if len(segments) == 0:
+        return []
+
+    all_rows: list[np.ndarray] = []
+    all_cols: list[np.ndarray] = []
+    sizes: list[int] = []
+    coeffs: list[tuple[float, float, float]] = []
+    for corner1, corner2, A, B, C, col_major in segments:
+        min_col, max_col, min_row, max_row = min_max_col_row(edges, corner1, corner2)
+        row_range = np.arange(min_row, max_row)
+        col_range = np.arange(min_col, max_col)
+        if col_major:
+            cols = np.repeat(col_range, len(row_range))
+            rows = np.tile(row_range, len(col_range))
+        else:
+            rows = np.repeat(row_range, len(col_range))
+            cols = np.tile(col_range, len(row_range))
+        all_rows.append(rows)
+        all_cols.append(cols)
+        sizes.append(len(rows))
+        coeffs.append((A, B, C))
+
+    rows = np.concatenate(all_rows).astype(np.int64)
+    cols = np.concatenate(all_cols).astype(np.int64)
+    sizes = np.array(sizes)
+    coeffs = np.array(coeffs, dtype=np.float64)
+    A, B, C = [np.repeat(coeffs[:, i], sizes) for i in range(3)]
+
+    # one gather for all segments, evaluated in the same order of operations as the per-pixel test
+    is_edge = edges[rows, cols] != 0
+    dist = np.abs(A * cols + B * rows + C)
+    supported = is_edge & (dist <= tolerance)
+
+    ret: list[np.ndarray] = []
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    for i in range(len(segments)):
+        start, end = offsets[i], offsets[i + 1]
+        mask = supported[start:end]
+        ret.append(np.stack([cols[start:end][mask], rows[start:end][mask]], axis=1))
+    return ret
+
+
+def fit_line_inliers_pixels(
+    pixels: np.ndarray, coeff: tuple[float, float, float], min_tolerance=0.5, max_tolerance=5, tol_step=0.1
+) -> tuple[float, float, float]:
+    """Array version of DEPRECATED_utils.fit_line_inliers_pixels(), with identical results.
+
+    The distance of every pixel to the line is computed once, instead of once
+    per tolerance step.
+
+    Args:
+    -----
+        pixels (np.ndarray): Nx2 array of [col, row] pixels.
+        coeff (tuple): The (A, B, C) line coefficients fitted to all pixels.
+    """
+    A, B, C = coeff
+    required_inliers = int(round(0.7 * len(pixels)))
+    dist = np.abs(A * pixels[:, 0] + B * pixels[:, 1] + C)
+    tolerance = min_tolerance
+    is_inlier = None
+    while tolerance <= max_tolerance:
+        is_inlier = dist <= tolerance
+        if np.count_nonzero(is_inlier) >= required_inliers:
+            break
+        tolerance += tol_step
+
+    if tolerance <= max_tolerance:
+        A, B, C = fit_line_pixels(pixels[is_inlier].tolist())
+
+    return A, B, C
+
+
+def confirm_facets(
+    expected_corners: list[list[float]], edges: np.ndarray, tolerance: float, pixels: int, corners_per_facet: int
+) -> dict[int, dict[str, list]]:
+    """Confirm the edges of every facet, given the expected corners of all facets of a heliostat.
+
+    Equivalent to the confirm_facets()/confirm_facet_edges() helpers that
+    KeyFrameCornerSearch.confirm() and KeyFrameTrackSearch.confirm_corners()
+    used to define, but the edge image is sampled for all facet edges at once.
+
+    Args:
+    -----
+        expected_corners (list[list[float]]): The [col, row] of each corner, corners_per_facet corners per facet.
+        edges (np.ndarray): The edge image.
+        tolerance (float): Maximum distance of an edge pixel from the expected facet edge.
+        pixels (int): Minimum number of edge pixels for a facet edge to be confirmed.
+        corners_per_facet (int): How many corners each facet has.
+
+    Returns:
+    --------
+        dict[int, dict[str, list]]: {facet_id: {'edges': [(A, B, C) or None, ...]}} The fitted line for each facet edge.
+    """
+    max_row, max_col = edges.shape[0], edges.shape[1]
+
+    # collect the segments to check for every facet
+    facets_segments: dict[int, list] = {}
+    segments: list[tuple] = []
+    for indx in range(0, len(expected_corners), corners_per_facet):
+        facet_id = indx // corners_per_facet
+        corners = [expected_corners[indx + i] for i in range(0, corners_per_facet)]
+        for corner_indx in range(0, len(corners)):
+            corner = corners[corner_indx]
+            if corner[0] >= max_col or corner[0] < 0 or corner[1] >= max_row or corner[1] < 0:
+                corners[corner_indx] = None
+        corners.append(corners[0])  # cyclic
+
+        facet_segments = []
+        for edge_indx in range(0, len(corners) - 1):
+            corner1 = corners[edge_indx]
+            corner2 = corners[edge_indx + 1]
+            if corner1 is None or corner2 is None:
+                facet_segments.append(None)
+                continue
+            A, B, C = find_hom_line_2points(corner1, corner2)
+            if A is None:
+                # degenerate edge, doesn't get an entry
+                continue
+            facet_segments.append(len(segments))
+            segments.append((corner1, corner2, A, B, C, edge_indx % 2 == 1))
+        facets_segments[facet_id] = facet_segments
+
+    # find the supporting pixels for all segments
+    support = edge_support_pixels(edges, segments, tolerance)
+
+    # fit lines to the confirmed edges
+    confirmed_facets = {}
+    for facet_id, facet_segments in facets_segments.items():
+        confirmed_edges = []
+        for segment_indx in facet_segments:
+            if segment_indx is None or len(support[segment_indx]) < pixels:
+                confirmed_edges.append(None)  # edge was not confirmed
+                continue
+            edge_pixels = support[segment_indx]
+            edge_coeff = fit_line_pixels(edge_pixels.tolist())
+            edge_inliers_coeff = fit_line_inliers_pixels(edge_pixels, edge_coeff)
+            confirmed_edges.append(edge_inliers_coeff)
+        confirmed_facets[facet_id] = {'edges': confirmed_edges}
+
+    return confirmed_facets
+
+
+def find_corners(
+    confirmed_facets: dict[int, dict[str, list]], corners_per_facet: int, corners_per_heliostat: int
+) -> list[list[float] | None]:
+    """Intersect the confirmed edges of each facet to get the confirmed corners of the heliostat.
+
+    Returns:
+    --------
+        list[list[float]|None]: The [col, row] of each heliostat corner, or None if that corner couldn't be confirmed.
+    """
+    hel_corners = [None for _ in range(0, corners_per_heliostat)]
+    for facet_indx, facet in confirmed_facets.items():
+        corners = []
+        edges = facet['edges']
+        edges.append(edges[0])  # cyclic
+        for edge_indx in range(0, len(edges) - 1):
+            edge0 = edges[edge_indx]
+            edge1 = edges[edge_indx + 1]
+            if edge0 is not None and edge1 is not None:
+                corners.append(findIntersectionLines(edge0, edge1))
+            else:
+                corners.append(None)
+        corners.insert(0, corners.pop())
+        indx = facet_indx * corners_per_facet
+        for i, j in zip(range(indx, indx + corners_per_facet), range(0, corners_per_facet)):
+            hel_corners[i] = corners[j]
+    return hel_corners
@@ -0,0 +1,97 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+import opencsp.common.lib.opencsp_path.opencsp_root_path as orp
+
+# setting path
+sys.path.append(os.path.join(orp.opencsp_code_dir(), '..', 'contrib', 'app', 'ufacet-s'))
+import helio_scan.lib.FrameFeatureCache as ffc  # nopep8
+
+
+class test_FrameFeatureCache(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.imgs = {
+            os.path.join(frame_dir, 'frame_000001.JPG'): rng.integers(0, 256, (40, 60, 3), dtype=np.uint8)
+            for frame_dir in ['video_a', 'video_b', 'video_c']
+        }
+        self.loads: list[str] = []
+
+    def _loader(self, frame_dir_body_ext: str):
+        def load():
+            self.loads.append(frame_dir_body_ext)
+            return self.imgs[frame_dir_body_ext]
+
+        return load
+
+    def test_hit(self):
+        cache = ffc.FrameFeatureCache()
+        frame_dir_body_ext = os.path.join('video_a', 'frame_000001.JPG')
+
+        features = cache.get(frame_dir_body_ext, loader=self._loader(frame_dir_body_ext))
+        edges = features.edges('light')
+        features_again = cache.get(frame_dir_body_ext, loader=self._loader(frame_dir_body_ext))
+
+        self.assertIs(features_again, features)
+        self.assertIs(features_again.edges('light'), edges)
+        self.assertEqual(self.loads, [frame_dir_body_ext])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_missing_frame(self):
+        cache = ffc.FrameFeatureCache()
+        self.assertIsNone(cache.get('missing.JPG', loader=lambda: None))
+        self.assertNotIn('missing.JPG', cache)
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        frame_nbytes = 40 * 60 * 3
+        cache = ffc.FrameFeatureCache(max_bytes=2.5 * frame_nbytes)
+        frame_a, frame_b, frame_c = self.imgs.keys()
+
+        cache.get(frame_a, loader=self._loader(frame_a))
+        cache.get(frame_b, loader=self._loader(frame_b))
+        cache.get(frame_a, loader=self._loader(frame_a))  # frame_b is now the least recently used
+        cache.get(frame_c, loader=self._loader(frame_c))
+
+        self.assertIn(frame_a, cache)
+        self.assertNotIn(frame_b, cache)
+        self.assertIn(frame_c, cache)
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+
+        # features grow the frame past the limit, but the most recently requested frame is always kept
+        cache.get(frame_c).edges('light')
+        cache.get(frame_c)
+        self.assertEqual(list(cache._frames.keys()), [frame_c])
+
+        # dropped frames are reloaded
+        cache.get(frame_b, loader=self._loader(frame_b))
+        self.assertEqual(self.loads, [frame_a, frame_b, frame_c, frame_b])
+
+    def test_no_collision_across_directories(self):
+        cache = ffc.FrameFeatureCache()
+        frame_a, frame_b, _ = self.imgs.keys()
+
+        features_a = cache.get(frame_a, loader=self._loader(frame_a))
+        features_b = cache.get(frame_b, loader=self._loader(frame_b))
+
+        self.assertIsNot(features_b, features_a)
+        np.testing.assert_array_equal(features_a.img, self.imgs[frame_a])
+        np.testing.assert_array_equal(features_b.img, self.imgs[frame_b])
+        self.assertEqual(self.loads, [frame_a, frame_b])
+
+    def test_shared_cache_max_bytes(self):
+        cache = ffc.shared_cache()
+        self.assertIs(ffc.shared_cache(), cache)
+        max_bytes = cache.max_bytes
+        try:
+            self.assertIs(ffc.shared_cache(8e9 / 25), cache)
+            self.assertEqual(cache.max_bytes, 8e9 / 25)
+        finally:
+            cache.max_bytes = max_bytes
+
+
+if __name__ == '__main__':
+    unittest.main()
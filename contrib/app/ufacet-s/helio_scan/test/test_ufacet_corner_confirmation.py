@@ -0,0 +1,143 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+import opencsp.common.lib.opencsp_path.opencsp_root_path as orp
+
+# setting path
+sys.path.append(os.path.join(orp.opencsp_code_dir(), '..', 'contrib', 'app', 'ufacet-s'))
+import helio_scan.lib.ufacet_corner_confirmation as ucc  # nopep8
+from helio_scan.lib.DEPRECATED_utils import find_hom_line_2points, min_max_col_row, fit_line_pixels  # nopep8
+from helio_scan.lib.DEPRECATED_utils import fit_line_inliers_pixels  # nopep8
+
+
+def confirm_facets_loop(expected_corners, edges, tolerance, pixels, corners_per_facet):
+    """The per-pixel loops that KeyFrameCornerSearch.confirm() and KeyFrameTrackSearch.confirm_corners() used"""
+    max_row = edges.shape[0]
+    max_col = edges.shape[1]
+
+    def confirm_facet_edges(corners, edges, tolerance, pixels):
+        confirmed_edges = []
+        corners.append(corners[0])  # cyclic
+        for indx in range(0, len(corners) - 1):
+            corner1 = corners[indx]
+            corner2 = corners[indx + 1]
+            if corner1 is None or corner2 is None:
+                confirmed_edges.append(None)
+                continue
+            # edge coefficients
+            A, B, C = find_hom_line_2points(corner1, corner2)
+            if A is None:
+                continue
+            min_col, max_col, min_row, max_row = min_max_col_row(edges, corner1, corner2)
+            edge_pixels = []
+            # confirming
+            if indx % 2 == 0:
+                for row in range(min_row, max_row):
+                    for col in range(min_col, max_col):
+                        dist = abs(A * col + B * row + C)
+                        if edges[row][col] and dist <= tolerance:
+                            edge_pixels.append([col, row])
+            else:
+                for col in range(min_col, max_col):
+                    for row in range(min_row, max_row):
+                        dist = abs(A * col + B * row + C)
+                        if edges[row][col] and dist <= tolerance:
+                            edge_pixels.append([col, row])
+            if len(edge_pixels) < pixels:
+                confirmed_edges.append(None)  # edge was not confirmed
+                continue
+
+            # confirmed edge
+            edge_coeff = fit_line_pixels(edge_pixels)
+            edge_inliers_coeff = fit_line_inliers_pixels(edge_pixels, edge_coeff)
+            confirmed_edges.append(edge_inliers_coeff)
+
+        return confirmed_edges
+
+    confirmed_facets = {}
+    for indx in range(0, len(expected_corners), corners_per_facet):
+        facet_id = indx // corners_per_facet
+        corners = [expected_corners[indx + i] for i in range(0, corners_per_facet)]
+        for corner_indx in range(0, len(corners)):
+            corner = corners[corner_indx]
+            if corner[0] >= max_col or corner[0] < 0 or corner[1] >= max_row or corner[1] < 0:
+                corners[corner_indx] = None
+
+        confirmed_facets[facet_id] = {'edges': confirm_facet_edges(corners, edges, tolerance, pixels)}
+    return confirmed_facets
+
+
+class test_ufacet_corner_confirmation(unittest.TestCase):
+    def setUp(self) -> None:
+        """Edge image of a 3x3 grid of slightly rotated facets, with noise and gaps, and their noisy expected corners"""
+        rng = np.random.default_rng(0)
+        self.corners_per_facet = 4
+        self.edges = np.zeros((300, 400), dtype=np.uint8)
+        self.expected_corners = []
+        angle = np.deg2rad(3)
+        rot = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        for facet_row in range(3):
+            for facet_col in range(3):
+                center = np.array([80 + 120 * facet_col, 60 + 90 * facet_row])
+                # top-left, top-right, bottom-right, bottom-left, as [col, row]
+                square = np.array([[-45, -35], [45, -35], [45, 35], [-45, 35]])
+                corners = center + square @ rot.T
+                for i in range(4):
+                    c0, c1 = corners[i], corners[(i + 1) % 4]
+                    for t in np.linspace(0, 1, 200):
+                        if rng.random() < 0.1:
+                            continue  # gap in the edge
+                        col, row = np.round(c0 + t * (c1 - c0) + rng.normal(0, 0.4, 2)).astype(int)
+                        if 0 <= row < self.edges.shape[0] and 0 <= col < self.edges.shape[1]:
+                            self.edges[row, col] = 255
+                self.expected_corners += (corners + rng.normal(0, 1.5, corners.shape)).tolist()
+        self.edges[rng.random(self.edges.shape) < 0.01] = 255
+
+        # one facet that is partially outside of the image
+        self.expected_corners[0] = [-5.0, 20.0]
+
+    def test_confirm_facets_matches_loop(self):
+        for tolerance, pixels in [(3, 10), (1.5, 40), (2, 120)]:
+            expected = confirm_facets_loop(
+                [list(c) for c in self.expected_corners], self.edges, tolerance, pixels, self.corners_per_facet
+            )
+            actual = ucc.confirm_facets(self.expected_corners, self.edges, tolerance, pixels, self.corners_per_facet)
+            self.assertEqual(actual, expected)
+
+            hel_corners_expected = ucc.find_corners(expected, self.corners_per_facet, len(self.expected_corners))
+            hel_corners_actual = ucc.find_corners(actual, self.corners_per_facet, len(self.expected_corners))
+            self.assertEqual(hel_corners_actual, hel_corners_expected)
+
+    def test_edge_support_pixels_order(self):
+        corner1, corner2 = self.expected_corners[1], self.expected_corners[2]
+        A, B, C = find_hom_line_2points(corner1, corner2)
+        min_col, max_col, min_row, max_row = min_max_col_row(self.edges, corner1, corner2)
+        row_major = []
+        for row in range(min_row, max_row):
+            for col in range(min_col, max_col):
+                if self.edges[row][col] and abs(A * col + B * row + C) <= 2:
+                    row_major.append([col, row])
+        col_major = sorted(row_major, key=lambda pixel: (pixel[0], pixel[1]))
+
+        support = ucc.edge_support_pixels(
+            self.edges, [(corner1, corner2, A, B, C, False), (corner1, corner2, A, B, C, True)], 2
+        )
+        self.assertGreater(len(row_major), 0)
+        self.assertEqual(support[0].tolist(), row_major)
+        self.assertEqual(support[1].tolist(), col_major)
+
+    def test_fit_line_inliers_pixels(self):
+        rng = np.random.default_rng(1)
+        cols = np.arange(100)
+        rows = np.round(0.2 * cols + 10 + rng.normal(0, 1, cols.size)).astype(int)
+        rows[::9] += 8  # outliers
+        pixels = np.stack([cols, rows], axis=1)
+        coeff = fit_line_pixels(pixels.tolist())
+        self.assertEqual(ucc.fit_line_inliers_pixels(pixels, coeff), fit_line_inliers_pixels(pixels.tolist(), coeff))
+
+
+if __name__ == '__main__':
+    unittest.main()
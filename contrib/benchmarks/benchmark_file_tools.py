@@ -0,0 +1,66 @@
+"""
+Time to list and count the files in a large frames directory with file_tools.
+
+Creates --nfiles empty "frame" files (plus a few other files) in a temporary
+directory and times files_in_directory(), files_in_directory_by_extension(),
+files_in_directory_with_associated_sizes() and count_items_in_directory(),
+with and without the cached directory listing. Run from the repository root
+with, for example:
+
+    PYTHONPATH=. python contrib/benchmarks/benchmark_file_tools.py --nfiles 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import opencsp.common.lib.tool.file_tools as ft
+
+
+def _time(description: str, func, nrepeats=3):
+    tstart = time.time()
+    for i in range(nrepeats):
+        ret = func()
+    elapsed = (time.time() - tstart) / nrepeats
+    count = ret if isinstance(ret, int) else len(ret)
+    print(f"{description:>45}: {elapsed * 1e3:>9.1f}ms ({count} items)")
+
+
+def benchmark(nfiles: int):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(nfiles):
+            open(os.path.join(tmp_dir, "frame_%06d.JPG" % i), "w").close()
+        for i in range(10):
+            open(os.path.join(tmp_dir, "notes_%d.txt" % i), "w").close()
+
+        # make the directory old enough to be cached
+        mtime = time.time() - 10
+        os.utime(tmp_dir, (mtime, mtime))
+
+        _time("files_in_directory", lambda: ft.files_in_directory(tmp_dir))
+        _time("files_in_directory(files_only)", lambda: ft.files_in_directory(tmp_dir, files_only=True))
+        _time("files_in_directory_by_extension", lambda: ft.files_in_directory_by_extension(tmp_dir, ["txt"])["txt"])
+        _time("files_in_directory_with_associated_sizes", lambda: ft.files_in_directory_with_associated_sizes(tmp_dir))
+        _time("count_items_in_directory", lambda: ft.count_items_in_directory(tmp_dir, "frame_", ".JPG"))
+        _time(
+            "count_items_in_directory(use_cache)",
+            lambda: ft.count_items_in_directory(tmp_dir, "frame_", ".JPG", use_cache=True),
+        )
+        _time(
+            "iterate_directory(globexp, use_cache)",
+            lambda: list(ft.iterate_directory(tmp_dir, "*.txt", use_cache=True)),
+        )
+        _time(
+            "binary_count_items_in_directory",
+            lambda: ft.binary_count_items_in_directory(tmp_dir, "frame_%06d.JPG", start=0),
+        )
+        ft.clear_directory_cache()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog=os.path.basename(__file__), description='file_tools directory listing')
+    parser.add_argument('--nfiles', type=int, default=100000, help="Number of files in the directory.")
+    args = parser.parse_args()
+
+    benchmark(args.nfiles)
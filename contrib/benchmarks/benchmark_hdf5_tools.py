@@ -0,0 +1,97 @@
+"""
+File size and read/write throughput of HDF5 archives saved with hdf5_tools.
+
+Saves a SOFAST-like archive, with a stack of fringe images and many small
+parameter datasets, and compares:
+
+    - save_hdf5_datasets() with a file name per call (reopens the file each time)
+    - one HDF5Session for all calls, uncompressed
+    - one HDF5Session for all calls, chunked and gzip/lzf compressed
+
+Reading is timed for the whole image stack, and for a 100x100 pixel region of
+one image with load_hdf5_dataset_slice(). Run from the repository root with,
+for example:
+
+    PYTHONPATH=. python contrib/benchmarks/benchmark_hdf5_tools.py --size 1000 --nimages 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import opencsp.common.lib.tool.hdf5_tools as h5
+
+
+def _fringe_images(size: int, nimages: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    x = np.arange(size)[None, :, None]
+    periods = np.geomspace(8, size, nimages)[None, None, :]
+    images = 127 + 100 * np.sin(2 * np.pi * x / periods) + rng.normal(0, 3, (size, size, nimages))
+    return np.clip(images, 0, 255).astype(np.uint8)
+
+
+def _save(file: str, images: np.ndarray, nparams: int, session_kwargs: dict | None):
+    datasets = [f'Measurement/fringe_image_{i:d}' for i in range(images.shape[2])]
+    params = [f'Params/param_{i:d}' for i in range(nparams)]
+    images = [images[..., i] for i in range(images.shape[2])]
+    values = np.arange(nparams, dtype=float)
+
+    if session_kwargs is None:
+        for image, dataset in zip(images, datasets):
+            h5.save_hdf5_datasets([image], [dataset], file)
+        for value, param in zip(values, params):
+            h5.save_hdf5_datasets([value], [param], file)
+    else:
+        with h5.HDF5Session(file, 'w', **session_kwargs) as session:
+            for image, dataset in zip(images, datasets):
+                h5.save_hdf5_datasets([image], [dataset], session)
+            for value, param in zip(values, params):
+                h5.save_hdf5_datasets([value], [param], session)
+    return datasets
+
+
+def benchmark(size: int, nimages: int, nparams: int = 200):
+    images = _fringe_images(size, nimages)
+    nbytes = images.nbytes
+    chunks = (min(size, 256), min(size, 256))
+    variants = {
+        "file name per call": None,
+        "session": {},
+        "session, gzip 4": dict(chunks=chunks, compression='gzip', compression_opts=4),
+        "session, lzf": dict(chunks=chunks, compression='lzf'),
+    }
+
+    print(f"{'variant':>20} {'size (MB)':>10} {'write MB/s':>11} {'read MB/s':>10} {'100x100 read (ms)':>18}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, (description, session_kwargs) in enumerate(variants.items()):
+            file = os.path.join(tmp_dir, f"archive_{i:d}.h5")
+
+            tstart = time.time()
+            datasets = _save(file, images, nparams, session_kwargs)
+            write_time = time.time() - tstart
+
+            tstart = time.time()
+            h5.load_hdf5_datasets(datasets, file)
+            read_time = time.time() - tstart
+
+            tstart = time.time()
+            h5.load_hdf5_dataset_slice(datasets[-1], file, np.s_[size // 2 : size // 2 + 100, :100])
+            slice_time = time.time() - tstart
+
+            file_size = os.path.getsize(file) / 1e6
+            print(
+                f"{description:>20} {file_size:>10.1f} {nbytes / write_time / 1e6:>11.1f} "
+                + f"{nbytes / read_time / 1e6:>10.1f} {slice_time * 1e3:>18.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog=os.path.basename(__file__), description='hdf5_tools size and throughput')
+    parser.add_argument('--size', type=int, default=1000, help="Number of pixels along each side of the images.")
+    parser.add_argument('--nimages', type=int, default=20, help="Number of images.")
+    args = parser.parse_args()
+
+    benchmark(args.size, args.nimages)
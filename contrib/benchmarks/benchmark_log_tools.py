@@ -0,0 +1,65 @@
+"""
+Time spent logging from many worker processes with log_tools.
+
+Each of --nprocs worker processes logs --nmessages info messages and as many
+disabled debug messages, either with every process writing directly to the
+log file and console (multiprocessing_logger()) or through the queue listener
+(multiprocessing_logger(use_queue=True)). Console output is discarded. Run
+from the repository root with, for example:
+
+    PYTHONPATH=. python contrib/benchmarks/benchmark_log_tools.py --nprocs 8 --nmessages 20000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import opencsp.common.lib.tool.log_tools as lt
+
+
+def _worker(nmessages: int) -> float:
+    tstart = time.time()
+    for i in range(nmessages):
+        lt.info("message %d from %s" % (i, multiprocessing.current_process().name))
+        lt.debug("disabled message %d" % i)
+    return time.time() - tstart
+
+
+def benchmark(nprocs: int, nmessages: int, use_queue: bool):
+    with tempfile.TemporaryDirectory() as tmp_dir, open(os.devnull, "w") as devnull:
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = devnull, devnull
+        try:
+            lt.multiprocessing_logger(os.path.join(tmp_dir, "log.txt"), use_queue=use_queue)
+
+            tstart = time.time()
+            with multiprocessing.Pool(nprocs) as pool:
+                worker_times = pool.map(_worker, [nmessages] * nprocs)
+            lt.stop_log_queue_listener()
+            elapsed = time.time() - tstart
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+
+        # reset for the next run
+        for handler in list(lt.global_multiprocessing_logger.handlers):
+            lt.global_multiprocessing_logger.removeHandler(handler)
+            handler.close()
+
+    description = "queue" if use_queue else "direct"
+    print(
+        f"{description:>6}: {elapsed:.2f}s total, "
+        + f"{sum(worker_times) / (nprocs * nmessages) * 1e6:.1f}us per message in the workers"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog=os.path.basename(__file__), description='log_tools multiprocess logging')
+    parser.add_argument('--nprocs', type=int, default=8, help="Number of worker processes.")
+    parser.add_argument('--nmessages', type=int, default=20000, help="Number of messages per worker.")
+    args = parser.parse_args()
+
+    benchmark(args.nprocs, args.nmessages, use_queue=False)
+    benchmark(args.nprocs, args.nmessages, use_queue=True)
@@ -0,0 +1,58 @@
+"""
+Time and peak memory of building a PowerPoint deck from in-memory images.
+
+Adds --nslides slides, each with a 2x2 grid of random RGB images, to a
+RenderControlPowerpointPresentation and saves it. Images are encoded when the
+slide is added and then released, so peak memory should stay flat as the
+number of slides grows. Run from the repository root with, for example:
+
+    PYTHONPATH=. python contrib/benchmarks/benchmark_powerpoint.py --nslides 10 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import opencsp.common.lib.render.PowerpointSlide as pps
+from opencsp.common.lib.render.lib.PowerpointImage import PowerpointImage
+import opencsp.common.lib.render_control.RenderControlPowerpointPresentation as rcpp
+import opencsp.common.lib.render_control.RenderControlPowerpointSlide as rcpps
+
+
+def benchmark(nslides: int, num_workers: int, size: tuple[int, int] = (1500, 2000)):
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 256, (*size, 3), dtype=np.uint8) for i in range(4)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        PowerpointImage._tmp_save_path = tmp_dir
+
+        tracemalloc.start()
+        tstart = time.time()
+        presentation = rcpp.RenderControlPowerpointPresentation()
+        for i in range(nslides):
+            slide_control = rcpps.RenderControlPowerpointSlide(reduced_image_size_scale=0.5)
+            slide = pps.PowerpointSlide.template_content_grid(2, 2, slide_control)
+            for image in images:
+                # copy, as if each image was newly generated
+                slide.add_image(image.copy())
+            slide.save(num_workers)
+            presentation.add_slide(slide)
+        presentation.save(os.path.join(tmp_dir, "benchmark.pptx"))
+        elapsed = time.time() - tstart
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"{nslides:d} slides, {num_workers:d} workers: {elapsed:.2f}s, peak memory {peak / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog=os.path.basename(__file__), description='PowerPoint deck build time')
+    parser.add_argument('--nslides', type=int, default=10, help="Number of slides.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Number of threads to encode images with.")
+    args = parser.parse_args()
+
+    benchmark(args.nslides, args.workers)
@@ -0,0 +1,100 @@
+"""
+Barrier latency of the ServerSynchronizer transports.
+
+Simulates N servers as threads in this process, and times how long each
+ServerSynchronizer.wait() takes from the moment the last server arrives. Run
+from the repository root with, for example:
+
+    PYTHONPATH=. python contrib/benchmarks/benchmark_server_synchronizer.py --num-servers 20 --num-barriers 10
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import opencsp.common.lib.process.ServerSynchronizer as ss
+import opencsp.common.lib.process.lib.DirectoryWatcher as dw
+import opencsp.common.lib.process.lib.FileSynchronizerTransport as fst
+import opencsp.common.lib.process.lib.InotifySynchronizerTransport as ist
+import opencsp.common.lib.process.lib.TcpSynchronizerTransport as tst
+
+
+def _make_transports(kind: str, num_servers: int, path: str, settle_time: float):
+    if kind == "file":
+        # the settle time needs to be a few poll intervals long, so that every server sees every file
+        poll_interval = min(1, settle_time / 5)
+        transports = [
+            fst.FileSynchronizerTransport(path, poll_interval=poll_interval, settle_time=settle_time)
+            for _ in range(num_servers)
+        ]
+        return transports, None
+    elif kind == "inotify":
+        return [ist.InotifySynchronizerTransport(path, settle_time=settle_time) for _ in range(num_servers)], None
+    elif kind == "tcp":
+        coordinator = tst.TcpSynchronizerCoordinator(num_servers)
+        coordinator.start()
+        transports = [
+            tst.TcpSynchronizerTransport("127.0.0.1", coordinator.port, host_coordinator=False)
+            for _ in range(num_servers)
+        ]
+        return transports, coordinator
+    raise ValueError(f"Unknown transport \"{kind}\"")
+
+
+def benchmark(kind: str, num_servers: int, num_barriers: int, settle_time: float) -> list[float]:
+    """Returns the latency of each barrier, in seconds, measured from the last server's arrival to the last server's release."""
+    with tempfile.TemporaryDirectory() as path:
+        transports, coordinator = _make_transports(kind, num_servers, path, settle_time)
+        arrivals = [[0.0] * num_servers for _ in range(num_barriers)]
+        releases = [[0.0] * num_servers for _ in range(num_barriers)]
+
+        def run(server_index: int):
+            synchronizer = ss.ServerSynchronizer(num_servers, server_index, transport=transports[server_index])
+            try:
+                for barrier_idx in range(num_barriers):
+                    arrivals[barrier_idx][server_index] = time.time()
+                    synchronizer.wait()
+                    releases[barrier_idx][server_index] = time.time()
+            finally:
+                synchronizer.stop()
+
+        threads = [threading.Thread(target=run, args=[i]) for i in range(num_servers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if coordinator != None:
+            coordinator.close()
+
+    return [max(releases[i]) - max(arrivals[i]) for i in range(num_barriers)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog=os.path.basename(__file__), description='ServerSynchronizer barrier latency')
+    parser.add_argument('--num-servers', type=int, default=20, help="How many servers to simulate.")
+    parser.add_argument('--num-barriers', type=int, default=5, help="How many wait() calls to time.")
+    parser.add_argument(
+        '--transports',
+        nargs='+',
+        default=["file", "inotify", "tcp"],
+        help="Which transports to benchmark (file, inotify, tcp).",
+    )
+    parser.add_argument(
+        '--settle-time', type=float, default=5, help="settle_time for the file based transports, in seconds."
+    )
+    args = parser.parse_args()
+
+    print(f"{'transport':>10} {'servers':>8} {'mean (ms)':>10} {'median (ms)':>12} {'max (ms)':>10}")
+    for kind in args.transports:
+        if kind == "inotify" and not dw.DirectoryWatcher.is_supported():
+            print(f"{kind:>10} not supported on this system")
+            continue
+        latencies = benchmark(kind, args.num_servers, args.num_barriers, args.settle_time)
+        latencies_ms = [latency * 1000 for latency in latencies]
+        print(
+            f"{kind:>10} {args.num_servers:>8} {statistics.mean(latencies_ms):>10.1f} "
+            + f"{statistics.median(latencies_ms):>12.1f} {max(latencies_ms):>10.1f}"
+        )
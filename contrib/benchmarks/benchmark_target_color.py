@@ -0,0 +1,81 @@
+"""
+Generation time of large TargetColor patterns.
+
+Times the pattern builders in opencsp.common.lib.target.TargetColor on a
+square target with the given number of pixels per side (10,000 x 10,000 by
+default, about the size of a 3m print at 85 dpi). Run from the repository
+root with, for example:
+
+    PYTHONPATH=. python contrib/benchmarks/benchmark_target_color.py --size 10000
+"""
+
+import argparse
+import os
+import time
+
+import opencsp.common.lib.render.color as Color
+import opencsp.common.lib.target.TargetColor as tc
+import opencsp.common.lib.target.target_color_convert as tcc
+
+
+def _time(description: str, n_pixels: int, func):
+    tstart = time.time()
+    ret = func()
+    elapsed = time.time() - tstart
+    print(f"{description:>40} {elapsed:>10.2f} {n_pixels / elapsed / 1e6:>12.2f}")
+    return ret
+
+
+def benchmark(size: int, dpm: float = 3333.33):
+    width = size / dpm
+    n_pixels = size * size
+    print(f"{'pattern':>40} {'time (s)':>10} {'Mpixels/s':>12}")
+
+    target = _time(
+        "polar, saturated center to white", n_pixels, lambda: tc.construct_target_polar_color_bar(width, width, dpm)
+    )
+    _time(
+        "polar, light center to saturated",
+        n_pixels,
+        lambda: tc.construct_target_polar_color_bar(
+            width,
+            width,
+            dpm,
+            radial_gradient_type='light_center_to_saturated',
+            radial_gradient_name='l2s',
+            pattern_boundary='circle',
+        ),
+    )
+    _time(
+        "linear x, continuous",
+        n_pixels,
+        lambda: tc.construct_target_linear_color_bar(
+            width, width, dpm, Color.black(), tcc.O_color_bar(), 'O', Color.white(), 'x', 'continuous'
+        ),
+    )
+    _time(
+        "linear y, discrete, saturated to white",
+        n_pixels,
+        lambda: tc.construct_target_linear_color_bar(
+            width,
+            width,
+            dpm,
+            Color.black(),
+            tcc.O_color_bar(),
+            'O',
+            Color.white(),
+            'y',
+            'discrete',
+            lateral_gradient_type='saturated_to_white',
+        ),
+    )
+    _time("adjust color saturation", n_pixels, lambda: target.adjust_color_saturation(0.5))
+    _time("extend all sides by 100 pixels", n_pixels, lambda: tc.extend_target_all(target, 100, Color.white()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog=os.path.basename(__file__), description='TargetColor generation time')
+    parser.add_argument('--size', type=int, default=10000, help="Number of pixels along each side of the target.")
+    args = parser.parse_args()
+
+    benchmark(args.size)
@@ -4,9 +4,10 @@ machine vision camera.
 """
 
 import os
+import threading
 import tkinter
+from tkinter import messagebox
 from tkinter.filedialog import askopenfilename, asksaveasfilename
-from warnings import warn
 
 import cv2
 import matplotlib.pyplot as plt
@@ -14,12 +15,14 @@ import numpy as np
 from scipy.spatial.transform import Rotation
 
 import opencsp.app.camera_calibration.lib.calibration_camera as cc
+import opencsp.app.camera_calibration.lib.calibration_pipeline as cp
 import opencsp.app.camera_calibration.lib.image_processing as ip
 from opencsp.app.camera_calibration.lib.ViewAnnotatedImages import ViewAnnotatedImages
 import opencsp.app.sofast.lib.spatial_processing as sp
 from opencsp.common.lib.camera.Camera import Camera
 from opencsp.common.lib.geometry.Vxy import Vxy
 from opencsp.common.lib.geometry.Vxyz import Vxyz
+import opencsp.common.lib.opencsp_path.opencsp_root_path as orp
 import opencsp.common.lib.tool.tk_tools as tkt
 
 
@@ -46,9 +49,15 @@ class CalibrationGUI:
         self.images_loaded = False
         self.camera_calibrated = False
 
+        # Corner finding parameters. Corners are found in a background thread,
+        # which must not start worker processes while Tk is running.
+        self.num_processes = 1
+        self.pyramid_levels = 0
+        self.corners_cache_dir = os.path.join(orp.opencsp_cache_dir(), 'camera_calibration', 'corners')
+
         # Initialize variables
         self.files: list[str]
-        self.images: list[np.ndarray]
+        self.used_files: list[str]
         self.used_file_names: list[str]
         self.p_object: list[Vxyz]
         self.p_image: list[Vxy]
@@ -207,7 +216,7 @@ class CalibrationGUI:
             self.camera_calibrated = False
 
             # Clear data
-            self.images = []
+            self.used_files = []
             self.used_file_names = []
             self.p_object = []
             self.p_image = []
@@ -228,41 +237,65 @@ class CalibrationGUI:
         # Get number checkerboard points
         npts = self.get_npts()
 
-        # Find corners
-        self.p_object = []
-        self.p_image = []
-        self.images = []
-        self.used_file_names = []
-
-        for file in self.files:
-            # Get file name
-            file_name = os.path.basename(file)
-
-            # Update progress
-            print('Processing:', file_name, flush=True)
-
-            # Load images
-            img = cv2.imread(file, cv2.IMREAD_GRAYSCALE)
-
-            # Find checkerboard corners
-            p_object, p_image = ip.find_checkerboard_corners(npts, img)
-            if p_object is None or p_image is None:
-                warn(f'Could not find corners in image: {file_name:s}.', stacklevel=2)
-                continue
+        # Disable buttons while corners are found
+        for btn in [self.btn_select_ims, self.btn_find_corns, self.btn_view_corns, self.btn_calibrate]:
+            btn.config(state="disabled")
+        self.lbl_corns_found.config(text=f'Processing 0/{len(self.files):d} images')
+
+        # Find corners in a background thread so the window stays responsive
+        self._corners_progress = (0, len(self.files))
+        self._corners_results = None
+        self._corners_error = None
+        thread = threading.Thread(target=self._find_corners_thread, args=(npts,), daemon=True)
+        thread.start()
+        self.root.after(100, self._check_find_corners, thread)
+
+    def _find_corners_thread(self, npts: tuple[int, int]):
+        def progress_callback(num_done: int, num_files: int, file: str, found: bool):
+            print('Processed:', os.path.basename(file), flush=True)
+            self._corners_progress = (num_done, num_files)
+
+        try:
+            self._corners_results = cp.find_corners_in_files(
+                self.files,
+                npts,
+                num_processes=self.num_processes,
+                pyramid_levels=self.pyramid_levels,
+                cache_dir=self.corners_cache_dir,
+                progress_callback=progress_callback,
+            )
+        except Exception as error:
+            self._corners_error = error
+
+    def _check_find_corners(self, thread: threading.Thread):
+        # Update progress, and check again later if corners are still being found
+        if thread.is_alive():
+            num_done, num_files = self._corners_progress
+            self.lbl_corns_found.config(text=f'Processing {num_done:d}/{num_files:d} images')
+            self.root.after(100, self._check_find_corners, thread)
+            return
+
+        self.btn_select_ims.config(state="normal")
+        if self._corners_error is not None:
+            self.enable_btns()
+            messagebox.showerror('Error', repr(self._corners_error))
+            return
 
-            # Save image, filename, and found corners
-            self.images.append(img)
-            self.used_file_names.append(file_name)
+        if len(self._corners_results[0]) == 0:
+            self.enable_btns()
+            messagebox.showerror('Error', 'Could not find checkerboard corners in any image.')
+            return
 
-            self.p_object.append(p_object)
-            self.p_image.append(p_image)
+        # Save filenames and found corners
+        self.used_files, self.p_object, self.p_image, img_size_xy = self._corners_results
+        self.used_file_names = [os.path.basename(file) for file in self.used_files]
 
         # Update flags
         self.images_loaded = True
         self.camera_calibrated = False
 
         # Save image size
-        self.img_size_xy = np.flip(self.images[0].shape)
+        self.img_size_xy = np.array(img_size_xy)
 
         # Clear any calibrated camera
         self.camera = None
@@ -283,7 +316,9 @@ class CalibrationGUI:
 
         # Annotate images
         ims = []
-        for idx, image in enumerate(self.images):
+        for idx, file in enumerate(self.used_files):
+            # Load image
+            image = cv2.imread(file, cv2.IMREAD_GRAYSCALE)
             # Create RGB image
             im3 = np.concatenate([image[..., np.newaxis]] * 3, axis=2)
             # Annotate image
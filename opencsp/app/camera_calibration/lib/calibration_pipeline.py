@@ -0,0 +1,141 @@
+"""Headless pipeline to find checkerboard corners in a set of calibration
+images and calibrate a machine vision camera, without the GUI.
+"""
+
+from functools import partial
+from multiprocessing.pool import Pool
+import os
+from typing import Callable, Iterable
+
+from scipy.spatial.transform import Rotation
+
+import opencsp.app.camera_calibration.lib.calibration_camera as cc
+import opencsp.app.camera_calibration.lib.image_processing as ip
+from opencsp.common.lib.camera.Camera import Camera
+from opencsp.common.lib.geometry.Vxy import Vxy
+from opencsp.common.lib.geometry.Vxyz import Vxyz
+import opencsp.common.lib.tool.file_tools as ft
+import opencsp.common.lib.tool.log_tools as lt
+
+
+def find_corners_in_files(
+    files: Iterable[str],
+    npts: tuple[int, int],
+    num_processes: int = 1,
+    pyramid_levels: int = 0,
+    cache_dir: str = None,
+    progress_callback: Callable[[int, int, str, bool], None] = None,
+) -> tuple[list[str], list[Vxyz], list[Vxy], tuple[int, int]]:
+    """
+    Finds checkerboard corners in all given image files.
+
+    Parameters
+    ----------
+    files : Iterable[str]
+        Paths to calibration image files.
+    npts : tuple (x, y)
+        Number of checkerboard corners, see ip.find_checkerboard_corners().
+    num_processes : int, optional
+        Number of worker processes to find corners with, by default 1 (run in
+        the calling process).
+    pyramid_levels : int, optional
+        Number of times images are downscaled for the first corner search, see
+        ip.find_checkerboard_corners(). By default 0 (search the full resolution
+        images only).
+    cache_dir : str, optional
+        Directory to cache found corners in, by default None (no caching). See
+        ip.find_checkerboard_corners_in_file().
+    progress_callback : Callable[[int, int, str, bool], None], optional
+        Called in the calling process after each image is processed, with the
+        number of images processed so far, the total number of images, the
+        image file, and whether corners were found. By default None.
+
+    Returns
+    -------
+    used_files : list[str]
+        Files where corners were found, in the order given.
+    p_object : list[Vxyz]
+        Location of corners in target grid coordinates, for each used file.
+    p_image : list[Vxy]
+        Location of corners in camera pixels, for each used file.
+    img_size_xy : tuple[int, int]
+        Size of the first used image in pixels. None if no corners were found.
+
+    """
+    files = list(files)
+    if cache_dir is not None:
+        ft.create_directories_if_necessary(cache_dir)
+
+    find_corners = partial(
+        ip.find_checkerboard_corners_in_file, npts=npts, pyramid_levels=pyramid_levels, cache_dir=cache_dir
+    )
+
+    used_files = []
+    p_object = []
+    p_image = []
+    img_size_xy = None
+
+    def process_results(results: Iterable[tuple[Vxyz, Vxy, tuple[int, int]]]):
+        nonlocal img_size_xy
+        for idx, (file, (p_cur_object, p_cur_image, cur_img_size_xy)) in enumerate(zip(files, results)):
+            found = p_cur_image is not None
+            if found:
+                used_files.append(file)
+                p_object.append(p_cur_object)
+                p_image.append(p_cur_image)
+                if img_size_xy is None:
+                    img_size_xy = cur_img_size_xy
+            else:
+                lt.warn(f'Could not find corners in image: {os.path.basename(file):s}.')
+
+            if progress_callback is not None:
+                progress_callback(idx + 1, len(files), file, found)
+
+    if num_processes > 1:
+        with Pool(num_processes) as pool:
+            process_results(pool.imap(find_corners, files))
+    else:
+        process_results(map(find_corners, files))
+
+    return used_files, p_object, p_image, img_size_xy
+
+
+def calibrate_camera_from_files(
+    files: Iterable[str], npts: tuple[int, int], name: str, **kwargs
+) -> tuple[Camera, list[Rotation], list[Vxyz], float, list[str]]:
+    """
+    Finds checkerboard corners in all given image files and calibrates a
+    camera from them.
+
+    Parameters
+    ----------
+    files : Iterable[str]
+        Paths to calibration image files.
+    npts : tuple (x, y)
+        Number of checkerboard corners.
+    name : str
+        Name of camera.
+    kwargs
+        Corner finding parameters, see find_corners_in_files().
+
+    Returns
+    -------
+    camera : Camera
+        Calibrated camera.
+    r_cam_object : list[Rotation]
+        Camera-object rotation for each used file.
+    v_cam_object_cam : list[Vxyz]
+        Camera location vector for each used file.
+    error : float
+        Average reprojection error (pixels).
+    used_files : list[str]
+        Files where corners were found, and that the camera was calibrated with.
+
+    """
+    used_files, p_object, p_image, img_size_xy = find_corners_in_files(files, npts, **kwargs)
+    if len(used_files) == 0:
+        raise ValueError('Could not find checkerboard corners in any image.')
+
+    (camera, r_cam_object, v_cam_object_cam, error) = cc.calibrate_camera(p_object, p_image, img_size_xy, name)
+
+    return camera, r_cam_object, v_cam_object_cam, error, used_files
@@ -6,9 +6,11 @@ import numpy as np
 
 from opencsp.common.lib.geometry.Vxy import Vxy
 from opencsp.common.lib.geometry.Vxyz import Vxyz
+import opencsp.common.lib.tool.hdf5_tools as h5
+import opencsp.common.lib.tool.log_tools as lt
 
 
-def find_checkerboard_corners(npts: tuple[int, int], img: np.ndarray) -> tuple[Vxyz, Vxy]:
+def find_checkerboard_corners(npts: tuple[int, int], img: np.ndarray, pyramid_levels: int = 0) -> tuple[Vxyz, Vxy]:
     """
     Finds checkerboard corners in given image.
 
@@ -21,6 +23,13 @@ def find_checkerboard_corners(npts: tuple[int, int], img: np.ndarray) -> tuple[V
     img : 2D numpy array, uint8
         Image containing checkerboard image. Should be opened using
         cv2.imread(file, cv2.IMREAD_GRAYSCALE)
+    pyramid_levels : int, optional
+        Number of times to halve the image (cv.pyrDown) before searching for
+        the checkerboard. The corners found in the downscaled image are refined
+        level by level back up to full resolution. This is much faster for
+        large images. If the checkerboard is not found in the downscaled image,
+        or the refined corners do not form a consistent grid, the search is
+        repeated at full resolution. By default 0 (search at full resolution).
 
     Returns
     -------
@@ -30,26 +39,97 @@ def find_checkerboard_corners(npts: tuple[int, int], img: np.ndarray) -> tuple[V
         Location of corners in camera pixels
 
     """
-    # Find corners
-    chessboard_flags = cv.CALIB_CB_ADAPTIVE_THRESH + cv.CALIB_CB_FAST_CHECK + cv.CALIB_CB_NORMALIZE_IMAGE
-    ret, corners = cv.findChessboardCorners(img, npts, chessboard_flags)
+    p_corners_refined = None
 
-    # Check corners were found
-    if ret is not True:
-        return None, None
+    # Find and refine corners in downscaled image
+    if pyramid_levels > 0:
+        p_corners_refined = _find_checkerboard_corners_pyramid(npts, img, pyramid_levels)
 
-    # Process corners
-    p_corners = Vxy(corners[:, 0, :].T, dtype=np.float32)
+    if p_corners_refined is None:
+        # Find corners
+        ret, corners = cv.findChessboardCorners(img, npts, _CHESSBOARD_FLAGS)
 
-    # Refine the corners
-    p_corners_refined = refine_checkerboard_corners(img, p_corners, window_size=(11, 11))
+        # Check corners were found
+        if ret is not True:
+            return None, None
+
+        # Process corners
+        p_corners = Vxy(corners[:, 0, :].T, dtype=np.float32)
+
+        # Refine the corners
+        p_corners_refined = refine_checkerboard_corners(img, p_corners, window_size=(11, 11))
+
+    return checkerboard_object_points(npts), p_corners_refined
 
+
+def checkerboard_object_points(npts: tuple[int, int]) -> Vxyz:
+    """
+    Returns the location of checkerboard corners in target grid coordinates,
+    in the order they are returned by find_checkerboard_corners().
+
+    Parameters
+    ----------
+    npts : tuple (x, y)
+        Number of checkerboard corners.
+
+    Returns
+    -------
+    Vxyz
+        Location of corners in target grid coordinates, float32.
+
+    """
     # Define object points (x,y,z) as in: (0,0,0), (1,0,0), (2,0,0), ... (6,5,0)
     objp = np.zeros((npts[0] * npts[1], 3), dtype=np.float32)
     objp[:, :2] = np.mgrid[0 : npts[0], 0 : npts[1]].T.reshape(-1, 2)
-    p_object = Vxyz(objp.T, dtype=np.float32)
+    return Vxyz(objp.T, dtype=np.float32)
 
-    return p_object, p_corners_refined
+
+def find_checkerboard_corners_in_file(
+    file: str, npts: tuple[int, int], pyramid_levels: int = 0, cache_dir: str = None
+) -> tuple[Vxyz, Vxy, tuple[int, int]]:
+    """
+    Loads an image file and finds its checkerboard corners. Images are not
+    returned, so this is suitable to run in worker processes.
+
+    Parameters
+    ----------
+    file : str
+        Path to image file.
+    npts : tuple (x, y)
+        Number of corners to find, see find_checkerboard_corners().
+    pyramid_levels : int, optional
+        See find_checkerboard_corners(), by default 0.
+    cache_dir : str, optional
+        Directory to cache detected corners in, by default None (no caching).
+        Cache files are named by the hash of the image file contents and the
+        detection parameters. Images where no checkerboard was found are cached
+        too.
+
+    Returns
+    -------
+    p_object : Vxyz
+        Location of corners in target grid coordinates. None if not found.
+    p_image : Vxy
+        Location of corners in camera pixels. None if not found.
+    img_size_xy : tuple[int, int]
+        Size of image in pixels.
+
+    """
+
+    def find_corners() -> list[np.ndarray]:
+        img = cv.imread(file, cv.IMREAD_GRAYSCALE)
+        _, p_image = find_checkerboard_corners(npts, img, pyramid_levels)
+        corners = np.zeros((0, 2), dtype=np.float32) if p_image is None else p_image.data.T
+        return [corners, np.array((img.shape[1], img.shape[0]))]
+
+    data = h5.load_or_compute_file_datasets(
+        file, (tuple(npts), pyramid_levels), ['corners', 'image_size_xy'], find_corners, cache_dir
+    )
+    corners = np.reshape(data['corners'], (-1, 2)).astype(np.float32)
+    img_size_xy = tuple(np.reshape(data['image_size_xy'], 2).astype(int).tolist())
+    if corners.shape[0] == 0:
+        return None, None, img_size_xy
+    return checkerboard_object_points(npts), Vxy(corners.T, dtype=np.float32), img_size_xy
 
 
 def refine_checkerboard_corners(
@@ -102,3 +182,46 @@ def annotate_found_corners(npts: tuple[int, int], img: np.ndarray, img_points: V
 
     """
     cv.drawChessboardCorners(img, npts, img_points.data.T, True)
+
+
+_CHESSBOARD_FLAGS = cv.CALIB_CB_ADAPTIVE_THRESH + cv.CALIB_CB_FAST_CHECK + cv.CALIB_CB_NORMALIZE_IMAGE
+
+
+def _find_checkerboard_corners_pyramid(npts: tuple[int, int], img: np.ndarray, pyramid_levels: int) -> Vxy | None:
+    """Finds checkerboard corners in the image downscaled pyramid_levels times,
+    and refines them one pyramid level at a time up to full resolution. Returns
+    None if the corners are not found or are not a consistent grid."""
+    # Build image pyramid
+    pyramid = [img]
+    for _ in range(pyramid_levels):
+        pyramid.append(cv.pyrDown(pyramid[-1]))
+
+    # Find corners in smallest image
+    ret, corners = cv.findChessboardCorners(pyramid[-1], npts, _CHESSBOARD_FLAGS)
+    if ret is not True:
+        lt.debug(f'Checkerboard not found after downscaling {pyramid_levels:d} times.')
+        return None
+
+    # Refine corners at each level. Pixel (x, y) of a pyrDown image is centered
+    # on pixel (2x, 2y) of the larger image.
+    criteria = (cv.TERM_CRITERIA_EPS + cv.TermCriteria_COUNT, 40, 0.001)
+    for level_img in pyramid[:0:-1]:
+        corners = cv.cornerSubPix(level_img, corners, (5, 5), (-1, -1), criteria) * 2
+    p_corners = Vxy(corners[:, 0, :].T, dtype=np.float32)
+    p_corners_refined = refine_checkerboard_corners(img, p_corners, window_size=(11, 11))
+
+    # Check the corners form a smooth grid. A corner that is misplaced in the
+    # downscaled image may not be recovered by the full resolution refinement.
+    grid = p_corners_refined.data.T.reshape(npts[1], npts[0], 2)
+    spacing = min(
+        np.linalg.norm(np.diff(grid, axis=0), axis=-1).min(), np.linalg.norm(np.diff(grid, axis=1), axis=-1).min()
+    )
+    curvature = max(
+        np.linalg.norm(np.diff(grid, 2, axis=0), axis=-1).max(initial=0),
+        np.linalg.norm(np.diff(grid, 2, axis=1), axis=-1).max(initial=0),
+    )
+    if curvature > 0.25 * spacing:
+        lt.debug('Checkerboard corners found in downscaled image are not a consistent grid.')
+        return None
+
+    return p_corners_refined
@@ -10,8 +10,10 @@ import numpy as np
 import cv2
 
 import opencsp.app.camera_calibration.lib.calibration_camera as cc
+import opencsp.app.camera_calibration.lib.calibration_pipeline as cp
 import opencsp.app.camera_calibration.lib.image_processing as ip
 import opencsp.app.sofast.lib.spatial_processing as sp
+import opencsp.common.lib.tool.file_tools as ft
 from opencsp.common.lib.tool.hdf5_tools import load_hdf5_datasets, save_hdf5_datasets
 
 
@@ -63,6 +65,11 @@ class TestCameraCalibration:
         # Calculate image size
         img_size = images[0].shape
 
+        # Save inputs for the corner finding pipeline tests
+        cls.base_dir = base_dir
+        cls.files = files
+        cls.npts = npts
+
         # Calibrate camera
         (camera, r_cam_object, v_cam_object_cam, calibration_error) = cc.calibrate_camera(
             p_object, p_image, img_size, cam_name
@@ -159,6 +166,31 @@ class TestCameraCalibration:
     def test_reprojection_errors(self):
         np.testing.assert_allclose(self.reprojection_errors, self.reprojection_errors_exp)
 
+    def test_find_corners_in_files(self):
+        cache_dir = os.path.join(self.base_dir, 'output', 'corners_cache')
+        ft.delete_files_in_directory(cache_dir, '*.h5', error_on_dir_not_exists=False)
+
+        progress = []
+        for _ in range(2):
+            # Find corners in parallel, then load them from cache
+            used_files, p_object, p_image, img_size_xy = cp.find_corners_in_files(
+                self.files,
+                self.npts,
+                num_processes=2,
+                pyramid_levels=2,
+                cache_dir=cache_dir,
+                progress_callback=lambda num_done, num_files, file, found: progress.append((num_done, num_files)),
+            )
+
+            # Corners refined from the downscaled images match full resolution search
+            assert used_files == self.files
+            np.testing.assert_allclose(np.array([a.data for a in p_object]), self.Pxyz_object_points_exp)
+            np.testing.assert_allclose(np.array([a.data for a in p_image]), self.p_image_points_exp, atol=2e-3)
+            np.testing.assert_array_equal(img_size_xy, np.flip(cv2.imread(self.files[0]).shape[:2]))
+
+        assert len(ft.files_in_directory(cache_dir)) == len(self.files)
+        assert progress == [(idx + 1, len(self.files)) for idx in range(len(self.files))] * 2
+
 
 if __name__ == "__main__":
     # Set below boolean to True to save and overwrite new test data
@@ -1,7 +1,9 @@
 """Photogrammetric reconstruction class based on images of Aruco markers
 """
 
+from functools import partial
 from glob import glob
+from multiprocessing.pool import Pool
 from os.path import join
 from typing import Iterable
 
@@ -31,6 +33,13 @@ class SceneReconstruction:
     intersect_threshold : float
         Maximum point to ray distance to be considered an intersection during
         triangulation, by default 0.02 meters.
+    num_processes : int
+        Number of worker processes used to load images and find Aruco markers,
+        by default 1 (load in this process).
+    marker_cache_dir : str | None
+        Directory to cache found Aruco markers in, by default None (no caching).
+        Markers are cached by image file contents, so re-running the
+        reconstruction on the same images skips marker detection.
     """
 
     def __init__(self, camera: Camera, known_point_locations: ndarray, image_filter_path: str) -> 'SceneReconstruction':
@@ -49,6 +58,8 @@ class SceneReconstruction:
 
         """
         self.intersect_threshold = 0.02  # meters
+        self.num_processes = 1
+        self.marker_cache_dir: str | None = None
 
         # Save data
         self.camera = camera
@@ -67,6 +78,13 @@ class SceneReconstruction:
         self.located_point_ids: ndarray[int]  # IDs of located points
         self.located_point_mask: ndarray[bool]  # Mask of located points
 
+        # Observation table, one entry per marker point seen in an image, ordered by image
+        # and then by the order of points in the image. See _build_observation_table().
+        self._obs_camera_idxs: ndarray[int]  # Image index of each observation
+        self._obs_point_idxs: ndarray[int]  # Index (into unique_point_ids) of each observation
+        self._obs_pts_xy: ndarray  # Nx2 image point of each observation
+        self._obs_image_offsets: ndarray[int]  # Observations of image i are [offsets[i], offsets[i+1])
+
         # Save figures
         self.make_figures = False
         self.figures: list[plt.Figure] = []
@@ -93,7 +111,22 @@ class SceneReconstruction:
     @property
     def unlocated_marker_ids(self) -> ndarray:
         """Returns all unlocated marker IDs"""
-        return np.unique(np.hstack([image.unlocated_point_ids for image in self.images]))
+        point_idxs = self._obs_point_idxs[np.logical_not(self.located_point_mask[self._obs_point_idxs])]
+        return self.unique_point_ids[np.unique(point_idxs)]
+
+    @property
+    def _image_poses_known(self) -> ndarray[bool]:
+        """Returns mask of images with known poses"""
+        return np.array([image.pose_known for image in self.images], dtype=bool)
+
+    def _build_observation_table(self) -> None:
+        """Collects the image points of all images into one table of observations"""
+        point_ids = [image.point_ids for image in self.images]
+        counts = [ids.size for ids in point_ids]
+        self._obs_camera_idxs = np.repeat(np.arange(len(self.images)), counts)
+        self._obs_point_idxs = np.searchsorted(self.unique_point_ids, np.hstack(point_ids))
+        self._obs_pts_xy = np.vstack([image.pts_im_xy for image in self.images])
+        self._obs_image_offsets = np.concatenate(([0], np.cumsum(counts)))
 
     def convert_to_four_corners(self) -> None:
         """Converts all images to four corner images instead of single points"""
@@ -110,6 +143,7 @@ class SceneReconstruction:
         self.points_xyz = np.repeat(self.points_xyz, 4, axis=0) * mask_nan[:, None]
         self.located_point_ids = self.located_point_ids * 4
         self.located_point_mask = (np.repeat(self.located_point_mask, 4) * mask_zero).astype(bool)
+        self._build_observation_table()
 
     def set_id_known(self, id_: int, pt: np.ndarray) -> None:
         """Sets given ID as known in all images
@@ -121,15 +155,7 @@ class SceneReconstruction:
         pt : np.ndarray
             Shape (3,) ndarray xyz point location
         """
-        lt.debug(f'Point ID {id_:.0f} located.')
-        # Update master array
-        mask = self.unique_point_ids == id_
-        self.points_xyz[mask] = pt
-        self.located_point_mask += mask
-        self.located_point_ids = self.unique_point_ids[self.located_point_mask]
-        # Save in all images
-        for image in self.images:
-            image.set_point_id_located(id_, pt)
+        self.set_ids_known([id_], np.reshape(pt, (1, 3)))
 
     def set_ids_known(self, ids: Iterable[int], pts: ndarray) -> None:
         """Sets multiple IDs known in all images
@@ -141,8 +167,32 @@ class SceneReconstruction:
         pts : ndarray
             Nx3 ndarray of marker ID locations
         """
-        for id_, pt in zip(ids, pts):
-            self.set_id_known(id_, pt)
+        ids = np.asarray(ids).reshape(-1)
+        pts = np.asarray(pts).reshape((-1, 3))
+        for id_ in ids:
+            lt.debug(f'Point ID {id_:.0f} located.')
+
+        # Ignore IDs that are not seen in any image
+        idxs = np.searchsorted(self.unique_point_ids, ids)
+        idxs = np.minimum(idxs, self.unique_point_ids.size - 1)
+        mask_valid = self.unique_point_ids[idxs] == ids
+        idxs = idxs[mask_valid]
+
+        # Update master array
+        self.points_xyz[idxs] = pts[mask_valid]
+        self.located_point_mask[idxs] = True
+        self.located_point_ids = self.unique_point_ids[self.located_point_mask]
+
+        # Save in all images that see the points
+        mask_set = np.zeros(self.num_points, dtype=bool)
+        mask_set[idxs] = True
+        obs_set = np.nonzero(mask_set[self._obs_point_idxs])[0]
+        obs_camera_idxs = self._obs_camera_idxs[obs_set]
+        for idx_image in np.unique(obs_camera_idxs):
+            obs = obs_set[obs_camera_idxs == idx_image]
+            self.images[idx_image].set_points_located(
+                obs - self._obs_image_offsets[idx_image], self.points_xyz[self._obs_point_idxs[obs]]
+            )
 
     def save_ids_known(self) -> None:
         """Loads known marker IDs and their locations"""
@@ -153,10 +203,20 @@ class SceneReconstruction:
         self.set_ids_known(marker_ids, pts_xyz_marker)
 
     def load_images(self) -> None:
-        """Saves loaded dataset in class"""
+        """Saves loaded dataset in class. Images are loaded and Aruco markers are found
+        using num_processes processes. Only the marker corners are kept, the images are
+        loaded again from file if needed."""
+        find_markers = partial(ph.find_aruco_marker_in_file, cache_dir=self.marker_cache_dir)
+        desc = 'Loading marker images'
+        if self.num_processes > 1:
+            with Pool(self.num_processes) as pool:
+                markers = list(tqdm(pool.imap(find_markers, self.image_paths), total=len(self.image_paths), desc=desc))
+        else:
+            markers = [find_markers(file) for file in tqdm(self.image_paths, desc=desc)]
+
         self.images: list[ImageMarker] = []
-        for idx, file in enumerate(tqdm(self.image_paths, desc='Loading marker images')):
-            self.images.append(ImageMarker.load_aruco_origin(file, idx, self.camera))
+        for idx, (file, (ids_marker, corners)) in enumerate(zip(self.image_paths, markers)):
+            self.images.append(ImageMarker.from_aruco_corners(ids_marker, corners, idx, self.camera, file=file))
 
         # Save unique markers
         self.unique_point_ids = np.unique(np.hstack([im.point_ids for im in self.images]))
@@ -167,6 +227,7 @@ class SceneReconstruction:
         self.points_xyz = np.zeros((self.num_points, 3)) * np.nan
         self.located_point_ids = np.array([])
         self.located_point_mask = np.zeros(self.num_points, dtype=bool)
+        self._build_observation_table()
 
     def located_images_with_view_of_marker(self, id_: int) -> list[ImageMarker]:
         """Returns list of located images that have view of given marker
@@ -180,11 +241,9 @@ class SceneReconstruction:
         -------
         list[ImageMarker]
         """
-        images = []
-        for image in self.images:
-            if image.pose_known and (id_ in image.point_ids.tolist()):
-                images.append(image)
-        return images
+        mask_obs = self.unique_point_ids[self._obs_point_idxs] == id_
+        camera_idxs = np.unique(self._obs_camera_idxs[mask_obs])
+        return [self.images[idx] for idx in camera_idxs if self.images[idx].pose_known]
 
     def attempt_all_camera_pose_calculation(self) -> None:
         """Attempt to calculate poses of all cameras"""
@@ -193,7 +252,8 @@ class SceneReconstruction:
             image.attempt_calculate_pose()
 
     def attempt_all_points_triangulation(self, intersect_thres: float = 0.02) -> None:
-        """Attemps to calculate position of all unknown points using ray intersection
+        """Attemps to calculate position of all unknown points using ray intersection.
+        All unknown points are triangulated at once.
 
         Parameters
         ----------
@@ -201,32 +261,40 @@ class SceneReconstruction:
             Maximum point to ray distance to be considered an intersection, by default 0.02
         """
         lt.debug('Solving for marker locations by intersecing rays')
-        for id_ in self.unlocated_marker_ids:
-            # Get images with view of marker
-            images = self.located_images_with_view_of_marker(id_)
-            # Check if enough views
-            if len(images) < 2:
-                lt.debug(f'Not enough camera views to locate marker ID {id_:d}')
-                continue
-            # Get list of cameras, pts, rots, tvecs
-            cameras = []
-            rots = []
-            tvecs = []
-            pts_img = []
-            for im in images:
-                idx = im.point_ids.tolist().index(id_)  # Index of point in current image
-                pts_img.append(im.pts_im_xy[idx])  # Location of 2d point in image
-                rots.append(Rotation.from_rotvec(im.rvec))
-                tvecs.append(im.tvec)
-                cameras.append(self.camera)
-            tvecs = Vxyz(np.array(tvecs).T)
-            pts_img = Vxy(np.array(pts_img).T)
-            # Triangulate
-            pt_int, dists = ph.triangulate(cameras, rots, tvecs, pts_img)
-            if dists.max() < intersect_thres:
-                self.set_id_known(id_, pt_int.data.squeeze())
-            else:
-                lt.debug(f'Too high of intersecion error to locate marker ID {id_:d}')
+        # Observations of unlocated points from located cameras
+        mask_unlocated = np.logical_not(self.located_point_mask[self._obs_point_idxs])
+        mask_obs = mask_unlocated * self._image_poses_known[self._obs_camera_idxs]
+        num_views = np.bincount(self._obs_point_idxs[mask_obs], minlength=self.num_points)
+
+        # Check if enough views
+        point_idxs_unlocated = np.unique(self._obs_point_idxs[mask_unlocated])
+        for idx in point_idxs_unlocated[num_views[point_idxs_unlocated] < 2]:
+            lt.debug(f'Not enough camera views to locate marker ID {self.unique_point_ids[idx]:d}')
+        mask_obs *= num_views[self._obs_point_idxs] >= 2
+        if not mask_obs.any():
+            return
+
+        # Triangulate
+        camera_idxs = self._obs_camera_idxs[mask_obs]
+        point_idxs = self._obs_point_idxs[mask_obs]
+        pts_int, dists = ph.triangulate_points(
+            self.camera,
+            Rotation.from_rotvec(self.all_image_rvecs[camera_idxs]),
+            Vxyz(self.all_image_tvecs[camera_idxs].T),
+            Vxy(self._obs_pts_xy[mask_obs].T),
+            point_idxs,
+            self.num_points,
+        )
+        pts_int = pts_int.data.T
+        max_dists = np.zeros(self.num_points)
+        np.maximum.at(max_dists, point_idxs, dists)
+
+        point_idxs_tri = np.unique(point_idxs)
+        mask_located = max_dists[point_idxs_tri] < intersect_thres
+        for idx in point_idxs_tri[np.logical_not(mask_located)]:
+            lt.debug(f'Too high of intersecion error to locate marker ID {self.unique_point_ids[idx]:d}')
+        point_idxs_tri = point_idxs_tri[mask_located]
+        self.set_ids_known(self.unique_point_ids[point_idxs_tri], pts_int[point_idxs_tri])
 
     def refine_located_poses_and_points(self) -> None:
         """Performs bundle adjustment on located points and poses"""
@@ -237,25 +305,11 @@ class SceneReconstruction:
         tvecs_all = np.nan_to_num(self.all_image_tvecs)  # (Nim, 3)
         obj_pts_all = np.nan_to_num(self.points_xyz)  # (Npts, 3)
 
-        point_indices = []
-        camera_idxs = []
-        points2d = []
-        for image in self.images:
-            if not image.pose_known:
-                # Skip if pose is not known
-                continue
-            # Camera index for every point observation that has been located
-            camera_idxs.append([image.img_id] * image.num_located_markers)
-            # Point (0-based) index for every point observation that has been located
-            pt_ids = image.located_point_ids  # ID number
-            pt_idxs = [self.unique_point_ids.tolist().index(pt_id) for pt_id in pt_ids]  # index
-            point_indices.append(pt_idxs)
-            # 2d image points of every point observation
-            points2d.append(image.pts_im_xy[image.located_markers_mask])
-
-        camera_idxs = np.hstack(camera_idxs).astype(int)  # (Nobs, )
-        point_indices = np.hstack(point_indices).astype(int)  # (Nobs, )
-        points2d = np.vstack(points2d)  # (Nobs, 2)
+        # Observations of located points from located cameras
+        mask_obs = self.located_point_mask[self._obs_point_idxs] * self._image_poses_known[self._obs_camera_idxs]
+        camera_idxs = self._obs_camera_idxs[mask_obs]  # (Nobs, )
+        point_indices = self._obs_point_idxs[mask_obs]  # (Nobs, )
+        points2d = self._obs_pts_xy[mask_obs]  # (Nobs, 2)
 
         (
             rvecs_all_opt,  # optimized rvecs
@@ -82,6 +82,9 @@ class TestSceneReconstruction(unittest.TestCase):
         cls.pts_meas = scene_recon.get_data()
         cls.scene_recon = scene_recon
         cls.dir_output = dir_output
+        cls.camera = camera
+        cls.known_point_locations = known_point_locations
+        cls.image_filter_path = image_filter_path
 
     def tearDown(self) -> None:
         plt.close('all')
@@ -92,6 +95,22 @@ class TestSceneReconstruction(unittest.TestCase):
         np.testing.assert_allclose(self.pts_meas, pts_exp, atol=1e-5, rtol=0)
         print('Corner locations tested successfully.')
 
+    def test_load_images_parallel_cached(self):
+        """Tests that loading images in parallel, and from the marker cache, finds the same markers"""
+        cache_dir = join(self.out_dir, 'marker_cache')
+        ft.create_directories_if_necessary(cache_dir)
+
+        for _ in range(2):  # Fill cache, then load from cache
+            scene_recon = SceneReconstruction(self.camera, self.known_point_locations, self.image_filter_path)
+            scene_recon.num_processes = 2
+            scene_recon.marker_cache_dir = cache_dir
+            scene_recon.load_images()
+
+            for image, image_exp in zip(scene_recon.images, self.scene_recon.images):
+                image.convert_to_four_corner()
+                np.testing.assert_equal(image.point_ids, image_exp.point_ids)
+                np.testing.assert_equal(image.pts_im_xy, image_exp.pts_im_xy)
+
     def test_save_csv(self):
         """Saves CSV file of points to data location"""
         file = join(self.out_dir, 'point_locations.csv')
@@ -3,6 +3,7 @@ from warnings import warn
 
 import matplotlib.pyplot as plt
 import numpy as np
+from scipy.spatial import cKDTree
 
 from opencsp.common.lib.geometry.Vxy import Vxy
 from opencsp.common.lib.tool import log_tools as lt
@@ -23,6 +24,10 @@ class BlobIndex:
         search for points.
     apply_filter : bool
         To filter bad points (experimental)
+    use_kdtree : bool
+        To find points with a KD-tree of all blobs instead of checking every unassigned
+        blob on every search step. Gives identical results, and is much faster when
+        there are many blobs. By default True.
     """
 
     def __init__(self, points: Vxy, x_min: int, x_max: int, y_min: int, y_max: int) -> 'BlobIndex':
@@ -50,6 +55,10 @@ class BlobIndex:
         self.search_thresh = 5.0  # pixels
         self.search_perp_axis_ratio = 3.0
         self.apply_filter = False
+        self.use_kdtree = True
+
+        self._kdtree: cKDTree = None  # built on first use
+        self._stop_at_assigned = False  # stop extending at already assigned indices, see run_from_prior()
 
         self._offset_x = -x_min  # index
         self._offset_y = -y_min  # index
@@ -84,12 +93,29 @@ class BlobIndex:
 
         return idxs[idx], dists[idx]
 
+    def _get_kdtree(self) -> cKDTree:
+        """Returns the KD-tree of all points, building it if necessary"""
+        if self._kdtree is None:
+            self._kdtree = cKDTree(self._points.data.T)
+        return self._kdtree
+
+    def _unassigned_point_indices_near(self, point: Vxy, radius: float) -> np.ndarray[int]:
+        """Returns the indices of all unassigned points within radius of the given point, in increasing order"""
+        idxs = np.array(self._get_kdtree().query_ball_point(point.data.squeeze(), radius), dtype=int)
+        idxs = np.sort(idxs)
+        return idxs[np.logical_not(self._is_assigned[idxs])]
+
     def _nearest_unassigned_idx_from_xy_point_direction(
         self, pt_cur: Vxy, pt_exp: Vxy
     ) -> tuple[bool, tuple[int, float]]:
         """Returns the point index and distance of unassigned point nearest to given xy
         point in direction form current to expected point.
 
+        When use_kdtree is True, only points that could be within search_thresh of
+        the expected point are considered. If the nearest point in the search
+        direction is farther away than that, then (False, (None, None)) is
+        returned instead of a point that would be rejected by the caller anyway.
+
         Parameters
         ----------
         pt_cur : Vxy
@@ -102,8 +128,16 @@ class BlobIndex:
         tuple[int, float]
             Point index (indexing self._points) and distance from expected point
         """
-        points = self._get_unassigned_points()
-        idxs = self._get_unassigned_point_indices()
+        if self.use_kdtree:
+            # Any point farther than this from the current point is also farther than
+            # search_thresh from the expected point. Pad the radius slightly so that
+            # points exactly on the boundary are checked below with the same math.
+            radius = (pt_exp - pt_cur).magnitude()[0] + self.search_thresh
+            idxs = self._unassigned_point_indices_near(pt_cur, radius * (1 + 1e-9) + 1e-9)
+            points = self._points[idxs]
+        else:
+            points = self._get_unassigned_points()
+            idxs = self._get_unassigned_point_indices()
         # Calculate xy deltas for expected/current point
         points_rel = points - pt_cur  # Vectors, current point to all points
         v_search = pt_exp - pt_cur  # Vector, from current point to expected point
@@ -309,13 +343,20 @@ class BlobIndex:
         else:
             lt.error_and_raise(ValueError, f'Given "direction" must be either "x" or "y", not {direction}')
 
+        # Group the assigned points by row/column once. Points assigned while stepping
+        # through one row/column always belong to that row/column, so these groups stay
+        # the same as if each row/column was looked up when it is reached.
+        idxs_assigned = self._get_assigned_point_indices()
+        idxs_assigned = idxs_assigned[np.argsort(idxs_a[idxs_assigned], kind='stable')]
+        idxs_a_unique, idxs_a_starts = np.unique(idxs_a[idxs_assigned], return_index=True)
+        idxs_a_ends = np.append(idxs_a_starts[1:], len(idxs_assigned))
+
         # Step through direction
-        # TODO Can speed up with matrix data storage
-        for idx_a in np.unique(idxs_a[self._get_assigned_point_indices()]):
+        for idx_a, start, end in zip(idxs_a_unique, idxs_a_starts, idxs_a_ends):
             # Get points on axis
-            mask = idxs_a == idx_a
-            pts = self._points[mask]  # points on axis
-            is_b = idxs_b[mask]  # indices of points on axis
+            idxs_on_axis = idxs_assigned[start:end]
+            pts = self._points[idxs_on_axis]  # points on axis
+            is_b = idxs_b[idxs_on_axis]  # indices of points on axis
             # Step through all points on axis
             for i_b in is_b:
                 if not i_b + step in is_b:  # If adjacent point is not assigned, find it
@@ -350,6 +391,11 @@ class BlobIndex:
                                 else:
                                     idx_x = int(idx_a)
                                     idx_y = int(i_b + step + (idx_b_next * step))
+                                # When seeded from prior points, stop at indices that are already assigned
+                                if self._stop_at_assigned and not np.isnan(
+                                    self._point_indices_mat[idx_y + self._offset_y, idx_x + self._offset_x]
+                                ):
+                                    break
                                 self._assign(idx_new, idx_x, idx_y)
                             else:
                                 break
@@ -411,6 +457,47 @@ class BlobIndex:
         # Find 3x3 core point block
         self._find_3x3_center_block()
         # Extend rows
+        self._extend_all()
+
+    def run_from_prior(self, points_prior: Vxy, indices_prior: Vxy) -> None:
+        """Runs blob indexing sequence seeded with previously indexed points,
+        for example from a previous measurement of the same optic in the same
+        setup. Each prior point is matched to the nearest blob within
+        search_thresh, which is assigned the prior point's index. Rows/columns
+        are then extended as in run() to find any blobs not matched. Unlike
+        run(), extending a row/column stops when it reaches an index that is
+        already assigned, so that blobs between seeded points are not given
+        the index of a seeded point.
+
+        Parameters
+        ----------
+        points_prior : Vxy
+            Length N vector, previously located points xy locations, pixels
+        indices_prior : Vxy
+            Length N vector, previously located points xy blob indices, int
+        """
+        # Match each prior point to the nearest blob
+        dists, idxs = self._get_kdtree().query(points_prior.data.T, distance_upper_bound=self.search_thresh)
+        idxs_prior = np.nonzero(np.isfinite(dists))[0]
+
+        # If more than one prior point is matched to the same blob, keep the closest
+        idxs_prior = idxs_prior[np.argsort(dists[idxs_prior], kind='stable')]
+        _, idxs_unique = np.unique(idxs[idxs_prior], return_index=True)
+        idxs_prior = np.sort(idxs_prior[idxs_unique])
+
+        for idx_prior in idxs_prior:
+            idx_x, idx_y = indices_prior.data[:, idx_prior].astype(int)
+            self._assign(idxs[idx_prior], idx_x, idx_y)
+
+        # Extend rows
+        self._stop_at_assigned = True
+        try:
+            self._extend_all()
+        finally:
+            self._stop_at_assigned = False
+
+    def _extend_all(self) -> None:
+        """Extends all rows/collumns until no more points are found"""
         prev_num_unassigned = self._num_unassigned()
         for idx in range(100):
             self._extend_data('x', -1)
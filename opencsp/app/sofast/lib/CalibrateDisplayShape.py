@@ -11,7 +11,6 @@ from numpy import ndarray
 from scipy import interpolate
 from scipy.signal import medfilt
 from scipy.spatial.transform import Rotation
-from tqdm import tqdm
 
 from opencsp.app.sofast.lib.DisplayShape import DisplayShape
 import opencsp.app.sofast.lib.image_processing as ip
@@ -277,18 +276,17 @@ class CalibrateDisplayShape:
             # Store in array
             u_cam_pt_screen_mat[:, idx_pose, :] = u_cam_pt_screen.data.T
 
-        # Calculate high-res intersection points
-        v_screen_pt_screen_mat = np.zeros((self.data_calculation.num_points_screen, 3))
-        intersection_dists = np.zeros((self.data_calculation.num_points_screen, self.data_calculation.num_poses))
-
-        for idx_pt in tqdm(range(self.data_calculation.num_points_screen), desc='Intersecting rays'):
-            # Intersect points
-            pt, dists = ph.nearest_ray_intersection(
-                v_screen_cam_screen, Vxyz(u_cam_pt_screen_mat[idx_pt].T)  # length N  # length N
-            )
-
-            v_screen_pt_screen_mat[idx_pt] = pt.data.squeeze()
-            intersection_dists[idx_pt] = dists
+        # Calculate high-res intersection points of all points at once. Rays are ordered by point then pose.
+        num_points = self.data_calculation.num_points_screen
+        num_poses = self.data_calculation.num_poses
+        pts_int, dists = ph.nearest_ray_intersections(
+            Vxyz(np.tile(v_screen_cam_screen.data, num_points)),
+            Vxyz(u_cam_pt_screen_mat.reshape((-1, 3)).T),
+            np.repeat(np.arange(num_points), num_poses),
+            num_points,
+        )
+        v_screen_pt_screen_mat = pts_int.data.T
+        intersection_dists = dists.reshape((num_points, num_poses))
 
         # Create mask of accurate intersections
         dist_error_mean = intersection_dists.mean(1)
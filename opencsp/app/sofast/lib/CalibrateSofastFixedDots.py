@@ -9,7 +9,6 @@ import numpy as np
 import numpy.typing as npt
 from numpy import ndarray
 from scipy.spatial.transform import Rotation
-from tqdm import tqdm
 
 from opencsp.app.sofast.lib.DotLocationsFixedPattern import DotLocationsFixedPattern
 from opencsp.common.lib.camera.Camera import Camera
@@ -201,23 +200,25 @@ class CalibrateSofastFixedDots:
 
     def _intersect_rays(self) -> None:
         """Intersects camera rays to find dot xyz locations"""
-        points_xyz = []
-        int_dists = []
-        for dot_idx in tqdm(range(self._num_dots), desc='Intersecting rays'):
-            dot_image_pts_xy = [pt[dot_idx] for pt in self._dot_image_points_xy]
-            point, dists = ph.triangulate(
-                [self._camera] * self._num_images, self._rots_cams, self._vecs_cams, dot_image_pts_xy
-            )
-            points_xyz.append(point)
-            int_dists.append(dists)
-            # Save xyz point in matrix
-            if dists.mean() <= self.intersection_threshold:
-                indices = self._dot_image_points_indices[dot_idx]
-                idx_x = indices.x[0] - self._x_min
-                idx_y = indices.y[0] - self._y_min
-                self._dot_points_xyz_mat[idx_y, idx_x, :] = point.data.squeeze()
-
-        self._dot_intersection_dists = np.array(int_dists)
+        # Stack rays of all dots from all cameras, ordered by camera then dot
+        rvecs = np.repeat([rot.as_rotvec() for rot in self._rots_cams], self._num_dots, axis=0)
+        tvecs = np.repeat([vec.data.squeeze() for vec in self._vecs_cams], self._num_dots, axis=0)
+        pts_xy = np.concatenate([pts.data for pts in self._dot_image_points_xy], axis=1)
+        dot_idxs = np.tile(np.arange(self._num_dots), self._num_images)
+
+        # Intersect rays of all dots at once
+        points_xyz, dists = ph.triangulate_points(
+            self._camera, Rotation.from_rotvec(rvecs), Vxyz(tvecs.T), Vxy(pts_xy), dot_idxs, self._num_dots
+        )
+        int_dists = dists.reshape((self._num_images, self._num_dots)).T
+
+        # Save xyz points in matrix
+        mask_valid = int_dists.mean(axis=1) <= self.intersection_threshold
+        idxs_x = self._dot_image_points_indices.x[mask_valid] - self._x_min
+        idxs_y = self._dot_image_points_indices.y[mask_valid] - self._y_min
+        self._dot_points_xyz_mat[idxs_y, idxs_x, :] = points_xyz.data.T[mask_valid]
+
+        self._dot_intersection_dists = int_dists
         lt.info(
             'Dot ray intersections mean intersection error: ' f'{self._dot_intersection_dists.mean() * 1000:.1f} mm'
         )
@@ -0,0 +1,121 @@
+"""Lazily calibrated view of SofastFringe fringe images
+"""
+
+import numpy as np
+from numpy import ndarray
+
+from opencsp.app.sofast.lib.ImageCalibrationAbstract import ImageCalibrationAbstract
+
+
+class CalibratedFringeImages:
+    """Read-only, lazily calibrated view of (a subset of) the fringe images of
+    a MeasurementSofastFringe.
+
+    No calibrated images are stored. Calibration is applied on demand, in
+    chunks of pixels, when the view is indexed. Indexing with a (M, N) boolean
+    pixel mask, as in ``view[mask]`` or ``view[mask, :]``, calibrates only the
+    masked pixels and returns a (number of masked pixels, n) array. Any other
+    indexing, or np.asarray(view), calibrates the full MxNxn stack.
+    """
+
+    def __init__(
+        self,
+        measurement,
+        calibration: ImageCalibrationAbstract,
+        frame_idxs: ndarray[int],
+        dtype: np.dtype = np.float32,
+        chunk_size: int = 2**18,
+        **kwargs,
+    ) -> 'CalibratedFringeImages':
+        """
+        Parameters
+        ----------
+        measurement : MeasurementSofastFringe
+            Measurement with the raw fringe images.
+        calibration : ImageCalibrationAbstract
+            Image calibration to apply.
+        frame_idxs : ndarray[int]
+            Indices of the fringe images in this view.
+        dtype : np.dtype, optional
+            Data type of calibrated values, by default np.float32.
+        chunk_size : int, optional
+            Number of pixels to calibrate at once, by default 2**18. Bounds
+            the memory used by intermediate calculations.
+        **kwargs
+            Other keyword arguments to pass into ImageCalibration object
+            "apply_to_pixels" method.
+        """
+        self.measurement = measurement
+        self.calibration = calibration
+        self.frame_idxs = np.asarray(frame_idxs, dtype=int)
+        self.dtype = np.dtype(dtype)
+        self.chunk_size = chunk_size
+        self.kwargs = kwargs
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        """Shape of the full calibrated image stack, (M, N, n)"""
+        return (*self.measurement.image_shape_yx, self.frame_idxs.size)
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def frames(self, frame_key: int | slice | ndarray) -> 'CalibratedFringeImages':
+        """Returns a view of a subset of the frames of this view"""
+        return CalibratedFringeImages(
+            self.measurement, self.calibration, self.frame_idxs[frame_key], self.dtype, self.chunk_size, **self.kwargs
+        )
+
+    def calibrate_pixels(self, pixels_y: ndarray[int], pixels_x: ndarray[int]) -> ndarray:
+        """
+        Calibrates the given pixels of all frames in this view.
+
+        Parameters
+        ----------
+        pixels_y/x : ndarray[int]
+            1d arrays, row/column of each pixel.
+
+        Returns
+        -------
+        ndarray
+            (number of pixels, n) calibrated pixel values.
+        """
+        pixels_calibrated = np.empty((len(pixels_y), self.frame_idxs.size), dtype=self.dtype)
+        for idx_0 in range(0, len(pixels_y), self.chunk_size):
+            idx_1 = idx_0 + self.chunk_size
+            pixels_calibrated[idx_0:idx_1] = self.calibration.apply_to_pixels(
+                self.measurement, (pixels_y[idx_0:idx_1], pixels_x[idx_0:idx_1]), self.frame_idxs, **self.kwargs
+            )
+        return pixels_calibrated
+
+    def __getitem__(self, key) -> ndarray:
+        # Calibrate only the pixels in a boolean pixel mask
+        mask, frame_key = (key, slice(None)) if not isinstance(key, tuple) else (key[0], key[1:])
+        if isinstance(mask, ndarray) and mask.dtype == bool and mask.shape == self.shape[:2]:
+            if isinstance(frame_key, tuple):
+                if len(frame_key) > 1:
+                    raise IndexError(f'Too many indices for calibrated fringe images: {len(key):d}')
+                frame_key = frame_key[0] if len(frame_key) == 1 else slice(None)
+            return self.frames(frame_key).calibrate_pixels(*np.nonzero(mask))
+
+        # Calibrate all pixels
+        return np.asarray(self)[key]
+
+    def __array__(self, dtype: np.dtype = None, copy: bool = None) -> ndarray:
+        # Calibrate blocks of whole rows at a time
+        n_rows, n_cols, n_frames = self.shape
+        rows_per_chunk = max(1, self.chunk_size // max(n_cols, 1))
+        images_calibrated = np.empty((n_rows, n_cols, n_frames), dtype=self.dtype)
+        for row_0 in range(0, n_rows, rows_per_chunk):
+            row_1 = min(row_0 + rows_per_chunk, n_rows)
+            pixels_y, pixels_x = np.indices((row_1 - row_0, n_cols)).reshape((2, -1))
+            pixels_calibrated = self.calibrate_pixels(pixels_y + row_0, pixels_x)
+            images_calibrated[row_0:row_1] = pixels_calibrated.reshape((row_1 - row_0, n_cols, n_frames))
+
+        if dtype is not None:
+            return images_calibrated.astype(dtype, copy=False)
+        return images_calibrated
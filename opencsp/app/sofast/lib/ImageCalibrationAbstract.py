@@ -12,11 +12,15 @@ import opencsp.common.lib.tool.log_tools as lt
 
 
 class ImageCalibrationAbstract(hdf5_tools.HDF5_IO_Abstract, aph.AbstractPlotHandler, ABC):
-    def __init__(self, camera_values: ndarray, display_values: ndarray):
+    response_lut_max_size = 2**16
+    """Largest response lookup table to create, enough for 16 bit cameras"""
+
+    def __init__(self, camera_values: ndarray, display_values: ndarray, response_lut: ndarray | None = None):
         """
         ImageCalibration object used for calibrating fringe images. Creates a
         "response_function" that converts camera values to effecive display
-        values.
+        values, and a "response_lut" lookup table of the response function
+        evaluated at integer camera values.
 
         Parameters
         ----------
@@ -24,6 +28,11 @@ class ImageCalibrationAbstract(hdf5_tools.HDF5_IO_Abstract, aph.AbstractPlotHand
             1D array, camera digital numbers.
         display_values : ndarray
             1D array, corresponding display digital numbers.
+        response_lut : ndarray | None, optional
+            1D array, previously calculated response lookup table (as saved to
+            HDF). The default is None, calculate from camera/display values.
+            The table is also recalculated if the given table doesn't match the
+            camera/display values.
 
         """
         super().__init__()
@@ -32,6 +41,16 @@ class ImageCalibrationAbstract(hdf5_tools.HDF5_IO_Abstract, aph.AbstractPlotHand
         self.display_values = display_values
 
         self._create_response_function()
+        if response_lut is None:
+            self._create_response_lut()
+        elif self._matches_response_lut(response_lut):
+            self.response_lut = response_lut
+        else:
+            lt.warn(
+                'Warning in ImageCalibrationAbstract: given response lookup table does not match the '
+                + 'camera/display values, recalculating it.'
+            )
+            self._create_response_lut()
 
     @staticmethod
     def get_cal_options() -> dict[str, type['ImageCalibrationAbstract']]:
@@ -51,6 +70,53 @@ class ImageCalibrationAbstract(hdf5_tools.HDF5_IO_Abstract, aph.AbstractPlotHand
     def apply_to_images(self, measurement) -> ndarray:
         pass
 
+    @abstractmethod
+    def apply_to_pixels(self, measurement, pixels_yx: tuple[ndarray, ndarray], frame_idxs: ndarray) -> ndarray:
+        """
+        Performs camera-projector brightness values calibration on only the
+        given pixels and fringe images of a measurement, without calibrating
+        the full images. CalibratedFringeImages calls this once per chunk of
+        pixels.
+
+        Parameters
+        ----------
+        measurement : Measurement
+            Measurement object to apply calibration to.
+        pixels_yx : tuple[ndarray, ndarray]
+            1d arrays, row/column of each pixel to calibrate.
+        frame_idxs : ndarray
+            1d array, indices of the fringe images to calibrate.
+
+        Returns
+        -------
+        ndarray
+            (number of pixels, number of frames) calibrated pixel values, float.
+
+        """
+
+    def apply_response(self, images: ndarray) -> ndarray:
+        """
+        Converts camera values to display values using the response function.
+        Integer images are converted with a single lookup in the response
+        lookup table, other images are interpolated.
+
+        Parameters
+        ----------
+        images : ndarray
+            Images, camera digital numbers.
+
+        Returns
+        -------
+        ndarray
+            Images, display digital numbers, float.
+
+        """
+        if self.response_lut is not None and np.issubdtype(images.dtype, np.integer):
+            # Camera values past the end of the table are all beyond the
+            # calibrated range, and map to the last display value.
+            return np.take(self.response_lut, images, mode='clip')
+        return self.response_function(images)
+
     def _create_response_function(self) -> None:
         """
         Creates response function (interpolation object) to convert from camera
@@ -71,6 +137,41 @@ class ImageCalibrationAbstract(hdf5_tools.HDF5_IO_Abstract, aph.AbstractPlotHand
             camera_values_clip, display_values_clip, bounds_error=False, fill_value=(display_min, display_max)
         )
 
+    def _create_response_lut(self) -> None:
+        """
+        Creates lookup table of the response function for integer camera values
+        from 0 to one past the calibrated range. Negative values are clipped to
+        0 on lookup, which is only equivalent if 0 is at or below the calibrated
+        range. Otherwise, no lookup table is created.
+
+        """
+        size = self._response_lut_size()
+        if size is not None:
+            self.response_lut = self.response_function(np.arange(size))
+        else:
+            self.response_lut = None
+
+    def _response_lut_size(self) -> int | None:
+        """The size of the lookup table created by _create_response_lut(), or None if none is created"""
+        camera_min, camera_max = self.response_function.x[0], self.response_function.x[-1]
+        if 0 <= camera_min and camera_max < self.response_lut_max_size - 1:
+            return int(camera_max) + 2
+        return None
+
+    def _matches_response_lut(self, response_lut: ndarray) -> bool:
+        """
+        True if the given lookup table could have been created from the
+        camera/display values: it has the size of the table that
+        _create_response_lut() creates, and its values are within the range of
+        display values.
+
+        """
+        size = self._response_lut_size()
+        if size is None or np.ndim(response_lut) != 1 or np.size(response_lut) != size:
+            return False
+        display_min, display_max = np.min(self.display_values), np.max(self.display_values)
+        return bool(np.all((response_lut >= display_min) & (response_lut <= display_max)))
+
     @classmethod
     def from_data(
         cls, images_cal: ndarray, display_values: ndarray, mask: ndarray | None = None, num_samps: int = 1000
@@ -223,6 +324,10 @@ class ImageCalibrationAbstract(hdf5_tools.HDF5_IO_Abstract, aph.AbstractPlotHand
 
         # Load grid data
         datasets = [prefix + 'ImageCalibration/camera_values', prefix + 'ImageCalibration/display_values']
+        # Load cached response lookup table, if saved
+        _, file_names_and_shapes = hdf5_tools.get_groups_and_datasets(file)
+        if prefix + 'ImageCalibration/response_lut' in [name for name, shape in file_names_and_shapes]:
+            datasets.append(prefix + 'ImageCalibration/response_lut')
         kwargs = hdf5_tools.load_hdf5_datasets(datasets, file)
 
         return cls(**kwargs)
@@ -272,6 +377,9 @@ class ImageCalibrationAbstract(hdf5_tools.HDF5_IO_Abstract, aph.AbstractPlotHand
             prefix + 'ImageCalibration/calibration_type',
         ]
         data = [self.camera_values, self.display_values, self.get_calibration_name()]
+        if self.response_lut is not None:
+            datasets.append(prefix + 'ImageCalibration/response_lut')
+            data.append(self.response_lut)
 
         # Save data
         hdf5_tools.save_hdf5_datasets(data, datasets, file)
@@ -26,4 +26,29 @@ class ImageCalibrationGlobal(ImageCalibrationAbstract):
             Calibrated fringe images, float.
 
         """
-        return self.response_function(measurement.fringe_images)
+        return self.apply_response(measurement.fringe_images)
+
+    def apply_to_pixels(
+        self, measurement: Measurement, pixels_yx: tuple[ndarray, ndarray], frame_idxs: ndarray
+    ) -> ndarray:
+        """
+        Performs camera-projector brightness values calibration on only the
+        given pixels and fringe images. See apply_to_images().
+
+        Parameters
+        ----------
+        measurement : Measurement
+            Measurement object to apply calibration to.
+        pixels_yx : tuple[ndarray, ndarray]
+            1d arrays, row/column of each pixel to calibrate.
+        frame_idxs : ndarray
+            1d array, indices of the fringe images to calibrate.
+
+        Returns
+        -------
+        ndarray
+            (number of pixels, number of frames) calibrated pixel values, float.
+
+        """
+        pixels_y, pixels_x = pixels_yx
+        return self.apply_response(measurement.fringe_images[pixels_y[:, None], pixels_x[:, None], frame_idxs])
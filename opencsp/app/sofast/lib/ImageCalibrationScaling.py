@@ -31,10 +31,41 @@ class ImageCalibrationScaling(ImageCalibrationAbstract):
             Calibrated fringe images, float.
 
         """
+        return self._calibrate(measurement.mask_images, measurement.fringe_images)
+
+    def apply_to_pixels(
+        self, measurement: Measurement, pixels_yx: tuple[ndarray, ndarray], frame_idxs: ndarray
+    ) -> ndarray:
+        """
+        Performs camera-projector brightness values calibration on only the
+        given pixels and fringe images. See apply_to_images().
+
+        Parameters
+        ----------
+        measurement : Measurement
+            Measurement object to apply calibration to.
+        pixels_yx : tuple[ndarray, ndarray]
+            1d arrays, row/column of each pixel to calibrate.
+        frame_idxs : ndarray
+            1d array, indices of the fringe images to calibrate.
+
+        Returns
+        -------
+        ndarray
+            (number of pixels, number of frames) calibrated pixel values, float.
+
+        """
+        pixels_y, pixels_x = pixels_yx
+        mask_images = measurement.mask_images[pixels_y, pixels_x, :]  # Npix x 2
+        fringe_images = measurement.fringe_images[pixels_y[:, None], pixels_x[:, None], frame_idxs]  # Npix x n
+        return self._calibrate(mask_images, fringe_images)
+
+    def _calibrate(self, mask_images: ndarray, fringe_images: ndarray) -> ndarray:
+        """Calibrates fringe images (... x n) given their mask images (... x 2)"""
         # Convert camera images to observed display values
-        im_dark_disp = self.response_function(measurement.mask_images[..., 0:1])  # M x N x 1
-        im_light_disp = self.response_function(measurement.mask_images[..., 1:2])  # M x N x 1
-        fringe_images_disp = self.response_function(measurement.fringe_images)  # M x N x n
+        im_dark_disp = self.apply_response(mask_images[..., 0:1])  # M x N x 1
+        im_light_disp = self.apply_response(mask_images[..., 1:2])  # M x N x 1
+        fringe_images_disp = self.apply_response(fringe_images)  # M x N x n
 
         # Calculate delta image
         im_delta_disp = im_light_disp - im_dark_disp  # M x N x 1
@@ -5,6 +5,7 @@ import datetime as dt
 
 import numpy as np
 
+from opencsp.app.sofast.lib.CalibratedFringeImages import CalibratedFringeImages
 from opencsp.app.sofast.lib.ImageCalibrationAbstract import ImageCalibrationAbstract
 import opencsp.app.sofast.lib.AbstractMeasurementSofast as ams
 import opencsp.app.sofast.lib.DistanceOpticScreen as osd
@@ -83,40 +84,49 @@ class MeasurementSofastFringe(ams.AbstractMeasurementSofast):
         return self.fringe_images[..., self.num_y_ims :]
 
     @property
-    def fringe_images_calibrated(self) -> np.ndarray:
-        """Returns calibrated fringes"""
+    def fringe_images_calibrated(self) -> CalibratedFringeImages:
+        """Returns lazily calibrated fringes. Index with a pixel mask to
+        calibrate only the masked pixels, see CalibratedFringeImages."""
         if self._fringe_images_calibrated is None:
             raise ValueError('Fringe images have not been calibrated.')
 
         return self._fringe_images_calibrated
 
     @property
-    def fringe_images_y_calibrated(self) -> np.ndarray:
-        """Returns calibrated y-only fringes"""
-        return self.fringe_images_calibrated[..., : self.num_y_ims]
+    def fringe_images_y_calibrated(self) -> CalibratedFringeImages:
+        """Returns lazily calibrated y-only fringes"""
+        return self.fringe_images_calibrated.frames(slice(None, self.num_y_ims))
 
     @property
-    def fringe_images_x_calibrated(self) -> np.ndarray:
-        """Returns calibrated x-only fringes"""
-        return self.fringe_images_calibrated[..., self.num_y_ims :]
+    def fringe_images_x_calibrated(self) -> CalibratedFringeImages:
+        """Returns lazily calibrated x-only fringes"""
+        return self.fringe_images_calibrated.frames(slice(self.num_y_ims, None))
 
-    def calibrate_fringe_images(self, calibration: ImageCalibrationAbstract, **kwargs) -> None:
+    def calibrate_fringe_images(
+        self, calibration: ImageCalibrationAbstract, dtype: np.dtype = np.float32, **kwargs
+    ) -> None:
         """
-        Performs brightness level calibration on the raw captured fringes.
+        Sets the brightness level calibration of the raw captured fringes.
+        Calibration is applied on demand when the calibrated fringes are
+        accessed, so the full calibrated images are never stored.
 
         Parameters
         ----------
         calibration : ImageCalibrationAbstract
             Image Calibration object.
+        dtype : np.dtype, optional
+            Data type of calibrated fringes, by default np.float32.
         **kwargs
             Other keyword arguments to pass into ImageCalibration object
-            "apply_to_images" method.
+            "apply_to_pixels" method.
 
         """
         if not isinstance(calibration, ImageCalibrationAbstract):
             raise ValueError('Input calibration must be instance of ImageCalibrationAbstract.')
 
-        self._fringe_images_calibrated = calibration.apply_to_images(self, **kwargs)
+        self._fringe_images_calibrated = CalibratedFringeImages(
+            self, calibration, np.arange(self.num_fringe_ims), dtype, **kwargs
+        )
 
     @classmethod
     def load_from_hdf(cls, file: str, prefix='') -> 'MeasurementSofastFringe':
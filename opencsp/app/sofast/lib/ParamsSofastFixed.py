@@ -19,6 +19,20 @@ class ParamsSofastFixed:
             Defines search region when searching for next dot. Ratio of length along search direction
             to perpendicular distance. Larger value equals narrower search region.
         mask_* : mask finding parameters
+        use_roi : bool
+            To reuse the mask bounding box and indexed blob positions of the previous measurement
+            processed as priors. The mask and blobs are then found only in a region of interest
+            around them, and blobs are indexed starting from the previous blob indices. Falls back
+            to the full frame when the priors do not fit the measurement. By default False.
+        roi_margin : int
+            Pixels, margin added around the previous mask/blob bounding box to define the region
+            of interest.
+        roi_downscale : int
+            Factor the region of interest is first downscaled by to check and tighten the mask
+            bounding box before calculating the mask at full resolution. 1 skips this step.
+        roi_min_blob_fraction : float
+            Minimum number of blobs indexed in the region of interest, as a fraction of the
+            number of previously indexed blobs, before falling back to the full frame.
         *debug : debug objects
         geometry_params : ParamsOpticGeometry
             Parameters to use when processing geometry of facet
@@ -30,6 +44,10 @@ class ParamsSofastFixed:
         self.mask_filt_thresh: int = 4
         self.mask_thresh_active_pixels: float = 0.05
         self.mask_keep_largest_area: bool = False
+        self.use_roi: bool = False
+        self.roi_margin: int = 25
+        self.roi_downscale: int = 4
+        self.roi_min_blob_fraction: float = 0.95
 
         self.slope_solver_data_debug: SlopeSolverDataDebug = SlopeSolverDataDebug()
         self.geometry_data_debug: DebugOpticsGeometry = DebugOpticsGeometry()
@@ -23,6 +23,7 @@ from opencsp.common.lib.deflectometry.SlopeSolverData import SlopeSolverData
 from opencsp.common.lib.deflectometry.Surface2DAbstract import Surface2DAbstract
 from opencsp.common.lib.geometry.RegionXY import RegionXY
 from opencsp.common.lib.geometry.Uxyz import Uxyz
+from opencsp.common.lib.geometry.Vxy import Vxy
 import opencsp.common.lib.tool.log_tools as lt
 
 
@@ -76,42 +77,199 @@ class ProcessSofastFixed:
         self.data_image_processing_facet: list[cdc.CalculationImageProcessingFacet]
         self.data_error: cdc.CalculationError
 
+        # Priors from previous measurement, used when self.params.use_roi is True
+        self.roi_mask_prev: tuple[int, int, int, int] = None  # Mask bounding box, (y0, y1, x0, x1) pixels
+        self.blob_points_prev: Vxy = None  # Indexed blob locations, pixels
+        self.blob_indices_prev: Vxy = None  # Blob xy indices
+
+    def reset_roi(self) -> None:
+        """Clears the mask and blob priors from the previous measurement. The
+        next measurement is then processed using the full frame."""
+        self.roi_mask_prev = None
+        self.blob_points_prev = None
+        self.blob_indices_prev = None
+
     def find_blobs(self) -> BlobIndex:
-        """Finds blobs in image"""
-        pts_blob = ip.detect_blobs(self.measurement.image, self.blob_detector)
+        """Finds blobs in image
 
-        # Index blobs
+        If self.params.use_roi is True, blobs are first searched for only near
+        the previous measurement's blobs, and indexed starting from their
+        indices. Falls back to the full frame if too few blobs are indexed.
+        """
+        blob_index = None
+        if self.params.use_roi and self.blob_points_prev is not None:
+            blob_index = self._find_blobs_roi()
+
+        if blob_index is None:
+            pts_blob = ip.detect_blobs(self.measurement.image, self.blob_detector)
+
+            # Index blobs
+            blob_index = self._create_blob_index(pts_blob)
+            blob_index.run(self.measurement.origin)
+
+        self.blob_points_prev, self.blob_indices_prev = blob_index.get_data()
+
+        return blob_index
+
+    def _create_blob_index(self, pts_blob: Vxy) -> BlobIndex:
         blob_index = BlobIndex(pts_blob, *self.fixed_pattern_dot_locs.dot_extent)
         blob_index.search_thresh = self.params.blob_search_thresh
         blob_index.search_perp_axis_ratio = self.params.search_perp_axis_ratio
-        blob_index.run(self.measurement.origin)
+        return blob_index
+
+    def _find_blobs_roi(self) -> BlobIndex | None:
+        """Finds blobs in the region of interest around the previous blobs and
+        indexes them starting from the previous blob indices. Returns None if
+        too few blobs are indexed."""
+        pts_prev = self.blob_points_prev
+
+        # Check that the origin blob has not moved
+        idx_origin = np.nonzero((self.blob_indices_prev.x == 0) & (self.blob_indices_prev.y == 0))[0]
+        if (idx_origin.size == 0) or (
+            (pts_prev[idx_origin[0]] - self.measurement.origin).magnitude()[0] > self.params.blob_search_thresh
+        ):
+            lt.debug('Origin is not near previous origin blob; finding blobs in full frame.')
+            return None
+
+        roi = (
+            int(np.floor(pts_prev.y.min())),
+            int(np.ceil(pts_prev.y.max())) + 1,
+            int(np.floor(pts_prev.x.min())),
+            int(np.ceil(pts_prev.x.max())) + 1,
+        )
+        y0, y1, x0, x1 = self._expand_roi(roi, self.params.roi_margin)
+
+        pts_blob = ip.detect_blobs(self.measurement.image[y0:y1, x0:x1], self.blob_detector)
+        if len(pts_blob) == 0:
+            lt.debug('No blobs found in region of interest; finding blobs in full frame.')
+            return None
+        pts_blob = pts_blob + Vxy((x0, y0))
+
+        # Index blobs
+        blob_index = self._create_blob_index(pts_blob)
+        try:
+            blob_index.run_from_prior(pts_prev, self.blob_indices_prev)
+        except ValueError as error:
+            lt.debug(f'{error} Finding blobs in full frame.')
+            return None
+
+        num_blobs = len(blob_index.get_data()[0])
+        if num_blobs < self.params.roi_min_blob_fraction * len(pts_prev):
+            lt.debug(
+                f'Indexed {num_blobs:d} blobs in region of interest, previously {len(pts_prev):d}; '
+                'finding blobs in full frame.'
+            )
+            return None
 
         return blob_index
 
     def calculate_mask(self) -> ndarray:
         """Calculate mask image
 
-        Parameters
-        ----------
-        image : ndarray
-            Measurement image
+        If self.params.use_roi is True, the mask is first calculated only in
+        the region of interest around the previous measurement's mask. Falls
+        back to the full frame if the mask is not contained in this region.
         """
-        # Calculate mask
-        im_dark = self.measurement.image * 0
-        images = np.concatenate((im_dark[..., None], self.measurement.image[..., None]), axis=2)
-        params = [
-            self.params.mask_hist_thresh,
-            self.params.mask_filt_width,
-            self.params.mask_filt_thresh,
-            self.params.mask_thresh_active_pixels,
-        ]
-        mask = ip.calc_mask_raw(images, *params)
+        mask = None
+        if self.params.use_roi and self.roi_mask_prev is not None:
+            mask = self._calculate_mask_roi()
+
+        if mask is None:
+            mask = self._calc_mask_raw(self.measurement.image)
+            if mask.sum() < self._min_active_pixels():
+                lt.error_and_raise(ValueError, f'Mask contains less than {self._min_active_pixels():d} active pixels.')
 
         if self.params.mask_keep_largest_area:
             mask = ip.keep_largest_mask_area(mask)
 
+        self.roi_mask_prev = self._bounding_box(mask)
+
         return mask
 
+    def _calc_mask_raw(self, image: ndarray, downscale: int = 1) -> ndarray:
+        """Calculates the raw mask of the given (region of) image, without
+        checking the number of active pixels"""
+        filt_width = max(1, round(self.params.mask_filt_width / downscale))
+        filt_thresh = self.params.mask_filt_thresh * (filt_width / self.params.mask_filt_width) ** 2
+
+        im_dark = image * 0
+        images = np.concatenate((im_dark[..., None], image[..., None]), axis=2)
+        return ip.calc_mask_raw(images, self.params.mask_hist_thresh, filt_width, filt_thresh, 0)
+
+    def _min_active_pixels(self) -> int:
+        return int(self.measurement.image.size * self.params.mask_thresh_active_pixels)
+
+    def _calculate_mask_roi(self) -> ndarray | None:
+        """Calculates the mask in the region of interest around the previous
+        mask. Returns None if the mask is not contained in the region."""
+        image = self.measurement.image
+        y0, y1, x0, x1 = self._expand_roi(self.roi_mask_prev, self.params.roi_margin)
+
+        # Check, and tighten, region of interest at reduced scale
+        ds = self.params.roi_downscale
+        if ds > 1:
+            ny, nx = (y1 - y0) // ds, (x1 - x0) // ds
+            image_roi = cv.resize(image[y0 : y0 + ny * ds, x0 : x0 + nx * ds], (nx, ny), interpolation=cv.INTER_AREA)
+            mask_roi = self._try_calc_mask_roi(image_roi, (y0, y0 + ny * ds, x0, x0 + nx * ds), ds)
+            if mask_roi is None:
+                return None
+            cy0, cy1, cx0, cx1 = self._bounding_box(mask_roi)
+            roi = (y0 + cy0 * ds, y0 + cy1 * ds, x0 + cx0 * ds, x0 + cx1 * ds)
+            y0, y1, x0, x1 = self._expand_roi(roi, ds + self.params.mask_filt_width)
+
+        # Calculate mask at full resolution
+        mask_roi = self._try_calc_mask_roi(image[y0:y1, x0:x1], (y0, y1, x0, x1))
+        if mask_roi is None:
+            return None
+
+        mask = np.zeros(image.shape, dtype=bool)
+        mask[y0:y1, x0:x1] = mask_roi
+        return mask
+
+    def _try_calc_mask_roi(
+        self, image_roi: ndarray, roi: tuple[int, int, int, int], downscale: int = 1
+    ) -> ndarray | None:
+        """Calculates the mask of the given region of interest image. Returns
+        None if the mask cannot be calculated, has too few active pixels, or
+        touches an edge of the region of interest that is not an image edge."""
+        try:
+            mask_roi = self._calc_mask_raw(image_roi, downscale)
+        except ValueError as error:
+            lt.debug(f'{error} Calculating mask in full frame.')
+            return None
+
+        if not mask_roi.any() or mask_roi.sum() * downscale**2 < self._min_active_pixels():
+            lt.debug('Too few active pixels in region of interest; calculating mask in full frame.')
+            return None
+
+        y0, y1, x0, x1 = roi
+        ny, nx = self.measurement.image.shape
+        if (
+            (y0 > 0 and mask_roi[0].any())
+            or (y1 < ny and mask_roi[-1].any())
+            or (x0 > 0 and mask_roi[:, 0].any())
+            or (x1 < nx and mask_roi[:, -1].any())
+        ):
+            lt.debug('Mask extends past region of interest; calculating mask in full frame.')
+            return None
+
+        return mask_roi
+
+    def _expand_roi(self, roi: tuple[int, int, int, int], margin: int) -> tuple[int, int, int, int]:
+        """Expands (y0, y1, x0, x1) region by margin pixels, limited to image"""
+        y0, y1, x0, x1 = roi
+        ny, nx = self.measurement.image.shape
+        return max(y0 - margin, 0), min(y1 + margin, ny), max(x0 - margin, 0), min(x1 + margin, nx)
+
+    @staticmethod
+    def _bounding_box(mask: ndarray) -> tuple[int, int, int, int] | None:
+        """Returns (y0, y1, x0, x1) bounding box of active pixels in 2d mask, None if there are none"""
+        ys = np.nonzero(mask.any(axis=1))[0]
+        xs = np.nonzero(mask.any(axis=0))[0]
+        if ys.size == 0:
+            return None
+        return ys[0], ys[-1] + 1, xs[0], xs[-1] + 1
+
     def generate_geometry(self, blob_index: BlobIndex, mask_raw: np.ndarray) -> dict:
         """Generates blob dataset from sofast dataset.
 
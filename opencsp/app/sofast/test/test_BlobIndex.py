@@ -0,0 +1,99 @@
+"""Unit test suite to test the BlobIndex class"""
+
+import os
+import unittest
+
+import numpy as np
+
+from opencsp.app.sofast.lib.BlobIndex import BlobIndex
+from opencsp.common.lib.geometry.Vxy import Vxy
+from opencsp.common.lib.opencsp_path.opencsp_root_path import opencsp_code_dir
+
+
+class TestBlobIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Makes a grid of blobs with some distortion, noise, missing blobs, and outliers"""
+        rng = np.random.default_rng(0)
+        idx_x, idx_y = np.meshgrid(np.arange(-20, 21), np.arange(-15, 16))
+        idx_x = idx_x.flatten()
+        idx_y = idx_y.flatten()
+        angle = np.deg2rad(4)
+        xs = 500 + 20 * (np.cos(angle) * idx_x - np.sin(angle) * idx_y) + 0.004 * idx_x**2 * idx_y
+        ys = 400 + 20 * (np.sin(angle) * idx_x + np.cos(angle) * idx_y) + 0.01 * idx_y**2
+        xs += rng.normal(0, 0.3, xs.size)
+        ys += rng.normal(0, 0.3, ys.size)
+
+        # remove some blobs, but not the center 3x3 block
+        keep = (rng.random(xs.size) > 0.03) | ((np.abs(idx_x) <= 1) & (np.abs(idx_y) <= 1))
+        xs, ys = xs[keep], ys[keep]
+
+        # add some spurious blobs
+        xs = np.concatenate((xs, rng.uniform(0, 1000, 30)))
+        ys = np.concatenate((ys, rng.uniform(0, 800, 30)))
+
+        order = rng.permutation(xs.size)
+        cls.points = Vxy((xs[order], ys[order]))
+        cls.origin = Vxy((500, 400))
+
+    def _run(self, use_kdtree: bool, apply_filter: bool = False) -> BlobIndex:
+        blob_index = BlobIndex(self.points, -20, 20, -15, 15)
+        blob_index.use_kdtree = use_kdtree
+        blob_index.apply_filter = apply_filter
+        blob_index.run(self.origin)
+        return blob_index
+
+    def test_finds_most_points(self):
+        points, indices = self._run(use_kdtree=True).get_data()
+        self.assertGreater(len(points), 0.9 * 41 * 31)
+        # the center point should be assigned (0, 0)
+        idx_center = np.argmin((points - self.origin).magnitude())
+        np.testing.assert_array_equal(indices[idx_center].data.squeeze(), [0, 0])
+
+    def test_kdtree_matches_brute_force(self):
+        for apply_filter in [False, True]:
+            blob_index_kdtree = self._run(use_kdtree=True, apply_filter=apply_filter)
+            blob_index_brute = self._run(use_kdtree=False, apply_filter=apply_filter)
+
+            points_kdtree, indices_kdtree = blob_index_kdtree.get_data()
+            points_brute, indices_brute = blob_index_brute.get_data()
+            np.testing.assert_array_equal(points_kdtree.data, points_brute.data)
+            np.testing.assert_array_equal(indices_kdtree.data, indices_brute.data)
+
+            points_mat_kdtree, indices_mat_kdtree = blob_index_kdtree.get_data_mat()
+            points_mat_brute, indices_mat_brute = blob_index_brute.get_data_mat()
+            np.testing.assert_array_equal(points_mat_kdtree, points_mat_brute)
+            np.testing.assert_array_equal(indices_mat_kdtree, indices_mat_brute)
+
+    def test_run_matches_expected(self):
+        """The blob assignments of run() on the distorted grid with spurious blobs are unchanged"""
+        file = os.path.join(opencsp_code_dir(), 'app/sofast/test/data/input/BlobIndex/run_distorted_grid.csv')
+        expected = np.loadtxt(file, delimiter=',', skiprows=1)
+
+        for use_kdtree in [True, False]:
+            points, indices = self._run(use_kdtree=use_kdtree).get_data()
+            np.testing.assert_allclose(points.data, expected[:, :2].T, rtol=0, atol=1e-9)
+            np.testing.assert_array_equal(indices.data, expected[:, 2:].T)
+
+    def test_run_from_prior(self):
+        points_exp, indices_exp = self._run(use_kdtree=True).get_data()
+
+        # Seeded with all previously indexed points
+        blob_index = BlobIndex(self.points, -20, 20, -15, 15)
+        blob_index.run_from_prior(points_exp, indices_exp)
+        points, indices = blob_index.get_data()
+        np.testing.assert_array_equal(points.data, points_exp.data)
+        np.testing.assert_array_equal(indices.data, indices_exp.data)
+
+        # Seeded with some previously indexed points, the rest are found by extending rows/columns
+        for step in [2, 5]:
+            blob_index = BlobIndex(self.points, -20, 20, -15, 15)
+            blob_index.run_from_prior(points_exp[::step], indices_exp[::step])
+            points, indices = blob_index.get_data()
+            np.testing.assert_array_equal(indices.data, indices_exp.data)
+            # Outlier blobs close to grid blobs may be found instead
+            self.assertGreater(np.all(points.data == points_exp.data, axis=0).mean(), 0.99)
+
+
+if __name__ == '__main__':
+    unittest.main()
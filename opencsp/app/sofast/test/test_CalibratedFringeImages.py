@@ -0,0 +1,84 @@
+"""Unit test suite to test CalibratedFringeImages class
+"""
+
+import datetime as dt
+import unittest
+
+import numpy as np
+
+from opencsp.app.sofast.lib.CalibratedFringeImages import CalibratedFringeImages
+from opencsp.app.sofast.lib.ImageCalibrationGlobal import ImageCalibrationGlobal
+from opencsp.app.sofast.lib.ImageCalibrationScaling import ImageCalibrationScaling
+from opencsp.app.sofast.lib.MeasurementSofastFringe import MeasurementSofastFringe as Measurement
+import opencsp.app.sofast.lib.DistanceOpticScreen as osd
+from opencsp.common.lib.geometry.Vxyz import Vxyz
+
+
+class TestCalibratedFringeImages(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        rng = np.random.default_rng(0)
+
+        # Create calibrations
+        camera_values = np.array([0, 5, 20, 60, 120, 200, 250, 255], dtype=float)
+        display_values = np.linspace(0, 255, 8)
+        cls.calibrations = [
+            ImageCalibrationGlobal(camera_values, display_values),
+            ImageCalibrationScaling(camera_values, display_values),
+        ]
+
+        # Create measurement with 4 y and 8 x fringe images
+        mask_images = np.stack((rng.integers(0, 30, (30, 40)), rng.integers(150, 256, (30, 40))), axis=2)
+        fringe_images = rng.integers(0, 256, (30, 40, 12))
+        dist_optic_screen_measure = osd.DistanceOpticScreen(Vxyz((0, 0, 0)), 10)
+        cls.measurement = Measurement(
+            mask_images.astype('uint8'),
+            fringe_images.astype('uint8'),
+            np.array([0.5, 4.0]),
+            np.array([1.0]),
+            dist_optic_screen_measure,
+            dt.datetime.now(),
+            'Test',
+        )
+
+        # Create mask
+        cls.mask = rng.random((30, 40)) > 0.7
+
+    def test_masked_pixels(self):
+        for calibration in self.calibrations:
+            images_exp = calibration.apply_to_images(self.measurement).astype(np.float32)
+            self.measurement.calibrate_fringe_images(calibration)
+
+            np.testing.assert_array_equal(self.measurement.fringe_images_calibrated[self.mask], images_exp[self.mask])
+            np.testing.assert_array_equal(
+                self.measurement.fringe_images_y_calibrated[self.mask, :], images_exp[self.mask, :4]
+            )
+            np.testing.assert_array_equal(
+                self.measurement.fringe_images_x_calibrated[self.mask, 2:5], images_exp[self.mask, 6:9]
+            )
+
+    def test_full_images(self):
+        for calibration in self.calibrations:
+            images_exp = calibration.apply_to_images(self.measurement)
+            # Small chunks, so that chunks split image rows
+            view = CalibratedFringeImages(self.measurement, calibration, np.arange(12), np.float64, chunk_size=25)
+
+            self.assertEqual(view.shape, (30, 40, 12))
+            np.testing.assert_array_equal(np.asarray(view), images_exp)
+            np.testing.assert_array_equal(view[self.mask], images_exp[self.mask])
+            np.testing.assert_array_equal(view[3:5, :, 1], images_exp[3:5, :, 1])
+
+    def test_not_calibrated(self):
+        with self.assertRaises(ValueError):
+            Measurement(
+                self.measurement.mask_images,
+                self.measurement.fringe_images,
+                self.measurement.fringe_periods_x,
+                self.measurement.fringe_periods_y,
+                self.measurement.dist_optic_screen_measure,
+                self.measurement.date,
+            ).fringe_images_calibrated
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -101,6 +101,42 @@ class TestImageCalibrationGlobal(unittest.TestCase):
         cal2 = ImageCalibrationGlobal.load_from_hdf(cal_path_name_ext)
         np.testing.assert_almost_equal(cal.camera_values, cal2.camera_values, decimal=1e-6)
         np.testing.assert_almost_equal(cal.display_values, cal2.display_values, decimal=1e-6)
+        np.testing.assert_array_equal(cal.response_lut, cal2.response_lut)
+
+        # cached lookup table is used instead of recalculating it
+        cal2 = ImageCalibrationGlobal(cal.camera_values, cal.display_values, response_lut=cal.response_lut * 0)
+        cal2.save_to_hdf(cal_path_name_ext)
+        cal3 = ImageCalibrationGlobal.load_from_hdf(cal_path_name_ext)
+        np.testing.assert_array_equal(cal3.response_lut, 0)
+
+        # cached lookup tables that don't match the camera/display values are recalculated
+        for response_lut in [cal.response_lut[:-1], cal.response_lut + 1000, np.full_like(cal.response_lut, np.nan)]:
+            cal2.response_lut = response_lut
+            cal2.save_to_hdf(cal_path_name_ext)
+            cal3 = ImageCalibrationGlobal.load_from_hdf(cal_path_name_ext)
+            np.testing.assert_array_equal(cal3.response_lut, cal.response_lut)
+
+    def test_response_lut(self):
+        rng = np.random.default_rng(0)
+        camera_values = np.array([3.5, 20.2, 20.2, 80.0, 200.7, 1000.1, 4000.0])
+        display_values = np.linspace(0, 255, 7)
+        cal = ImageCalibrationGlobal(camera_values, display_values)
+
+        # Lookup table covers integer camera values up to one past the calibrated range
+        self.assertEqual(cal.response_lut.size, 4002)
+
+        # Integer images are converted with lookup table, same as interpolation
+        for dtype in ['uint8', 'uint16', 'int32']:
+            images = rng.integers(-10 if dtype == 'int32' else 0, 5000, (20, 30, 4)).astype(dtype)
+            np.testing.assert_array_equal(cal.apply_response(images), cal.response_function(images))
+
+        # Float images are interpolated
+        images = rng.uniform(0, 5000, (20, 30, 4))
+        np.testing.assert_array_equal(cal.apply_response(images), cal.response_function(images))
+
+        # No lookup table if calibrated range includes negative values
+        cal = ImageCalibrationGlobal(camera_values - 10, display_values)
+        self.assertIsNone(cal.response_lut)
 
     def test_plot_gray_levels_cal_no_calibration(self):
         # load the calibration
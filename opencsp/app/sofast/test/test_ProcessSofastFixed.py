@@ -14,6 +14,7 @@ from opencsp.app.sofast.lib.ProcessSofastFixed import ProcessSofastFixed
 from opencsp.app.sofast.lib.SpatialOrientation import SpatialOrientation
 from opencsp.common.lib.camera.Camera import Camera
 from opencsp.common.lib.deflectometry.Surface2DParabolic import Surface2DParabolic
+from opencsp.common.lib.geometry.Vxy import Vxy
 from opencsp.common.lib.opencsp_path.opencsp_root_path import opencsp_code_dir
 import opencsp.common.lib.render.figure_management as fm
 import opencsp.common.lib.render_control.RenderControlAxis as rca
@@ -84,6 +85,45 @@ class TestProcessSofastFixed(unittest.TestCase):
             self.process_sofast_fixed.data_slope_solver.slopes_facet_xy, self.exp_slopes_xy, rtol=0, atol=1e-6
         )
 
+    def test_roi(self):
+        """Tests finding mask and blobs in region of interest of previous measurement"""
+        process_sofast_fixed = ProcessSofastFixed(
+            self.process_sofast_fixed.orientation,
+            self.process_sofast_fixed.camera,
+            self.process_sofast_fixed.fixed_pattern_dot_locs,
+            self.process_sofast_fixed.facet_data,
+        )
+        process_sofast_fixed.params.use_roi = True
+        measurement = self.process_sofast_fixed.measurement
+        process_sofast_fixed.load_measurement_data(measurement)
+
+        # First measurement, full frame
+        pts_exp, indices_exp = process_sofast_fixed.find_blobs().get_data()
+        mask_exp = process_sofast_fixed.calculate_mask()
+
+        # Second measurement, region of interest
+        pts, indices = process_sofast_fixed.find_blobs().get_data()
+        mask = process_sofast_fixed.calculate_mask()
+
+        np.testing.assert_allclose(pts.data, pts_exp.data, rtol=0, atol=1e-3)
+        np.testing.assert_array_equal(indices.data, indices_exp.data)
+        np.testing.assert_array_equal(mask, mask_exp)
+
+        # Shifted measurement, falls back to full frame
+        measurement_shifted = MeasurementSofastFixed(
+            np.roll(measurement.image, (40, -30), axis=(0, 1)),
+            measurement.dist_optic_screen_measure,
+            measurement.origin + Vxy((-30, 40)),
+        )
+        process_sofast_fixed.load_measurement_data(measurement_shifted)
+
+        pts, indices = process_sofast_fixed.find_blobs().get_data()
+        mask = process_sofast_fixed.calculate_mask()
+
+        np.testing.assert_allclose(pts.data, pts_exp.data + [[-30], [40]], rtol=0, atol=1e-3)
+        np.testing.assert_array_equal(indices.data, indices_exp.data)
+        np.testing.assert_array_equal(mask, np.roll(mask_exp, (40, -30), axis=(0, 1)))
+
     def tearDown(self) -> None:
         # Make sure we release all matplotlib resources.
         plt.close('all')
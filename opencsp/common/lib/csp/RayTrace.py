@@ -64,13 +64,16 @@ class RayTrace:
     def draw(self, view: View3d, trace_style: RenderControlRayTrace = None) -> None:
         if trace_style == None:
             trace_style = RenderControlRayTrace()
-        for lp in self.light_paths_ensemble:
-            lp.draw(view, trace_style.light_path_control)
+        # Draw with one matplotlib artist per style, instead of one per light path.
+        with view.batch_draw():
+            for lp in self.light_paths_ensemble:
+                lp.draw(view, trace_style.light_path_control)
 
     def draw_subset(self, view: View3d, count: int, trace_style: RenderControlRayTrace = None):
-        for i in np.floor(np.linspace(0, len(self.light_paths_ensemble) - 1, count)):
-            lp = self.light_paths_ensemble[int(i)]
-            lp.draw(view, trace_style.light_path_control)
+        with view.batch_draw():
+            for i in np.floor(np.linspace(0, len(self.light_paths_ensemble) - 1, count)):
+                lp = self.light_paths_ensemble[int(i)]
+                lp.draw(view, trace_style.light_path_control)
 
     @strict_types
     def add_many_light_paths(self, new_paths: list[LightPath]):
@@ -213,8 +213,10 @@ class SolarField(RayTraceable):
     def draw(self, view: View3d, solar_field_style: RenderControlSolarField = RenderControlSolarField()) -> None:
         # Heliostats.
         if solar_field_style.draw_heliostats:
-            for heliostat in self.heliostats:
-                heliostat.draw(view, solar_field_style.heliostat_styles)
+            # Draw with one matplotlib artist per style, instead of several per heliostat.
+            with view.batch_draw():
+                for heliostat in self.heliostats:
+                    heliostat.draw(view, solar_field_style.heliostat_styles)
 
     def draw_figure(self, figure_control, axis_control_m, view_spec, title, solar_field_style, grid=True):
         # Setup view
@@ -3,12 +3,17 @@ from PIL import Image
 import sys
 from typing import Optional, Union
 
+from opencsp.common.lib.cv.CacheableImageStore import CacheableImageStore
 import opencsp.common.lib.tool.file_tools as ft
 import opencsp.common.lib.tool.image_tools as it
 import opencsp.common.lib.tool.log_tools as lt
 
 
 class CacheableImage:
+    store = CacheableImageStore()
+    """ Process-wide store of the arrays loaded from cache or source files.
+    Change store.memory_budget to limit how much memory they use. """
+
     def __init__(self, array: np.ndarray = None, cache_path: str = None, source_path: str = None):
         """An image container that allows for caching an image when the image
         data isn't in use, or for retrieval of an image from the cached file
@@ -25,6 +30,16 @@ class CacheableImage:
         priority order for the data that is returned from various methods:
         (1) in-memory array, (2) numpy cache file, (3) image source file.
 
+        Arrays loaded from the cache or source file are kept in
+        CacheableImage.store, which drops the least recently used arrays
+        when over its memory budget. Cache files are read into memory rather
+        than memory mapped, so that the files aren't held open and the store's
+        memory accounting matches the memory actually used.
+
+        While its array is in the store, nparray returns the same array to
+        every caller. Copy the array before modifying it, unless the change
+        should be seen by all users of this image.
+
         Parameters
         ----------
         array: np.ndarray, optional
@@ -104,11 +119,14 @@ class CacheableImage:
     def nparray(self):
         self._image = None
 
-        if self._array is None:
-            if not self.cached:
-                self._array = self.__load_image()
+        if not self._array is None:
+            return self._array
 
-        return self.__load_image()
+        array = self.store.get(self)
+        if array is None:
+            array = self.__load_image()
+            self.store.put(self, array)
+        return array
 
     def to_image(self):
         if self._image == None:
@@ -131,14 +149,17 @@ class CacheableImage:
                 )
             cache_path = self.cache_path
             self.validate_cache_path(cache_path, "cache")
-        self.cache_path = cache_path
 
         # check that this instance isn't already cached
-        if self._array is None and self._image == None:
+        if self._array is None and self.cached and ft.file_exists(cache_path):
+            self.cache_path = cache_path
             return
 
         # cache this instance
-        np.save(cache_path, self.nparray)
+        array = self.nparray
+        self.cache_path = cache_path
+        np.save(cache_path, array)
+        self.store.remove(self)
         self._array = None
         self._image = None
         self.cached = True
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+import threading
+import weakref
+
+import numpy as np
+
+
+class CacheableImageStore:
+    def __init__(self, memory_budget: int = 2 * pow(2, 30)):
+        """A least-recently-used store of the in-memory arrays of
+        CacheableImages that have been loaded from their cache or source files.
+
+        When the total size of the stored arrays exceeds the memory budget, the
+        arrays of the least recently used images are dropped from the store.
+        The next time they are requested, they are loaded again from file. One
+        store is shared by all CacheableImages in the process, see
+        CacheableImage.store.
+
+        Images are removed from the store when they are garbage collected.
+
+        Parameters
+        ----------
+        memory_budget : int, optional
+            The total number of bytes of image arrays to keep in memory. By
+            default 2GB.
+        """
+        self.memory_budget = memory_budget
+        """ The total number of bytes of image arrays to keep in memory. The
+        most recently used array is always kept, even if it is larger than the
+        budget. """
+        self.hits = 0
+        """ How many times a requested array was in the store. """
+        self.misses = 0
+        """ How many times a requested array was not in the store and had to be
+        loaded from file. """
+        self.evictions = 0
+        """ How many arrays have been dropped from the store to stay within
+        the memory budget. """
+        self._entries: OrderedDict[int, tuple[weakref.ref, np.ndarray]] = OrderedDict()
+        """ Stored arrays by image id, from least to most recently used. """
+        self._memory_used = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheableImageStore({len(self)} images, {self.memory_used}/{self.memory_budget} bytes, "
+            + f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions)"
+        )
+
+    @property
+    def memory_used(self) -> int:
+        """The total number of bytes of the stored arrays."""
+        return self._memory_used
+
+    def get(self, image) -> np.ndarray | None:
+        """Returns the stored array for the given CacheableImage and marks it
+        as most recently used, or None if it isn't in the store."""
+        with self._lock:
+            entry = self._entries.get(id(image))
+            if entry is None or entry[0]() is not image:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(id(image))
+            self.hits += 1
+            return entry[1]
+
+    def put(self, image, array: np.ndarray):
+        """Stores the array for the given CacheableImage as the most recently
+        used array, and drops least recently used arrays as necessary to stay
+        within the memory budget."""
+        with self._lock:
+            self._remove(id(image))
+
+            key = id(image)
+            ref = weakref.ref(image, lambda ref, key=key: self._on_image_deleted(key, ref))
+            self._entries[key] = (ref, array)
+            self._memory_used += array.nbytes
+
+            while self._memory_used > self.memory_budget and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._memory_used -= evicted.nbytes
+                self.evictions += 1
+
+    def remove(self, image):
+        """Drops the array of the given CacheableImage from the store, if any."""
+        with self._lock:
+            self._remove(id(image))
+
+    def _on_image_deleted(self, key: int, ref: weakref.ref):
+        with self._lock:
+            # the id might have been reused by a newer image
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is ref:
+                self._remove(key)
+
+    def _remove(self, key: int):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._memory_used -= entry[1].nbytes
+
+    def clear(self):
+        """Drops all arrays from the store."""
+        with self._lock:
+            self._entries.clear()
+            self._memory_used = 0
+
+    def reset_counters(self):
+        """Sets the hit, miss, and eviction counters back to 0."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
@@ -116,6 +116,12 @@ class SpotAnalysis(Iterator[tuple[SpotAnalysisOperable]]):
         save_overwrite: bool
             If True, then overwrite any existing images in the save_dir with the
             new output. Defaults to False.
+        num_workers: int
+            The number of threads that each stateless image processor (see
+            AbstractSpotAnalysisImagesProcessor.is_stateless) executes with.
+            Stateful image processors always execute on one image at a time, in
+            order. Results are returned in the same order regardless. Defaults
+            to 1.
     """
 
     def __init__(
@@ -124,6 +130,7 @@ class SpotAnalysis(Iterator[tuple[SpotAnalysisOperable]]):
         image_processors: list[asaip.AbstractSpotAnalysisImagesProcessor],
         save_dir: str = None,
         save_overwrite=False,
+        num_workers=1,
     ):
         self.name = name
         """ The name of this instance. For example, this could be one of the use
@@ -151,6 +158,9 @@ class SpotAnalysis(Iterator[tuple[SpotAnalysisOperable]]):
         self.save_overwrite = save_overwrite
         """ If True, then overwrite any existing images in the save_dir with the
         new output. Defaults to False. """
+        self.num_workers = num_workers
+        """ The number of threads that each stateless image processor executes
+        with. """
         self.default_support_images: dict[ImageType, CacheableImage] = None
         """ Other supporting images for processing input images. If not None, then
         all values here will be made available for processing as the default
@@ -180,6 +190,11 @@ class SpotAnalysis(Iterator[tuple[SpotAnalysisOperable]]):
         for image_processor in self.image_processors:
             image_processor._allowed_memory_footprint = mem_per_image_processor
 
+        # run stateless image processors in parallel
+        for image_processor in self.image_processors:
+            if image_processor.is_stateless:
+                image_processor.num_workers = self.num_workers
+
         # assign the input stream to the first image processor
         if self.input_stream != None:
             self._assign_inputs(self.input_stream)
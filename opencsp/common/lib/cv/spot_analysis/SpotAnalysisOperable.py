@@ -1,5 +1,5 @@
 import copy
-from dataclasses import dataclass, field, replace
+from dataclasses import dataclass, field, fields, replace
 import numpy as np
 import numpy.typing as npt
 import sys
@@ -84,7 +84,8 @@ class SpotAnalysisOperable:
                 primary_image_source_path = primary_image.source_path
             else:
                 primary_image_source_path = primary_image.cache_path
-            requires_update = True
+            # only update when there is a path to record, to avoid updating forever
+            requires_update = requires_update or primary_image_source_path != None
 
         # set the source path on the cacheable instance of the primary image
         if primary_image.source_path == None:
@@ -92,10 +93,14 @@ class SpotAnalysisOperable:
                 primary_image.source_path = primary_image_source_path
 
         if requires_update:
-            # use __init__ to update frozen values
-            self.__init__(
-                primary_image, primary_image_source_path=primary_image_source_path, supporting_images=supporting_images
+            # use __init__ to update frozen values, keeping all other values
+            kwargs = {f.name: getattr(self, f.name) for f in fields(self)}
+            kwargs.update(
+                primary_image=primary_image,
+                primary_image_source_path=primary_image_source_path,
+                supporting_images=supporting_images,
             )
+            self.__init__(**kwargs)
 
     def __sizeof__(self) -> int:
         return sys.getsizeof(self.primary_image) + sum([sys.getsizeof(im) for im in self.supporting_images.values()])
@@ -11,6 +11,12 @@ class SpotAnalysisPopulationStatistics:
     """ Minimum value seen across images. None if not yet calculated. """
     avgf_rolling_window: npt.NDArray[np.float_] = None
     """ Average value seen across images. None if not yet calculated. """
+    varf_rolling_window: npt.NDArray[np.float_] = None
+    """ Variance of the values seen across the images in the rolling window. None if not yet calculated. """
+    minf_rolling_window: npt.NDArray[np.float_] = None
+    """ Minimum value seen across the images in the rolling window. None if not yet calculated. """
+    maxf_rolling_window: npt.NDArray[np.float_] = None
+    """ Maximum value seen across the images in the rolling window. None if not yet calculated. """
 
     window_size: int = 1
     """ Current window size, for statistics that are calculated as a rolling window. """
@@ -33,6 +39,11 @@ class SpotAnalysisPopulationStatistics:
             ret = ret.astype(np.int32)
         return ret
 
+    @property
+    def stdf_rolling_window(self) -> npt.NDArray[np.float_]:
+        """The standard deviation of the values seen across images in the rolling window."""
+        return np.sqrt(self.varf_rolling_window)
+
     @property
     def avgi_rolling_window(self) -> npt.NDArray[np.int_]:
         """Like favg_rolling_window, but returns the rounded integer result."""
@@ -1,4 +1,6 @@
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import copy
 from typing import Callable, Iterator, Union
 
@@ -41,6 +43,27 @@ class AbstractSpotAnalysisImagesProcessor(Iterator[SpotAnalysisOperable], Abstra
         iteration in __next__(). """
         self._on_image_processed: list[Callable[[SpotAnalysisOperable]]] = []
         """ A list of callbacks to be evaluated when an image is finished processing. """
+        self.num_workers = 1
+        """ The number of threads to evaluate _execute() with while iterating.
+        Only used by stateless processors (see is_stateless). With more than one
+        worker, up to max_queue_size input operables are fetched ahead and
+        executed on concurrently. Results are still returned, and callbacks
+        evaluated, in the order of the input operables. Defaults to 1. """
+        self.max_queue_size: int = None
+        """ The maximum number of input operables being executed on at once
+        when num_workers > 1. None for 2*num_workers. """
+        self._executor: ThreadPoolExecutor = None
+        self._in_flight: deque[tuple[SpotAnalysisOperable, bool, Future]] = deque()
+        """ Input operables being executed on by the _executor, their is_last
+        values, and their results, in input order. """
+
+    @property
+    def is_stateless(self) -> bool:
+        """True if _execute() neither depends on nor changes the state of this
+        instance, and always returns exactly one result per input operable. Such
+        processors can execute on several input operables at once, see
+        num_workers. False by default."""
+        return False
 
     def run(
         self,
@@ -94,6 +117,14 @@ class AbstractSpotAnalysisImagesProcessor(Iterator[SpotAnalysisOperable], Abstra
 
         self.inmem_inputs.append(input_operable)
         ret: list[SpotAnalysisOperable] = self._execute(input_operable, is_last)
+        return self._register_execute_results(ret, is_last)
+
+    def _register_execute_results(
+        self, ret: list[SpotAnalysisOperable], is_last: bool = False
+    ) -> list[SpotAnalysisOperable]:
+        """Validates and records the results of _execute(), evaluates the
+        on_image_processed callbacks, and releases memory. Called from
+        process_image(), and from __next__() when executing in parallel."""
         if not isinstance(ret, list):
             lt.error_and_raise(
                 TypeError,
@@ -186,6 +217,7 @@ class AbstractSpotAnalysisImagesProcessor(Iterator[SpotAnalysisOperable], Abstra
                 self.assign_inputs(self._original_operables)  # initializes the leger
                 self.input_iter = iter(self._original_operables)
                 self.inmem_inputs = []
+                self._shutdown_executor()
                 try:
                     self.next_item = next(self.input_iter)
                 except StopIteration:
@@ -221,6 +253,12 @@ class AbstractSpotAnalysisImagesProcessor(Iterator[SpotAnalysisOperable], Abstra
             # - the current input operable
             # - the input operable for the next cycle
             # - and the value of is_last
+            if self.num_workers > 1 and self.is_stateless:
+                output_operables, is_last = self._process_next_image_parallel()
+                if len(output_operables) > 0:
+                    break
+                continue
+
             input_operable = self.next_item
             if input_operable == None:
                 lt.error_and_raise(
@@ -263,6 +301,56 @@ class AbstractSpotAnalysisImagesProcessor(Iterator[SpotAnalysisOperable], Abstra
 
         return ret
 
+    def _process_next_image_parallel(self) -> tuple[list[SpotAnalysisOperable], bool]:
+        """Keeps up to max_queue_size input operables executing in the
+        background, and registers the results for the oldest of them.
+
+        Returns
+        -------
+        results : list[SpotAnalysisOperable]
+            The results from executing on the oldest input operable.
+        is_last : bool
+            True if the oldest input operable was the last input operable.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.num_workers, thread_name_prefix=self.name)
+        max_queue_size = self.max_queue_size or 2 * self.num_workers
+
+        # fetch and start executing on input operables, until the queue is full
+        while len(self._in_flight) < max(max_queue_size, 1) and self.next_item != None:
+            input_operable = self.next_item
+            try:
+                self.next_item = next(self.input_iter)
+                is_last = False
+            except StopIteration:
+                self.next_item = None
+                is_last = True
+            future = self._executor.submit(self._execute, input_operable, is_last)
+            self._in_flight.append((input_operable, is_last, future))
+
+        # register results in input order, so that they are deterministic
+        input_operable, is_last, future = self._in_flight.popleft()
+        if self.cummulative_processed_results == None:
+            self.initialize_cummulative_processed_results()
+        self.inmem_inputs.append(input_operable)
+        try:
+            ret = self._register_execute_results(future.result(), is_last)
+        except Exception:
+            self._shutdown_executor()
+            raise
+
+        if is_last:
+            self._shutdown_executor()
+        return ret, is_last
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            for _, _, future in self._in_flight:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._in_flight.clear()
+
     @tt.strict_types
     def get_processed_image_save_callback(
         self, dir: str, name_prefix: str = None, ext="jpg"
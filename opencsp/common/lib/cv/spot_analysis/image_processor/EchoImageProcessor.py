@@ -10,6 +10,10 @@ class EchoImageProcessor(AbstractSpotAnalysisImagesProcessor):
     def __init__(self):
         super().__init__(self.__class__.__name__)
 
+    @property
+    def is_stateless(self) -> bool:
+        return True
+
     def _execute(self, operable: SpotAnalysisOperable, is_last: bool) -> list[SpotAnalysisOperable]:
         lt.debug(f"Processing image {operable.primary_image_name_for_logs}")
         return [operable]
@@ -30,6 +30,10 @@ class FalseColorImageProcessor(AbstractSpotAnalysisImagesProcessor):
         self.map_type = map_type
         self.opencv_map = opencv_map
 
+    @property
+    def is_stateless(self) -> bool:
+        return True
+
     @staticmethod
     def _map_jet_large_rgb(input_color: int):
         """Like the opencv jet false color map, except that this covers a
@@ -89,13 +93,55 @@ class FalseColorImageProcessor(AbstractSpotAnalysisImagesProcessor):
             ret = [255, 2 * (input_color - (255 * 3 + 128)), 2 * (input_color - (255 * 3 + 128))]
         return (ret[0] << 16) + (ret[1] << 8) + ret[2]
 
+    _color_luts: dict[str, np.ndarray] = {}
+    """ Color lookup tables for the custom maps, by map type. Built on first use and shared between instances. """
+
+    @classmethod
+    def _get_color_lut(cls, map_type: str) -> np.ndarray:
+        """Returns the rgb color (uint32) for each of the representable
+        grayscale colors of the given custom map type, as an array with shape
+        (representable colors, 3). The table is only computed the first time
+        it is requested."""
+        if map_type not in cls._color_luts:
+            representable_colors = 255 * 6 if map_type == 'large' else 255 * 4
+            map_func = cls._map_jet_large_rgb if map_type == 'large' else cls._map_jet_human_rgb
+            rgb = np.array([map_func(k) for k in range(representable_colors)], dtype=np.uint32)
+            lut = np.stack((rgb >> 16, (rgb >> 8) & 255, rgb & 255), axis=1)
+            lut.flags.writeable = False
+            cls._color_luts[map_type] = lut
+        return cls._color_luts[map_type]
+
+    @staticmethod
+    def _apply_color_lut(image: np.ndarray, color_lut: np.ndarray, max_value, index_dtype: type) -> np.ndarray:
+        """Rescales the grayscale image to the representable colors of the
+        color_lut, so that max_value is the last color, and returns the color
+        of each pixel.
+
+        Integer images of up to 16 bits are mapped with a single lookup into
+        a table with the color of every possible grayscale value. Other images
+        are rescaled pixel by pixel, then looked up in the color_lut."""
+        representable_colors = color_lut.shape[0]
+        scale = (representable_colors - 1) / max_value
+        if len(image.shape) == 3:
+            image = np.squeeze(image, axis=2)
+
+        if np.issubdtype(image.dtype, np.integer) and image.dtype.itemsize <= 2:
+            # Index the table by the bits of each value, so that signed values don't need an offset
+            unsigned_dtype = np.dtype(f'u{image.dtype.itemsize}')
+            levels = np.arange(2 ** (8 * image.dtype.itemsize), dtype=unsigned_dtype).view(image.dtype)
+            level_indices = np.clip(levels * scale, 0, representable_colors - 1).astype(index_dtype)
+            return color_lut[level_indices][image.view(unsigned_dtype)]
+
+        indices = np.clip(image * scale, 0, representable_colors - 1).astype(index_dtype)
+        return color_lut[indices]
+
     def apply_mapping_jet_custom(self, operable: SpotAnalysisOperable, map_type: str):
         """Updates the primary image to use the jet color map plus black and
         white (black->blue->cyan->green->yellow->red->white). This larger
         version of the opencv color map can represent either 1020 or 1530
         different grayscale colors (compared to 256 colors with
-        opencv.applyColorMap()). However, this takes ~0.28 seconds for a
-        1626 x 1236 pixel image."""
+        opencv.applyColorMap()). Takes ~0.02 seconds for a 1626 x 1236 pixel
+        8 or 16 bit image."""
         # rescale to the number of representable colors
         # black_to_blue = 255
         # blue_to_cyan = 255
@@ -103,30 +149,17 @@ class FalseColorImageProcessor(AbstractSpotAnalysisImagesProcessor):
         # green_to_yellow = 127/255
         # yellow_to_red = 128/255
         # red_to_white = 127/255
-        representable_colors = 255 * 6 if map_type == 'large' else 255 * 4
         max_value = operable.max_popf
-        new_image: np.ndarray = operable.primary_image.nparray * ((representable_colors - 1) / max_value)
-        new_image = np.clip(new_image, 0, representable_colors - 1).astype(np.int32)
-        if len(new_image.shape) == 3:
-            new_image = np.squeeze(new_image, axis=2)
-
-        # add extra color channels
-        dims, nchannels = it.dims_and_nchannels(new_image)
-        color_image = np.expand_dims(new_image, axis=2)
-        color_image = np.broadcast_to(color_image, (dims[0], dims[1], 3))
-        color_image = np.array(color_image.astype(np.uint32))
-        assert it.dims_and_nchannels(color_image)[1] == 3
 
         # apply the mapping
-        map_func = self._map_jet_large_rgb if map_type == 'large' else self._map_jet_human_rgb
-        mapping = {k: map_func(k) for k in range(representable_colors)}
-        new_image = np.vectorize(mapping.__getitem__)(new_image)
-        color_image[:, :, 0] = new_image >> 16
-        color_image[:, :, 1] = (new_image >> 8) & 255
-        color_image[:, :, 2] = new_image & 255
-        ret = color_image
+        color_lut = self._get_color_lut(map_type)
+        ret = self._apply_color_lut(operable.primary_image.nparray, color_lut, max_value, np.int32)
+        assert it.dims_and_nchannels(ret)[1] == 3
 
         # Other methods I've tried:
+        # mapping = {k: map_func(k) for k in range(representable_colors)}
+        # new_image = np.vectorize(mapping.__getitem__)(new_image)
+        #     ~0.28 s/image
         # new_image = np.vectorize(self._map_jet_large_rgb)(new_image)
         #     ~1.61 s/image
         # np.apply_along_axis(self._map_jet_large, axis=2, arr=color_image)
@@ -143,9 +176,9 @@ class FalseColorImageProcessor(AbstractSpotAnalysisImagesProcessor):
         # rescale to the number of representable colors
         representable_colors = 256
         max_value = operable.max_popf
-        new_image: np.ndarray = operable.primary_image.nparray * ((representable_colors - 1) / max_value)
-        new_image = np.clip(new_image, 0, representable_colors - 1)
-        new_image = new_image.astype(np.uint8)
+        new_image = self._apply_color_lut(
+            operable.primary_image.nparray, np.arange(representable_colors, dtype=np.uint8), max_value, np.uint8
+        )
 
         # apply the mapping
         ret = cv2.applyColorMap(new_image, self.opencv_map)
@@ -37,19 +37,26 @@ class LogScaleImageProcessor(AbstractSpotAnalysisImagesProcessor):
         self.cummulative_max_value_input = cummulative_max_value_input
         self.max_value_output = max_value_output
 
+    @property
+    def is_stateless(self) -> bool:
+        # the auto cummulative max_value_input depends on all previous images
+        return not (self.original_max_value_input == 0 and self.cummulative_max_value_input)
+
     def _execute(self, operable: SpotAnalysisOperable, is_last: bool) -> list[np.ndarray]:
         primary_image: np.ndarray = operable.primary_image.nparray
         current_max_value_input = operable.max_popf
 
         # update input maximum values to the largest observed value
+        max_value_input = self.max_value_input
         if self.original_max_value_input == 0:
             if self.cummulative_max_value_input:
                 if operable.population_statistics != None:
-                    self.max_value_input = current_max_value_input
+                    max_value_input = current_max_value_input
                 else:
-                    self.max_value_input = np.max([self.max_value_input, current_max_value_input])
+                    max_value_input = np.max([self.max_value_input, current_max_value_input])
+                self.max_value_input = max_value_input
             else:
-                self.max_value_input = current_max_value_input
+                max_value_input = current_max_value_input
 
         # determine the necessary output bit depth
         for data_type in [np.uint8, np.uint16, np.uint32, np.uint64]:
@@ -61,7 +68,7 @@ class LogScaleImageProcessor(AbstractSpotAnalysisImagesProcessor):
         # log and rescale the image
         log_image = np.log(primary_image + 1)
         log_max = np.max(log_image)
-        target_max_val = self.max_value_output * (current_max_value_input / self.max_value_input)
+        target_max_val = self.max_value_output * (current_max_value_input / max_value_input)
         scalar = target_max_val / log_max
         processed_image = scalar * log_image
 
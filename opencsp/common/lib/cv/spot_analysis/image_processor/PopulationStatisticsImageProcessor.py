@@ -1,3 +1,4 @@
+from collections import deque
 import dataclasses
 import numpy as np
 from opencsp.common.lib.cv.CacheableImage import CacheableImage
@@ -13,10 +14,109 @@ import opencsp.common.lib.tool.log_tools as lt
 
 
 @dataclasses.dataclass
-class _RollingWindowOperableStats:
-    operable: SpotAnalysisOperable
+class _ImageColorStats:
+    """Per-color statistics of a single image, each with shape (nchannels)."""
+
     sum_per_color: np.ndarray
-    dims: np.ndarray
+    sum_sq_per_color: np.ndarray
+    pixels_cnt: int
+    min_colors: np.ndarray
+    max_colors: np.ndarray
+
+    @classmethod
+    def from_image(cls, image: np.ndarray) -> "_ImageColorStats":
+        _, nchannels = it.dims_and_nchannels(image)
+        pixels = image.reshape((-1, nchannels))
+        sum_per_color = np.sum(pixels, axis=0, dtype=np.float64)
+        pixels_f = pixels.astype(np.float64)
+        sum_sq_per_color = np.einsum('ij,ij->j', pixels_f, pixels_f)
+        min_colors, max_colors = it.min_max_colors(image)
+        return cls(sum_per_color, sum_sq_per_color, pixels.shape[0], min_colors, max_colors)
+
+
+class _RollingWindowStats:
+    """Running per-color statistics over the last N images seen, updated in
+    O(1) amortized time per image, regardless of the window size.
+
+    The per-image sums are kept in preallocated ring buffers so that they can
+    be subtracted from the running sums when an image leaves the window. The
+    window minimums and maximums are tracked with one monotonic deque per
+    color channel."""
+
+    def __init__(self, nchannels: int, capacity: int = 16):
+        self.nchannels = nchannels
+        self.size = 0
+        """ The number of images in the window. """
+        self._num_added = 0
+        """ The number of images ever added, used as the index of the next image. """
+        self._sums = np.zeros((capacity, nchannels), dtype=np.float64)
+        self._sums_sq = np.zeros((capacity, nchannels), dtype=np.float64)
+        self._pixels_cnts = np.zeros(capacity, dtype=np.int64)
+        self.colors_sum = np.zeros(nchannels, dtype=np.float64)
+        self.colors_sum_sq = np.zeros(nchannels, dtype=np.float64)
+        self.pixels_cnt = 0
+        self._min_deques: list[deque[tuple[int, float]]] = [deque() for i in range(nchannels)]
+        """ Per color, (image index, min value) with increasing values. The
+        front is the minimum of the window. """
+        self._max_deques: list[deque[tuple[int, float]]] = [deque() for i in range(nchannels)]
+        """ Per color, (image index, max value) with decreasing values. The
+        front is the maximum of the window. """
+
+    def _grow(self):
+        """Doubles the capacity of the ring buffers, keeping the images in the window."""
+        capacity = self._pixels_cnts.shape[0]
+        idxs = np.arange(self._num_added - self.size, self._num_added)
+        for name in ["_sums", "_sums_sq", "_pixels_cnts"]:
+            old = getattr(self, name)
+            new = np.zeros((capacity * 2, *old.shape[1:]), dtype=old.dtype)
+            new[idxs % (capacity * 2)] = old[idxs % capacity]
+            setattr(self, name, new)
+
+    def pop(self):
+        """Removes the oldest image from the window."""
+        idx = self._num_added - self.size
+        slot = idx % self._pixels_cnts.shape[0]
+        self.colors_sum -= self._sums[slot]
+        self.colors_sum_sq -= self._sums_sq[slot]
+        self.pixels_cnt -= self._pixels_cnts[slot]
+        for window_deque in self._min_deques + self._max_deques:
+            if window_deque[0][0] == idx:
+                window_deque.popleft()
+        self.size -= 1
+
+    def push(self, image_stats: _ImageColorStats):
+        """Adds the newest image to the window."""
+        if self.size == self._pixels_cnts.shape[0]:
+            self._grow()
+        idx = self._num_added
+        slot = idx % self._pixels_cnts.shape[0]
+        self._sums[slot] = image_stats.sum_per_color
+        self._sums_sq[slot] = image_stats.sum_sq_per_color
+        self._pixels_cnts[slot] = image_stats.pixels_cnt
+        self.colors_sum += image_stats.sum_per_color
+        self.colors_sum_sq += image_stats.sum_sq_per_color
+        self.pixels_cnt += image_stats.pixels_cnt
+
+        for channel in range(self.nchannels):
+            min_deque, max_deque = self._min_deques[channel], self._max_deques[channel]
+            min_color, max_color = image_stats.min_colors[channel], image_stats.max_colors[channel]
+            while len(min_deque) > 0 and min_deque[-1][1] >= min_color:
+                min_deque.pop()
+            min_deque.append((idx, min_color))
+            while len(max_deque) > 0 and max_deque[-1][1] <= max_color:
+                max_deque.pop()
+            max_deque.append((idx, max_color))
+
+        self._num_added += 1
+        self.size += 1
+
+    @property
+    def min_colors(self) -> np.ndarray:
+        return np.array([min_deque[0][1] for min_deque in self._min_deques])
+
+    @property
+    def max_colors(self) -> np.ndarray:
+        return np.array([max_deque[0][1] for max_deque in self._max_deques])
 
 
 class PopulationStatisticsImageProcessor(AbstractSpotAnalysisImagesProcessor):
@@ -44,77 +144,67 @@ class PopulationStatisticsImageProcessor(AbstractSpotAnalysisImagesProcessor):
         if min_pop_size hasn't been met yet. """
         self.initial_operables: list[SpotAnalysisOperable] = []
         """ The initial operables gathered while waiting for min_pop_size. """
-        self.rolling_window_operables: list[SpotAnalysisOperable] = []
+        self.rolling_window_operables: deque[SpotAnalysisOperable] = deque()
         """ The last N operables seen, for the purpose of gathering statistics
         on a rolling window of imagess. """
-        self._rolling_window_stats: list[_RollingWindowOperableStats] = []
-        """ Optimization to require only one operable per call to
-        _calculate_rolling_window(). """
+        self._rolling_window_stats: _RollingWindowStats = None
+        """ Running statistics for the images in the rolling window, so that
+        each call to _calculate_rolling_window() only has to analyze one image. """
 
     def _calculate_rolling_window(
-        self,
-        curr_stats: SpotAnalysisPopulationStatistics,
-        operable: SpotAnalysisOperable,
-        window: list[SpotAnalysisOperable],
+        self, curr_stats: SpotAnalysisPopulationStatistics, image_stats: _ImageColorStats, window_size: int
     ):
-        """Analyze the given operables to generate rolling window statistics."""
+        """Add the given image statistics to the rolling window of at most window_size images, and
+        generate rolling window statistics."""
         ret: SpotAnalysisPopulationStatistics = dataclasses.replace(curr_stats)
 
-        # remove operables no longer in the window
-        to_remove = []
-        for stat in self._rolling_window_stats:
-            if stat.operable not in window:
-                to_remove.append(stat)
-        for stat in to_remove:
-            self._rolling_window_stats.remove(stat)
-
-        # add this new operable
-        found_operable = False
-        for stat in self._rolling_window_stats:
-            if stat.operable == operable:
-                found_operable = True
-                break
-        if not found_operable:
-            image = operable.primary_image.nparray
-            dims, _ = it.dims_and_nchannels(image)
-            sum_per_color = np.sum(image, axis=(0, 1))
-            self._rolling_window_stats.append(_RollingWindowOperableStats(operable, sum_per_color, dims))
+        if self._rolling_window_stats is None:
+            self._rolling_window_stats = _RollingWindowStats(
+                len(image_stats.sum_per_color), capacity=int(np.clip(self.target_rolling_window_size, 1, 1024))
+            )
+        window = self._rolling_window_stats
 
-        # calculate statistics
-        first_stat = self._rolling_window_stats[0]
-        rolling_colors_sum = np.array(first_stat.sum_per_color)
-        rolling_pixels_cnt = first_stat.dims[0] * first_stat.dims[1]
+        # remove images no longer in the window, and add this new image
+        while window.size > max(window_size - 1, 0):
+            window.pop()
+        window.push(image_stats)
 
-        for stat in self._rolling_window_stats[1:]:
-            rolling_colors_sum += stat.sum_per_color
-            rolling_pixels_cnt += stat.dims[0] * stat.dims[1]
-
-        ret.avgf_rolling_window = rolling_colors_sum / rolling_pixels_cnt
-        ret.window_size = len(self._rolling_window_stats)
+        # calculate statistics
+        ret.avgf_rolling_window = window.colors_sum / window.pixels_cnt
+        ret.varf_rolling_window = np.maximum(
+            window.colors_sum_sq / window.pixels_cnt - ret.avgf_rolling_window * ret.avgf_rolling_window, 0
+        )
+        ret.minf_rolling_window = window.min_colors
+        ret.maxf_rolling_window = window.max_colors
+        ret.window_size = window.size
 
         return ret
 
-    def _calculate_cummulative(self, curr_stats: SpotAnalysisPopulationStatistics, operable: SpotAnalysisOperable):
-        """Analyze the given operable and update the cummulative statistics."""
+    def _calculate_cummulative(self, curr_stats: SpotAnalysisPopulationStatistics, image_stats: _ImageColorStats):
+        """Update the cummulative statistics with the given image statistics."""
         ret: SpotAnalysisPopulationStatistics = dataclasses.replace(curr_stats)
 
-        image = operable.primary_image.nparray
-        min_colors, max_colors = it.min_max_colors(image)
-
         if ret.minf is not None:
-            ret.minf = np.min([ret.minf, min_colors], axis=0)
+            ret.minf = np.minimum(ret.minf, image_stats.min_colors)
         else:
-            ret.minf = min_colors
+            ret.minf = image_stats.min_colors
 
         if ret.maxf is not None:
-            ret.maxf = np.max([ret.maxf, max_colors], axis=0)
+            ret.maxf = np.maximum(ret.maxf, image_stats.max_colors)
         else:
-            ret.maxf = max_colors
+            ret.maxf = image_stats.max_colors
 
         ret.population_size += 1
 
         return ret
 
+    def _calculate_stats(self, curr_stats: SpotAnalysisPopulationStatistics, operable: SpotAnalysisOperable):
+        """Analyze the given operable and update the rolling window and cummulative statistics."""
+        image_stats = _ImageColorStats.from_image(operable.primary_image.nparray)
+        ret = self._calculate_rolling_window(curr_stats, image_stats, len(self.rolling_window_operables))
+        ret = self._calculate_cummulative(ret, image_stats)
+        return ret
+
     def _execute(self, operable: SpotAnalysisOperable, is_last: bool) -> list[SpotAnalysisOperable]:
         ret: list[SpotAnalysisOperable] = []
         self.rolling_window_operables.append(operable)
@@ -133,20 +223,16 @@ class PopulationStatisticsImageProcessor(AbstractSpotAnalysisImagesProcessor):
             # We've reached the minimum population size (or the end of the images stream, as indicated by is_last).
             self.curr_stats = SpotAnalysisPopulationStatistics()
             for prior_operable in self.initial_operables:
-                self.curr_stats = self._calculate_rolling_window(
-                    self.curr_stats, prior_operable, self.rolling_window_operables
-                )
-                self.curr_stats = self._calculate_cummulative(self.curr_stats, prior_operable)
+                self.curr_stats = self._calculate_stats(self.curr_stats, prior_operable)
                 ret.append(dataclasses.replace(prior_operable, population_statistics=self.curr_stats))
 
         # do some calculations
-        self.curr_stats = self._calculate_rolling_window(self.curr_stats, operable, self.rolling_window_operables)
-        self.curr_stats = self._calculate_cummulative(self.curr_stats, operable)
+        self.curr_stats = self._calculate_stats(self.curr_stats, operable)
         ret.append(dataclasses.replace(operable, population_statistics=self.curr_stats))
 
         # release operables that we no longer need
         self.initial_operables.clear()
         while len(self.rolling_window_operables) > self.target_rolling_window_size - 1:
-            self.rolling_window_operables.pop(0)
+            self.rolling_window_operables.popleft()
 
         return ret
@@ -0,0 +1,74 @@
+import dataclasses
+import threading
+import time
+import unittest
+
+import numpy as np
+import numpy.testing as nptest
+
+from opencsp.common.lib.cv.CacheableImage import CacheableImage
+from opencsp.common.lib.cv.SpotAnalysis import SpotAnalysis
+from opencsp.common.lib.cv.spot_analysis.SpotAnalysisOperable import SpotAnalysisOperable
+from opencsp.common.lib.cv.spot_analysis.image_processor import *
+
+
+class _SlowStatelessImageProcessor(AbstractSpotAnalysisImagesProcessor):
+    """Adds the mean of the population statistics to each image, and records
+    the threads it was executed on."""
+
+    def __init__(self):
+        super().__init__(self.__class__.__name__)
+        self.thread_ids: set[int] = set()
+
+    @property
+    def is_stateless(self) -> bool:
+        return True
+
+    def _execute(self, operable: SpotAnalysisOperable, is_last: bool) -> list[SpotAnalysisOperable]:
+        self.thread_ids.add(threading.get_ident())
+        # finish out of order
+        time.sleep(0.02 * np.random.default_rng().random())
+        processed_image = operable.primary_image.nparray + np.mean(operable.population_statistics.avgf_rolling_window)
+        return [dataclasses.replace(operable, primary_image=processed_image)]
+
+
+class TestAbstractSpotAnalysisImageProcessor(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.images = [rng.integers(0, 4096, (20, 30)) for i in range(20)]
+
+    def _run(self, num_workers: int) -> tuple[list[SpotAnalysisOperable], _SlowStatelessImageProcessor]:
+        slow_processor = _SlowStatelessImageProcessor()
+        processors = [
+            PopulationStatisticsImageProcessor(min_pop_size=1, target_rolling_window_size=3),
+            LogScaleImageProcessor(max_value_output=255),
+            slow_processor,
+            EchoImageProcessor(),
+        ]
+        for processor in processors:
+            processor.max_queue_size = 5
+        spot_analysis = SpotAnalysis("parallel test", processors, num_workers=num_workers)
+        spot_analysis.set_input_operables([SpotAnalysisOperable(CacheableImage(image)) for image in self.images])
+        return list(spot_analysis), slow_processor
+
+    def test_parallel_matches_serial(self):
+        serial_results, serial_processor = self._run(num_workers=1)
+        parallel_results, parallel_processor = self._run(num_workers=4)
+
+        self.assertEqual(len(serial_processor.thread_ids), 1)
+        self.assertGreater(len(parallel_processor.thread_ids), 1)
+
+        self.assertEqual(len(serial_results), len(self.images))
+        self.assertEqual(len(parallel_results), len(self.images))
+        for serial_result, parallel_result in zip(serial_results, parallel_results):
+            nptest.assert_array_equal(parallel_result.primary_image.nparray, serial_result.primary_image.nparray)
+
+    def test_stateless(self):
+        self.assertTrue(EchoImageProcessor().is_stateless)
+        self.assertTrue(LogScaleImageProcessor().is_stateless)
+        self.assertFalse(LogScaleImageProcessor(cummulative_max_value_input=True).is_stateless)
+        self.assertFalse(PopulationStatisticsImageProcessor().is_stateless)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+import numpy.testing as nptest
+
+from opencsp.common.lib.cv.spot_analysis.SpotAnalysisOperable import SpotAnalysisOperable
+from opencsp.common.lib.cv.spot_analysis.image_processor.FalseColorImageProcessor import FalseColorImageProcessor
+
+
+class TestFalseColorImageProcessorLookupTable(unittest.TestCase):
+    def test_jet_custom_bit_depths(self):
+        rng = np.random.default_rng(0)
+        images = [
+            rng.integers(0, 256, (40, 30)).astype(np.uint8),
+            rng.integers(0, 4096, (40, 30)).astype(np.uint16),
+            rng.integers(-100, 2000, (40, 30, 1)).astype(np.int16),
+            rng.random((40, 30)).astype(np.float32) * 900,
+        ]
+
+        for map_type, map_func, representable_colors in [
+            ('large', FalseColorImageProcessor._map_jet_large_rgb, 1530),
+            ('human', FalseColorImageProcessor._map_jet_human_rgb, 1020),
+        ]:
+            processor = FalseColorImageProcessor(map_type=map_type)
+            for image in images:
+                operable = SpotAnalysisOperable(image, primary_image_source_path="test_jet_custom_bit_depths.png")
+                actual_result = processor.apply_mapping_jet_custom(operable, map_type).primary_image.nparray
+
+                # map every pixel individually
+                levels = np.squeeze(image) * ((representable_colors - 1) / image.max())
+                levels = np.clip(levels, 0, representable_colors - 1).astype(np.int32)
+                rgb = np.array([[map_func(level) for level in row] for row in levels], dtype=np.uint32)
+                expected_result = np.stack((rgb >> 16, (rgb >> 8) & 255, rgb & 255), axis=2)
+
+                self.assertEqual(actual_result.dtype, np.uint32)
+                nptest.assert_array_equal(actual_result, expected_result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+import numpy.testing as nptest
+
+from opencsp.common.lib.cv.CacheableImage import CacheableImage
+from opencsp.common.lib.cv.spot_analysis.SpotAnalysisOperable import SpotAnalysisOperable
+from opencsp.common.lib.cv.spot_analysis.image_processor.PopulationStatisticsImageProcessor import (
+    PopulationStatisticsImageProcessor,
+)
+
+
+class TestPopulationStatisticsRollingWindow(unittest.TestCase):
+    def test_rolling_window_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        images = [rng.integers(0, 4096, (4, 5, 3)) for i in range(50)]
+        window_size = 7
+        processor = PopulationStatisticsImageProcessor(min_pop_size=window_size, target_rolling_window_size=window_size)
+        processor._allowed_memory_footprint = pow(2, 30)
+
+        results: list[SpotAnalysisOperable] = []
+        for i, image in enumerate(images):
+            results += processor.process_image(
+                SpotAnalysisOperable(CacheableImage(image)), is_last=i == len(images) - 1
+            )
+        self.assertEqual(len(results), len(images))
+
+        for i, result in enumerate(results):
+            stats = result.population_statistics
+            window = np.array(images[max(i - window_size + 1, 0) : i + 1]).reshape((-1, 3))
+            self.assertEqual(stats.window_size, min(i + 1, window_size))
+            nptest.assert_allclose(stats.avgf_rolling_window, np.mean(window, axis=0))
+            nptest.assert_allclose(stats.varf_rolling_window, np.var(window, axis=0), rtol=1e-9)
+            nptest.assert_array_equal(stats.minf_rolling_window, np.min(window, axis=0))
+            nptest.assert_array_equal(stats.maxf_rolling_window, np.max(window, axis=0))
+            nptest.assert_array_equal(stats.minf, np.min(images[: i + 1], axis=(0, 1, 2)))
+            nptest.assert_array_equal(stats.maxf, np.max(images[: i + 1], axis=(0, 1, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import gc
+import os
+import unittest
+
+import numpy as np
+
+from opencsp.common.lib.cv.CacheableImage import CacheableImage
+from opencsp.common.lib.cv.CacheableImageStore import CacheableImageStore
+import opencsp.common.lib.opencsp_path.opencsp_root_path as orp
+import opencsp.common.lib.tool.file_tools as ft
+
+
+class TestCacheableImage(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.out_dir = os.path.join(
+            orp.opencsp_code_dir(), 'common', 'lib', 'cv', 'test', 'data', 'output', 'CacheableImage'
+        )
+        ft.create_directories_if_necessary(cls.out_dir)
+
+        rng = np.random.default_rng(0)
+        cls.arrays = [rng.integers(0, 256, (100, 100), dtype=np.uint8) for i in range(3)]
+        cls.cache_paths = [os.path.join(cls.out_dir, f"image{i}.npy") for i in range(3)]
+        for array, cache_path in zip(cls.arrays, cls.cache_paths):
+            np.save(cache_path, array)
+
+    def setUp(self) -> None:
+        # use a separate store for each test, with space for two of the test images
+        self.default_store = CacheableImage.store
+        CacheableImage.store = CacheableImageStore(memory_budget=25000)
+
+    def tearDown(self) -> None:
+        CacheableImage.store = self.default_store
+
+    def test_lru_eviction(self):
+        store = CacheableImage.store
+        images = [CacheableImage(cache_path=cache_path) for cache_path in self.cache_paths]
+
+        for image, array in zip(images, self.arrays):
+            np.testing.assert_array_equal(image.nparray, array)
+        self.assertEqual((store.hits, store.misses, store.evictions), (0, 3, 1))
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.memory_used, 20000)
+
+        # image 0 was evicted, 1 and 2 are still in memory
+        np.testing.assert_array_equal(images[1].nparray, self.arrays[1])
+        self.assertEqual((store.hits, store.misses, store.evictions), (1, 3, 1))
+
+        # image 2 is now the least recently used
+        np.testing.assert_array_equal(images[0].nparray, self.arrays[0])
+        self.assertEqual((store.hits, store.misses, store.evictions), (1, 4, 2))
+        self.assertIsNone(store.get(images[2]))
+
+        store.reset_counters()
+        self.assertEqual((store.hits, store.misses, store.evictions), (0, 0, 0))
+
+    def test_loaded_array_is_shared(self):
+        image = CacheableImage(cache_path=self.cache_paths[0])
+        array = image.nparray
+        self.assertNotIsInstance(array.base, np.memmap)
+        self.assertIs(image.nparray, array)
+
+        # changes are seen by other callers, but aren't written back to the cache file
+        array[0, 0] += 1
+        self.assertEqual(image.nparray[0, 0], array[0, 0])
+        np.testing.assert_array_equal(np.load(self.cache_paths[0]), self.arrays[0])
+
+        # dropping the array from the store reloads the unchanged image from the cache file
+        CacheableImage.store.remove(image)
+        np.testing.assert_array_equal(image.nparray, self.arrays[0])
+
+    def test_cache(self):
+        cache_path = os.path.join(self.out_dir, "test_cache.npy")
+        image = CacheableImage(self.arrays[0], cache_path=cache_path)
+        image.cache()
+        self.assertTrue(image.cached)
+        self.assertEqual(len(CacheableImage.store), 0)
+
+        np.testing.assert_array_equal(image.nparray, self.arrays[0])
+        self.assertEqual(len(CacheableImage.store), 1)
+
+    def test_deleted_images_are_removed(self):
+        image = CacheableImage(cache_path=self.cache_paths[0])
+        image.nparray
+        self.assertEqual(len(CacheableImage.store), 1)
+
+        del image
+        gc.collect()
+        self.assertEqual(len(CacheableImage.store), 0)
+        self.assertEqual(CacheableImage.store.memory_used, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
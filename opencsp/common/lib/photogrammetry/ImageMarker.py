@@ -24,14 +24,24 @@ class ImageMarker:
     """Class to hold images of Aruco markers. Contains methods
     to process locations of Aruco markers."""
 
-    def __init__(self, image: ndarray, point_ids: ndarray[int], pts_im_xy: ndarray, img_id: int, camera: Camera):
+    def __init__(
+        self,
+        image: ndarray | None,
+        point_ids: ndarray[int],
+        pts_im_xy: ndarray,
+        img_id: int,
+        camera: Camera,
+        file: str = None,
+        corners: ndarray = None,
+        corners_kwargs: dict = None,
+    ):
         """
         Instantiates ImageMarker class.
 
         Parameters
         ----------
-        image : ndarray
-            2D image array.
+        image : ndarray | None
+            2D image array. If None, the image is loaded from file when it is needed.
         point_ids : ndarray
             1d array of point IDs.
         pts_im_xy : ndarray
@@ -40,6 +50,15 @@ class ImageMarker:
             ID of image.
         camera : Camera
             Camera object of camera that captured image.
+        file : str, optional
+            Path to the image file, by default None.
+        corners : ndarray, optional
+            Shape (N, 4, 2) array of all four corners of each aruco marker, as
+            found by photogrammetry.find_aruco_marker(), by default None. If given,
+            convert_to_four_corner() uses these instead of finding the markers again.
+        corners_kwargs : dict, optional
+            The detection parameters that corners were found with, by default None
+            (default parameters).
         """
         # Perform checks
         if point_ids.size != pts_im_xy.shape[0]:
@@ -50,10 +69,13 @@ class ImageMarker:
             raise TypeError('Input IDs dtype must be int')
 
         # Save data
-        self.image = image
+        self._image = image
+        self.file = file
         self.img_id = img_id
         self.camera = camera
         self.four_corner_model = False
+        self._corners = corners
+        self._corners_kwargs = {} if corners_kwargs is None else corners_kwargs
 
         # Image point data
         self.point_ids = point_ids
@@ -69,6 +91,17 @@ class ImageMarker:
     def __repr__(self):
         return f'Image {self.img_id:d}'
 
+    @property
+    def image(self) -> ndarray:
+        """2D grayscale image. Loaded from file the first time it is needed, if not given."""
+        if self._image is None and self.file is not None:
+            self._image = ph.load_image_grayscale(self.file)
+        return self._image
+
+    @image.setter
+    def image(self, image: ndarray) -> None:
+        self._image = image
+
     def plot_image_with_points(self) -> None:
         """Plots captured image with image point and reprojected point locations"""
         # Calculate reprojected points
@@ -106,10 +139,48 @@ class ImageMarker:
         # Find aruco markers
         ids_marker, pts_list = ph.find_aruco_marker(img_gray, **kwargs)
 
+        return cls.from_aruco_corners(ids_marker, np.array(pts_list), img_id, camera, img_gray, file, kwargs)
+
+    @classmethod
+    def from_aruco_corners(
+        cls,
+        ids_marker: ndarray[int],
+        corners: ndarray,
+        img_id: int,
+        camera: Camera,
+        image: ndarray = None,
+        file: str = None,
+        corners_kwargs: dict = None,
+    ) -> 'ImageMarker':
+        """Creates an ImageMarker from already found Aruco markers, saves the origin point.
+        See photogrammetry.find_aruco_marker_in_file().
+
+        Parameters
+        ----------
+        ids_marker : ndarray[int]
+            Shape (N,) array of marker IDs
+        corners : ndarray
+            Shape (N, 4, 2) array of the image points of all four marker corners
+        img_id : int
+            Image index to save to image.
+        camera : Camera
+            Calibrated camera object
+        image : ndarray, optional
+            2D grayscale image, by default None (loaded from file when needed)
+        file : str, optional
+            File path to image, by default None
+        corners_kwargs : dict, optional
+            Detection parameters that the markers were found with, by default None
+
+        Returns
+        -------
+        ImageMarker
+
+        """
         # Save only origin point
-        pts_mat = np.vstack([pts[0] for pts in pts_list])
+        pts_mat = corners[:, 0, :]
 
-        return cls(img_gray, ids_marker, pts_mat, img_id, camera)
+        return cls(image, ids_marker, pts_mat, img_id, camera, file, corners, corners_kwargs)
 
     def convert_to_four_corner(self, **kwargs) -> None:
         """Converts from using only origin point to all four marker corners"""
@@ -118,11 +189,13 @@ class ImageMarker:
             return
         self.four_corner_model = True
 
-        # Find all aruco corners in image
-        point_ids, pts_list = ph.find_aruco_marker(self.image, **kwargs)
-
-        # Concatenate all points
-        pts_im_xy = np.vstack(pts_list)
+        # Find all aruco corners in image, unless already found with the same parameters
+        if self._corners is not None and kwargs == self._corners_kwargs:
+            point_ids = self.point_ids
+            pts_im_xy = self._corners.reshape((-1, 2))
+        else:
+            point_ids, pts_list = ph.find_aruco_marker(self.image, **kwargs)
+            pts_im_xy = np.vstack(pts_list)
         num_markers = len(point_ids)
 
         point_ids = np.array(point_ids) * 4
@@ -188,6 +261,19 @@ class ImageMarker:
         self.located_markers_mask[mask] = True
         self.pts_obj_xyz[mask] = pt
 
+    def set_points_located(self, idxs: ndarray[int], pts: ndarray) -> None:
+        """Sets the points at the given indices (into point_ids) as located
+
+        Parameters
+        ----------
+        idxs : ndarray[int]
+            Shape (N,) indices of points in point_ids
+        pts : ndarray
+            Shape (N, 3) xyz point locations
+        """
+        self.located_markers_mask[idxs] = True
+        self.pts_obj_xyz[idxs] = pts
+
     def set_point_id_unlocated(self, id_: int) -> None:
         """Sets given point ID as unlocated"""
         mask = self.point_ids == id_
@@ -8,7 +8,8 @@ from typing import Literal
 
 import cv2 as cv
 import numpy as np
-from scipy.sparse import lil_matrix
+from scipy.sparse import bsr_matrix, csr_matrix
+from scipy.sparse.linalg import spsolve
 from scipy.optimize import least_squares
 
 import opencsp.common.lib.tool.log_tools as lt
@@ -25,6 +26,9 @@ def bundle_adjust(
     dist_coefs: np.ndarray,
     opt_type: Literal['camera', 'points', 'both'],
     verbose: int,
+    loss: Literal['linear', 'soft_l1', 'huber', 'cauchy', 'arctan'] = 'linear',
+    f_scale: float = 1.0,
+    solver: Literal['trf', 'schur'] = 'trf',
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Perform bundel adjustment algorithm on object points and camera poses.
@@ -32,6 +36,9 @@ def bundle_adjust(
     Npts = number of points
     Nobs = number of observations
 
+    The Jacobian of the reprojection errors is calculated analytically (see
+    jac()), so each solver iteration projects the observations only once.
+
     Parameters
     ----------
     rvecs : np.ndarray
@@ -54,6 +61,20 @@ def bundle_adjust(
         What to optimize: {'camera', 'points', 'both'}
     verbose : int
         Level of verbosity of least squares solver [0, 1, 2]
+    loss : str, optional
+        Robust loss function applied to the reprojection errors, to reduce the
+        influence of outliers such as mis-detected markers. One of the loss
+        functions of scipy.optimize.least_squares: {'linear', 'soft_l1',
+        'huber', 'cauchy', 'arctan'}, by default 'linear'.
+    f_scale : float, optional
+        Reprojection error, in pixels, beyond which the robust loss starts to
+        down-weight observations, by default 1.0. Not used for the 'linear' loss.
+    solver : str, optional
+        'trf' to solve with scipy.optimize.least_squares. 'schur' to solve with
+        a Levenberg-Marquardt iteration that eliminates the object points with
+        the Schur complement of the normal equations, so that each step only
+        solves a (6*Nim, 6*Nim) system. 'schur' is faster for large problems
+        where each image only sees part of the points. By default 'trf'.
 
     Returns
     -------
@@ -68,6 +89,10 @@ def bundle_adjust(
     # Check inputs
     if opt_type not in ['camera', 'points', 'both']:
         raise ValueError(f'Given opt_type must be one of ("camera", "points", "both"), not "{opt_type:s}"')
+    if loss not in _LOSSES:
+        raise ValueError(f'Given loss must be one of {tuple(_LOSSES.keys())}, not "{loss:s}"')
+    if solver not in ['trf', 'schur']:
+        raise ValueError(f'Given solver must be one of ("trf", "schur"), not "{solver:s}"')
 
     # Calculate number of cameras and points
     n_cameras = rvecs.shape[0]
@@ -77,27 +102,33 @@ def bundle_adjust(
     params = np.hstack((rvecs, tvecs))
     x0 = np.hstack((params.ravel(), pts_obj.ravel()))
 
-    # Create Jacobian sparsity structure
-    jac_sparsity = bundle_adjustment_sparsity(n_cameras, n_points, camera_indices, point_indices, opt_type)
-
     # Optimize
-    res = least_squares(
-        fun,
-        x0,
-        jac_sparsity=jac_sparsity,
-        verbose=verbose,
-        x_scale='jac',
-        ftol=1e-4,
-        method='trf',
-        args=(n_cameras, n_points, camera_indices, point_indices, pts_img, intrinsic_mat, dist_coefs),
+    problem = _BundleAdjustmentProblem(
+        n_cameras, n_points, camera_indices, point_indices, pts_img, intrinsic_mat, dist_coefs, opt_type
     )
-    lt.debug('Bundle adjustment finished: ' + res.message)
+    if solver == 'trf':
+        res = least_squares(
+            problem.residuals,
+            x0,
+            jac=problem.jacobian,
+            verbose=verbose,
+            x_scale='jac',
+            ftol=1e-4,
+            method='trf',
+            loss=loss,
+            f_scale=f_scale,
+        )
+        x_opt = res.x
+        message = res.message
+    else:
+        x_opt, message = _solve_schur(problem, x0, loss, f_scale, ftol=1e-4, verbose=verbose)
+    lt.debug('Bundle adjustment finished: ' + message)
 
     # Return data
-    data = res.x[: n_cameras * 6].reshape((n_cameras, 6))
+    data = x_opt[: n_cameras * 6].reshape((n_cameras, 6))
     rvecs_opt = data[:, :3]
     tvecs_opt = data[:, 3:]
-    pts_obj_opt = res.x[n_cameras * 6 :].reshape((n_points, 3))
+    pts_obj_opt = x_opt[n_cameras * 6 :].reshape((n_points, 3))
 
     return rvecs_opt, tvecs_opt, pts_obj_opt
 
@@ -156,28 +187,366 @@ def fun(
     return (points_proj - points_2d).ravel()
 
 
-def bundle_adjustment_sparsity(
-    n_cameras: int, n_points: int, camera_indices: np.ndarray, point_indices: np.ndarray, opt_type: str
-):
+def jac(
+    params: np.ndarray,
+    n_cameras: int,
+    n_points: int,
+    camera_indices: np.ndarray,
+    point_indices: np.ndarray,
+    points_2d: np.ndarray,
+    intrinsic_mat: np.ndarray,
+    dist_coefs: np.ndarray,
+    opt_type: Literal['camera', 'points', 'both'] = 'both',
+) -> csr_matrix:
     """
-    Returns Jacobian sparsity structure.
+    Analytic Jacobian of fun(), with a (2, 6) camera block and a (2, 3) point block per observation.
+
+    The derivatives of the projection with respect to the camera-frame points
+    come from cv.projectPoints(), which includes the Brown distortion model.
+    They are chained with the derivatives of the Rodrigues rotation from
+    cv.Rodrigues(). Columns of parameters that are not optimized (see opt_type)
+    are left empty.
 
+    Returns
+    -------
+    csr_matrix
+        (2*Nobs, 6*Nim + 3*Npts) sparse Jacobian.
     """
-    m = camera_indices.size * 2  # num observed points (x and y)
-    n = n_cameras * 6 + n_points * 3  # Nvars
-    jac_sparsity = lil_matrix((m, n), dtype=int)  # Num xy points x num vars
+    problem = _BundleAdjustmentProblem(
+        n_cameras, n_points, camera_indices, point_indices, points_2d, intrinsic_mat, dist_coefs, opt_type
+    )
+    return problem.jacobian(params)
 
-    i = np.arange(camera_indices.size)
 
-    # Fill in diagonals of Jacobian sparsity matrix
-    if opt_type in ['camera', 'both']:
-        for s in range(6):
-            jac_sparsity[2 * i, camera_indices * 6 + s] = 1  # rotation
-            jac_sparsity[2 * i + 1, camera_indices * 6 + s] = 1  # translation
+def _project_with_jacobians(
+    camera_params: np.ndarray,
+    points_3d: np.ndarray,
+    camera_indices: np.ndarray,
+    point_indices: np.ndarray,
+    intrinsic_mat: np.ndarray,
+    dist_coefs: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Projects every observation, and calculates the derivatives of the projections.
 
-    if opt_type in ['points', 'both']:
-        for s in range(3):
-            jac_sparsity[2 * i, n_cameras * 6 + point_indices * 3 + s] = 1
-            jac_sparsity[2 * i + 1, n_cameras * 6 + point_indices * 3 + s] = 1
+    Returns
+    -------
+    points_proj : np.ndarray
+        (Nobs, 2) projected points.
+    d_camera : np.ndarray
+        (Nobs, 2, 6) derivatives with respect to the camera's rvec and tvec.
+    d_point : np.ndarray
+        (Nobs, 2, 3) derivatives with respect to the object point.
+    """
+    # Rotation matrices and their derivatives with respect to rvec, for every camera
+    rot_mats = np.zeros((camera_params.shape[0], 3, 3))
+    d_rot_mats = np.zeros((camera_params.shape[0], 3, 3, 3))  # (camera, rvec component, 3, 3)
+    for idx in np.unique(camera_indices):
+        rot_mat, d_rot_mat = cv.Rodrigues(camera_params[idx, :3])
+        rot_mats[idx] = rot_mat
+        d_rot_mats[idx] = d_rot_mat.reshape((3, 3, 3))
+
+    # Convert object points to local camera coordinates
+    points = points_3d[point_indices]
+    rot_obs = rot_mats[camera_indices]
+    points_cam = np.einsum('nij,nj->ni', rot_obs, points) + camera_params[camera_indices, 3:6]
 
-    return jac_sparsity
+    # Project. With zero rvec and tvec, the derivatives with respect to tvec are the
+    # derivatives with respect to the camera-frame points.
+    rvec = np.array([0.0, 0.0, 0.0])
+    tvec = np.array([0.0, 0.0, 0.0])
+    points_proj, d_proj = cv.projectPoints(points_cam, rvec, tvec, intrinsic_mat, dist_coefs)
+    d_proj_d_cam = d_proj[:, 3:6].reshape((-1, 2, 3))  # (Nobs, 2, 3)
+
+    # Chain rule
+    d_points_cam_d_rvec = np.einsum('nkij,nj->nik', d_rot_mats[camera_indices], points)  # (Nobs, 3, 3)
+    d_camera = np.concatenate((d_proj_d_cam @ d_points_cam_d_rvec, d_proj_d_cam), axis=2)
+    d_point = d_proj_d_cam @ rot_obs
+
+    return points_proj[:, 0, :], d_camera, d_point
+
+
+class _BundleAdjustmentProblem:
+    """
+    Reprojection errors and their analytic Jacobian for a bundle adjustment
+    problem. The residuals and Jacobian are calculated together, and the most
+    recent evaluation is cached, because least_squares() asks for both at the
+    same parameters.
+    """
+
+    def __init__(
+        self,
+        n_cameras: int,
+        n_points: int,
+        camera_indices: np.ndarray,
+        point_indices: np.ndarray,
+        points_2d: np.ndarray,
+        intrinsic_mat: np.ndarray,
+        dist_coefs: np.ndarray,
+        opt_type: Literal['camera', 'points', 'both'],
+    ):
+        self.n_cameras = n_cameras
+        self.n_points = n_points
+        self.camera_indices = np.asarray(camera_indices)
+        self.point_indices = np.asarray(point_indices)
+        self.points_2d = points_2d
+        self.intrinsic_mat = intrinsic_mat
+        self.dist_coefs = dist_coefs
+        self.opt_cameras = opt_type in ['camera', 'both']
+        self.opt_points = opt_type in ['points', 'both']
+
+        # Column indices of the non-zero Jacobian entries. Every row (x or y of an observation)
+        # depends on the 6 parameters of one camera, and on the 3 coordinates of one point.
+        n_obs = self.camera_indices.size
+        cols = []
+        if self.opt_cameras:
+            cols.append(self.camera_indices[:, np.newaxis] * 6 + np.arange(6))
+        if self.opt_points:
+            cols.append(n_cameras * 6 + self.point_indices[:, np.newaxis] * 3 + np.arange(3))
+        cols = np.concatenate(cols, axis=1)  # (Nobs, nnz per row)
+        self._nnz_per_row = cols.shape[1]
+        self._jac_indices = np.repeat(cols, 2, axis=0).ravel()
+        self._jac_indptr = np.arange(2 * n_obs + 1) * self._nnz_per_row
+        self._jac_shape = (2 * n_obs, n_cameras * 6 + n_points * 3)
+
+        self._x: np.ndarray = None
+        self._residuals: np.ndarray = None
+        self._d_camera: np.ndarray = None
+        self._d_point: np.ndarray = None
+
+    def unpack(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the (Nim, 6) camera parameters and (Npts, 3) object points"""
+        camera_params = x[: self.n_cameras * 6].reshape((self.n_cameras, 6))
+        points_3d = x[self.n_cameras * 6 :].reshape((self.n_points, 3))
+        return camera_params, points_3d
+
+    def evaluate(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the (Nobs, 2) reprojection errors and their (Nobs, 2, 6) camera and (Nobs, 2, 3) point derivatives"""
+        if self._x is None or not np.array_equal(x, self._x):
+            camera_params, points_3d = self.unpack(x)
+            points_proj, self._d_camera, self._d_point = _project_with_jacobians(
+                camera_params, points_3d, self.camera_indices, self.point_indices, self.intrinsic_mat, self.dist_coefs
+            )
+            self._residuals = points_proj - self.points_2d
+            self._x = x.copy()
+        return self._residuals, self._d_camera, self._d_point
+
+    def residuals(self, x: np.ndarray) -> np.ndarray:
+        """Same as fun()"""
+        return self.evaluate(x)[0].ravel()
+
+    def jacobian(self, x: np.ndarray) -> csr_matrix:
+        """Analytic Jacobian of residuals(), see jac()"""
+        _, d_camera, d_point = self.evaluate(x)
+        data = []
+        if self.opt_cameras:
+            data.append(d_camera)
+        if self.opt_points:
+            data.append(d_point)
+        data = np.concatenate(data, axis=2).ravel()
+        return csr_matrix((data, self._jac_indices, self._jac_indptr), shape=self._jac_shape)
+
+
+# Robust loss functions, with the same definitions as scipy.optimize.least_squares.
+# Each takes z = (f / f_scale)**2 and returns rho(z) and its first and second derivatives.
+_LOSSES = {
+    'linear': lambda z: (z, np.ones_like(z), np.zeros_like(z)),
+    'soft_l1': lambda z: (2 * (np.sqrt(1 + z) - 1), (1 + z) ** -0.5, -0.5 * (1 + z) ** -1.5),
+    'huber': lambda z: (
+        np.where(z <= 1, z, 2 * np.sqrt(z) - 1),
+        np.where(z <= 1, 1, np.maximum(z, 1) ** -0.5),
+        np.where(z <= 1, 0, -0.5 * np.maximum(z, 1) ** -1.5),
+    ),
+    'cauchy': lambda z: (np.log1p(z), 1 / (1 + z), -1 / (1 + z) ** 2),
+    'arctan': lambda z: (np.arctan(z), 1 / (1 + z**2), -2 * z / (1 + z**2) ** 2),
+}
+
+
+def _robust_cost(residuals: np.ndarray, loss: str, f_scale: float) -> tuple[float, np.ndarray, np.ndarray]:
+    """
+    Returns the cost 0.5*f_scale**2*sum(rho), and the weights of each residual
+    in the gradient and in the Gauss-Newton Hessian. The Hessian weights include
+    the second derivative of the loss, the same as scipy.optimize.least_squares.
+    """
+    rho, rho_1, rho_2 = _LOSSES[loss]((residuals / f_scale) ** 2)
+    hessian_weights = np.maximum(rho_1 + 2 * rho_2 * (residuals / f_scale) ** 2, np.finfo(float).eps)
+    return 0.5 * f_scale**2 * np.sum(rho), rho_1, hessian_weights
+
+
+def _block_t_matmul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Returns a[n].T @ b[n] for every block n"""
+    return np.matmul(a.transpose((0, 2, 1)), b)
+
+
+def _block_t_dot(a: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Returns a[n].T @ v[n] for every block n"""
+    return np.matmul(a.transpose((0, 2, 1)), v[..., np.newaxis])[..., 0]
+
+
+def _block_diag_solve(blocks: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+    """Solves each (n, n) block of blocks with the matching (n,) row of rhs"""
+    return np.linalg.solve(blocks, rhs[..., np.newaxis])[..., 0]
+
+
+def _solve_schur(
+    problem: _BundleAdjustmentProblem,
+    x0: np.ndarray,
+    loss: str,
+    f_scale: float,
+    ftol: float = 1e-4,
+    xtol: float = 1e-8,
+    gtol: float = 1e-8,
+    max_iterations: int = 100,
+    verbose: int = 0,
+) -> tuple[np.ndarray, str]:
+    """
+    Levenberg-Marquardt bundle adjustment that solves the normal equations with the Schur complement.
+
+    The normal equations of bundle adjustment have the block structure::
+
+        [ U   W ] [dc]   [-gc]
+        [ W.T V ] [dp] = [-gp]
+
+    where U and V are block diagonal, with a (6, 6) block per camera and a
+    (3, 3) block per point. The points are eliminated with the Schur complement
+    S = U - W V^-1 W.T, leaving a small sparse system for the cameras. The
+    robust loss is applied by re-weighting the residuals at every iteration.
+
+    The stopping criteria are the same as for scipy.optimize.least_squares.
+
+    Returns
+    -------
+    x : np.ndarray
+        Optimized parameters.
+    message : str
+        Reason that the iteration stopped.
+    """
+    n_cameras, n_points = problem.n_cameras, problem.n_points
+    cams, pts = problem.camera_indices, problem.point_indices
+    n_cam_params = n_cameras * 6
+
+    # Block sparsity structure of W, sorted by camera and then point
+    pair_keys, pair_inverse = np.unique(cams * n_points + pts, return_inverse=True)
+    pair_pts = pair_keys % n_points
+    pair_indptr = np.searchsorted(pair_keys // n_points, np.arange(n_cameras + 1))
+
+    x = x0.astype(float).copy()
+    f, d_camera, d_point = problem.evaluate(x)
+    cost, grad_weights, weights = _robust_cost(f, loss, f_scale)
+    damping = 1e-3
+    damping_factor = 2.0
+    message = f'The maximum number of iterations ({max_iterations:d}) is exceeded.'
+
+    for iteration in range(max_iterations):
+        # Weighted blocks of the normal equations
+        jc_w = d_camera * weights[..., np.newaxis]  # (Nobs, 2, 6)
+        jp_w = d_point * weights[..., np.newaxis]  # (Nobs, 2, 3)
+        grad_c = np.zeros((n_cameras, 6))
+        grad_p = np.zeros((n_points, 3))
+        U = np.zeros((n_cameras, 6, 6))
+        V = np.zeros((n_points, 3, 3))
+        if problem.opt_cameras:
+            np.add.at(grad_c, cams, _block_t_dot(d_camera, grad_weights * f))
+            np.add.at(U, cams, _block_t_matmul(jc_w, d_camera))
+        if problem.opt_points:
+            np.add.at(grad_p, pts, _block_t_dot(d_point, grad_weights * f))
+            np.add.at(V, pts, _block_t_matmul(jp_w, d_point))
+        if problem.opt_cameras and problem.opt_points:
+            # Camera/point coupling blocks, one per observed (camera, point) pair
+            W_blocks = np.zeros((pair_pts.size, 6, 3))
+            np.add.at(W_blocks, pair_inverse, _block_t_matmul(jc_w, d_point))
+            W = bsr_matrix((W_blocks, pair_pts, pair_indptr), shape=(n_cam_params, n_points * 3))
+            W_T = W.T.tobsr()
+        grad = np.concatenate((grad_c.ravel(), grad_p.ravel()))
+
+        if np.max(np.abs(grad)) < gtol:
+            message = '`gtol` termination condition is satisfied.'
+            break
+
+        # Marquardt scaling of the damping. Parameters without any observations (and fixed
+        # parameters) have zero diagonals, give them a nominal scale so that the blocks stay
+        # invertible. Their gradient is zero, so their step is zero.
+        diag_c = np.maximum(np.diagonal(U, axis1=1, axis2=2), 1e-12)
+        diag_p = np.maximum(np.diagonal(V, axis1=1, axis2=2), 1e-12)
+
+        # Try steps until one reduces the cost
+        while True:
+            U_damped = U + np.eye(6) * (damping * diag_c)[:, np.newaxis, :]
+            V_damped = V + np.eye(3) * (damping * diag_p)[:, np.newaxis, :]
+
+            step_c = np.zeros((n_cameras, 6))
+            step_p = np.zeros((n_points, 3))
+            if problem.opt_cameras and problem.opt_points:
+                # Reduced camera system S dc = -gc + W V^-1 gp
+                W_V_inv = bsr_matrix(
+                    (W_blocks @ np.linalg.inv(V_damped)[pair_pts], pair_pts, pair_indptr), shape=W.shape
+                )
+                U_mat = bsr_matrix(
+                    (U_damped, np.arange(n_cameras), np.arange(n_cameras + 1)), shape=(n_cam_params,) * 2
+                )
+                S = U_mat - W_V_inv @ W_T
+                rhs = -grad_c.ravel() + W_V_inv @ grad_p.ravel()
+                if S.nnz > 0.2 * n_cam_params**2:
+                    # Most cameras see common points, a dense solve is faster
+                    step_c = np.linalg.solve(S.toarray(), rhs).reshape((n_cameras, 6))
+                else:
+                    step_c = spsolve(S.tocsc(), rhs).reshape((n_cameras, 6))
+                step_p = _block_diag_solve(V_damped, -grad_p - (W_T @ step_c.ravel()).reshape((n_points, 3)))
+            elif problem.opt_cameras:
+                step_c = _block_diag_solve(U_damped, -grad_c)
+            else:
+                step_p = _block_diag_solve(V_damped, -grad_p)
+            step = np.concatenate((step_c.ravel(), step_p.ravel()))
+            if not np.all(np.isfinite(step)):
+                # Singular or non-finite normal equations, keep the last parameters
+                gain = None
+                break
+
+            # Predicted cost reduction of the (damped) quadratic model
+            predicted = -(grad @ step) - 0.5 * (
+                np.einsum('ni,nij,nj', step_c, U, step_c)
+                + np.einsum('ni,nij,nj', step_p, V, step_p)
+                + 2 * (step_c.ravel() @ (W @ step_p.ravel()) if (problem.opt_cameras and problem.opt_points) else 0)
+            )
+
+            x_new = x + step
+            f_new, d_camera_new, d_point_new = problem.evaluate(x_new)
+            cost_new, grad_weights_new, weights_new = _robust_cost(f_new, loss, f_scale)
+            actual = cost - cost_new
+            gain = actual / predicted if predicted > 0 else -1
+
+            if gain > 0:
+                # Accept step, reduce damping
+                damping *= max(1 / 3, 1 - (2 * gain - 1) ** 3)
+                damping_factor = 2.0
+                break
+
+            # Reject step, increase damping
+            damping *= damping_factor
+            damping_factor *= 2
+            if np.linalg.norm(step) < xtol * (xtol + np.linalg.norm(x)):
+                break
+
+        if gain is None:
+            message = 'The step is not finite.'
+            break
+        if gain <= 0:
+            message = '`xtol` termination condition is satisfied.'
+            break
+
+        step_norm = np.linalg.norm(step)
+        x, f, d_camera, d_point = x_new, f_new, d_camera_new, d_point_new
+        cost_prev, cost, grad_weights, weights = cost, cost_new, grad_weights_new, weights_new
+        if verbose >= 2:
+            lt.info(f'Bundle adjustment iteration {iteration + 1:d}: cost {cost:.6e}, step norm {step_norm:.2e}')
+
+        if actual < ftol * cost_prev and gain > 0.25:
+            message = '`ftol` termination condition is satisfied.'
+            break
+        if step_norm < xtol * (xtol + np.linalg.norm(x)):
+            message = '`xtol` termination condition is satisfied.'
+            break
+
+    if verbose >= 1:
+        lt.info(f'{message} Final cost {cost:.4e}, after {iteration + 1:d} iterations.')
+    return x, message
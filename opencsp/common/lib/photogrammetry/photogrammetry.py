@@ -15,6 +15,7 @@ from opencsp.common.lib.geometry.Vxy import Vxy
 from opencsp.common.lib.geometry.Vxyz import Vxyz
 from opencsp.common.lib.geometry.Pxyz import Pxyz
 from opencsp.common.lib.geometry.TransformXYZ import TransformXYZ
+import opencsp.common.lib.tool.hdf5_tools as h5
 import opencsp.common.lib.tool.log_tools as lt
 
 
@@ -80,6 +81,40 @@ def find_aruco_marker(
     return ids.squeeze().astype(int), pts
 
 
+def find_aruco_marker_in_file(file: str, cache_dir: str = None, **kwargs) -> tuple[ndarray[int], ndarray]:
+    """
+    Loads an image file and finds the corners of its aruco markers. Only the
+    marker arrays are returned, so this is suitable to run in worker processes.
+
+    Parameters
+    ----------
+    file : str
+        Path to image file.
+    cache_dir : str, optional
+        Directory to cache detected markers in, by default None (no caching).
+        Cache files are named by the hash of the image file contents and the
+        detection parameters, so a cached detection is reused for an identical
+        image even if it is renamed or moved.
+    kwargs
+        Detection parameters, see find_aruco_marker().
+
+    Returns
+    -------
+    ids : ndarray[int]
+        Shape (N,) array of IDs of aruco markers seen in image.
+    corners : ndarray
+        Shape (N, 4, 2) array of the image points of all four corners of the
+        aruco markers.
+    """
+
+    def find_markers() -> list[ndarray]:
+        ids, pts = find_aruco_marker(load_image_grayscale(file), **kwargs)
+        return [np.reshape(ids, -1), np.array(pts).reshape((-1, 4, 2))]
+
+    data = h5.load_or_compute_file_datasets(file, sorted(kwargs.items()), ['ids', 'corners'], find_markers, cache_dir)
+    return np.reshape(data['ids'], -1).astype(int), np.reshape(data['corners'], (-1, 4, 2))
+
+
 def valid_camera_pose(
     camera: Camera, rvec: ndarray, tvec: ndarray, pts_image: ndarray, pts_object: ndarray, reproj_thresh: float = 100.0
 ) -> bool:
@@ -462,3 +497,109 @@ def nearest_ray_intersection(p_origins: Vxyz, u_dirs: Vxyz | Uxyz) -> tuple[Vxyz
     dists = dist_from_rays(p_int, u_dirs, p_origins)
 
     return p_int, dists
+
+
+def triangulate_points(
+    camera: Camera,
+    rots: Rotation,
+    tvecs: Vxyz,
+    pts_img: Vxy,
+    segment_idxs: ndarray[int],
+    num_segments: int | None = None,
+) -> tuple[Vxyz, ndarray]:
+    """Triangulates positions of many unknown markers at once. The rays of
+    all markers are stacked, and each ray is assigned to its marker by its
+    segment index. See triangulate().
+
+    Parameters
+    ----------
+    camera : Camera
+        Camera object used to capture all images
+    rots : Rotation
+        Length N stacked world to camera Rotations, one per ray
+    tvecs : Vxyz
+        Length N camera to world translation vectors (camera coordinates), one per ray
+    pts_img : Vxy
+        Length N image points, one per ray
+    segment_idxs : ndarray[int]
+        Shape (N,) index of the marker each ray belongs to
+    num_segments : int | None, optional
+        Number of markers, by default max(segment_idxs) + 1
+
+    Returns
+    -------
+    tuple[Vxyz, ndarray]
+        Length num_segments intersection points (NaN for markers without rays),
+        shape (N,) perpendicular distances from each ray to the point of its marker
+    """
+    # Calculate camera positions and rays in object reference frame
+    r_cam_world = rots.inv()
+    pts_origins = -r_cam_world.apply(tvecs.data.T)  # (N, 3)
+    u_rays = r_cam_world.apply(camera.vector_from_pixel(pts_img).data.T)  # (N, 3)
+
+    # Intersect rays of each marker
+    return nearest_ray_intersections(Vxyz(pts_origins.T), Vxyz(u_rays.T), segment_idxs, num_segments)
+
+
+def nearest_ray_intersections(
+    p_origins: Vxyz, u_dirs: Vxyz | Uxyz, segment_idxs: ndarray[int], num_segments: int | None = None
+) -> tuple[Vxyz, ndarray]:
+    """
+    Finds the least squares points of intersection of many sets of skew rays
+    at once, and calculates residuals. The rays of all sets are stacked, and
+    each ray is assigned to its set by its segment index. The normal equations
+    of each set are summed block-wise and all sets are solved together. See
+    nearest_ray_intersection().
+
+    Parameters
+    ----------
+    p_origins : Vxyz
+        Length N vector of XYZ origin of each ray.
+    u_dirs : Vxyz | Uxyz
+        Length N vector of unit pointing direction vectors. Must be UNIT VECTORS.
+    segment_idxs : ndarray[int]
+        Shape (N,) index of the set (intersection point) each ray belongs to.
+    num_segments : int | None, optional
+        Number of sets, by default max(segment_idxs) + 1
+
+    Returns
+    -------
+    Vxyz, ndarray
+        Length num_segments least squares XYZ intersection points (NaN for sets
+        without rays), shape (N,) perpendicular distances from each ray to the
+        intersection point of its set
+
+    """
+    pts_origins = p_origins.data.T  # (N, 3)
+    u_rays = u_dirs.data.T  # (N, 3)
+    segment_idxs = np.asarray(segment_idxs, dtype=int)
+    if num_segments is None:
+        num_segments = segment_idxs.max(initial=-1) + 1
+
+    # Sum normal equations of each set: Ax = b
+    #    A: sum(I - v*v_T)     [summed over rays of set] -> (3, 3) array
+    #    b: sum((I - v*v_T)*p) [summed over rays of set] -> (3, 1) array
+    proj_mats = np.eye(3) - u_rays[:, :, np.newaxis] * u_rays[:, np.newaxis, :]  # (N, 3, 3)
+    proj_origins = (proj_mats @ pts_origins[:, :, np.newaxis])[..., 0]  # (N, 3)
+    a_mats = np.array([np.bincount(segment_idxs, w, num_segments) for w in proj_mats.reshape(-1, 9).T])
+    b_vecs = np.array([np.bincount(segment_idxs, w, num_segments) for w in proj_origins.T])
+    a_mats = a_mats.T.reshape(-1, 3, 3)  # (M, 3, 3)
+    b_vecs = b_vecs.T  # (M, 3)
+
+    # Find least squares solutions of all sets with rays. A is symmetric, so
+    # the minimum norm solution (as np.linalg.lstsq) is found from its
+    # eigendecomposition. This also handles sets with parallel rays.
+    has_rays = np.bincount(segment_idxs, minlength=num_segments) > 0
+    evals, evecs = np.linalg.eigh(a_mats[has_rays])  # (M, 3), (M, 3, 3)
+    mask_valid = evals > evals.max(axis=1, initial=0, keepdims=True) * 3 * np.finfo(float).eps
+    inv_evals = np.divide(1.0, evals, out=np.zeros_like(evals), where=mask_valid)
+    coefs = (evecs.transpose(0, 2, 1) @ b_vecs[has_rays, :, np.newaxis])[..., 0] * inv_evals
+    pts_int = np.zeros((num_segments, 3)) * np.nan
+    pts_int[has_rays] = (evecs @ coefs[:, :, np.newaxis])[..., 0]
+
+    # Calculate intersection errors (perpendicular distances to rays)
+    v_ori_int = pts_int[segment_idxs] - pts_origins
+    scales = np.sum(u_rays * v_ori_int, axis=1)
+    dists = np.linalg.norm(v_ori_int - u_rays * scales[:, np.newaxis], axis=1)
+
+    return Vxyz(pts_int.T), dists
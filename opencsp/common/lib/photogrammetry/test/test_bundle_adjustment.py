@@ -46,7 +46,8 @@ def test_bundle_adjust_camera():
     rvecs = np.zeros((2, 3))
     rvecs[1, 1] = -np.pi / 4
     tvecs = array([[0, 0, 0], [10, 0, 0]], dtype=float)
-    pts_obj = array([[0, 0, 10], [1, 0, 10], [-1, 0, 10]], dtype=float)
+    # Points are not collinear, so that the camera poses are fully constrained
+    pts_obj = array([[0, 0, 10], [1, 0, 10], [-1, 1, 10]], dtype=float)
     cam_indices = array([0, 0, 0, 1, 1, 1])
     point_indices = array([0, 1, 2, 0, 1, 2])
     int_mat = camera.intrinsic_mat
@@ -69,3 +70,93 @@ def test_bundle_adjust_camera():
     np.testing.assert_allclose(rvecs_out, rvecs, atol=1e-3, rtol=0)
     np.testing.assert_allclose(tvecs_out, tvecs, atol=1e-2, rtol=0)
     np.testing.assert_allclose(pts_obj_out, pts_obj, atol=1e-6, rtol=0)
+
+
+def get_test_scene(n_cameras: int = 6, n_points: int = 40):
+    """Creates cameras at random poses all looking at a cloud of points"""
+    np.random.seed(1)
+    rvecs = np.random.randn(n_cameras, 3) * 0.1
+    tvecs = np.random.randn(n_cameras, 3) * 0.2
+    tvecs[:, 2] += 5
+    pts_obj = np.random.uniform(-1, 1, (n_points, 3))
+    cam_indices = np.repeat(np.arange(n_cameras), n_points)
+    point_indices = np.tile(np.arange(n_points), n_cameras)
+    int_mat = np.array([[1000, 0, 500], [0, 1000, 400], [0, 0, 1]], dtype=float)
+    dist_coefs = np.array([0.05, -0.02, 0.001, 0.002])
+    params = np.hstack((np.hstack((rvecs, tvecs)).ravel(), pts_obj.ravel()))
+    pts_img = ba.fun(
+        params, n_cameras, n_points, cam_indices, point_indices, np.zeros((cam_indices.size, 2)), int_mat, dist_coefs
+    ).reshape((-1, 2))
+    return rvecs, tvecs, pts_obj, cam_indices, point_indices, pts_img, int_mat, dist_coefs
+
+
+def test_jac():
+    rvecs, tvecs, pts_obj, cam_indices, point_indices, pts_img, int_mat, dist_coefs = get_test_scene(3, 5)
+    n_cameras, n_points = rvecs.shape[0], pts_obj.shape[0]
+    params = np.hstack((np.hstack((rvecs, tvecs)).ravel(), pts_obj.ravel()))
+    args = (n_cameras, n_points, cam_indices, point_indices, pts_img, int_mat, dist_coefs)
+
+    # Central finite differences
+    jac_num = np.zeros((cam_indices.size * 2, params.size))
+    for idx in range(params.size):
+        delta = np.zeros(params.size)
+        delta[idx] = 1e-6
+        jac_num[:, idx] = (ba.fun(params + delta, *args) - ba.fun(params - delta, *args)) / 2e-6
+
+    np.testing.assert_allclose(ba.jac(params, *args).toarray(), jac_num, atol=1e-4, rtol=0)
+
+    # Columns of fixed parameters are empty
+    jac_camera = ba.jac(params, *args, opt_type='camera').toarray()
+    np.testing.assert_allclose(jac_camera[:, : n_cameras * 6], jac_num[:, : n_cameras * 6], atol=1e-4, rtol=0)
+    np.testing.assert_array_equal(jac_camera[:, n_cameras * 6 :], 0)
+
+
+def test_bundle_adjust_schur():
+    rvecs, tvecs, pts_obj, cam_indices, point_indices, pts_img, int_mat, dist_coefs = get_test_scene()
+    pts_img = pts_img + np.random.randn(*pts_img.shape) * 0.2
+    rvecs_in = rvecs + np.random.randn(*rvecs.shape) * 0.005
+    tvecs_in = tvecs + np.random.randn(*tvecs.shape) * 0.01
+    pts_obj_in = pts_obj + np.random.randn(*pts_obj.shape) * 0.01
+    args = (rvecs_in, tvecs_in, pts_obj_in, cam_indices, point_indices, pts_img, int_mat, dist_coefs)
+
+    for opt_type in ['camera', 'points', 'both']:
+        rvecs_trf, tvecs_trf, pts_obj_trf = ba.bundle_adjust(*args, opt_type, verbose=0, solver='trf')
+        rvecs_schur, tvecs_schur, pts_obj_schur = ba.bundle_adjust(*args, opt_type, verbose=0, solver='schur')
+
+        np.testing.assert_allclose(rvecs_schur, rvecs_trf, atol=1e-4, rtol=0)
+        np.testing.assert_allclose(tvecs_schur, tvecs_trf, atol=1e-3, rtol=0)
+        np.testing.assert_allclose(pts_obj_schur, pts_obj_trf, atol=1e-3, rtol=0)
+
+
+def test_bundle_adjust_robust_loss():
+    rvecs, tvecs, pts_obj, cam_indices, point_indices, pts_img, int_mat, dist_coefs = get_test_scene()
+    pts_img = pts_img + np.random.randn(*pts_img.shape) * 0.1
+    # Add gross outliers
+    pts_img_outliers = pts_img.copy()
+    outliers = np.random.choice(pts_img.shape[0], 10, replace=False)
+    pts_img_outliers[outliers] += np.random.uniform(20, 50, (10, 2))
+    args = (rvecs, tvecs, pts_obj, cam_indices, point_indices)
+    kwargs = dict(intrinsic_mat=int_mat, dist_coefs=dist_coefs, opt_type='points', verbose=0)
+
+    for solver in ['trf', 'schur']:
+        _, _, pts_obj_clean = ba.bundle_adjust(*args, pts_img=pts_img, **kwargs, solver=solver)
+        _, _, pts_obj_linear = ba.bundle_adjust(*args, pts_img=pts_img_outliers, **kwargs, solver=solver)
+        _, _, pts_obj_robust = ba.bundle_adjust(
+            *args, pts_img=pts_img_outliers, **kwargs, loss='cauchy', f_scale=1.0, solver=solver
+        )
+
+        assert np.abs(pts_obj_linear - pts_obj_clean).max() > 0.1
+        np.testing.assert_allclose(pts_obj_robust, pts_obj_clean, atol=5e-3, rtol=0)
+
+
+def test_bundle_adjust_schur_not_finite():
+    rvecs, tvecs, pts_obj, cam_indices, point_indices, pts_img, int_mat, dist_coefs = get_test_scene()
+    pts_img = pts_img.copy()
+    pts_img[0] = np.nan
+    args = (rvecs, tvecs, pts_obj, cam_indices, point_indices, pts_img, int_mat, dist_coefs)
+
+    rvecs_opt, tvecs_opt, pts_obj_opt = ba.bundle_adjust(*args, 'both', verbose=0, solver='schur')
+
+    np.testing.assert_array_equal(rvecs_opt, rvecs)
+    np.testing.assert_array_equal(tvecs_opt, tvecs)
+    np.testing.assert_array_equal(pts_obj_opt, pts_obj)
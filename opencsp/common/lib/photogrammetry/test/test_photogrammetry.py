@@ -12,6 +12,7 @@ from opencsp.common.lib.geometry.Uxyz import Uxyz
 from opencsp.common.lib.geometry.Vxy import Vxy
 from opencsp.common.lib.geometry.Vxyz import Vxyz
 from opencsp.common.lib.photogrammetry import photogrammetry as ph
+import opencsp.common.lib.tool.file_tools as ft
 
 
 def get_test_camera() -> Camera:
@@ -46,6 +47,28 @@ def test_find_aruco_marker():
     np.testing.assert_equal(corns_exp, np.array(corners))
 
 
+def test_find_aruco_marker_in_file():
+    file = join(os.path.dirname(__file__), 'data/image.png')
+    cache_dir = join(os.path.dirname(__file__), 'data/output/marker_cache')
+    ft.create_directories_if_necessary(cache_dir)
+    for cache_file in ft.files_in_directory(cache_dir):
+        os.remove(join(cache_dir, cache_file))
+
+    ids_exp, corners_exp = ph.find_aruco_marker(ph.load_image_grayscale(file), 10, 0.01)
+
+    # Without cache, with new cache, and loaded from cache
+    for cache in [None, cache_dir, cache_dir]:
+        ids, corners = ph.find_aruco_marker_in_file(file, cache, adaptiveThreshConstant=10, minMarkerPerimeterRate=0.01)
+        np.testing.assert_equal(ids, ids_exp)
+        np.testing.assert_equal(corners, np.array(corners_exp))
+        assert corners.dtype == corners_exp[0].dtype
+    assert len(ft.files_in_directory(cache_dir)) == 1
+
+    # Different detection parameters are cached separately
+    ph.find_aruco_marker_in_file(file, cache_dir, adaptiveThreshConstant=7)
+    assert len(ft.files_in_directory(cache_dir)) == 2
+
+
 def test_valid_camera_pose():
     camera = get_test_camera()
     rvec = np.zeros(3)
@@ -155,3 +178,32 @@ def test_nearest_ray_intersection():
 
     np.testing.assert_allclose(pt.data.squeeze(), np.array([0, 0, 1]), atol=1e-6, rtol=0)
     np.testing.assert_allclose(dists, np.array([0, 0]), atol=1e-6, rtol=0)
+
+
+def test_triangulate_points():
+    camera = get_test_camera()
+    rots = Rotation.identity(4)
+    tvecs = Vxyz([[0, 1, 0, 1], [0, 1, 0, 1], [0, 0, 0, 0]])
+    pts_img = Vxy([[0, 1, 0, 1], [0, 1, 0, 0]])
+    pts, dists = ph.triangulate_points(camera, rots, tvecs, pts_img, np.array([0, 0, 2, 2]))
+
+    # Same as triangulating each point separately
+    for idx in [0, 2]:
+        mask = slice(idx, idx + 2)
+        pt_exp, dists_exp = ph.triangulate([camera] * 2, rots[mask], tvecs[mask], pts_img[mask])
+        np.testing.assert_allclose(pts[idx].data, pt_exp.data, atol=1e-6, rtol=0)
+        np.testing.assert_allclose(dists[mask], dists_exp, atol=1e-6, rtol=0)
+    np.testing.assert_allclose(pts[0].data.squeeze(), np.array([0, 0, 1]), rtol=0, atol=1e-6)
+    assert np.isnan(pts[1].data).all()
+
+
+def test_nearest_ray_intersections():
+    # Three sets of rays: two intersecting, and one parallel
+    p_origins = Vxyz([[5, 1, 0, 0, 1, 1], [0, 0, 1, 0, 0, 0], [0, 0, 0, 0, 0, 0]])
+    u_dirs = Uxyz([[-5, 0, 0, 0, 1, 0], [0, 1, -1, 0, 0, 0], [1, 0, 1, 1, 0, 1]])
+    segment_idxs = np.array([0, 1, 0, 2, 1, 2])
+
+    pts, dists = ph.nearest_ray_intersections(p_origins, u_dirs, segment_idxs)
+
+    np.testing.assert_allclose(pts.data.T, np.array([[0, 0, 1], [1, 0, 0], [0.5, 0, 0]]), atol=1e-6, rtol=0)
+    np.testing.assert_allclose(dists, np.array([0, 0, 0, 0.5, 0, 0.5]), atol=1e-6, rtol=0)
@@ -0,0 +1,215 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Iterator
+
+import opencsp.common.lib.process.parallel_file_tools as pft
+import opencsp.common.lib.process.subprocess_tools as subt
+import opencsp.common.lib.tool.file_tools as ft
+import opencsp.common.lib.tool.log_tools as lt
+
+
+@dataclass
+class VideoChunk:
+    """A frame-exact range of a video that can be extracted independently of all other chunks."""
+
+    chunk_index: int
+    """ The index of this chunk within the partitioner's chunks. """
+    start_frame: int
+    """ The global (0-based) index of the first frame in this chunk. Always a keyframe, except possibly for frame 0. """
+    num_frames: int
+    """ How many frames are in this chunk. """
+    seek_time: float
+    """ The time to seek to (with -ss before -i) in order to start decoding exactly at start_frame, in seconds. """
+
+
+class KeyframePartitioner:
+    """Splits a video into many small frame-exact chunks, aligned to keyframes.
+
+    Unlike the ParallelPartitioner, which statically assigns an equal portion
+    of the data to each server, the chunks from this partitioner are meant to
+    be claimed dynamically. Each server repeatedly claims the next unclaimed
+    chunk with claimed_chunks() until there is no more work, so a slow server
+    simply ends up extracting fewer chunks instead of holding up the rest.
+
+    Because every chunk starts on a keyframe, ffmpeg can seek directly to the
+    start of the chunk without decoding (and possibly duplicating or dropping)
+    any frames from the previous group of pictures.
+
+    Typical usage::
+
+        # server 0
+        partitioner = KeyframePartitioner.from_video(video_path_name_ext)
+        partitioner.save(plan_path_name_ext)
+        server_synchronizer.wait()
+
+        # all servers
+        partitioner = KeyframePartitioner.load(plan_path_name_ext)
+        for chunk in partitioner.claimed_chunks(claims_dir, f"server_{server_index}"):
+            video_handler.extract_frame_range(chunk.start_frame, chunk.num_frames, chunk.seek_time)
+    """
+
+    def __init__(
+        self, num_frames: int, keyframe_indices: list[int], keyframe_times: list[float], target_chunk_frames: int = 300
+    ):
+        """
+        Args:
+        -----
+            num_frames (int): The total number of frames in the video.
+            keyframe_indices (list[int]): The global (0-based) indices of the keyframes, in display order.
+            keyframe_times (list[float]): The presentation time of each keyframe, in seconds, relative to the first frame.
+            target_chunk_frames (int, optional): The minimum number of frames per chunk. Consecutive groups of
+                pictures are merged until the chunk has at least this many frames, except for the last chunk.
+                Smaller chunks balance better across servers, at the cost of a little ffmpeg startup time
+                per chunk. Defaults to 300.
+        """
+        if len(keyframe_indices) != len(keyframe_times):
+            lt.error_and_raise(
+                ValueError,
+                "Error in KeyframePartitioner(): keyframe_indices and keyframe_times must be the same length, "
+                + f"but are {len(keyframe_indices)} and {len(keyframe_times)}",
+            )
+        if target_chunk_frames < 1:
+            lt.error_and_raise(
+                ValueError,
+                f"Error in KeyframePartitioner(): target_chunk_frames must be >= 1, but is {target_chunk_frames}",
+            )
+
+        self.num_frames = num_frames
+        self.keyframe_indices = list(keyframe_indices)
+        self.keyframe_times = list(keyframe_times)
+        self.target_chunk_frames = target_chunk_frames
+        self.chunks: list[VideoChunk] = self._build_chunks()
+        """ The frame-exact chunks that together cover every frame in the video exactly once. """
+
+    @property
+    def frame_duration(self) -> float:
+        """Estimated duration of a single frame, in seconds."""
+        if len(self.keyframe_indices) < 2:
+            return 0
+        return (self.keyframe_times[-1] - self.keyframe_times[0]) / (
+            self.keyframe_indices[-1] - self.keyframe_indices[0]
+        )
+
+    def _build_chunks(self) -> list[VideoChunk]:
+        if self.num_frames <= 0:
+            return []
+
+        # Chunk boundaries must be keyframes. The first frame always starts a
+        # chunk, even for videos that open with non-keyframes.
+        boundaries: list[tuple[int, float]] = [(0, 0.0)]
+        for frame_idx, frame_time in zip(self.keyframe_indices, self.keyframe_times):
+            if frame_idx > 0 and frame_idx < self.num_frames:
+                boundaries.append((frame_idx, frame_time))
+
+        # Start slightly before the keyframe so that rounding in the probed
+        # timestamps can't cause ffmpeg to skip the keyframe itself.
+        half_frame = self.frame_duration / 2
+
+        chunks: list[VideoChunk] = []
+        start_frame, start_time = boundaries[0]
+        for frame_idx, frame_time in boundaries[1:]:
+            if frame_idx - start_frame < self.target_chunk_frames:
+                continue
+            seek_time = max(start_time - half_frame, 0)
+            chunks.append(VideoChunk(len(chunks), start_frame, frame_idx - start_frame, seek_time))
+            start_frame, start_time = frame_idx, frame_time
+        seek_time = max(start_time - half_frame, 0)
+        chunks.append(VideoChunk(len(chunks), start_frame, self.num_frames - start_frame, seek_time))
+
+        return chunks
+
+    @staticmethod
+    def parse_ffprobe_packets(lines: list[str]) -> tuple[int, list[int], list[float]]:
+        """Parses the output from "ffprobe -show_entries packet=pts_time,flags -of csv=p=0".
+
+        Packets are listed in decoding order, which for videos with B-frames is
+        different from the display order. The packets are sorted by their
+        presentation time to get each frame's global index.
+
+        Args:
+        -----
+            lines (list[str]): The lines output by ffprobe, for example "0.033367,K__".
+
+        Returns:
+        --------
+            num_frames (int): The number of frames in the video.
+            keyframe_indices (list[int]): The index of each keyframe, in display order.
+            keyframe_times (list[float]): The time of each keyframe, relative to the first frame.
+        """
+        frames: list[tuple[float, bool]] = []
+        for line in lines:
+            line = line.strip()
+            if line == "":
+                continue
+            pts_time, flags = (line.split(",") + [""])[:2]
+            if pts_time == "N/A":
+                lt.warn("Warning in KeyframePartitioner.parse_ffprobe_packets(): skipping packet without a timestamp")
+                continue
+            frames.append((float(pts_time), "K" in flags))
+        frames.sort(key=lambda frame: frame[0])
+
+        if len(frames) == 0:
+            return 0, [], []
+        first_time = frames[0][0]
+        keyframe_indices = [i for i, (_, is_key) in enumerate(frames) if is_key]
+        keyframe_times = [frames[i][0] - first_time for i in keyframe_indices]
+        return len(frames), keyframe_indices, keyframe_times
+
+    @classmethod
+    def from_video(cls, video_path_name_ext: str, target_chunk_frames: int = 300):
+        """Probe the keyframes of the given video with ffprobe.
+
+        Only the container's packet headers are read, so this is fast even for
+        long high resolution videos. It should be done once (for example on
+        server 0) and shared with the other servers via save() and load().
+        """
+        if not ft.file_exists(video_path_name_ext):
+            lt.error_and_raise(
+                FileNotFoundError,
+                f'Error in KeyframePartitioner.from_video(): video "{video_path_name_ext}" does not exist',
+            )
+        path = ft.path_to_cmd_line(video_path_name_ext)
+        lines = subt.run(f"ffprobe -v error -select_streams v:0 -show_entries packet=pts_time,flags -of csv=p=0 {path}")
+        num_frames, keyframe_indices, keyframe_times = cls.parse_ffprobe_packets([line.val for line in lines])
+        lt.info(f"KeyframePartitioner: found {len(keyframe_indices)} keyframes in {num_frames} frames")
+        return cls(num_frames, keyframe_indices, keyframe_times, target_chunk_frames)
+
+    def save(self, plan_path_name_ext: str):
+        """Save this partitioner's probe results, so that other servers can load() them without probing again."""
+        plan = {
+            "num_frames": self.num_frames,
+            "keyframe_indices": self.keyframe_indices,
+            "keyframe_times": self.keyframe_times,
+            "target_chunk_frames": self.target_chunk_frames,
+        }
+        # write to a temporary file first, so that other servers never read a partial plan
+        tmp_path_name_ext = plan_path_name_ext + ".tmp"
+        with open(tmp_path_name_ext, "w") as fout:
+            json.dump(plan, fout)
+        os.replace(tmp_path_name_ext, plan_path_name_ext)
+
+    @classmethod
+    def load(cls, plan_path_name_ext: str):
+        with open(plan_path_name_ext, "r") as fin:
+            plan = json.load(fin)
+        return cls(plan["num_frames"], plan["keyframe_indices"], plan["keyframe_times"], plan["target_chunk_frames"])
+
+    def claimed_chunks(self, claims_dir: str, claimant: str = "") -> Iterator[VideoChunk]:
+        """Yields the chunks that this worker successfully claims, until all chunks have been claimed.
+
+        Every worker should iterate over this generator with the same claims
+        directory. Each chunk is handed to exactly one worker. Chunks are
+        claimed one at a time, just before they are yielded, so faster workers
+        end up claiming more chunks.
+
+        Args:
+        -----
+            claims_dir (str): A directory shared by all workers, to put the claim files in. Must be empty before the first worker starts.
+            claimant (str, optional): A description of this worker, written into its claim files for debugging. Defaults to "".
+        """
+        ft.create_directories_if_necessary(claims_dir)
+        for chunk in self.chunks:
+            claim_path_name_ext = os.path.join(claims_dir, f"chunk_{chunk.chunk_index}.claim")
+            if pft.claim_file(claim_path_name_ext, claimant):
+                yield chunk
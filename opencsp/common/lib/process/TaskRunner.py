@@ -0,0 +1,224 @@
+import functools
+import multiprocessing
+import os
+import pickle
+import statistics
+import time
+from typing import Callable, Iterable, TypeVar
+
+import opencsp.common.lib.tool.file_tools as ft
+import opencsp.common.lib.tool.log_tools as lt
+
+T = TypeVar("T")
+
+
+def _timed_call(func: Callable, idx_task: tuple[int, any]):
+    """Worker function. Evaluates func(task) and returns the index, result, and elapsed time."""
+    idx, task = idx_task
+    tstart = time.time()
+    ret = func(task)
+    return idx, ret, time.time() - tstart
+
+
+class TaskRunner:
+    def __init__(
+        self,
+        num_workers: int = None,
+        checkpoint_dir: str = None,
+        chunksize: int = None,
+        straggler_factor: float = 3.0,
+        straggler_min_seconds: float = 1.0,
+        description: str = "tasks",
+    ):
+        """Runs a function over a list of independent tasks, in parallel, with resumable checkpoints.
+
+        This is like multiprocessing.Pool.map(), with a few differences:
+            - Tasks are handed out with imap_unordered(), so that one slow task
+              doesn't prevent the other workers from picking up more work.
+            - If checkpoint_dir is given, then the result of each task is
+              pickled to its own file as soon as it completes. When the same
+              tasks are run again (for example after a crash), the tasks that
+              already have a checkpoint are skipped and their results are
+              loaded from disk instead.
+            - Throughput is reported as tasks complete, and tasks that take
+              much longer than the typical task (stragglers) are reported at
+              the end.
+
+        Results are always returned in the same order as the input tasks.
+
+        Example usage::
+
+            runner = TaskRunner(checkpoint_dir=os.path.join(output_dir, "_checkpoints"))
+            results = runner.map(self.search_key_frame, key_frame_ids)
+            # ... save the results ...
+            runner.clear_checkpoints()
+
+        Args:
+        -----
+            num_workers (int, optional): How many processes to use. None to use one per cpu. 1 to evaluate all tasks
+                serially in this process. Defaults to None.
+            checkpoint_dir (str, optional): Where to save the per-task results. None to not save any checkpoints.
+                Defaults to None.
+            chunksize (int, optional): How many tasks to send to a worker at a time. None to choose a chunksize that
+                gives each worker several chunks. Defaults to None.
+            straggler_factor (float, optional): Tasks that take longer than this multiple of the median task time
+                are reported as stragglers. Defaults to 3.0.
+            straggler_min_seconds (float, optional): Tasks faster than this are never reported as stragglers.
+                Defaults to 1.0.
+            description (str, optional): What to call the tasks in log messages. Defaults to "tasks".
+        """
+        if num_workers == None:
+            num_workers = os.cpu_count() or 1
+        if num_workers < 1:
+            lt.error_and_raise(
+                ValueError, f"Error in TaskRunner(): num_workers must be at least 1, but is {num_workers}"
+            )
+
+        self.num_workers = num_workers
+        self.checkpoint_dir = checkpoint_dir
+        self.chunksize = chunksize
+        self.straggler_factor = straggler_factor
+        self.straggler_min_seconds = straggler_min_seconds
+        self.description = description
+
+        self.task_durations: dict[str, float] = {}
+        """ How long each task evaluated by the most recent call to map() took, in seconds. Skipped tasks are not included. """
+        self.num_skipped = 0
+        """ How many tasks the most recent call to map() loaded from checkpoints instead of evaluating. """
+
+    def _checkpoint_path(self, task_id: str) -> str:
+        body = ft.convert_string_to_file_body(str(task_id))
+        return os.path.join(self.checkpoint_dir, f"{body}.pkl")
+
+    def has_checkpoint(self, task_id: str) -> bool:
+        """Returns True if there is a saved result for the given task."""
+        if self.checkpoint_dir == None:
+            return False
+        return ft.file_exists(self._checkpoint_path(task_id))
+
+    def _load_checkpoint(self, task_id: str):
+        with open(self._checkpoint_path(task_id), "rb") as fin:
+            return pickle.load(fin)
+
+    def _save_checkpoint(self, task_id: str, result):
+        ft.create_directories_if_necessary(self.checkpoint_dir)
+        path = self._checkpoint_path(task_id)
+
+        # write to a temporary file first, so that a crash mid-write doesn't leave a partial checkpoint
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as fout:
+            pickle.dump(result, fout)
+        os.replace(tmp_path, path)
+
+    def clear_checkpoints(self):
+        """Removes all checkpoint files. Call this once the results from map() have been saved elsewhere."""
+        if self.checkpoint_dir == None or not ft.directory_exists(self.checkpoint_dir):
+            return
+        ft.delete_files_in_directory(self.checkpoint_dir, "*.pkl")
+        ft.delete_files_in_directory(self.checkpoint_dir, "*.pkl.tmp")
+        if ft.directory_is_empty(self.checkpoint_dir):
+            os.rmdir(self.checkpoint_dir)
+
+    def _get_chunksize(self, num_tasks: int) -> int:
+        if self.chunksize != None:
+            return self.chunksize
+        # aim for ~4 chunks per worker, to balance scheduling overhead against load balancing
+        return max(1, num_tasks // (self.num_workers * 4))
+
+    def map(self, task_func: Callable[[T], any], tasks: Iterable[T], task_ids: Iterable[str] = None) -> list:
+        """Evaluates task_func(task) for every task, skipping tasks that have already been checkpointed.
+
+        Args:
+        -----
+            task_func (Callable[[T], any]): The function to evaluate. Must be picklable when num_workers > 1.
+                Its return value must be picklable when num_workers > 1 or checkpoint_dir is set.
+            tasks (Iterable[T]): The argument for each call to task_func.
+            task_ids (Iterable[str], optional): A unique identifier for each task, used to name its checkpoint
+                file. None to use str(task). Defaults to None.
+
+        Returns:
+        --------
+            list: The return value of task_func for each task, in the same order as tasks.
+        """
+        tasks = list(tasks)
+        task_ids = [str(task) for task in tasks] if task_ids == None else [str(task_id) for task_id in task_ids]
+        if len(task_ids) != len(tasks):
+            lt.error_and_raise(
+                ValueError,
+                f"Error in TaskRunner.map(): number of task_ids ({len(task_ids)}) doesn't match number of tasks ({len(tasks)})",
+            )
+        if len(set(task_ids)) != len(task_ids):
+            lt.error_and_raise(ValueError, "Error in TaskRunner.map(): task_ids must be unique")
+
+        results = [None] * len(tasks)
+        self.task_durations = {}
+
+        # load previously completed tasks
+        todo: list[tuple[int, T]] = []
+        for idx, (task_id, task) in enumerate(zip(task_ids, tasks)):
+            if self.has_checkpoint(task_id):
+                results[idx] = self._load_checkpoint(task_id)
+            else:
+                todo.append((idx, task))
+        self.num_skipped = len(tasks) - len(todo)
+        if self.num_skipped > 0:
+            lt.info(f"TaskRunner: loaded {self.num_skipped} of {len(tasks)} {self.description} from checkpoints")
+        if len(todo) == 0:
+            return results
+
+        # evaluate the remaining tasks
+        worker_func = functools.partial(_timed_call, task_func)
+        tstart = time.time()
+        if self.num_workers == 1:
+            self._collect(map(worker_func, todo), len(todo), task_ids, results, tstart)
+        else:
+            num_workers = min(self.num_workers, len(todo))
+            chunksize = self._get_chunksize(len(todo))
+            lt.info(
+                f"TaskRunner: evaluating {len(todo)} {self.description} with {num_workers} workers (chunksize {chunksize})"
+            )
+            with multiprocessing.Pool(num_workers) as pool:
+                self._collect(
+                    pool.imap_unordered(worker_func, todo, chunksize=chunksize), len(todo), task_ids, results, tstart
+                )
+
+        self._report_stragglers()
+        return results
+
+    def _collect(self, completed: Iterable[tuple[int, any, float]], num_todo: int, task_ids, results, tstart):
+        report_interval = max(1, num_todo // 10)
+        for num_done, (idx, ret, elapsed) in enumerate(completed, start=1):
+            task_id = task_ids[idx]
+            results[idx] = ret
+            self.task_durations[task_id] = elapsed
+            if self.checkpoint_dir != None:
+                self._save_checkpoint(task_id, ret)
+
+            if num_done % report_interval == 0 or num_done == num_todo:
+                total_elapsed = time.time() - tstart
+                throughput = num_done / total_elapsed if total_elapsed > 0 else float("inf")
+                lt.info(
+                    f"TaskRunner: {num_done}/{num_todo} {self.description} done in {total_elapsed:.1f}s "
+                    + f"({throughput:.2f} {self.description}/s)"
+                )
+
+    def stragglers(self) -> list[tuple[str, float]]:
+        """Returns the (task_id, seconds) of the tasks from the most recent call to map() that took longer than
+        straggler_factor times the median task time (and at least straggler_min_seconds), slowest first."""
+        if len(self.task_durations) < 2:
+            return []
+        median = statistics.median(self.task_durations.values())
+        threshold = max(median * self.straggler_factor, self.straggler_min_seconds)
+        slow = [(task_id, dur) for task_id, dur in self.task_durations.items() if dur > threshold]
+        return sorted(slow, key=lambda v: v[1], reverse=True)
+
+    def _report_stragglers(self):
+        slow = self.stragglers()
+        if len(slow) == 0:
+            return
+        median = statistics.median(self.task_durations.values())
+        slow_str = ", ".join([f"{task_id} ({dur:.1f}s)" for task_id, dur in slow[:10]])
+        lt.info(
+            f"TaskRunner: {len(slow)} straggler {self.description} took more than {self.straggler_factor}x "
+            + f"the median time of {median:.1f}s: {slow_str}"
+        )
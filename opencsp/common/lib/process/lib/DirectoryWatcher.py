@@ -0,0 +1,128 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+
+import opencsp.common.lib.tool.log_tools as lt
+
+# flags from <sys/inotify.h>
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _libc():
+    name = ctypes.util.find_library("c") or "libc.so.6"
+    return ctypes.CDLL(name, use_errno=True)
+
+
+class DirectoryWatcher:
+    def __init__(self, directory: str):
+        """Watches a single directory for new files, using the Linux inotify API.
+
+        This is an event-driven replacement for repeatedly calling os.path.exists()
+        on the files in a directory. Every file that exists when the watcher is
+        created, and every file that is created or moved into the directory
+        afterwards, is remembered as "seen", even if that file is later deleted.
+
+        Note that inotify only reports changes made through the local kernel. Files
+        created by other machines on a network file system will not generate events.
+
+        Args:
+        -----
+            directory (str): The directory to watch. Must already exist.
+        """
+        if not self.is_supported():
+            lt.error_and_raise(RuntimeError, "Error in DirectoryWatcher(): inotify is not available on this system")
+
+        self.directory = os.path.normpath(directory)
+        self._libc = _libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            lt.error_and_raise(OSError, f"Error in DirectoryWatcher(): inotify_init1 failed: {os.strerror(errno)}")
+        wd = self._libc.inotify_add_watch(self._fd, self.directory.encode(), _IN_CREATE | _IN_MOVED_TO)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            lt.error_and_raise(
+                OSError,
+                f"Error in DirectoryWatcher(): can't watch directory \"{self.directory}\": {os.strerror(errno)}",
+            )
+
+        # Take the snapshot after the watch has been added, so that every file is
+        # either in the snapshot or generates an event.
+        self.seen: set[str] = set(os.listdir(self.directory))
+        """ The names of all the files that have existed in the directory since this watcher was created. """
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Returns True if inotify can be used on this system."""
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            return hasattr(_libc(), "inotify_init1")
+        except OSError:
+            return False
+
+    def _read_events(self) -> list[str]:
+        names: list[str] = []
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, cookie, name_len = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset : offset + name_len].rstrip(b"\0").decode()
+                offset += name_len
+                if mask & _IN_Q_OVERFLOW:
+                    # we missed some events, fall back to looking at the directory contents
+                    names += os.listdir(self.directory)
+                elif name != "":
+                    names.append(name)
+        self.seen.update(names)
+        return names
+
+    def wait(self, timeout: float) -> list[str]:
+        """Blocks until at least one new file appears in the directory, or the timeout expires.
+
+        Args:
+        -----
+            timeout (float): How long to wait, in seconds.
+
+        Returns:
+        --------
+            list[str]: The names of the files that appeared. Empty if the timeout expired.
+        """
+        names = self._read_events()
+        if len(names) > 0:
+            return names
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if len(readable) == 0:
+            return []
+        return self._read_events()
+
+    def has_seen(self, path_name_ext: str) -> bool:
+        """Returns True if the given file has existed in the watched directory at any point since this watcher was created."""
+        self._read_events()
+        dir_name, name_ext = os.path.split(os.path.normpath(path_name_ext))
+        if dir_name != self.directory:
+            return False
+        return name_ext in self.seen
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
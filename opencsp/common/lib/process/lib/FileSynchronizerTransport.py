@@ -0,0 +1,298 @@
+import os
+import random
+import time
+
+import opencsp.common.lib.opencsp_path.opencsp_root_path as orp
+import opencsp.common.lib.process.lib.SynchronizerTransportAbstract as sta
+import opencsp.common.lib.process.parallel_file_tools as pft
+import opencsp.common.lib.tool.file_tools as ft
+import opencsp.common.lib.tool.log_tools as lt
+
+
+class FileSynchronizerTransport(sta.SynchronizerTransportAbstract):
+    path = os.path.join(orp.opencsp_temporary_dir(), "synchronize_servers_by_file")
+
+    def __init__(self, path: str = None, poll_interval: float = 1, settle_time: float = 5):
+        """Synchronizes servers by creating and polling for indicator files on a shared file system.
+
+        This is the original ServerSynchronizer signaling mechanism, and works
+        anywhere that all servers share a (network) file system. In particular,
+        the opencsp_temporary_dir() is utilized by default.
+
+        Args:
+        -----
+            path (str, optional): The shared directory to create the indicator files in. Defaults to the class path.
+            poll_interval (float, optional): How often to check for indicator files, in seconds. Defaults to 1.
+            settle_time (float, optional): How long to give the other servers to observe the state of the shared file
+                system, after startup cleanup and after each wait. Should be several times longer than the
+                poll_interval. Defaults to 5.
+        """
+        super().__init__()
+        self.path = self.__class__.path if path == None else path
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+
+    def _attach(self):
+        # Clean out any existing wait, stop, error, and value files
+        ft.create_directories_if_necessary(self.path)
+        try:
+            ft.delete_files_in_directory(self.path, "*wait*")
+            if self.server_index == 0:
+                ft.delete_files_in_directory(self.path, "*value*.txt")
+        except FileNotFoundError:
+            # Probably another server deleted a file we were also trying to delete.
+            pass
+        if self.server_index == 0:
+            self._remove_all_stop_files()
+        else:
+            # have all other servers wait for server 0 to remove the stop and error files
+            time.sleep(self.settle_time)
+
+    def _wait_on_files(
+        self, wait_file_path_name_exts: list[str], stop_file_path_name_exts: list[str] = None, msg: str = None
+    ):
+        """Wait for all of the given "wait" indicator files (or their corresponding "stop" indicator files) to exist."""
+        alternates: dict[str, list[str]] = {}
+        if stop_file_path_name_exts != None:
+            for i in range(len(wait_file_path_name_exts)):
+                alternates[wait_file_path_name_exts[i]] = [stop_file_path_name_exts[i]]
+        pft.wait_on_files(
+            wait_file_path_name_exts, self.timeout, alternates=alternates, msg=msg, poll_interval=self.poll_interval
+        )
+        lt.debug(f"Server @{self.server_index}: found all files")
+        # wait for all servers to see that the files exist
+        time.sleep(self.settle_time)
+
+    def _settle_before_cleanup(self):
+        """Called after stop() has read the error files, before it removes the stop and error files.
+        _wait_on_files() already gave the other servers time to see the stop files, so there's nothing to do here."""
+        pass
+
+    def _get_file_stopped(self, other_server_index: int):
+        """Returns the path_name_ext of the "stopped" indicator file.
+
+        Parameters:
+        -----------
+            - other_server_index (int): The index of the server to get the indicator file for.
+        """
+        return f"{self.path}/stopped_{other_server_index}"
+
+    def _get_file_error(self, other_server_index: int):
+        """Returns the path_name_ext of the "error" indicator file.
+
+        Parameters:
+        -----------
+            - other_server_index (int): The index of the server to get the indicator file for.
+        """
+        return f"{self.path}/error_{other_server_index}"
+
+    def _get_file_waiting(self, other_server_index: int, synchronization_index: int):
+        """Returns the path_name_ext of the "wait" indicator file.
+
+        Parameters:
+        -----------
+            - other_server_index (int): The index of the server to get the indicator file for.
+            - synchronization_index (int): Essentially the step number for which wait() call to wait for.
+        """
+        if synchronization_index == 0:
+            # special case for the first index 0, so that when we call ft.delete_files()/wait() in _attach(), we don't accidentally delete id 0 files
+            return f"{self.path}/startup_{synchronization_index}_{other_server_index}"
+        return f"{self.path}/wait_{synchronization_index}_{other_server_index}"
+
+    def _get_file_value(self, other_server_index: int, synchronization_index: int):
+        """Returns the path_name_ext of the "value" communication file.
+
+        Parameters:
+        -----------
+            - other_server_index (int): The index of the server to get the indicator file for.
+            - synchronization_index (int): Essentially the step number for which wait() call to wait for.
+        """
+        return f"{self.path}/value_{synchronization_index}_{other_server_index}.txt"
+
+    def get_stopped_servers(self):
+        """Get a list of servers that have stopped (aka have "stopped" indicator files).
+
+        Returns:
+        --------
+            server_idxs (list[int]): List of all the stopped server indexes."""
+        ret: list[int] = []
+        all_file_path_name_exts = [(i, self._get_file_stopped(i)) for i in range(self.num_servers)]
+        for other_server_index, file_path_name_ext in all_file_path_name_exts:
+            if ft.file_exists(file_path_name_ext):
+                ret.append(other_server_index)
+        return ret
+
+    def get_errored_servers(self):
+        """Get a list of servers that have errored (aka have "errored" indicator files).
+
+        Returns:
+        --------
+            ret (list[tuple[int,str,str]]): List of all the errored server indexes, error types, and error messages."""
+        ret: list[tuple[int, str, str]] = []
+        all_file_path_name_exts = [(i, self._get_file_error(i)) for i in range(self.num_servers)]
+        for other_server_index, file_path_name_ext in all_file_path_name_exts:
+            if ft.file_exists(file_path_name_ext):
+                try:
+                    lines = ft.read_text_file(file_path_name_ext)
+                    err_type, err_msg = lines[0], '\n'.join(lines[1:])
+                except:
+                    err_type, err_msg = "unknown error", "N/A"
+                ret.append(tuple([other_server_index, err_type, err_msg]))
+        return ret
+
+    def _write_value(self, synchronization_index: int, value: str):
+        my_file_path_name_ext = self._get_file_value(self.server_index, synchronization_index)
+        my_file_path_name_ext_tmp = my_file_path_name_ext + ".tmp"
+
+        # remove the stale file, if any
+        if ft.file_exists(my_file_path_name_ext):
+            lt.warn(
+                f"Warning: in ServerSynchronizer.gather(), value file {my_file_path_name_ext} "
+                + "should not exist yet! This probably indicates a bug in the flow of your synchronized server code!"
+            )
+            ft.delete_file(my_file_path_name_ext)
+
+        # write my contents to the file
+        if ft.file_exists(my_file_path_name_ext_tmp):
+            ft.delete_file(my_file_path_name_ext_tmp)
+        try:
+            with open(my_file_path_name_ext_tmp, "w") as fout:
+                fout.write(value)
+            ft.rename_file(my_file_path_name_ext_tmp, my_file_path_name_ext)
+
+        except Exception as ex:
+            if ft.file_exists(my_file_path_name_ext):
+                ft.delete_file(my_file_path_name_ext)
+            raise
+
+        finally:
+            if ft.file_exists(my_file_path_name_ext_tmp):
+                ft.delete_file(my_file_path_name_ext_tmp)
+
+    def _read_values(self, synchronization_index: int) -> list[str]:
+        ret: list[str] = []
+        for other_idx in range(self.num_servers):
+            other_file_path_name_ext = self._get_file_value(other_idx, synchronization_index)
+            if ft.file_exists(other_file_path_name_ext):
+                with open(other_file_path_name_ext, "r") as fin:
+                    ret.append(fin.read())
+            else:
+                ret.append(None)
+        return ret
+
+    def barrier(self, synchronization_index: int, check_for_stopped_servers: bool, value: str = None) -> list[str]:
+        """Wait for all servers to reach this point.
+
+        This method uses the "wait" indicator files, as named by the _get_file_waiting() method,
+        to wait for all other servers to reach this point. The steps to waiting here are:
+            - (1) create this server's value and wait indicator files
+            - (2) look for stopped servers to exclude from the wait check (if check_for_stopped_servers)
+            - (3) wait for any still-running server to generate their own wait indicator files
+            - (4) remove this server's wait indicator file
+            - (5) read the values from all servers"""
+        # Getting ready for the _next_ wait():
+        # Make sure the next synchronization files don't exist.
+        # This must happen before creating my file, since other servers can
+        # start the next wait as soon as they see my file.
+        for i in range(self.num_servers):
+            next_file_path_name_ext = self._get_file_waiting(i, synchronization_index + 1)
+            if ft.file_exists(next_file_path_name_ext):
+                lt.warn(
+                    f"Warning: in ServerSynchronizer.wait(), next synchronization file {next_file_path_name_ext} "
+                    + "should not exist yet! This probably indicates a bug in the flow of your synchronized server code!"
+                )
+                ft.delete_file(next_file_path_name_ext, error_on_not_exists=False)
+
+        # create my files (1)
+        if value != None:
+            self._write_value(synchronization_index, value)
+        my_file_path_name_ext = self._get_file_waiting(self.server_index, synchronization_index)
+        if not ft.file_exists(my_file_path_name_ext):
+            ft.create_file(my_file_path_name_ext)
+        else:
+            lt.warn(
+                f"Warning: in ServerSynchronizer.wait(), current synchronization file {my_file_path_name_ext} "
+                + "should not exist yet! This probably indicates a bug in the flow of your synchronized server code!"
+            )
+
+        try:
+            # wait for all servers (2,3)
+            stopped_idxs = []
+            stop_file_path_name_exts = None
+            if check_for_stopped_servers:
+                stopped_idxs = self.get_stopped_servers()
+            running_idxs = list(filter(lambda i: i not in stopped_idxs, range(self.num_servers)))
+            wait_file_path_name_exts = [self._get_file_waiting(i, synchronization_index) for i in running_idxs]
+            if check_for_stopped_servers:
+                stop_file_path_name_exts = [self._get_file_stopped(i) for i in running_idxs]
+            self._wait_on_files(wait_file_path_name_exts, stop_file_path_name_exts, msg=f"step {synchronization_index}")
+
+        finally:
+            # delete my file (4)
+            ft.delete_file(my_file_path_name_ext)
+
+        # gather the values (5)
+        if value == None:
+            return [None] * self.num_servers
+        return self._read_values(synchronization_index)
+
+    def _remove_all_stop_files(self):
+        """remove existing "stopped" and "errored" files"""
+        for i in range(self.num_servers):
+            stop_file_path_name_ext = self._get_file_stopped(i)
+            error_file_path_name_ext = self._get_file_error(i)
+            for file_path_name_ext in [stop_file_path_name_ext, error_file_path_name_ext]:
+                if ft.file_exists(file_path_name_ext):
+                    try:
+                        os.remove(file_path_name_ext)
+                    except Exception as ex:
+                        if isinstance(ex, FileNotFoundError) or isinstance(ex, PermissionError):
+                            # Probably just attempted to delete a file at the same time as another server.
+                            # Randomly backoff to reduce the likelihood of this happening again.
+                            time.sleep(random.randint(1, 10) / 10)
+
+    def stop(self, error_type: str = None, error_msg: str = None) -> list[tuple[int, str, str]]:
+        """Create the stop (and error) signal files, wait for other servers to stop, and remove the stop files.
+
+        This works in essentially the same way as the barrier() method, except that it is waiting on "stopped" files instead of "wait" files.
+        """
+        # create my "error" file, if any
+        # This is written before the "stopped" file, and renamed into place, so
+        # that other servers never see a stopped server with a partial error file.
+        if error_type != None:
+            my_file_path_name_ext = self._get_file_error(self.server_index)
+            if not ft.file_exists(my_file_path_name_ext):
+                with open(my_file_path_name_ext + ".tmp", "w") as err_file:
+                    err_file.write(error_type + "\n")
+                    err_file.write(error_msg)
+                os.replace(my_file_path_name_ext + ".tmp", my_file_path_name_ext)
+            else:
+                lt.warn(
+                    f"Warning: in ServerSynchronizer.stop(), error synchronization file {my_file_path_name_ext} "
+                    + "should not exist yet! This probably indicates a bug in the flow of your synchronized server code!"
+                )
+
+        # create my "stopped" file
+        my_file_path_name_ext = self._get_file_stopped(self.server_index)
+        if not ft.file_exists(my_file_path_name_ext):
+            ft.create_file(my_file_path_name_ext)
+        else:
+            lt.warn(
+                f"Warning: in ServerSynchronizer.stop(), stop synchronization file {my_file_path_name_ext} "
+                + "should not exist yet! This probably indicates a bug in the flow of your synchronized server code!"
+            )
+
+        # wait for all other servers to stop
+        all_stop_files = [self._get_file_stopped(i) for i in range(self.num_servers)]
+        self._wait_on_files(all_stop_files, None, msg="end step")
+
+        # Delete the stop files.
+        # Note: if self._wait_on_files(all_stop_files) times out, then an
+        # exception will be thrown and this code will never be reached.
+        # This is intended behavior, since we want the stop file to still
+        # be here by the time that the other servers are ready to stop.
+        errored_servers = self.get_errored_servers()
+        self._settle_before_cleanup()
+        self._remove_all_stop_files()
+
+        return errored_servers
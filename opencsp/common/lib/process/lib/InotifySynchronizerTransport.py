@@ -0,0 +1,64 @@
+import time
+
+import opencsp.common.lib.process.lib.DirectoryWatcher as dw
+import opencsp.common.lib.process.lib.FileSynchronizerTransport as fst
+import opencsp.common.lib.process.parallel_file_tools as pft
+import opencsp.common.lib.tool.log_tools as lt
+
+
+class InotifySynchronizerTransport(fst.FileSynchronizerTransport):
+    def __init__(self, path: str = None, settle_time: float = 5):
+        """Like the FileSynchronizerTransport, but wakes up on inotify events instead of polling for files.
+
+        Because every indicator file that has been created in the synchronization
+        directory is remembered by the DirectoryWatcher, servers don't need to
+        linger after each wait() for the other servers to notice their files.
+        This removes the polling latency and the per-wait settle time.
+
+        inotify only sees changes made through the local kernel, so this
+        transport is only appropriate when all the "servers" are processes on
+        the same machine (or at least all create their files on a local file
+        system). For servers spread across a network file system, use the
+        FileSynchronizerTransport or TcpSynchronizerTransport instead. Use
+        DirectoryWatcher.is_supported() to check if this transport is available.
+
+        Args:
+        -----
+            path (str, optional): The directory to create the indicator files in. Defaults to the class path.
+            settle_time (float, optional): How long servers other than 0 wait during startup, for server 0 to clean up
+                old indicator files, and how long servers wait in stop() before cleaning up the stop files. Defaults to 5.
+        """
+        super().__init__(path, poll_interval=1, settle_time=settle_time)
+        self.watcher: dw.DirectoryWatcher = None
+
+    def _attach(self):
+        super()._attach()
+        self.watcher = dw.DirectoryWatcher(self.path)
+
+    def _wait_on_files(
+        self, wait_file_path_name_exts: list[str], stop_file_path_name_exts: list[str] = None, msg: str = None
+    ):
+        """Wait for all of the given "wait" indicator files (or their corresponding "stop" indicator files) to have existed."""
+        alternates: dict[str, list[str]] = {}
+        if stop_file_path_name_exts != None:
+            for i in range(len(wait_file_path_name_exts)):
+                alternates[wait_file_path_name_exts[i]] = [stop_file_path_name_exts[i]]
+        pft.wait_on_files(
+            wait_file_path_name_exts,
+            self.timeout,
+            alternates=alternates,
+            msg=msg,
+            poll_interval=self.poll_interval,
+            watcher=self.watcher,
+        )
+        lt.debug(f"Server @{self.server_index}: found all files")
+
+    def _settle_before_cleanup(self):
+        # Other servers may still be creating their stop file or reading the error
+        # files, give them a chance to finish before removing those files.
+        time.sleep(self.settle_time)
+
+    def close(self):
+        if self.watcher != None:
+            self.watcher.close()
+            self.watcher = None
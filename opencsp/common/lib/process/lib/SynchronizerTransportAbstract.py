@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+
+
+class SynchronizerTransportAbstract(ABC):
+    """The signaling mechanism used by a ServerSynchronizer to communicate between servers.
+
+    The ServerSynchronizer is responsible for the bookkeeping (the synchronization
+    step number, error propagation, etc) and the transport is responsible for
+    getting messages between the servers. Implementations include:
+
+        - FileSynchronizerTransport: indicator files on a shared network file system (the default)
+        - InotifySynchronizerTransport: like the file transport, but event-driven for a local file system
+        - TcpSynchronizerTransport: a socket connection to a central coordinator
+    """
+
+    def __init__(self):
+        self.num_servers: int = None
+        self.server_index: int = None
+        self.timeout: float = None
+
+    def attach(self, num_servers: int, server_index: int, timeout: float):
+        """Called once by the ServerSynchronizer, before any other method, to prepare the transport for use.
+
+        Args:
+        -----
+            num_servers (int): How many servers are being synchronized.
+            server_index (int): Which server this is (indexing starts at 0).
+            timeout (float): Maximum amount of time to wait for other servers, in seconds.
+        """
+        self.num_servers = num_servers
+        self.server_index = server_index
+        self.timeout = timeout
+        self._attach()
+
+    @abstractmethod
+    def _attach(self):
+        """Prepare the transport for use. num_servers, server_index, and timeout have already been set."""
+
+    @abstractmethod
+    def barrier(self, synchronization_index: int, check_for_stopped_servers: bool, value: str = None) -> list[str]:
+        """Signal that this server has reached the given synchronization step and block until all other servers have too.
+
+        Args:
+        -----
+            synchronization_index (int): The step number. Every server calls barrier() with the same sequence of steps.
+            check_for_stopped_servers (bool): If True, then servers that have called stop() are not waited on.
+            value (str, optional): A value to share with all other servers. Defaults to None.
+
+        Returns:
+        --------
+            list[str]: The value from each server, in server index order. None for servers that didn't provide a value.
+
+        Raises:
+        -------
+            TimeoutError: If not all servers reach this step within the timeout.
+        """
+
+    @abstractmethod
+    def stop(self, error_type: str = None, error_msg: str = None) -> list[tuple[int, str, str]]:
+        """Signal that this server has stopped and block until all other servers have stopped.
+
+        Args:
+        -----
+            error_type (str, optional): The class name of the error this server stopped with, if any.
+            error_msg (str, optional): The message of the error this server stopped with, if any.
+
+        Returns:
+        --------
+            list[tuple[int, str, str]]: The (server_index, error_type, error_msg) of every server that stopped with an error.
+        """
+
+    @abstractmethod
+    def get_stopped_servers(self) -> list[int]:
+        """Returns the indexes of the servers that have called stop()."""
+
+    @abstractmethod
+    def get_errored_servers(self) -> list[tuple[int, str, str]]:
+        """Returns the (server_index, error_type, error_msg) of every server that has stopped with an error."""
+
+    def close(self):
+        """Release any resources held by this transport. Called after stop()."""
+        pass
@@ -0,0 +1,254 @@
+import json
+import socket
+import threading
+import time
+
+import opencsp.common.lib.process.lib.SynchronizerTransportAbstract as sta
+import opencsp.common.lib.tool.log_tools as lt
+
+
+def _send_message(sock: socket.socket, message: dict):
+    sock.sendall((json.dumps(message) + "\n").encode())
+
+
+def _recv_message(sock_file) -> dict:
+    line = sock_file.readline()
+    if line == "":
+        raise ConnectionError("Connection to the server synchronizer closed unexpectedly")
+    return json.loads(line)
+
+
+class TcpSynchronizerCoordinator:
+    def __init__(self, num_servers: int, host: str = "127.0.0.1", port: int = 0, timeout: float = 1000):
+        """Central coordinator that all TcpSynchronizerTransports connect to.
+
+        Each server holds a single socket connection to the coordinator. When
+        a server reaches a barrier it sends one message and then blocks on the
+        reply, which the coordinator sends as soon as the last server arrives.
+        There is no polling, so barrier latency is one network round trip.
+
+        Typically the coordinator is started automatically by server 0's
+        TcpSynchronizerTransport. It can also be started on its own, for
+        example in a unit test where all the "servers" are threads in the same
+        process::
+
+            coordinator = TcpSynchronizerCoordinator(num_servers=4)
+            coordinator.start()
+            transport = TcpSynchronizerTransport("127.0.0.1", coordinator.port, host_coordinator=False)
+
+        Args:
+        -----
+            num_servers (int): How many servers will connect.
+            host (str, optional): The interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. 0 to choose any free port. Defaults to 0.
+            timeout (float, optional): Maximum amount of time to wait for all servers to reach a barrier. Defaults to 1000.
+        """
+        self.num_servers = num_servers
+        self.host = host
+        self.timeout = timeout
+
+        self._lock = threading.Condition()
+        self._arrivals: dict[int, dict[int, tuple[str, bool]]] = {}
+        """ synchronization_index: {server_index: (value, check_for_stopped_servers)} """
+        self._stopped: set[int] = set()
+        self._errors: dict[int, tuple[str, str]] = {}
+        self._num_stop_replies = 0
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+        self._listener = socket.create_server((host, port))
+        self.port: int = self._listener.getsockname()[1]
+        """ The port that the coordinator is listening on. """
+
+    def start(self):
+        """Start accepting connections in a background thread."""
+        thread = threading.Thread(target=self._accept_loop, daemon=True)
+        thread.start()
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                # listener closed
+                break
+            thread = threading.Thread(target=self._handle_connection, args=[conn], daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _errors_list(self) -> list[tuple[int, str, str]]:
+        return [[idx, self._errors[idx][0], self._errors[idx][1]] for idx in sorted(self._errors.keys())]
+
+    def _barrier_released(self, synchronization_index: int) -> bool:
+        arrivals = self._arrivals.get(synchronization_index, {})
+        allow_stopped = all([check for _, check in arrivals.values()])
+        for server_index in range(self.num_servers):
+            if server_index in arrivals:
+                continue
+            if allow_stopped and server_index in self._stopped:
+                continue
+            return False
+        return True
+
+    def _handle_barrier(self, message: dict) -> dict:
+        synchronization_index = message["synchronization_index"]
+        with self._lock:
+            arrivals = self._arrivals.setdefault(synchronization_index, {})
+            arrivals[message["server_index"]] = (message["value"], message["check_for_stopped_servers"])
+            self._lock.notify_all()
+            released = self._lock.wait_for(lambda: self._barrier_released(synchronization_index), self.timeout)
+            if not released:
+                missing = [i for i in range(self.num_servers) if i not in arrivals]
+                return {
+                    "timeout": f"Could not find {len(missing)}/{self.num_servers} servers at step {synchronization_index}: {missing}"
+                }
+            values = [arrivals[i][0] if i in arrivals else None for i in range(self.num_servers)]
+            return {"values": values}
+
+    def _handle_stop(self, message: dict) -> dict:
+        with self._lock:
+            self._stopped.add(message["server_index"])
+            if message["error_type"] != None:
+                self._errors[message["server_index"]] = (message["error_type"], message["error_msg"])
+            self._lock.notify_all()
+            released = self._lock.wait_for(lambda: len(self._stopped) == self.num_servers, self.timeout)
+            if not released:
+                missing = [i for i in range(self.num_servers) if i not in self._stopped]
+                return {"timeout": f"Could not find {len(missing)}/{self.num_servers} servers at end step: {missing}"}
+            return {"errors": self._errors_list()}
+
+    def _handle_connection(self, conn: socket.socket):
+        with conn, conn.makefile("r") as conn_file:
+            while True:
+                try:
+                    message = _recv_message(conn_file)
+                except (ConnectionError, OSError, json.JSONDecodeError):
+                    break
+
+                if message["type"] == "barrier":
+                    reply = self._handle_barrier(message)
+                elif message["type"] == "stop":
+                    reply = self._handle_stop(message)
+                elif message["type"] == "query":
+                    with self._lock:
+                        reply = {"stopped": sorted(self._stopped), "errors": self._errors_list()}
+                else:
+                    reply = {"error": f"unknown message type \"{message['type']}\""}
+
+                try:
+                    _send_message(conn, reply)
+                except OSError:
+                    break
+                if message["type"] == "stop":
+                    with self._lock:
+                        self._num_stop_replies += 1
+                        self._lock.notify_all()
+
+    def wait_for_stop_replies(self, timeout: float) -> bool:
+        """Block until every server has been told that all servers have stopped. Returns False on timeout."""
+        with self._lock:
+            return self._lock.wait_for(lambda: self._num_stop_replies >= self.num_servers, timeout)
+
+    def close(self):
+        self._closed = True
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+
+
+class TcpSynchronizerTransport(sta.SynchronizerTransportAbstract):
+    def __init__(self, host: str, port: int, host_coordinator: bool = None, connect_timeout: float = 60):
+        """Synchronizes servers through a socket connection to a TcpSynchronizerCoordinator.
+
+        This avoids the polling latency of the file based transports and doesn't
+        touch the shared file system at all, at the cost of needing one server
+        to be reachable by all the others at a known host and port.
+
+        Args:
+        -----
+            host (str): The hostname or address of the coordinator, typically the address of server 0.
+            port (int): The port of the coordinator.
+            host_coordinator (bool, optional): If True, then this server starts the coordinator (listening on all
+                interfaces at the given port). None to host the coordinator on server 0. Defaults to None.
+            connect_timeout (float, optional): How long to keep retrying the connection to the coordinator, to give
+                the hosting server a chance to start. Defaults to 60.
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.host_coordinator = host_coordinator
+        self.connect_timeout = connect_timeout
+        self.coordinator: TcpSynchronizerCoordinator = None
+        self._sock: socket.socket = None
+        self._sock_file = None
+
+    def _attach(self):
+        if self.host_coordinator == None:
+            self.host_coordinator = self.server_index == 0
+        if self.host_coordinator:
+            self.coordinator = TcpSynchronizerCoordinator(self.num_servers, "", self.port, self.timeout)
+            self.coordinator.start()
+            self.port = self.coordinator.port
+
+        # connect to the coordinator, retrying while it starts up
+        tstart = time.time()
+        while True:
+            try:
+                self._sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+                break
+            except OSError as ex:
+                if time.time() - tstart > self.connect_timeout:
+                    lt.error_and_raise(
+                        TimeoutError,
+                        f"Error in TcpSynchronizerTransport(): could not connect to the coordinator at {self.host}:{self.port}: {ex}",
+                    )
+                time.sleep(0.1)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # the coordinator enforces the barrier timeout, give it a bit of extra time to reply
+        self._sock.settimeout(self.timeout + 10)
+        self._sock_file = self._sock.makefile("r")
+
+    def _request(self, message: dict) -> dict:
+        message["server_index"] = self.server_index
+        _send_message(self._sock, message)
+        try:
+            reply = _recv_message(self._sock_file)
+        except socket.timeout:
+            lt.error_and_raise(TimeoutError, f"Timed out waiting on the coordinator for \"{message['type']}\"")
+        if "timeout" in reply:
+            lt.error_and_raise(TimeoutError, reply["timeout"])
+        if "error" in reply:
+            lt.error_and_raise(RuntimeError, reply["error"])
+        return reply
+
+    def barrier(self, synchronization_index: int, check_for_stopped_servers: bool, value: str = None) -> list[str]:
+        message = {
+            "type": "barrier",
+            "synchronization_index": synchronization_index,
+            "check_for_stopped_servers": check_for_stopped_servers,
+            "value": value,
+        }
+        return self._request(message)["values"]
+
+    def stop(self, error_type: str = None, error_msg: str = None) -> list[tuple[int, str, str]]:
+        reply = self._request({"type": "stop", "error_type": error_type, "error_msg": error_msg})
+        return [tuple(err) for err in reply["errors"]]
+
+    def get_stopped_servers(self) -> list[int]:
+        return self._request({"type": "query"})["stopped"]
+
+    def get_errored_servers(self) -> list[tuple[int, str, str]]:
+        return [tuple(err) for err in self._request({"type": "query"})["errors"]]
+
+    def close(self):
+        if self._sock != None:
+            self._sock_file.close()
+            self._sock.close()
+            self._sock = None
+        if self.coordinator != None:
+            # Don't exit until the other servers have heard that everyone stopped.
+            # Otherwise their stop() calls could be left without a reply.
+            self.coordinator.wait_for_stop_replies(self.timeout)
+            self.coordinator.close()
+            self.coordinator = None
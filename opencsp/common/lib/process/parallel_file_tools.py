@@ -1,21 +1,36 @@
 import copy
+import os
 import time
 
+import opencsp.common.lib.process.lib.DirectoryWatcher as dw
 import opencsp.common.lib.tool.file_tools as ft
 import opencsp.common.lib.tool.log_tools as lt
 
 
-def _file_or_alternate_existing_file(path_name_ext: str, alternates: list[str]):
-    if ft.file_exists(path_name_ext):
+def _file_exists(path_name_ext: str, watcher: dw.DirectoryWatcher = None):
+    if watcher != None and watcher.has_seen(path_name_ext):
+        return True
+    return ft.file_exists(path_name_ext)
+
+
+def _file_or_alternate_existing_file(path_name_ext: str, alternates: list[str], watcher: dw.DirectoryWatcher = None):
+    if _file_exists(path_name_ext, watcher):
         return path_name_ext
     else:
         for alternate in alternates:
-            if ft.file_exists(alternate):
+            if _file_exists(alternate, watcher):
                 return alternate
     return None
 
 
-def wait_on_files(files: list[str], timeout: float = 1000, alternates: dict[str, list[str]] = None, msg: str = None):
+def wait_on_files(
+    files: list[str],
+    timeout: float = 1000,
+    alternates: dict[str, list[str]] = None,
+    msg: str = None,
+    poll_interval: float = 1,
+    watcher: dw.DirectoryWatcher = None,
+):
     """Waits up to 'timeout' seconds for all the files to exist.
 
     Note: there is no guarantee that all files exist when this function completes.
@@ -31,6 +46,11 @@ def wait_on_files(files: list[str], timeout: float = 1000, alternates: dict[str,
             place of the given files. An example use case could be to check if an
             error file was created from a process that we're waiting on the
             output from.
+        - poll_interval (float): How many seconds to wait between checks for the files.
+        - watcher (DirectoryWatcher): If not None, then instead of sleeping for
+            poll_interval between checks, wake up as soon as the watcher sees a
+            new file. Files that the watcher has seen are considered found, even
+            if they have since been deleted.
 
     Returns:
     --------
@@ -59,7 +79,7 @@ def wait_on_files(files: list[str], timeout: float = 1000, alternates: dict[str,
     while tend - tstart < timeout:  # wait for up to timeout seconds
         new_waiting = []
         for f in waiting:
-            found_path_name_ext = _file_or_alternate_existing_file(f, alternates[f])
+            found_path_name_ext = _file_or_alternate_existing_file(f, alternates[f], watcher)
             if found_path_name_ext == None:
                 new_waiting.append(f)
             else:
@@ -74,17 +94,21 @@ def wait_on_files(files: list[str], timeout: float = 1000, alternates: dict[str,
             break
 
         tend = time.time()
-        tsleep = min(1, timeout - (tend - tstart))
+        tsleep = min(poll_interval, timeout - (tend - tstart))
         if tsleep > 0:
-            time.sleep(tsleep)
-            tend += tsleep
+            if watcher != None:
+                watcher.wait(tsleep)
+                tend = time.time()
+            else:
+                time.sleep(tsleep)
+                tend += tsleep
 
     # check, did all servers finish?
     if len(waiting) > 0:
         # timed out, check one more time
         new_waiting = []
         for f in waiting:
-            found_path_name_ext = _file_or_alternate_existing_file(f, alternates[f])
+            found_path_name_ext = _file_or_alternate_existing_file(f, alternates[f], watcher)
             if found_path_name_ext == None:
                 new_waiting.append(f)
             else:
@@ -107,3 +131,32 @@ def wait_on_files(files: list[str], timeout: float = 1000, alternates: dict[str,
     # return the list of found files
     ret = [found_files[f] for f in files]
     return ret
+
+
+def claim_file(path_name_ext: str, contents: str = "") -> bool:
+    """Atomically create the given file, as a way of claiming some unit of work.
+
+    When many servers (or processes) call this function with the same path, at
+    most one of them gets a True return value. This makes it possible to hand
+    out work dynamically: every worker tries to claim each task in turn, and
+    only does the tasks that it successfully claims.
+
+    Note: this relies on O_EXCL file creation being atomic, which is true for
+    local file systems and NFSv3 and later.
+
+    Arguments:
+    ----------
+        - path_name_ext (str): The file to create. The parent directory must already exist.
+        - contents (str): Optional contents to write to the file, for example the name of the claiming server.
+
+    Returns:
+    --------
+        - True if this call created the file, False if it already existed.
+    """
+    try:
+        fd = os.open(path_name_ext, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as fout:
+        fout.write(contents)
+    return True
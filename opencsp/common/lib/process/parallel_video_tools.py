@@ -1,5 +1,6 @@
 import os
 
+import opencsp.common.lib.process.KeyframePartitioner as kp
 import opencsp.common.lib.process.ParallelPartitioner as ppart
 import opencsp.common.lib.process.ServerSynchronizer as ss
 import opencsp.common.lib.render_control.RenderControlVideo as rcv
@@ -80,108 +81,85 @@ def parallel_frames_to_videos(
 
 
 def parallel_video_to_frames(
-    num_servers: int, server_index: int, video_handler: vh.VideoHandler, server_synchronizer: ss.ServerSynchronizer
+    num_servers: int,
+    server_index: int,
+    video_handler: vh.VideoHandler,
+    server_synchronizer: ss.ServerSynchronizer,
+    target_chunk_frames: int = 300,
 ):
     """Extract all frames from the given video, where each server extracts the frames for part of the video.
     To extract all frames, execute this method on each server with that server's server_index.
 
-    We use the time select method "-ss start_time -to end_time", where each server starts at the
-    exact same time that the last server stopped. This way there should be a 1-frame overlap
-    between the frames that the servers output.
+    Server 0 probes the video's keyframes once, and splits the video into many
+    small chunks that each start on a keyframe (see KeyframePartitioner). The
+    servers then claim chunks one at a time until all chunks have been
+    extracted, so that faster servers do more of the work and a slow server
+    doesn't hold up the rest.
 
-    There is another method that could be frame-exact, meaning that there should be no (extra)
-    duplicate frames beyond what would be already duplicated by ffmpeg running on a single server.
-    The way to achieve this is with the "trim=start_frame=n:end_frame=m" option for the
-    output stream, where n and m are determined per-server based on the length and framerate
-    of the source video.
-    However, we don't use that method, because in practice what happens is ffmpeg duplicates the
-    first frame n times. So instead we use the likely ok but maybe not time select method.
+    Each chunk is extracted frame-exact, with a seek to its starting keyframe
+    and a frame count limit, and frames are written straight into the
+    destination directory with their global frame numbers. There are no
+    duplicate frames between servers and no merge or rename pass afterwards.
 
     Args:
     -----
         - num_servers (int): How many servers this is being evaluated on.
         - server_index (int): Which server out of num_servers this is being evaluated on. Indexing starts at 0.
         - video_handler (VideoHandler): The handler to use to extract the frames
-        - server_synchronizer (ServerSynchronizer): The synchronizer for all servers to wait on while collected extracted frames into a single directory.
+        - server_synchronizer (ServerSynchronizer): The synchronizer for all servers to wait on before and after extracting frames.
+        - target_chunk_frames (int): The minimum number of frames per chunk. Defaults to 300.
+
+    Returns:
+    --------
+        - int: The number of frames extracted by this server.
     """
     src_video_dir_name_ext = video_handler.src_video_dir_name_ext
     dst_frames_dir = video_handler.dst_frames_dir
     dst_example_frames_dir = video_handler.dst_example_frames_dir
     frame_control = video_handler.frame_control
+    plan_path_name_ext = os.path.join(dst_frames_dir, "_extraction_plan.json")
+    claims_dir = os.path.join(dst_frames_dir, "_extraction_claims")
 
-    # build the extraction directories for this server
-    dst_frames_dir_serv = os.path.join(dst_frames_dir, f"extraction_server_{server_index}")
-    ft.create_directories_if_necessary(dst_frames_dir_serv)
-    if dst_example_frames_dir != None:
-        dst_example_frames_dir_serv = os.path.join(dst_example_frames_dir, f"extraction_server_{server_index}")
-        ft.create_directories_if_necessary(dst_example_frames_dir_serv)
-    frame_name_format = frame_control.get_outframe_name(src_video_dir_name_ext, is_example_frames=False)
-    frame_name_format_example = frame_control.get_outframe_name(src_video_dir_name_ext, is_example_frames=True)
-    video_handler = vh.VideoHandler.VideoExtractor(
-        src_video_dir_name_ext, dst_frames_dir_serv, dst_example_frames_dir_serv, frame_control
-    )
-
-    # determine the number of frames in the video, and which ones this server should extract
-    video_tot_frames = video_handler.get_num_frames()
-    video_duration = video_handler.get_duration()
-    framerate = video_tot_frames / video_duration
-    single_server_range_nframes = int(video_tot_frames / num_servers)
-    single_server_range_seconds = single_server_range_nframes / framerate
-    rstart = single_server_range_seconds * server_index
-    rend = single_server_range_seconds * (server_index + 1)
-    lt.info(
-        f"In parallel_video_to_frames(), server @{server_index} (0-{num_servers-1}) extracting frames from {rstart:0.1f}s to {rend:0.1f}s"
-    )
+    # server 0: clean the destination directories and probe the keyframes, once for all servers
+    if server_index == 0:
+        for dst_dir in [dst_frames_dir, dst_example_frames_dir]:
+            if dst_dir == None:
+                continue
+            ft.create_directories_if_necessary(dst_dir)
+            frame_control.clean_dir(dst_dir)
+        if ft.directory_exists(claims_dir):
+            ft.delete_files_in_directory(claims_dir, "*.claim")
+        ft.create_directories_if_necessary(claims_dir)
+        partitioner = kp.KeyframePartitioner.from_video(src_video_dir_name_ext, target_chunk_frames)
+        partitioner.save(plan_path_name_ext)
+    server_synchronizer.wait()
 
-    # extract the frames!
-    video_handler.extract_frames(start_time=rstart, end_time=rend)
-
-    # remove any duplicates
-    duplicates_handler = vh.VideoHandler.VideoCreator(dst_frames_dir_serv, None, None, frame_control)
-    (non_duplicate_frame_files, duplicate_frame_files) = duplicates_handler.identify_duplicate_frames(0, 0)
-    for dup_frame in duplicate_frame_files:
-        dup_frame = os.path.join(dst_frames_dir_serv, dup_frame)
-        ft.delete_file(dup_frame)
-    for fi, src_frame in enumerate(non_duplicate_frame_files):
-        src_frame = os.path.join(dst_frames_dir_serv, src_frame)
-        dst_frame = os.path.join(dst_frames_dir_serv, frame_name_format % (fi + 1))
-        ft.rename_file(src_frame, dst_frame, is_file_check_only=(fi > 0))
+    # extract frames until there are no more chunks to claim
+    partitioner = kp.KeyframePartitioner.load(plan_path_name_ext)
+    example_frame_step = None
+    if frame_control.draw_example_frames and dst_example_frames_dir != None:
+        framerate = video_handler.get_num_frames() / video_handler.get_duration()
+        example_frame_step = max(int(round(framerate / frame_control.example_freq)), 1)
+    num_chunks, num_frames = 0, 0
+    for chunk in partitioner.claimed_chunks(claims_dir, f"server_{server_index}"):
+        lt.debug(
+            f"In parallel_video_to_frames(), server @{server_index} extracting chunk {chunk.chunk_index}: "
+            + f"frames {chunk.start_frame}-{chunk.start_frame + chunk.num_frames - 1}"
+        )
+        video_handler.extract_frame_range(chunk.start_frame, chunk.num_frames, chunk.seek_time, example_frame_step)
+        num_chunks += 1
+        num_frames += chunk.num_frames
     lt.info(
-        f"In parallel_video_to_frames(), server extracted {len(non_duplicate_frame_files)} frames and {len(duplicate_frame_files)} duplicates"
+        f"In parallel_video_to_frames(), server @{server_index} (0-{num_servers-1}) extracted {num_frames} frames "
+        + f"in {num_chunks}/{len(partitioner.chunks)} chunks"
     )
 
-    # if server 0, then:
-    # a) wait for all the other servers to finish
-    # b) collect their extracted frames into a single directory
+    # wait for all the servers to finish, then clean up the plan
     server_synchronizer.wait()
 
     if server_index == 0:
-        for dst_dir, fnf in [(dst_frames_dir, frame_name_format), (dst_example_frames_dir, frame_name_format_example)]:
-            if dst_dir == None:
-                continue
-
-            tot_frames = 0
-            for si in range(num_servers):
-                dst_dir_serv = os.path.join(dst_dir, f"extraction_server_{si}")
-                num_frames_serv = ft.count_items_in_directory(dst_dir_serv)
-
-                # move the non-duplicate frames to the common directory
-                for fi in range(1, num_frames_serv + 1):
-                    src_frame = os.path.join(dst_dir_serv, fnf % fi)
-                    dst_frame = os.path.join(dst_dir, fnf % (tot_frames + 1))
-                    # use the rename_file utility for the first file to make sure it got renamed successfully
-                    # only check for is_file for the rest of the files because the full check is slow
-                    ft.rename_file(src_frame, dst_frame, is_file_check_only=(fi > 1))
-                    tot_frames += 1
-                lt.info(f"Moved {num_frames_serv} frames from server {si}")
-
-                # check that the server's extraction directory is empty, then remove the directory
-                num_residual = ft.count_items_in_directory(dst_dir_serv)
-                if num_residual != 0:
-                    lt.warn(
-                        f"Warning: in parallel_video_to_frames(), server's extraction directory isn't empty! (found {num_residual} files)"
-                    )
-                else:
-                    os.rmdir(dst_dir_serv)
+        ft.delete_files_in_directory(claims_dir, "*.claim")
+        os.rmdir(claims_dir)
+        ft.delete_file(plan_path_name_ext)
 
-    server_synchronizer.wait()
+    return num_frames
@@ -0,0 +1,102 @@
+from concurrent import futures
+import os
+import shutil
+import unittest
+
+import opencsp.common.lib.process.KeyframePartitioner as kp
+import opencsp.common.lib.tool.file_tools as ft
+
+
+class TestKeyframePartitioner(unittest.TestCase):
+    path = os.path.join('common', 'lib', 'process', 'test', 'data', 'output', 'KeyframePartitioner')
+
+    def setUp(self):
+        super().setUp()
+        self.mypath = os.path.join(self.__class__.path, self._testMethodName)
+        # remove subdirectories such as "claims" too
+        if ft.directory_exists(self.mypath):
+            shutil.rmtree(self.mypath)
+        ft.create_directories_if_necessary(self.mypath)
+
+    def _assert_covers_all_frames(self, partitioner: kp.KeyframePartitioner):
+        next_frame = 0
+        for chunk_index, chunk in enumerate(partitioner.chunks):
+            self.assertEqual(chunk.chunk_index, chunk_index)
+            self.assertEqual(chunk.start_frame, next_frame)
+            self.assertGreater(chunk.num_frames, 0)
+            next_frame += chunk.num_frames
+        self.assertEqual(next_frame, partitioner.num_frames)
+
+    def test_parse_ffprobe_packets_reorders(self):
+        """Packets with B-frames are listed in decoding order, frame indices should be in display order."""
+        lines = ["0.000000,K__", "0.100000,___", "0.033333,___", "0.066667,___", "0.133333,K__", "", "N/A,___"]
+        num_frames, keyframe_indices, keyframe_times = kp.KeyframePartitioner.parse_ffprobe_packets(lines)
+        self.assertEqual(num_frames, 5)
+        self.assertEqual(keyframe_indices, [0, 4])
+        self.assertAlmostEqual(keyframe_times[1], 0.133333)
+
+    def test_parse_ffprobe_packets_nonzero_start(self):
+        lines = ["10.0,K_", "10.5,_", "11.0,K_"]
+        _, _, keyframe_times = kp.KeyframePartitioner.parse_ffprobe_packets(lines)
+        self.assertEqual(keyframe_times, [0.0, 1.0])
+
+    def test_chunks_aligned_to_keyframes(self):
+        # 30 fps, one keyframe every 10 frames
+        keyframe_indices = list(range(0, 95, 10))
+        keyframe_times = [i / 30 for i in keyframe_indices]
+        partitioner = kp.KeyframePartitioner(95, keyframe_indices, keyframe_times, target_chunk_frames=25)
+
+        self._assert_covers_all_frames(partitioner)
+        self.assertEqual([chunk.start_frame for chunk in partitioner.chunks], [0, 30, 60, 90])
+        self.assertEqual(partitioner.chunks[-1].num_frames, 5)
+        for chunk in partitioner.chunks:
+            self.assertIn(chunk.start_frame, keyframe_indices)
+            # seek to just before the keyframe, but after the previous frame
+            self.assertLessEqual(chunk.seek_time, chunk.start_frame / 30)
+            self.assertGreaterEqual(chunk.seek_time, (chunk.start_frame - 1) / 30)
+
+    def test_chunks_irregular_keyframes(self):
+        keyframe_indices = [3, 4, 50, 51, 120]
+        keyframe_times = [i / 25 for i in keyframe_indices]
+        partitioner = kp.KeyframePartitioner(130, keyframe_indices, keyframe_times, target_chunk_frames=1)
+
+        self._assert_covers_all_frames(partitioner)
+        self.assertEqual([chunk.start_frame for chunk in partitioner.chunks], [0, 3, 4, 50, 51, 120])
+        self.assertEqual(partitioner.chunks[0].seek_time, 0)
+
+    def test_no_frames(self):
+        partitioner = kp.KeyframePartitioner(0, [], [])
+        self.assertEqual(partitioner.chunks, [])
+
+    def test_save_load(self):
+        keyframe_indices = list(range(0, 1000, 12))
+        keyframe_times = [i / 24 for i in keyframe_indices]
+        partitioner = kp.KeyframePartitioner(1000, keyframe_indices, keyframe_times, target_chunk_frames=100)
+        plan_path_name_ext = os.path.join(self.mypath, "plan.json")
+        partitioner.save(plan_path_name_ext)
+
+        loaded = kp.KeyframePartitioner.load(plan_path_name_ext)
+        self.assertEqual(loaded.chunks, partitioner.chunks)
+
+    def test_claimed_chunks_split_between_workers(self):
+        """Every chunk should be claimed by exactly one of the workers."""
+        keyframe_indices = list(range(0, 1000, 10))
+        keyframe_times = [i / 30 for i in keyframe_indices]
+        partitioner = kp.KeyframePartitioner(1000, keyframe_indices, keyframe_times, target_chunk_frames=10)
+        claims_dir = os.path.join(self.mypath, "claims")
+
+        def claim_all(worker_idx: int):
+            return [chunk.chunk_index for chunk in partitioner.claimed_chunks(claims_dir, f"worker_{worker_idx}")]
+
+        with futures.ThreadPoolExecutor(4) as executor:
+            claimed = list(executor.map(claim_all, range(4)))
+
+        all_claimed = sorted(sum(claimed, []))
+        self.assertEqual(all_claimed, list(range(len(partitioner.chunks))))
+
+        # a late worker has nothing left to do
+        self.assertEqual(claim_all(4), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
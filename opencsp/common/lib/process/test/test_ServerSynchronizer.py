@@ -0,0 +1,136 @@
+import os
+import threading
+import unittest
+
+import opencsp.common.lib.process.ServerSynchronizer as ss
+import opencsp.common.lib.process.lib.DirectoryWatcher as dw
+import opencsp.common.lib.process.lib.FileSynchronizerTransport as fst
+import opencsp.common.lib.process.lib.InotifySynchronizerTransport as ist
+import opencsp.common.lib.process.lib.ServerSynchronizerError as sse
+import opencsp.common.lib.process.lib.TcpSynchronizerTransport as tst
+import opencsp.common.lib.tool.file_tools as ft
+
+
+class TestServerSynchronizer(unittest.TestCase):
+    path = os.path.join('common', 'lib', 'process', 'test', 'data', 'output', 'ServerSynchronizer')
+    num_servers = 3
+
+    def setUp(self):
+        super().setUp()
+        self.mypath = os.path.join(self.__class__.path, self._testMethodName)
+        ft.create_directories_if_necessary(self.mypath)
+        ft.delete_files_in_directory(self.mypath, "*")
+        self.coordinator: tst.TcpSynchronizerCoordinator = None
+
+    def tearDown(self):
+        if self.coordinator != None:
+            self.coordinator.close()
+        super().tearDown()
+
+    def _make_transport(self, kind: str):
+        if kind == "file":
+            return fst.FileSynchronizerTransport(self.mypath, poll_interval=0.05, settle_time=0.2)
+        elif kind == "inotify":
+            return ist.InotifySynchronizerTransport(self.mypath, settle_time=0.2)
+        elif kind == "tcp":
+            if self.coordinator == None:
+                self.coordinator = tst.TcpSynchronizerCoordinator(self.num_servers, timeout=10)
+                self.coordinator.start()
+            return tst.TcpSynchronizerTransport("127.0.0.1", self.coordinator.port, host_coordinator=False)
+
+    def _run_servers(self, kind: str, server_func) -> tuple[list, list[Exception]]:
+        """Simulate num_servers servers as threads, each calling server_func(synchronizer)."""
+        # create the transports up front, so that the tcp coordinator is only created once
+        transports = [self._make_transport(kind) for _ in range(self.num_servers)]
+        results = [None] * self.num_servers
+        errors: list[Exception] = [None] * self.num_servers
+
+        def run(server_index: int):
+            try:
+                synchronizer = ss.ServerSynchronizer(
+                    self.num_servers, server_index, timeout=10, transport=transports[server_index]
+                )
+                results[server_index] = server_func(synchronizer)
+            except Exception as ex:
+                errors[server_index] = ex
+
+        threads = [threading.Thread(target=run, args=[i]) for i in range(self.num_servers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+            self.assertFalse(thread.is_alive(), "Server thread didn't finish")
+        return results, errors
+
+    @staticmethod
+    def _wait_and_gather(synchronizer: ss.ServerSynchronizer):
+        try:
+            synchronizer.wait()
+            values = synchronizer.gather(f"value {synchronizer.server_index}")
+            synchronizer.wait()
+        finally:
+            synchronizer.stop()
+        return values
+
+    @staticmethod
+    def _server_1_errors(synchronizer: ss.ServerSynchronizer):
+        wait_error = None
+        try:
+            try:
+                synchronizer.wait()
+                if synchronizer.server_index == 1:
+                    raise ValueError("server 1 failed")
+                synchronizer.wait()
+            except sse.ServerSynchronizerError as ex:
+                wait_error = ex
+                raise
+        except Exception as ex:
+            synchronizer.stop(ex)
+        finally:
+            synchronizer.stop()
+        return wait_error
+
+    def _test_wait_and_gather(self, kind: str):
+        results, errors = self._run_servers(kind, self._wait_and_gather)
+        self.assertEqual(errors, [None] * self.num_servers)
+        expected = [f"value {i}" for i in range(self.num_servers)]
+        for values in results:
+            self.assertEqual(values, expected)
+
+    def _test_error_propagation(self, kind: str):
+        results, errors = self._run_servers(kind, self._server_1_errors)
+        self.assertIsInstance(errors[1], ValueError)
+        for i in [0, 2]:
+            self.assertIsNone(errors[i])
+            self.assertIsInstance(results[i], sse.ServerSynchronizerError)
+            self.assertIn("server 1 encountered a ValueError", str(results[i]))
+
+    def test_single_server(self):
+        synchronizer = ss.ServerSynchronizer(1, 0)
+        synchronizer.wait()
+        self.assertEqual(synchronizer.gather("a"), ["a"])
+        synchronizer.stop()
+
+    def test_file_wait_and_gather(self):
+        self._test_wait_and_gather("file")
+
+    def test_file_error_propagation(self):
+        self._test_error_propagation("file")
+
+    def test_tcp_wait_and_gather(self):
+        self._test_wait_and_gather("tcp")
+
+    def test_tcp_error_propagation(self):
+        self._test_error_propagation("tcp")
+
+    @unittest.skipUnless(dw.DirectoryWatcher.is_supported(), "requires inotify")
+    def test_inotify_wait_and_gather(self):
+        self._test_wait_and_gather("inotify")
+
+    @unittest.skipUnless(dw.DirectoryWatcher.is_supported(), "requires inotify")
+    def test_inotify_error_propagation(self):
+        self._test_error_propagation("inotify")
+
+
+if __name__ == '__main__':
+    unittest.main()
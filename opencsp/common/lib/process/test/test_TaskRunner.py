@@ -0,0 +1,84 @@
+import os
+import time
+import unittest
+
+import opencsp.common.lib.process.TaskRunner as tr
+import opencsp.common.lib.tool.file_tools as ft
+
+
+def add_two(ival):
+    return ival + 2
+
+
+def add_two_slow_first(ival):
+    if ival == 0:
+        time.sleep(0.5)
+    return ival + 2
+
+
+def fail_on_three(ival):
+    if ival == 3:
+        raise RuntimeError("task 3 failed")
+    return ival + 2
+
+
+class TestTaskRunner(unittest.TestCase):
+    path = os.path.join('common', 'lib', 'process', 'test', 'data', 'output', 'TaskRunner')
+
+    def setUp(self):
+        super().setUp()
+        self.mypath = os.path.join(self.__class__.path, self._testMethodName)
+        ft.create_directories_if_necessary(self.mypath)
+        ft.delete_files_in_directory(self.mypath, "*")
+
+    def test_single_worker(self):
+        runner = tr.TaskRunner(num_workers=1)
+        results = runner.map(add_two, range(10))
+        self.assertEqual(results, [i + 2 for i in range(10)])
+
+    def test_many_workers_keeps_order(self):
+        """Results should be in input order, even though tasks complete out of order."""
+        runner = tr.TaskRunner(num_workers=4, chunksize=1)
+        results = runner.map(add_two_slow_first, range(20))
+        self.assertEqual(results, [i + 2 for i in range(20)])
+
+    def test_resume_from_checkpoints(self):
+        runner = tr.TaskRunner(num_workers=2, checkpoint_dir=self.mypath)
+
+        # first run fails partway through, but finished tasks are checkpointed
+        with self.assertRaises(RuntimeError):
+            tr.TaskRunner(num_workers=1, checkpoint_dir=self.mypath).map(fail_on_three, range(6))
+        self.assertTrue(runner.has_checkpoint("0"))
+        self.assertFalse(runner.has_checkpoint("3"))
+
+        # second run only evaluates the remaining tasks
+        results = runner.map(add_two, range(6))
+        self.assertEqual(results, [i + 2 for i in range(6)])
+        self.assertEqual(runner.num_skipped, 3)
+        self.assertEqual(sorted(runner.task_durations.keys()), ["3", "4", "5"])
+
+        # clearing removes the checkpoints
+        runner.clear_checkpoints()
+        self.assertFalse(runner.has_checkpoint("0"))
+
+    def test_task_ids(self):
+        runner = tr.TaskRunner(num_workers=1, checkpoint_dir=self.mypath)
+        results = runner.map(add_two, [1, 2], task_ids=["hel_a", "hel_b"])
+        self.assertEqual(results, [3, 4])
+        self.assertTrue(runner.has_checkpoint("hel_a"))
+
+        with self.assertRaises(ValueError):
+            runner.map(add_two, [1, 2], task_ids=["hel_a", "hel_a"])
+        with self.assertRaises(ValueError):
+            runner.map(add_two, [1, 2], task_ids=["hel_a"])
+
+    def test_stragglers(self):
+        runner = tr.TaskRunner(num_workers=1, straggler_min_seconds=0.1)
+        runner.map(add_two_slow_first, range(5))
+        stragglers = runner.stragglers()
+        self.assertEqual(len(stragglers), 1)
+        self.assertEqual(stragglers[0][0], "0")
+
+
+if __name__ == '__main__':
+    unittest.main()
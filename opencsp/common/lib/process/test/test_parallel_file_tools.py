@@ -77,6 +77,17 @@ class TestSubprocess(unittest.TestCase):
         pft.wait_on_files([path_name_ext], timeout=10)
         self.assertTrue(ft.file_exists(path_name_ext))
 
+    def test_claim_file(self):
+        path_name_ext = os.path.join(self.mypath, "0.claim")
+        ft.create_directories_if_necessary(self.mypath)
+        ft.delete_file(path_name_ext, error_on_not_exists=False)
+
+        # only the first claim succeeds
+        self.assertTrue(pft.claim_file(path_name_ext, "server_0"))
+        self.assertFalse(pft.claim_file(path_name_ext, "server_1"))
+        with open(path_name_ext, 'r') as fin:
+            self.assertEqual(fin.read(), "server_0")
+
 
 if __name__ == '__main__':
     unittest.main()
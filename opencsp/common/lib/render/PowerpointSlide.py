@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import copy
 import os
 from PIL import Image
@@ -6,6 +7,7 @@ import typing
 
 from opencsp.common.lib.render.lib.PowerpointImage import PowerpointImage
 from opencsp.common.lib.render.lib.PowerpointText import PowerpointText
+import opencsp.common.lib.render_control.RenderControlFigureRecord as rcfr
 from opencsp.common.lib.render_control.RenderControlPowerpointSlide import RenderControlPowerpointSlide
 import opencsp.common.lib.tool.file_tools as ft
 import opencsp.common.lib.tool.log_tools as lt
@@ -344,17 +346,43 @@ class PowerpointSlide:
         for text in self.texts:
             text.clear_tmp_save()
 
-    def save(self):
-        """Saves images and texts out to temporary files, as necessary."""
+    def save(self, num_workers: int = None):
+        """Saves images and texts out to temporary files, as necessary.
+
+        Images from arrays, PIL images, and files are encoded in parallel,
+        with num_workers threads (default one per cpu). Figure records are
+        saved one at a time, since matplotlib isn't thread safe."""
+        if num_workers == None:
+            num_workers = os.cpu_count()
+
+        # save figures and already saved images on this thread
+        threadsafe_images: list[PowerpointImage] = []
         for image in self.images:
-            image.save()
+            is_figure = isinstance(image.get_val(), rcfr.RenderControlFigureRecord)
+            if image.has_val() and not image.is_saved_to_file() and not is_figure:
+                threadsafe_images.append(image)
+            else:
+                image.save()
+
+        # encode all other images in parallel
+        if num_workers > 1 and len(threadsafe_images) > 1:
+            with ThreadPoolExecutor(min(num_workers, len(threadsafe_images))) as executor:
+                # list() to re-raise any exceptions
+                list(executor.map(PowerpointImage.save, threadsafe_images))
+        else:
+            for image in threadsafe_images:
+                image.save()
+
         for text in self.texts:
             text.save()
 
     def save_and_bake(self):
         """Saves the images and texts to temporary files, as with save().
         This also reduces image size and frees them from memory (note that this happens normally,
-        it just happens in render instead)."""
+        it just happens in render instead).
+
+        In-memory images (arrays and PIL images) are reduced before they are
+        encoded, so that each image is only encoded once."""
         self.save()
         for image in self.images:
             if image.has_val():
@@ -258,6 +258,72 @@ class VideoHandler:
         # Return.
         return n_frames
 
+    def extract_frame_range(self, start_frame: int, num_frames: int, seek_time: float, example_frame_step: int = None):
+        """Extracts exactly the frames [start_frame, start_frame+num_frames) from the video, with their global frame numbers.
+
+        Unlike extract_frames(), this doesn't clean the output directories first,
+        so that many calls (on many servers) can write their frames into the same
+        directories. The frames are named as if they had been extracted by a
+        single call to extract_frames() for the whole video, so no renaming is
+        necessary afterwards.
+
+        For the extraction to be frame-exact, seek_time must land on or just
+        before the keyframe at start_frame (and after the previous frame). See
+        KeyframePartitioner for a way to build such ranges.
+
+        Args:
+            - start_frame (int): The global (0-based) index of the first frame to extract.
+            - num_frames (int): How many frames to extract.
+            - seek_time (float): The time to seek to in the video before decoding, in seconds.
+            - example_frame_step (int): If not None and the frame control draws example frames, then also extract every
+                example_frame_step'th frame (counted globally from frame 0) as an example frame. Defaults to None.
+
+        Returns:
+            int: The number of frames extracted (not including example frames)
+        """
+        # Check input.
+        if not ft.file_exists(self.src_video_dir_name_ext):
+            lt.error_and_raise(
+                FileNotFoundError,
+                'ERROR: In VideoHandler.extract_frame_range(), src_video_dir_name_ext does not exist: "'
+                + str(self.src_video_dir_name_ext)
+                + '"',
+            )
+        if num_frames <= 0:
+            return 0
+
+        # common arguments
+        # "-vsync 0" passes frames through as they are decoded, without duplicating or dropping any to match a framerate
+        paths = {"INFILE": self.src_video_dir_name_ext}
+        input_args = f"-ss {seek_time:.6f} -i %INFILE% -vsync 0 -q:v 1 -qmin 1"
+
+        # extract the frames, numbered starting at the global index (ffmpeg frame names start at 1)
+        frame_path_name_ext = self.get_extracted_frame_path_and_name_format("output")
+        frame_dir, _, _ = ft.path_components(frame_path_name_ext)
+        ft.create_directories_if_necessary(frame_dir)
+        paths["DESTDIR"] = frame_path_name_ext
+        cmd = self._build_ffmpeg_cmd(
+            f"{input_args} -frames:v {num_frames} -start_number {start_frame + 1} %DESTDIR%", paths
+        )
+        lt.debug("In VideoHandler.extract_frame_range()")
+        subt.run(cmd)
+
+        # extract the example frames
+        if self.frame_control.draw_example_frames and example_frame_step != None:
+            first_example = -(-start_frame // example_frame_step)  # ceil
+            if first_example * example_frame_step < start_frame + num_frames:
+                example_path_name_ext = self.get_extracted_frame_path_and_name_format("example")
+                example_dir, _, _ = ft.path_components(example_path_name_ext)
+                ft.create_directories_if_necessary(example_dir)
+                paths["DESTDIR"] = example_path_name_ext
+                select = f"trim=end_frame={num_frames},select='not(mod(n+{start_frame}\\,{example_frame_step}))'"
+                cmd = self._build_ffmpeg_cmd(
+                    f'{input_args} -filter:v "{select}" -start_number {first_example + 1} %DESTDIR%', paths
+                )
+                subt.run(cmd)
+
+        return num_frames
+
     def get_extracted_frame_path_and_name_format(self, frame_type="output"):
         """Build the frame output name format, including the frame number (ex "-%05d").=
 
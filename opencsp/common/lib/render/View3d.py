@@ -3,11 +3,14 @@
 
 """
 
+from contextlib import contextmanager
 import numpy as np
 import matplotlib.image as mpimg
 import matplotlib.pyplot as plt
 from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
+import matplotlib.lines as mlines
 from numpy import ndarray
 import os
 from PIL import Image
@@ -65,6 +68,8 @@ class View3d(aph.AbstractPlotHandler):
         self.x_limits = None
         self.y_limits = None
         self.z_limits = None
+        # While batch drawing (see batch_draw()), the projected (style, lines, points) still to draw, in call order.
+        self._batch: list[tuple[rcps.RenderControlPointSeq, list[ndarray], list[ndarray]]] = None
 
     @property
     def view(self) -> Figure:
@@ -506,6 +511,10 @@ class View3d(aph.AbstractPlotHandler):
         if len(xyz) != 3:
             lt.error('ERROR: In draw_xyz(), len(xyz)=', len(xyz), ' is not equal to 3.')
             assert False
+        if self._batch is not None and label is None:
+            self._add_to_batch(style, [], self._project_xyz([xyz]))
+            return
+        self._flush_batch()
         if self.view_spec['type'] == '3d':
             self.axis.plot3D(
                 [xyz[0]],
@@ -595,6 +604,9 @@ class View3d(aph.AbstractPlotHandler):
             labels = [None] * len(p)
         if style == None:
             style = rcps.default(markersize=2)
+        if all(label == None for label in labels):
+            self.draw_xyz_points(p, style)
+            return
         for x, y, z, label in zip(p.x, p.y, p.z, labels):
             self.draw_xyz((x, y, z), style, label)
 
@@ -616,6 +628,10 @@ class View3d(aph.AbstractPlotHandler):
                 xyz_list.append(input_xyz_list[0])
             else:
                 xyz_list = input_xyz_list
+            if self._batch is not None and label is None:
+                self._add_to_batch(style, self._project_xyz(xyz_list), [])
+                return
+            self._flush_batch()
             # Draw the point list.
             if self.view_spec['type'] == '3d':
                 self.axis.plot3D(
@@ -730,6 +746,303 @@ class View3d(aph.AbstractPlotHandler):
         """Alternative to View3d.drawxyz_list that used the Vxyz class instead"""
         self.draw_xyz_list(V.data.T, close, style, label)
 
+    # BATCHED PLOTTING
+
+    @contextmanager
+    def batch_draw(self):
+        """Context in which points and lines are drawn with as few matplotlib
+        artists as possible, instead of one artist per call.
+
+        Calls to draw_xyz(), draw_xyz_list(), draw_pq(), and draw_pq_list()
+        without a label are collected while in this context, and drawn when
+        the context exits. In 2d views, this is much faster to create and render
+        for many small elements, such as the light paths of a ray trace. For
+        example::
+
+            with view.batch_draw():
+                for heliostat in heliostats:
+                    heliostat.draw(view, heliostat_styles)
+
+        Elements are drawn in the order of the calls, and look the same as
+        when drawn one at a time. Points and lines that are drawn immediately
+        inside this context, such as labeled ones, first draw the elements
+        collected so far to keep that order. In 2d views, consecutive lines
+        are drawn as one LineCollection, and the markers of consecutive calls
+        with the same style as one Line2D. In 3d views only the markers are
+        combined, because Axes3D orders collections by depth instead of by
+        zorder, and lines combined into one Line3D are antialiased differently
+        where they overlap.
+        """
+        if self._batch is not None:
+            # already batching
+            yield self
+            return
+
+        self._batch = []
+        try:
+            yield self
+        finally:
+            batch, self._batch = self._batch, None
+            self._draw_batch(batch)
+
+    def _flush_batch(self) -> None:
+        """Draws the elements collected so far by batch_draw(), so that they're
+        drawn before the next element that is drawn immediately."""
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._draw_batch(batch)
+
+    def _project_xyz(self, xyz_list) -> list[ndarray]:
+        """Projects the given xyz points into the coordinates of this view.
+
+        Returns a list of (N,3) arrays for 3d views, or (N,2) pq arrays
+        otherwise. For camera views, the points are split into contiguous
+        sequences of visible points."""
+        xyz_arr = np.asarray(xyz_list, dtype=float).reshape((-1, 3))
+        view_type = self.view_spec['type']
+        if view_type == '3d':
+            return [xyz_arr]
+        elif view_type == 'xy':
+            return [xyz_arr[:, [0, 1]]]
+        elif view_type == 'xz':
+            return [xyz_arr[:, [0, 2]]]
+        elif view_type == 'yz':
+            return [xyz_arr[:, [1, 2]]]
+        elif view_type == 'vplane':
+            return [np.array([vs.xyz2pq(xyz, self.view_spec) for xyz in xyz_arr], dtype=float).reshape((-1, 2))]
+        elif view_type == 'camera':
+            # Discard all "None" entries, and split into separate contiguous lists.
+            pq_arrs: list[ndarray] = []
+            pq_list = []
+            for xyz in xyz_arr:
+                pq = vs.xyz2pq(xyz, self.view_spec)
+                if pq:
+                    pq_list.append(pq)
+                elif len(pq_list) > 0:
+                    pq_arrs.append(np.array(pq_list, dtype=float))
+                    pq_list = []
+            if len(pq_list) > 0:
+                pq_arrs.append(np.array(pq_list, dtype=float))
+            return pq_arrs
+        else:
+            lt.error_and_raise(
+                RuntimeError,
+                "ERROR: In View3d._project_xyz(), unrecognized view_spec['type'] = '"
+                + str(view_type)
+                + "' encountered.",
+            )
+
+    def _add_to_batch(self, style: rcps.RenderControlPointSeq, lines: list[ndarray], points: list[ndarray]):
+        # lines are drawn before points within an entry, so don't add lines after points
+        if (
+            (len(self._batch) > 0)
+            and (self._batch[-1][0] is style)
+            and (len(lines) == 0 or len(self._batch[-1][2]) == 0)
+        ):
+            self._batch[-1][1].extend(lines)
+            self._batch[-1][2].extend(points)
+        else:
+            self._batch.append((style, list(lines), list(points)))
+
+    @staticmethod
+    def _line_properties(style: rcps.RenderControlPointSeq) -> tuple[bool, bool, str, str]:
+        """Returns (has_line, has_markers, capstyle, joinstyle) of a Line2D drawn with the given style."""
+        line = mlines.Line2D([], [], linestyle=style.linestyle, marker=style.marker)
+        has_line = line.get_linestyle() not in ['None', ' ', '']
+        has_markers = line.get_marker() not in ['None', ' ', '', None]
+        if line.is_dashed():
+            return has_line, has_markers, line.get_dash_capstyle(), line.get_dash_joinstyle()
+        return has_line, has_markers, line.get_solid_capstyle(), line.get_solid_joinstyle()
+
+    def _draw_batch(
+        self, batch: list[tuple[rcps.RenderControlPointSeq, list[ndarray], list[ndarray]]], label: str = None
+    ):
+        """Draws the given (style, projected lines, projected points) entries, in order.
+
+        In 2d views, consecutive lines are drawn as a single LineCollection with
+        the same zorder, caps, and joins as Line2D, and the markers of each
+        entry as a single marker-only Line2D. A labeled entry is drawn as one
+        Line2D so that its legend entry shows both its line and markers. In 3d
+        views, each line is drawn as its own Line3D, and the points of each
+        entry as one Line3D. The label is only applied to the first entry."""
+        batch = [(style, lines, points) for style, lines, points in batch if (len(lines) + len(points)) > 0]
+        if len(batch) == 0:
+            return
+        if self.view_spec['type'] == '3d':
+            for style, lines, points in batch:
+                for line in lines:
+                    self._draw_batch_entry(style, [line], [], label)
+                    label = None
+                if len(points) > 0:
+                    self._draw_batch_entry(style, [], points, label)
+                    label = None
+            return
+        if label is not None:
+            self._draw_batch_entry(*batch[0], label=label)
+            batch = batch[1:]
+
+        collection_lines: list[ndarray] = []
+        collection_styles: list[rcps.RenderControlPointSeq] = []
+        collection_capjoin: tuple[str, str] = None
+
+        def draw_collection():
+            if len(collection_lines) > 0:
+                self.axis.add_collection(
+                    LineCollection(
+                        collection_lines,
+                        linestyles=[style.linestyle for style in collection_styles],
+                        linewidths=[style.linewidth for style in collection_styles],
+                        colors=[style.color for style in collection_styles],
+                        capstyle=collection_capjoin[0],
+                        joinstyle=collection_capjoin[1],
+                        zorder=mlines.Line2D.zorder,
+                    )
+                )
+                collection_lines.clear()
+                collection_styles.clear()
+
+        for style, lines, points in batch:
+            if (style.color is None) or (style.linewidth is None):
+                # default colors and widths are chosen by matplotlib per artist
+                draw_collection()
+                self._draw_batch_entry(style, lines, points)
+                continue
+
+            has_line, has_markers, capstyle, joinstyle = self._line_properties(style)
+            if has_line and (len(lines) > 0):
+                if (capstyle, joinstyle) != collection_capjoin:
+                    draw_collection()
+                    collection_capjoin = (capstyle, joinstyle)
+                collection_lines.extend(lines)
+                collection_styles.extend([style] * len(lines))
+            if has_markers:
+                draw_collection()
+                vertices = np.concatenate(lines + points)
+                self.axis.plot(
+                    *vertices.T,
+                    linestyle='None',
+                    color=style.color,
+                    marker=style.marker,
+                    markersize=style.markersize,
+                    markeredgecolor=style.markeredgecolor,
+                    markeredgewidth=style.markeredgewidth,
+                    markerfacecolor=style.markerfacecolor,
+                )
+        draw_collection()
+
+    def _draw_batch_entry(
+        self, style: rcps.RenderControlPointSeq, lines: list[ndarray], points: list[ndarray], label: str = None
+    ):
+        """Draws the given projected lines and points as a single Line2D/Line3D, with NaN breaks between them."""
+        ndim = 3 if self.view_spec['type'] == '3d' else 2
+        pieces: list[ndarray] = []
+        for line in lines:
+            pieces.append(line)
+            pieces.append(np.full((1, ndim), np.nan))
+        for point_arr in points:
+            # break between every point
+            point_arr = np.concatenate((point_arr[:, np.newaxis, :], np.full((len(point_arr), 1, ndim), np.nan)), 1)
+            pieces.append(point_arr.reshape((-1, ndim)))
+        vertices = np.concatenate(pieces)[:-1]
+
+        plot = self.axis.plot3D if ndim == 3 else self.axis.plot
+        plot(
+            *vertices.T,
+            label=label,
+            linestyle=style.linestyle,
+            linewidth=style.linewidth,
+            color=style.color,
+            marker=style.marker,
+            markersize=style.markersize,
+            markeredgecolor=style.markeredgecolor,
+            markeredgewidth=style.markeredgewidth,
+            markerfacecolor=style.markerfacecolor,
+        )
+
+    def _draw_lines_batched(
+        self,
+        lines: list[list[ndarray]],
+        style: rcps.RenderControlPointSeq | list[rcps.RenderControlPointSeq],
+        label: str,
+    ):
+        """Draws the given projected lines, in order. Each entry in lines is the projection of one line."""
+        styles = style if isinstance(style, list) else [style] * len(lines)
+        if len(styles) != len(lines):
+            lt.error_and_raise(
+                ValueError,
+                f"Error in View3d._draw_lines_batched(): expected one style per line, but {len(styles)=} and {len(lines)=}",
+            )
+
+        batch: list[tuple[rcps.RenderControlPointSeq, list[ndarray], list[ndarray]]] = []
+        for line_style, line in zip(styles, lines):
+            if (len(batch) > 0) and (batch[-1][0] is line_style):
+                batch[-1][1].extend(line)
+            else:
+                batch.append((line_style, list(line), []))
+
+        if self._batch is not None and label is None:
+            for line_style, style_lines, _ in batch:
+                self._add_to_batch(line_style, style_lines, [])
+        else:
+            self._flush_batch()
+            self._draw_batch(batch, label)
+
+    def draw_xyz_lines(
+        self,
+        xyz_lines: list[list[list]] | list[ndarray] | list[Vxyz],
+        close=False,
+        style: rcps.RenderControlPointSeq | list[rcps.RenderControlPointSeq] = None,
+        label: str = None,
+    ) -> None:
+        """Draw many lines or closed polygons, with as few matplotlib artists as possible.
+
+        Looks the same as calling draw_xyz_list() for each line, but is much
+        faster for many lines in 2d views. See batch_draw().
+
+        Parameters
+        ----------
+            xyz_lines: The lines to draw. Each line is a list of xyz three vectors, an (N,3) array, or a Vxyz.
+            close: Draw each line as a closed polygon (ignored for lines with < 3 points)
+            style: The style for all lines, or a list with one style per line. None for rcps.default().
+            label: The legend label for the lines. Only applied to the lines with the first style.
+        """
+        if style == None:
+            style = rcps.default()
+
+        lines: list[list[ndarray]] = []
+        for xyz_line in xyz_lines:
+            xyz_arr = xyz_line.data.T if isinstance(xyz_line, Vxyz) else np.asarray(xyz_line, dtype=float)
+            if close and (len(xyz_arr) > 2):
+                xyz_arr = np.concatenate((xyz_arr, xyz_arr[:1]))
+            lines.append(self._project_xyz(xyz_arr))
+
+        self._draw_lines_batched(lines, style, label)
+
+    def draw_xyz_points(
+        self, xyz: Vxyz | ndarray | list[list], style: rcps.RenderControlPointSeq = None, label: str = None
+    ) -> None:
+        """Draw many points with a single matplotlib artist.
+
+        Looks the same as calling draw_xyz() for each point, but is much faster
+        for many points.
+
+        Parameters
+        ----------
+            xyz: The points to draw, as a Vxyz, an (N,3) array, or a list of xyz three vectors.
+            style: The marker style for all points. None for rcps.default().
+            label: The legend label for the points.
+        """
+        if style == None:
+            style = rcps.default()
+        xyz_arr = xyz.data.T if isinstance(xyz, Vxyz) else xyz
+        points = self._project_xyz(xyz_arr)
+
+        if self._batch is not None and label is None:
+            self._add_to_batch(style, [], points)
+        else:
+            self._flush_batch()
+            self._draw_batch([(style, [], points)], label)
+
     # TODO tjlarki: only implemented for 3d views, should extend
     def draw_xyz_surface(
         self,
@@ -818,6 +1131,10 @@ class View3d(aph.AbstractPlotHandler):
             or (self.view_spec['type'] == 'vplane')
             or (self.view_spec['type'] == 'camera')
         ):
+            if self._batch is not None and label is None:
+                self._add_to_batch(style, [], [np.array([pq[0:2]], dtype=float)])
+                return
+            self._flush_batch()
             self.axis.plot(
                 [pq[0]],
                 [pq[1]],
@@ -870,6 +1187,10 @@ class View3d(aph.AbstractPlotHandler):
                 or (self.view_spec['type'] == 'vplane')
                 or (self.view_spec['type'] == 'camera')
             ):
+                if self._batch is not None and label is None:
+                    self._add_to_batch(style, [np.array([pq[0:2] for pq in pq_list], dtype=float)], [])
+                    return
+                self._flush_batch()
                 self.axis.plot(
                     [pq[0] for pq in pq_list],
                     [pq[1] for pq in pq_list],
@@ -891,6 +1212,44 @@ class View3d(aph.AbstractPlotHandler):
                     + "' encountered.",
                 )
 
+    def draw_pq_lines(
+        self,
+        pq_lines: list[list[list]] | list[ndarray],
+        close=False,
+        style: rcps.RenderControlPointSeq | list[rcps.RenderControlPointSeq] = None,
+        label: str = None,
+    ) -> None:
+        """Draw many lines or closed polygons, with as few matplotlib artists as possible.
+
+        Looks the same as calling draw_pq_list() for each line, but is much
+        faster for many lines. See batch_draw().
+
+        Parameters
+        ----------
+            pq_lines: The lines to draw. Each line is a list of pq pairs, or an (N,2) array.
+            close: Draw each line as a closed polygon (ignored for lines with < 3 points)
+            style: The style for all lines, or a list with one style per line. None for rcps.default().
+            label: The legend label for the lines. Only applied to the lines with the first style.
+        """
+        if self.view_spec['type'] == '3d':
+            lt.error_and_raise(
+                RuntimeError,
+                "ERROR: In View3d.draw_pq_lines(), incompatible view_spec['type'] = '"
+                + str(self.view_spec['type'])
+                + "' encountered.",
+            )
+        if style == None:
+            style = rcps.default()
+
+        lines: list[list[ndarray]] = []
+        for pq_line in pq_lines:
+            pq_arr = np.asarray(pq_line, dtype=float).reshape((-1, 2))
+            if close and (len(pq_arr) > 2):
+                pq_arr = np.concatenate((pq_arr, pq_arr[:1]))
+            lines.append([pq_arr])
+
+        self._draw_lines_batched(lines, style, label)
+
     # VECTOR FIELD PLOTTING
 
     def draw_xyzdxyz_list(
@@ -908,24 +1267,11 @@ class View3d(aph.AbstractPlotHandler):
             self.draw_xyz_list(xyz_list, close=close, style=style, label=label)
             # Setup the vector drawing style.
             vector_style = rcps.outline(color=style.vector_color, linewidth=style.vector_linewidth)
-            # Draw the vectors.
-            for xyzdxyz in xyzdxyz_list:
-                xyz0 = xyzdxyz[0]
-                x0 = xyz0[0]
-                y0 = xyz0[1]
-                z0 = xyz0[2]
-                dxyz = xyzdxyz[1]
-                dx = dxyz[0]
-                dy = dxyz[1]
-                dz = dxyz[2]
-                # Construct a ray.
-                scale = style.vector_scale
-                x1 = x0 + (scale * dx)
-                y1 = y0 + (scale * dy)
-                z1 = z0 + (scale * dz)
-                xyz1 = [x1, y1, z1]
-                ray = [xyz0, xyz1]
-                self.draw_xyz_list(ray, close=False, style=vector_style, label=None)
+            # Draw the vectors, as one ray per point.
+            xyz0 = np.array([xyzdxyz[0] for xyzdxyz in xyzdxyz_list], dtype=float).reshape((-1, 3))
+            dxyz = np.array([xyzdxyz[1] for xyzdxyz in xyzdxyz_list], dtype=float).reshape((-1, 3))
+            xyz1 = xyz0 + (style.vector_scale * dxyz)
+            self.draw_xyz_lines(np.stack((xyz0, xyz1), axis=1), close=False, style=vector_style, label=None)
 
     def draw_pqdpq_list(
         self,
@@ -942,18 +1288,8 @@ class View3d(aph.AbstractPlotHandler):
             self.draw_pq_list(pq_list, close=close, style=style, label=label)
             # Setup the vector drawing style.
             vector_style = rcps.outline(color=style.vector_color, linewidth=style.vector_linewidth)
-            # Draw the vectors.
-            for pqdpq in pqdpq_list:
-                pq0 = pqdpq[0]
-                p0 = pq0[0]
-                q0 = pq0[1]
-                dpq = pqdpq[1]
-                px = dpq[0]
-                qy = dpq[1]
-                # Construct a ray.
-                scale = style.vector_scale
-                p1 = p0 + (scale * px)
-                q1 = q0 + (scale * qy)
-                pq1 = [p1, q1]
-                ray = [pq0, pq1]
-                self.draw_pq_list(ray, close=False, style=vector_style, label=None)
+            # Draw the vectors, as one ray per point.
+            pq0 = np.array([pqdpq[0][0:2] for pqdpq in pqdpq_list], dtype=float).reshape((-1, 2))
+            dpq = np.array([pqdpq[1][0:2] for pqdpq in pqdpq_list], dtype=float).reshape((-1, 2))
+            pq1 = pq0 + (style.vector_scale * dpq)
+            self.draw_pq_lines(np.stack((pq0, pq1), axis=1), close=False, style=vector_style, label=None)
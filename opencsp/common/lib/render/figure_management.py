@@ -12,7 +12,16 @@ Features include:
 
 """
 
-# import matplotlib
+from concurrent.futures import Future
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import signal
+from threading import Thread
+import time
+
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -517,14 +526,233 @@ def print_figure_summary() -> None:
         fig_record.print_comments()
 
 
-def save_all_figures(output_path: str, format: str = None, timeout: float = None, raise_on_timeout=False):
+_non_interactive_backends = ['agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template']
+""" Matplotlib backends that don't have a GUI, and so are safe to use from forked processes. """
+
+
+def _can_save_in_processes() -> bool:
+    """Figures can be saved from forked copies of this process, as long as the
+    matplotlib backend doesn't hold on to any GUI resources."""
+    return ("fork" in multiprocessing.get_all_start_methods()) and (
+        matplotlib.get_backend().lower() in _non_interactive_backends
+    )
+
+
+def _save_figures_worker(
+    fig_records: list[RenderControlFigureRecord],
+    next_idx: multiprocessing.Value,
+    output_path: str,
+    format: str,
+    timeout: float,
+    conn: multiprocessing.connection.Connection,
+):
+    """Saves figure records from a forked process, taking the index of the next
+    record to save from next_idx until all records have been saved. Sends
+    ("start", index, start_time) and ("done", index, elapsed, (fig, txt) or
+    exception) messages to the parent process."""
+
+    def raise_timeout(signum, frame):
+        raise TimeoutError("timed out")
+
+    signal.signal(signal.SIGALRM, raise_timeout)
+
+    while True:
+        with next_idx.get_lock():
+            idx = next_idx.value
+            next_idx.value += 1
+        if idx >= len(fig_records):
+            break
+
+        conn.send(("start", idx, time.time()))
+        tstart = time.time()
+        try:
+            if timeout != None and timeout > 0:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            result = fig_records[idx].save(output_path, format=format, close_after_save=False)
+        except BaseException as error:
+            result = error
+            try:
+                pickle.dumps(error)
+            except Exception:
+                # the parent process can't receive this exception, send its description instead
+                result = RuntimeError(repr(error))
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        conn.send(("done", idx, time.time() - tstart, result))
+
+    conn.close()
+
+
+class _FigureSaveProcesses:
+    def __init__(self, fig_records: list[RenderControlFigureRecord], output_path: str, format: str, timeout: float):
+        """Saves figure records concurrently in forked processes. See
+        save_all_figures() and save_all_figures_async().
+
+        The processes are forked when start() is called, so the saved figures
+        are as they were at that time, and the calling process is free to
+        continue to modify or close figures while they are being saved.
+        """
+        self.fig_records = fig_records
+        self.output_path = output_path
+        self.format = format
+        self.timeout = timeout
+        self.results: list[tuple[str, str] | None] = [None] * len(fig_records)
+        """ The saved (image file, text file) for each figure record, or None if it failed to save. """
+        self.errors: dict[int, BaseException | str] = {}
+        """ The exception raised while saving the figure record at the given index, or why it failed to save. """
+        self._procs: dict[multiprocessing.connection.Connection, multiprocessing.Process] = {}
+        self._started: dict[multiprocessing.connection.Connection, tuple[int, float]] = {}
+        """ The figure index and start time of the figure each process is currently saving. """
+
+    def start(self, num_processes: int):
+        ctx = multiprocessing.get_context("fork")
+        next_idx = ctx.Value('i', 0)
+        for i in range(max(min(num_processes, len(self.fig_records)), 1)):
+            recv_conn, send_conn = ctx.Pipe(duplex=False)
+            args = (self.fig_records, next_idx, self.output_path, self.format, self.timeout, send_conn)
+            proc = ctx.Process(target=_save_figures_worker, args=args, daemon=True)
+            proc.start()
+            send_conn.close()
+            self._procs[recv_conn] = proc
+
+    def _stop(self, conn: multiprocessing.connection.Connection):
+        proc = self._procs.pop(conn)
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+        conn.close()
+        if conn in self._started:
+            idx, _ = self._started.pop(conn)
+            self.errors[idx] = "timed out" if self.timeout != None else "process exited"
+
+    def wait(self) -> "_FigureSaveProcesses":
+        """Waits for all figures to finish saving, and joins all processes."""
+        # grace period for figures that are stuck outside of the interpreter, and don't respond to signals
+        grace = 1.0
+
+        while len(self._procs) > 0:
+            for conn in multiprocessing.connection.wait(list(self._procs.keys()), timeout=0.1):
+                try:
+                    msg = conn.recv()
+                except EOFError:
+                    self._stop(conn)
+                    continue
+                if msg[0] == "start":
+                    _, idx, tstart = msg
+                    self._started[conn] = (idx, tstart)
+                else:
+                    _, idx, elapsed, result = msg
+                    self._started.pop(conn, None)
+                    if isinstance(result, BaseException):
+                        self.errors[idx] = result
+                    elif self.timeout != None and elapsed > self.timeout:
+                        self.errors[idx] = "timed out"
+                    else:
+                        self.results[idx] = result
+
+            # stop processes that are stuck saving a figure
+            if self.timeout != None:
+                for conn, (idx, tstart) in list(self._started.items()):
+                    if time.time() - tstart > self.timeout + grace:
+                        self._stop(conn)
+
+        # figures that weren't saved because all processes were stopped
+        for idx, result in enumerate(self.results):
+            if result is None and idx not in self.errors:
+                self.errors[idx] = "not started"
+
+        return self
+
+
+def _save_figures_serial(
+    fig_records: list[RenderControlFigureRecord], output_path: str, format: str, timeout: float
+) -> tuple[list[tuple[str, str] | None], dict[int, BaseException | str]]:
+    """Saves figure records one at a time in this process. Returns the saved
+    (image file, text file) for each figure record, and the exceptions raised
+    or why figure records at the given indices failed to save."""
+    results: list[tuple[str, str] | None] = [None] * len(fig_records)
+    errors: dict[int, BaseException | str] = {}
+
+    if timeout == None:
+        for idx, fig_record in enumerate(fig_records):
+            results[idx] = fig_record.save(output_path, format=format, close_after_save=False)
+    else:
+        # Save each figure with a timeout on how long to wait for the figure to be saved.
+        for idx, fig_record in enumerate(fig_records):
+            # start the save
+            thread_results = []
+
+            def save(fig_record=fig_record, thread_results=thread_results):
+                try:
+                    thread_results.append(fig_record.save(output_path, format=format, close_after_save=False))
+                except BaseException as error:
+                    thread_results.append(error)
+
+            t = Thread(target=save, daemon=True)
+            t.start()
+
+            # wait for the save to finish
+            t.join(timeout)
+            if not t.is_alive():
+                # join the thread again, in case it finished between the timeout and the is_alive()
+                t.join(0.1)
+            if len(thread_results) == 0:
+                errors[idx] = "timed out"
+            elif isinstance(thread_results[0], BaseException):
+                errors[idx] = thread_results[0]
+            else:
+                # done saving the figure
+                results[idx] = thread_results[0]
+
+    return results, errors
+
+
+def _figure_save_report(
+    fig_records: list[RenderControlFigureRecord],
+    results: list[tuple[str, str] | None],
+    errors: dict[int, BaseException | str],
+    raise_on_timeout: bool,
+) -> tuple[list[str], list[str], list[RenderControlFigureRecord]]:
+    figs: list[str] = []
+    txts: list[str] = []
+    failed: list[RenderControlFigureRecord] = []
+
+    for idx, fig_record in enumerate(fig_records):
+        if results[idx] is not None:
+            figs.append(results[idx][0])
+            txts.append(results[idx][1])
+            continue
+
+        # the figure failed to save before the timeout
+        err_msg = f"Error: figure_management.save_all_figures: failed to save figure {fig_record.figure_num} \"{fig_record.name}\" ({errors[idx]})"
+        if raise_on_timeout:
+            if isinstance(errors[idx], BaseException):
+                lt.error(err_msg)
+                raise RuntimeError(err_msg) from errors[idx]
+            lt.error_and_raise(RuntimeError, err_msg)
+        else:
+            lt.error(err_msg)
+        failed.append(fig_record)
+
+    return figs, txts, failed
+
+
+def save_all_figures(
+    output_path: str, format: str = None, timeout: float = None, raise_on_timeout=False, num_processes: int = 1
+):
     """Saves all figures opened with setup_figure (since reset_figure_management) to the given directory.
 
     The purpose for timeout is to let the program fail gracefully
     during the rare instances when matplotlib's save routine goes
     out to lunch.
 
-    Note: if a timeout is specified, and the matplotlib save
+    Where possible (on systems that support forking processes, with a
+    non-interactive matplotlib backend such as "agg"), figures are saved from
+    forked processes when num_processes > 1. Processes that take longer than
+    the timeout to save a figure are stopped, so that nothing is left running
+    once this function returns.
+
+    Note: otherwise, if a timeout is specified, and the matplotlib save
     routine fails to complete, the running thread may continue to
     evaluate forever.  For this reason, for processes that are
     expected to stop executing on their own, it is recommended that:
@@ -535,8 +763,9 @@ def save_all_figures(output_path: str, format: str = None, timeout: float = None
     -----
         - output_path (str): The directory to save figures to.
         - format (str): The file format for figures. None for RenderControlFigureRecord.save default. Defaults to None.
-        - timeout (float): How many seconds to wait for the image to be saved. None to wait indefinitely. Defaults to None. FIXME make this work on windows.
+        - timeout (float): How many seconds to wait for each image to be saved. None to wait indefinitely. Defaults to None.
         - raise_on_timeout (bool): Whether to raise an exception if timeout elapse. Defaults to False.
+        - num_processes (int): How many figures to save concurrently. Defaults to 1.
 
     Returns:
     --------
@@ -545,50 +774,85 @@ def save_all_figures(output_path: str, format: str = None, timeout: float = None
         - failed: list[RenderControlFigureRecord] The list of figure records that failed to save (only returned if timeout is not None)
     """
     global fig_record_list
-    figs: list[str] = []
-    txts: list[str] = []
-    failed: list[RenderControlFigureRecord] = []
+    fig_records = list(fig_record_list)
 
-    if timeout == None:
-        for fig_record in fig_record_list:
-            t1, t2 = fig_record.save(output_path, format=format, close_after_save=False)
-            figs.append(t1)
-            txts.append(t2)
+    if num_processes > 1 and _can_save_in_processes():
+        procs = _FigureSaveProcesses(fig_records, output_path, format, timeout)
+        procs.start(num_processes)
+        procs.wait()
+        results, errors = procs.results, procs.errors
+    else:
+        results, errors = _save_figures_serial(fig_records, output_path, format, timeout)
 
+    if timeout == None:
+        for idx, error in errors.items():
+            # not a timeout, re-raise the error from the save process
+            err_msg = (
+                f"Error: figure_management.save_all_figures: failed to save figure {fig_records[idx].figure_num} "
+                + f"\"{fig_records[idx].name}\" ({error})"
+            )
+            if isinstance(error, BaseException):
+                lt.error(err_msg)
+                raise error
+            lt.error_and_raise(RuntimeError, err_msg)
+        figs, txts, _ = _figure_save_report(fig_records, results, errors, raise_on_timeout)
         return figs, txts
     else:
-        # Save each figure with a timeout on how long to wait for the figure to be saved.
-        from threading import Thread
+        return _figure_save_report(fig_records, results, errors, raise_on_timeout)
 
-        for fig_record in fig_record_list:
-            # start the save
-            results = []
-            t = Thread(
-                target=lambda: results.append(fig_record.save(output_path, format=format, close_after_save=False))
-            )
-            t.start()
 
-            # wait for the save to finish
-            t.join(timeout)
-            if not t.is_alive():
-                # join the thread again, in case it finished between the timeout and the is_alive()
-                t.join(0.1)
-                # done saving the figure
-                # get the results and register the success
-                t1, t2 = results[0]
-                figs.append(t1)
-                txts.append(t2)
-                break
-
-            # the figure failed to save before the timeout
-            err_msg = f"Error: figure_management.save_all_figures: failed to save figure {fig_record.figure_num} \"{fig_record.name}\""
-            if raise_on_timeout:
-                lt.error_and_raise(RuntimeError, err_msg)
-            else:
-                lt.error(err_msg)
-            failed.append(fig_record)
+def save_all_figures_async(
+    output_path: str, format: str = None, timeout: float = None, num_processes: int = None
+) -> Future[tuple[list[str], list[str], list[RenderControlFigureRecord]]]:
+    """Starts saving all figures opened with setup_figure (since
+    reset_figure_management) to the given directory in the background.
+
+    The figures are saved from forked processes, as they were at the time of
+    this call. The caller is free to continue creating, modifying, or closing
+    figures while they are being saved. If figures can't be saved from forked
+    processes (see save_all_figures), then they are saved before this function
+    returns.
+
+    Args:
+    -----
+        - output_path (str): The directory to save figures to.
+        - format (str): The file format for figures. None for RenderControlFigureRecord.save default. Defaults to None.
+        - timeout (float): How many seconds to wait for each image to be saved. None to wait indefinitely. Defaults to None.
+        - num_processes (int): How many figures to save concurrently. None for the number of CPUs. Defaults to None.
+
+    Returns:
+    --------
+        - future: Future[tuple[list[str], list[str], list[RenderControlFigureRecord]]]
+            Evaluates to the image files, text files, and failed figure records, as from save_all_figures(timeout=...).
+    """
+    global fig_record_list
+    fig_records = list(fig_record_list)
+    if num_processes == None:
+        num_processes = os.cpu_count()
+
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+
+    if _can_save_in_processes():
+        procs = _FigureSaveProcesses(fig_records, output_path, format, timeout)
+        procs.start(num_processes)
+
+        def wait_for_processes():
+            try:
+                procs.wait()
+                future.set_result(_figure_save_report(fig_records, procs.results, procs.errors, False))
+            except BaseException as error:
+                future.set_exception(error)
+
+        Thread(target=wait_for_processes, daemon=True).start()
+    else:
+        try:
+            results, errors = _save_figures_serial(fig_records, output_path, format, timeout)
+            future.set_result(_figure_save_report(fig_records, results, errors, False))
+        except BaseException as error:
+            future.set_exception(error)
 
-        return figs, txts, failed
+    return future
 
 
 def formatted_fig_display(block: bool = False) -> None:
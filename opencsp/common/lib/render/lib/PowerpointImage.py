@@ -1,6 +1,7 @@
 from PIL import Image
 import numpy as np
 import os
+import threading
 import time
 
 import opencsp.common.lib.opencsp_path.opencsp_root_path as orp
@@ -12,6 +13,9 @@ import opencsp.common.lib.tool.file_tools as ft
 
 class PowerpointImage(pps.PowerpointShape):
     _tmp_save_path = os.path.join(orp.opencsp_temporary_dir(), "PowerpointImage/images/tmp")
+    _reserved_save_paths: set[str] = set()
+    """ Temporary image files that have been claimed by an image but might not have been written yet. """
+    _reserved_save_paths_lock = threading.Lock()
 
     def __init__(
         self,
@@ -125,10 +129,13 @@ class PowerpointImage(pps.PowerpointShape):
             nd_val: np.ndarray = self._val
             self.width, self.height = nd_val.shape[1], nd_val.shape[0]
         else:  # reference-type and figure records
-            if not self.is_saved_to_file():
-                self.save()
-            pil_val = Image.open(self.get_saved_path())
-            self.width, self.height = pil_val.width, pil_val.height
+            if isinstance(self._val, str) and not self.is_saved_to_file():
+                # the size is in the file header, no need to copy or decode the image
+                path_name_ext = self._val
+            else:
+                path_name_ext = self.get_saved_path()
+            with Image.open(path_name_ext) as pil_val:
+                self.width, self.height = pil_val.width, pil_val.height
 
         return self.width, self.height
 
@@ -190,24 +197,43 @@ class PowerpointImage(pps.PowerpointShape):
         if not self.is_saved_to_file():
             self.save()
 
-        # get the width and height
+        # check if the size is reasonable
         image_width, image_height = self.get_size()
+        reduced_size = self._get_reduced_size(image_width, image_height, reduced_image_size_scale)
+        if reduced_size is None:
+            return
+
+        # image is larger than is reasonable, shrink it
+        lt.debug(f"Resizing from ({image_width,image_height}) to ({reduced_size})")
+        with Image.open(self.get_saved_path()) as pil_image:
+            pil_image = pil_image.resize(reduced_size)
+        pil_image.save(self.get_saved_path())
+        self.width, self.height = reduced_size
+
+    def _get_reduced_size(
+        self, image_width: int, image_height: int, reduced_image_size_scale: float = None
+    ) -> tuple[int, int] | None:
+        """Returns the width and height that an image of the given size should
+        be reduced to, or None if the image is small enough already (within
+        reduced_image_size_scale% of its rendered size). Uses the parent slide's
+        reduced_image_size_scale if None."""
+        if reduced_image_size_scale is None:
+            if self.parent_slide == None:
+                return None
+            reduced_image_size_scale = self.parent_slide.slide_control.reduced_image_size_scale
+        if reduced_image_size_scale < 0 or not self.has_dims():
+            return None
 
-        # check if the size is reasonable (within reduced_image_size_scale% of the target size)
         reasonable = reduced_image_size_scale
         dpi = 300  # dots per inch
         if self.parent_slide != None:
             dpi = self.parent_slide.slide_control.slide_dpi
         expected_width_pixels = int(self.dims[2] * dpi * reasonable)
         expected_height_pixels = int(self.dims[3] * dpi * reasonable)
-        if image_width <= expected_width_pixels * reasonable:
-            return
+        if image_width <= expected_width_pixels:
+            return None
 
-        # image is larger than is reasonable, shrink it
-        pil_image: Image.Image = Image.open(self.get_saved_path())
-        lt.debug(f"Resizing from ({image_width,image_height}) to ({expected_width_pixels,expected_height_pixels})")
-        pil_image = pil_image.resize((expected_width_pixels, expected_height_pixels))
-        pil_image.save(self.get_saved_path())
+        return expected_width_pixels, expected_height_pixels
 
     def get_saved_path(self) -> str:
         """Get the path+name+ext to the saved file version of the image content. Calls save() as necessary."""
@@ -246,9 +272,20 @@ class PowerpointImage(pps.PowerpointShape):
         path, _, ext = ft.path_components(path_name_ext)
         ft.create_directories_if_necessary(path)
 
-        if isinstance(self._val, Image.Image):
-            pil_val: Image.Image = self._val
+        if isinstance(self._val, (Image.Image, np.ndarray)):
+            if isinstance(self._val, Image.Image):
+                pil_val: Image.Image = self._val
+            else:
+                pil_val = Image.fromarray(self._val)
+
+            # shrink the image before encoding it, instead of encoding it twice with reduce_size()
+            reduced_size = self._get_reduced_size(pil_val.width, pil_val.height)
+            if reduced_size is not None:
+                lt.debug(f"Resizing from ({pil_val.width,pil_val.height}) to ({reduced_size})")
+                pil_val = pil_val.resize(reduced_size)
+
             pil_val.save(path_name_ext)
+            self.width, self.height = pil_val.width, pil_val.height
 
         elif isinstance(self._val, rcfr.RenderControlFigureRecord):
             # Figure records add extra stuffs to the image names, save them to
@@ -267,10 +304,6 @@ class PowerpointImage(pps.PowerpointShape):
                 time.sleep(1)
                 self._move_file(tmp_path_name_ext_rcfr, path_name_ext)
 
-        elif isinstance(self._val, np.ndarray):
-            pil_val = Image.fromarray(self._val)
-            pil_val.save(path_name_ext)
-
         elif isinstance(self._val, str):
             ft.copy_file(self._val, path_name_ext)
 
@@ -341,6 +374,41 @@ class PowerpointImage(pps.PowerpointShape):
 
         return cls(image_path_name_ext, dims, cell_dims, caption_is_above, caption, stretch)
 
+    def _reserve_save_path(self) -> str:
+        """Finds an unused temporary file to save this image to, and claims it
+        so that images that are being saved in parallel don't choose the same
+        file."""
+        # get the slide range from the parent, if any
+        slide_idx_range = range(1000)
+        if self.parent_slide != None:
+            if self.parent_slide.slide_control.slide_index >= 0:
+                slide_idx_range = [self.parent_slide.slide_control.slide_index]
+
+        # get a temporary name to save to
+        cls = self.__class__
+        with cls._reserved_save_paths_lock:
+            is_unused = lambda path_name_ext: not (
+                (path_name_ext in cls._reserved_save_paths) or ft.file_exists(path_name_ext)
+            )
+
+            for tmp_slide_idx in slide_idx_range:
+                max_img_idx = 20  # probably shouldn't need more than 20 images in a slide
+                dir_name_ext_pattern = self._get_save_dir_name_ext_pattern(tmp_slide_idx)
+                if not is_unused(dir_name_ext_pattern % (max_img_idx - 1)):
+                    continue
+
+                for img_idx in range(max_img_idx):
+                    image_path_name_ext = dir_name_ext_pattern % img_idx
+                    if is_unused(image_path_name_ext):
+                        cls._reserved_save_paths.add(image_path_name_ext)
+                        return image_path_name_ext
+                break
+
+        lt.error_and_raise(
+            RuntimeError,
+            "Failed to find an empty spot to save this image to. Try using PowerpointImage.clear_tmp_save_all() to make more room.",
+        )
+
     @classmethod
     def _get_save_dir_name_ext_pattern(cls, slide_idx: int = None, for_glob=False):
         if slide_idx == None:
@@ -385,36 +453,16 @@ class PowerpointImage(pps.PowerpointShape):
             self._to_txt_file()  # update with the latest values
             return self.get_text_file_path()
 
-        # get the slide range from the parent, if any
-        slide_idx_range = range(1000)
-        if self.parent_slide != None:
-            if self.parent_slide.slide_control.slide_index >= 0:
-                slide_idx_range = [self.parent_slide.slide_control.slide_index]
-
         # get a temporary name to save to
-        found_unused_name = False
-        for tmp_slide_idx in slide_idx_range:
-            max_img_idx = 20  # probably shouldn't need more than 20 images in a slide
-            dir_name_ext_pattern = self._get_save_dir_name_ext_pattern(tmp_slide_idx)
-            max_image_path_name_ext = dir_name_ext_pattern % (max_img_idx - 1)
-            if ft.file_exists(max_image_path_name_ext):
-                continue
-
-            for img_idx in range(max_img_idx):
-                image_path_name_ext = dir_name_ext_pattern % img_idx
-                if not ft.file_exists(image_path_name_ext):
-                    found_unused_name = True
-                    break
-            break
-        if not found_unused_name:
-            lt.error_and_raise(
-                RuntimeError,
-                "Failed to find an empty spot to save this image to. Try using PowerpointImage.clear_tmp_save_all() to make more room.",
-            )
+        image_path_name_ext = self._reserve_save_path()
         lt.info(f"saving image to {image_path_name_ext}")
 
         # save the image
-        saved_path, body_ext = self._save(image_path_name_ext)
+        try:
+            saved_path, body_ext = self._save(image_path_name_ext)
+        finally:
+            with self.__class__._reserved_save_paths_lock:
+                self.__class__._reserved_save_paths.discard(image_path_name_ext)
         if saved_path != self._tmp_save_path:
             lt.error_and_raise(
                 RuntimeError,
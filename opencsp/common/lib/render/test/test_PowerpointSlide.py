@@ -0,0 +1,63 @@
+import os
+import unittest
+
+import numpy as np
+from PIL import Image
+
+import opencsp.common.lib.render.PowerpointSlide as pps
+from opencsp.common.lib.render.lib.PowerpointImage import PowerpointImage
+import opencsp.common.lib.render_control.RenderControlPowerpointPresentation as rcpp
+import opencsp.common.lib.render_control.RenderControlPowerpointSlide as rcpps
+import opencsp.common.lib.tool.file_tools as ft
+
+
+class test_PowerpointSlide(unittest.TestCase):
+    def setUp(self) -> None:
+        path, _, _ = ft.path_components(__file__)
+        self.out_dir = os.path.join(path, "data", "output", "PowerpointSlide")
+        ft.create_directories_if_necessary(self.out_dir)
+        ft.delete_files_in_directory(self.out_dir, "*")
+
+        # save temporary images to the output directory
+        self.default_tmp_save_path = PowerpointImage._tmp_save_path
+        PowerpointImage._tmp_save_path = self.out_dir
+
+        rng = np.random.default_rng(0)
+        self.arrays = [rng.integers(0, 256, (900, 1200, 3), dtype=np.uint8) for i in range(4)]
+
+    def tearDown(self) -> None:
+        PowerpointImage._tmp_save_path = self.default_tmp_save_path
+
+    def test_add_slide_releases_images(self):
+        slide_control = rcpps.RenderControlPowerpointSlide(reduced_image_size_scale=0.5)
+        slide = pps.PowerpointSlide.template_content_grid(2, 2, slide_control)
+        for array in self.arrays:
+            slide.add_image(array)
+
+        presentation = rcpp.RenderControlPowerpointPresentation()
+        presentation.add_slide(slide)
+
+        saved_paths = set()
+        for image in slide.images:
+            # pixel data was released, and each image was reduced before being saved
+            self.assertIsInstance(image.get_val(), str)
+            saved_paths.add(image.get_saved_path())
+            with Image.open(image.get_saved_path()) as pil_image:
+                self.assertEqual(pil_image.size, image.get_size())
+                self.assertLess(pil_image.width, 1200)
+        self.assertEqual(len(saved_paths), len(self.arrays))
+
+        presentation.save(os.path.join(self.out_dir, "test_add_slide_releases_images.pptx"))
+
+    def test_get_size_from_file(self):
+        # outside of the temporary save path
+        image_path_name_ext = os.path.join(self.out_dir, "..", "test_get_size_from_file.png")
+        Image.fromarray(self.arrays[0]).save(image_path_name_ext)
+
+        image = PowerpointImage(image_path_name_ext)
+        self.assertEqual(image.get_size(), (1200, 900))
+        self.assertFalse(image.is_saved_to_file())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from opencsp.common.lib.geometry.Vxyz import Vxyz
+import opencsp.common.lib.render.figure_management as fm
+import opencsp.common.lib.render.view_spec as vs
+import opencsp.common.lib.render_control.RenderControlFigure as rcfg
+import opencsp.common.lib.render_control.RenderControlPointSeq as rcps
+
+
+class test_View3d(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.squares = [
+            rng.uniform(-3, 3, (1, 3)) + np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 1]]) for i in range(40)
+        ]
+        self.needles = [np.stack((square[0], square[0] + rng.uniform(-1, 1, 3))) for square in self.squares]
+        self.outline = rcps.outline(color='grey', linewidth=2)
+        self.needle = rcps.outline(color='b')
+        self.dashed = rcps.RenderControlPointSeq(linestyle='--', color='m', marker='None')
+        self.curve = rcps.data_curve(color='g')
+        self.marker = rcps.marker(color='r')
+
+    def tearDown(self):
+        # Make sure we release all matplotlib resources.
+        plt.close('all')
+
+    def _view(self, view_spec: dict):
+        figure_control = rcfg.RenderControlFigure(tile_array=(1, 1), tile_square=True)
+        fig_record = fm.setup_figure_for_3d_data(
+            figure_control, view_spec=view_spec, name="View3d", code_tag=f"{__file__}._view()"
+        )
+        return fig_record.view
+
+    def _render(self, view) -> np.ndarray:
+        view.view.canvas.draw()
+        return np.asarray(view.view.canvas.buffer_rgba()).copy()
+
+    def _draw(self, view):
+        """Overlapping lines and markers with interleaved styles, as when drawing a solar field"""
+        for i, (square, needle) in enumerate(zip(self.squares, self.needles)):
+            view.draw_xyz_list(list(square), close=True, style=self.outline)
+            view.draw_xyz_list(list(needle), style=self.needle)
+            view.draw_xyz(square[0], style=self.marker)
+            if i % 5 == 0:
+                view.draw_xyz_list(list(square[1:]), style=self.dashed)
+            if i % 7 == 0:
+                view.draw_xyz_list(list(square[:3]), style=self.curve)
+            if i == 10:
+                view.draw_xyz(square[2], style=self.marker, label='labeled')
+
+    def test_batch_draw(self):
+        for view_spec in [vs.view_spec_xy(), vs.view_spec_yz(), vs.view_spec_3d()]:
+            unbatched = self._view(view_spec)
+            self._draw(unbatched)
+            batched = self._view(view_spec)
+            with batched.batch_draw():
+                self._draw(batched)
+
+            np.testing.assert_array_equal(self._render(batched), self._render(unbatched))
+            np.testing.assert_allclose(batched.axis.dataLim.get_points(), unbatched.axis.dataLim.get_points())
+            self.assertEqual(batched.axis.get_legend_handles_labels()[1], ['labeled'])
+            if view_spec['type'] == '3d':
+                np.testing.assert_allclose(batched.axis.zz_dataLim.get_points(), unbatched.axis.zz_dataLim.get_points())
+            else:
+                num_artists_unbatched = len(unbatched.axis.lines) + len(unbatched.axis.collections)
+                num_artists_batched = len(batched.axis.lines) + len(batched.axis.collections)
+                self.assertLess(num_artists_batched, num_artists_unbatched)
+
+    def test_draw_xyz_lines_per_item_styles(self):
+        styles = [self.outline if i % 2 == 0 else self.needle for i in range(len(self.squares))]
+
+        unbatched = self._view(vs.view_spec_xy())
+        for i, (square, style) in enumerate(zip(self.squares, styles)):
+            unbatched.draw_xyz_list(list(square), close=True, style=style, label='squares' if i == 0 else None)
+        batched = self._view(vs.view_spec_xy())
+        batched.draw_xyz_lines(self.squares, close=True, style=styles, label='squares')
+
+        np.testing.assert_array_equal(self._render(batched), self._render(unbatched))
+        # the labeled first line, and one collection for the rest
+        self.assertEqual(len(batched.axis.lines), 1)
+        self.assertEqual(len(batched.axis.collections), 1)
+        self.assertEqual(len(batched.axis.collections[0].get_segments()), len(self.squares) - 1)
+        self.assertEqual(len(batched.axis.collections[0].get_segments()[0]), 5)
+        self.assertEqual(batched.axis.get_legend_handles_labels()[1], ['squares'])
+
+    def test_draw_xyz_points(self):
+        view = self._view(vs.view_spec_xz())
+        points = Vxyz(np.concatenate(self.squares).T)
+        view.draw_xyz_points(points, style=self.marker)
+        self.assertEqual(len(view.axis.lines), 1)
+        np.testing.assert_allclose(view.axis.lines[0].get_xydata(), points.data[[0, 2]].T)
+
+
+if __name__ == '__main__':
+    unittest.main()
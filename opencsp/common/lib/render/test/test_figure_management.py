@@ -5,6 +5,8 @@ import time
 import unittest
 
 import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
 
 import opencsp.common.lib.opencsp_path.opencsp_root_path as root_path
 import opencsp.common.lib.process.subprocess_tools as st
@@ -199,6 +201,57 @@ class test_figure_management(unittest.TestCase):
         figs_txts_fails = fm.save_all_figures(self.dir_out, timeout=100, raise_on_timeout=True)
         self.assert_exists(figs_txts_fails, 1)
 
+    def _setup_line_figures(self, names: list[str]):
+        fm.reset_figure_management()
+        for i, name in enumerate(names):
+            figure_control = rcfg.RenderControlFigure(tile_array=(1, 1), tile_square=True)
+            fig_record = fm.setup_figure(figure_control, name=name, code_tag=f"{__file__}._setup_line_figures()")
+            fig_record.view.draw_p_list([i] * 100)
+
+    def test_save_all_figures_processes(self):
+        """Test that saving figures concurrently produces the same files, in the same order, as saving one at a time."""
+        names = [f"processes_{i}" for i in range(5)]
+        self._setup_line_figures(names)
+        serial_dir = os.path.join(self.dir_out, "serial")
+        parallel_dir = os.path.join(self.dir_out, "parallel")
+
+        figs, txts = fm.save_all_figures(serial_dir, format="png")
+        figs_txts = fm.save_all_figures(parallel_dir, format="png", num_processes=3)
+        self.assert_exists(figs_txts, 5)
+
+        parallel_figs, parallel_txts = figs_txts
+        self.assertEqual([os.path.basename(f) for f in parallel_figs], [os.path.basename(f) for f in figs])
+        self.assertEqual([os.path.basename(f) for f in parallel_txts], [os.path.basename(f) for f in txts])
+        for serial_txt, parallel_txt in zip(txts, parallel_txts):
+            with open(serial_txt) as serial_fin, open(parallel_txt) as parallel_fin:
+                self.assertEqual(serial_fin.read(), parallel_fin.read())
+        for serial_fig, parallel_fig in zip(figs, parallel_figs):
+            np.testing.assert_array_equal(np.asarray(Image.open(parallel_fig)), np.asarray(Image.open(serial_fig)))
+
+    def test_save_all_figures_processes_error(self):
+        """Test that an error while saving a figure in another process is re-raised as the original exception."""
+        self._setup_line_figures([f"processes_error_{i}" for i in range(2)])
+
+        def raise_error(*vargs, **kwargs):
+            raise ValueError("can't save this figure")
+
+        fm.fig_record_list[1].save = raise_error
+        with self.assertRaisesRegex(ValueError, "can't save this figure"):
+            fm.save_all_figures(self.dir_out, format="png", num_processes=2)
+
+    def test_save_all_figures_async(self):
+        """Test that figures can be changed while being saved in the background."""
+        names = [f"async_{i}" for i in range(3)]
+        self._setup_line_figures(names)
+
+        future = fm.save_all_figures_async(self.dir_out, timeout=100, num_processes=2)
+        fm.reset_figure_management()
+        plt.close('all')
+
+        figs_txts_fails = future.result(timeout=100)
+        self.assert_exists(figs_txts_fails, 3)
+        self.assertEqual(len(figs_txts_fails[2]), 0)
+
 
 if __name__ == '__main__':
     import argparse
@@ -56,9 +56,12 @@ class RenderControlPowerpointPresentation:
         """Adds the given slide to this presentation and saves the associated images to temporary files.
 
         For this reason (saving images), adding the slide to the presentation
-        should happen after the slide has been fully populated with contents."""
+        should happen after the slide has been fully populated with contents.
+        The images are released from memory once saved (see
+        PowerpointSlide.save_and_bake()), so that the memory used doesn't grow
+        with the number of slides."""
         self.new_slides.append(slide)
-        slide.save()
+        slide.save_and_bake()
 
     def save(self, dest_path_name_ext: str, overwrite=False):
         # check if the file already exists
@@ -1,4 +1,5 @@
 import inspect
+import itertools
 from itertools import compress
 import math
 from typing import Callable
@@ -19,6 +20,68 @@ import opencsp.common.lib.target.target_color_1d_gradient as tc1g
 from opencsp.common.lib.target.TargetAbstract import TargetAbstract
 import opencsp.common.lib.tool.time_date_tools as tdt
 
+# Number of pixels to compute at once, when generating a pattern in blocks of rows.
+# Bounds the memory used by intermediate arrays for very large targets.
+_PIXELS_PER_BLOCK = 2**20
+
+
+def _row_blocks(n_rows: int, n_cols: int):
+    """
+    Yields (start_row, end_row) pairs that cover all rows, with about _PIXELS_PER_BLOCK pixels per block.
+    """
+    rows_per_block = max(1, _PIXELS_PER_BLOCK // max(1, n_cols))
+    for start_row in range(0, n_rows, rows_per_block):
+        yield start_row, min(start_row + rows_per_block, n_rows)
+
+
+def _math_elementwise(func: Callable, *args) -> np.ndarray:
+    """
+    Applies the scalar function func (for example math.atan2 or pow) to each element of the given arrays.
+
+    NumPy's own transcendental functions can use SIMD implementations that differ from the math library in the
+    last bit.  Evaluating the same scalar function as the per-pixel code keeps the generated images bit-identical.
+    """
+    shape = np.broadcast_shapes(*[np.shape(arg) for arg in args])
+    # Scalar arguments are passed through unchanged, for example so that an int exponent stays an int.
+    iterables = [
+        itertools.repeat(arg) if np.ndim(arg) == 0 else np.broadcast_to(arg, shape).ravel().tolist() for arg in args
+    ]
+    values = map(func, *iterables)
+    return np.fromiter(values, dtype=float, count=math.prod(shape)).reshape(shape)
+
+
+def _saturated_to_white(rgb: np.ndarray, fraction: np.ndarray, exponent: float) -> np.ndarray:
+    """
+    Transition from saturated colors at fraction 0 to white at fraction 1.
+
+    fraction must broadcast against rgb without its last (color band) dimension.
+    """
+    saturation_factor = 1.0 - _math_elementwise(pow, fraction, exponent)
+    saturation_factor[saturation_factor < 0.0] = 0.0
+    saturation_factor[saturation_factor > 1.0] = 0.0
+    rgb_from_white = 255 - rgb
+    rgb_from_white *= saturation_factor[..., np.newaxis]
+    return 255 - rgb_from_white
+
+
+def _light_to_saturated(
+    rgb: np.ndarray, fraction: np.ndarray, saturation_min: float, saturation_max: float
+) -> np.ndarray:
+    """
+    Transition from partially saturated colors at fraction 0 to fully saturated at fraction 1, and white beyond.
+
+    fraction must broadcast against rgb without its last (color band) dimension.
+    """
+    saturation_range = saturation_max - saturation_min
+    saturation_factor = saturation_min + (fraction * saturation_range)
+    saturation_factor[saturation_factor < 0.0] = 0.0
+    saturation_factor[saturation_factor > 1.0] = 0.0
+    ref_rgb = 255
+    rgb_from_white = ref_rgb - rgb
+    rgb_from_white *= saturation_factor[..., np.newaxis]
+    new_rgb = ref_rgb - rgb_from_white
+    return np.where(fraction[..., np.newaxis] > 1.0, 255, new_rgb)
+
 
 class TargetColor(TargetAbstract):
     """
@@ -40,13 +103,11 @@ class TargetColor(TargetAbstract):
         initial_rgb = (
             self.initial_color.rgb_255()
         )  # ?? SCAFFOLDING RCB -- I GOT TRIPPED UP BY CONFUSION RE: IMAGES IN [0,1.0] AND IMAGES IN [0,255].  HOW BEST RESOLVE/PREVENT?
-        n_rows, n_cols = self.rows_cols()
-        for row in range(0, n_rows):
-            for col in range(0, n_cols):
-                # Set pixel color
-                self.image[row, col, 0] = initial_rgb[0]
-                self.image[row, col, 1] = initial_rgb[1]
-                self.image[row, col, 2] = initial_rgb[2]
+        self.rows_cols()  # Checks the number of bands.
+        # Set pixel color
+        self.image[:, :, 0] = initial_rgb[0]
+        self.image[:, :, 1] = initial_rgb[1]
+        self.image[:, :, 2] = initial_rgb[2]
         self.pattern_description = initial_color.name
 
     # ACCESS
@@ -74,22 +135,17 @@ class TargetColor(TargetAbstract):
         self, color_below_min: Color, color_bar, color_above_max: Color, discrete_or_continuous: str
     ) -> None:
         n_rows, n_cols = self.rows_cols()
-        for row in range(0, n_rows):
-            for col in range(0, n_cols):
-                # Lookup color bar entry.
-                val = col
-                val_min = 0
-                val_max = n_cols
-                color = tcc.color_given_value(
-                    val, val_min, val_max, color_below_min, color_bar, color_above_max, discrete_or_continuous
-                )
-                # Set pixel color
-                # ?? SCAFFOLDING RCB -- FIXUP ALL THIS CONFUSION REGARDING WHETHER COLORS ARE OVER [0,1] OR [0,255].
-                self.image[row, col, 0] = color[
-                    0
-                ]  # /255.0  # ?? SCAFFOLDING RCB -- CONVERT COLOR BAR TO INTERVAL [0,1]
-                self.image[row, col, 1] = color[1]  # /255.0
-                self.image[row, col, 2] = color[2]  # /255.0
+        # Lookup color bar entry for each column.
+        val = np.arange(n_cols)
+        val_min = 0
+        val_max = n_cols
+        color = tcc.color_given_values(
+            val, val_min, val_max, color_below_min, color_bar, color_above_max, discrete_or_continuous
+        )
+        # Set pixel color, the same for every row.
+        # ?? SCAFFOLDING RCB -- FIXUP ALL THIS CONFUSION REGARDING WHETHER COLORS ARE OVER [0,1] OR [0,255].
+        # ?? SCAFFOLDING RCB -- CONVERT COLOR BAR TO INTERVAL [0,1]
+        self.image[:, :, :] = color[np.newaxis, :, :]  # /255.0
 
     # Linear color bar, y direction
     def set_image_to_linear_color_bar_y(
@@ -104,79 +160,38 @@ class TargetColor(TargetAbstract):
         light_to_saturated_max: float = 1.0,  # Dimensionless.  Applies if lateral_gradient_type == 'light_to_saturated'.
     ) -> None:
         n_rows, n_cols = self.rows_cols()
-        for row in range(0, n_rows):
-            for col in range(0, n_cols):
-                # Lookup color bar entry.
-                val = row
-                val_min = 0
-                val_max = n_rows  # Last row in color bar is the final color; there is not a color beyond.
-                color = tcc.color_given_value(
-                    val, val_min, val_max, color_below_min, color_bar, color_above_max, discrete_or_continuous
-                )  # ?? SCAFFOLDING -- USE "SPLIT" CONTROL PARAMETER.
-
-                # Adjust saturation.
-                lateral_fraction = col / n_cols
-                # Color components.
-                this_red = color[0]  # /255.0  # ?? SCAFFOLDING RCB -- CONVERT COLOR BAR TO INTERVAL [0,1]
-                this_green = color[1]  # /255.0
-                this_blue = color[2]  # /255.0
-
-                if lateral_gradient_type == None:
-                    pass
-
-                elif lateral_gradient_type == "saturated_to_white":
-                    # Transition from saturated at left to white.
-                    saturation_factor = 1.0 - pow(lateral_fraction, saturated_to_white_exponent)
-                    if saturation_factor < 0.0:
-                        saturation_factor = 0.0
-                    if saturation_factor > 1.0:
-                        saturation_factor = 0.0
-                    this_red_from_white = 255 - this_red
-                    this_green_from_white = 255 - this_green
-                    this_blue_from_white = 255 - this_blue
-                    this_red_from_white *= saturation_factor
-                    this_green_from_white *= saturation_factor
-                    this_blue_from_white *= saturation_factor
-                    this_red = 255 - this_red_from_white
-                    this_green = 255 - this_green_from_white
-                    this_blue = 255 - this_blue_from_white
-
-                elif lateral_gradient_type == "light_to_saturated":
-                    # Transition from partially saturated at left to fully saturated at boundary.
-                    saturation_range = light_to_saturated_max - light_to_saturated_min
-                    saturation_factor = light_to_saturated_min + (lateral_fraction * saturation_range)
-                    if saturation_factor < 0.0:
-                        saturation_factor = 0.0
-                    if saturation_factor > 1.0:
-                        saturation_factor = 0.0
-                    if lateral_fraction <= 1.0:
-                        ref_red = 255
-                        ref_green = ref_red
-                        ref_blue = ref_red
-                        this_red_from_white = ref_red - this_red
-                        this_green_from_white = ref_green - this_green
-                        this_blue_from_white = ref_blue - this_blue
-                        this_red_from_white *= saturation_factor
-                        this_green_from_white *= saturation_factor
-                        this_blue_from_white *= saturation_factor
-                        this_red = ref_red - this_red_from_white
-                        this_green = ref_green - this_green_from_white
-                        this_blue = ref_blue - this_blue_from_white
-                    else:
-                        this_red = 255
-                        this_green = 255
-                        this_blue = 255
-                else:
-                    print(
-                        'ERROR: In TargetColor.set_image_to_linear_color_bar_y(), encountered unexpected lateral_gradient_type = '
-                        + str(lateral_gradient_type)
-                    )
-                    assert False  # ?? SCAFFOLDING RCB -- USE EXCEPTION
-
-                # Set pixel color
-                self.image[row, col, 0] = this_red
-                self.image[row, col, 1] = this_green
-                self.image[row, col, 2] = this_blue
+        if lateral_gradient_type not in [None, "saturated_to_white", "light_to_saturated"]:
+            print(
+                'ERROR: In TargetColor.set_image_to_linear_color_bar_y(), encountered unexpected lateral_gradient_type = '
+                + str(lateral_gradient_type)
+            )
+            assert False  # ?? SCAFFOLDING RCB -- USE EXCEPTION
+
+        # Lookup color bar entry for each row.
+        val = np.arange(n_rows)
+        val_min = 0
+        val_max = n_rows  # Last row in color bar is the final color; there is not a color beyond.
+        row_colors = tcc.color_given_values(
+            val, val_min, val_max, color_below_min, color_bar, color_above_max, discrete_or_continuous
+        )  # ?? SCAFFOLDING -- USE "SPLIT" CONTROL PARAMETER.
+        # Lateral fraction for each column.
+        lateral_fraction = np.arange(n_cols) / n_cols
+
+        for start_row, end_row in _row_blocks(n_rows, n_cols):
+            # Color components.
+            colors = np.broadcast_to(row_colors[start_row:end_row, np.newaxis, :], (end_row - start_row, n_cols, 3))
+            fraction = lateral_fraction[np.newaxis, :]  # The same for every row.
+
+            # Adjust saturation.
+            if lateral_gradient_type == None:
+                pass
+            elif lateral_gradient_type == "saturated_to_white":
+                colors = _saturated_to_white(colors, fraction, saturated_to_white_exponent)
+            elif lateral_gradient_type == "light_to_saturated":
+                colors = _light_to_saturated(colors, fraction, light_to_saturated_min, light_to_saturated_max)
+
+            # Set pixel color
+            self.image[start_row:end_row, :, :] = colors
 
     # Polar color bar
     def set_image_to_polar_color_bar(
@@ -212,111 +227,70 @@ class TargetColor(TargetAbstract):
         half_height = height / 2.0
         diameter = min(width, height)
         radius = diameter / 2.0
-        for row in range(0, n_rows):
+        if pattern_boundary not in ['circle', 'image_boundary']:
+            print(
+                'ERROR:  In TargetColor.set_image_to_polar_color_bar(), unexpected pattern_boundary = "'
+                + str(pattern_boundary)
+            )
+            assert False  # ?? SCAFFOLDING RCB -- CHANGE THIS TO EXCEPTION.
+        if radial_gradient_type not in ["saturated_center_to_white", "light_center_to_saturated"]:
+            print(
+                'ERROR: In TargetColor.set_image_to_polar_color_bar(), encountered unexpected radial_gradient_type = '
+                + str(radial_gradient_type)
+            )
+            assert False  # ?? SCAFFOLDING RCB -- USE EXCEPTION
+
+        # Generate the image a block of rows at a time, to limit memory use for large targets.
+        for start_row, end_row in _row_blocks(n_rows, n_cols):
             # # Progress report when generating large images.
-            # if (row % 10) == 0:
-            #     print('In set_image_to_polar_color_bar(), time = ', tdt.current_time_string(), '  row = ', str(row))
-            for col in range(0, n_cols):
-                # Lookup color bar entry.
-                delta_x = col - center_col
-                delta_y = -(row - center_row)  # Row 0 is at the top of the image.
-                this_angle = math.atan2(delta_y, delta_x)
-                this_radius = math.sqrt((delta_x * delta_x) + (delta_y * delta_y))
-                # Lookup color given angle.# (Saturation not adjusted yet.)
-                color = tcc.color_given_value(
-                    this_angle, -math.pi, math.pi, color_below_min, color_bar, color_above_max, discrete_or_continuous
+            # print('In set_image_to_polar_color_bar(), time = ', tdt.current_time_string(), '  row = ', str(start_row))
+            rows = np.arange(start_row, end_row)[:, np.newaxis]
+            cols = np.arange(0, n_cols)[np.newaxis, :]
+            delta_x, delta_y = np.broadcast_arrays(cols - center_col, -(rows - center_row))  # Row 0 is at the top.
+            this_angle = _math_elementwise(math.atan2, delta_y, delta_x)
+            this_radius = np.sqrt((delta_x * delta_x) + (delta_y * delta_y))
+            # Lookup color given angle.  (Saturation not adjusted yet.)
+            color = tcc.color_given_values(
+                this_angle, -math.pi, math.pi, color_below_min, color_bar, color_above_max, discrete_or_continuous
+            )
+            # Compute saturation adjustment.
+            # Determine the radius to use for scaling the saturation.
+            if pattern_boundary == 'circle':
+                # Circle
+                radius_for_this_angle = np.full(this_angle.shape, radius)
+            else:
+                # Rectangle
+                sin_angle = _math_elementwise(math.sin, this_angle)
+                cos_angle = _math_elementwise(math.cos, this_angle)
+                with np.errstate(divide='ignore'):
+                    radius_x = np.abs(half_width / cos_angle)
+                    radius_y = np.abs(half_height / sin_angle)
+                radius_for_this_angle = np.minimum(radius_x, radius_y)
+                radius_for_this_angle[cos_angle == 0] = radius_y[cos_angle == 0]
+                radius_for_this_angle[sin_angle == 0] = radius_x[sin_angle == 0]
+            # Add a margin to avoid border points that are above-max color due to numerical roundoff error.
+            radius_tolerance = 2  # Units are pixels
+            radius_for_this_angle += radius_tolerance
+            # Compute radius fraction, the percentage distance of this pixel from the image center to the image boundary.
+            radius_fraction = this_radius / radius_for_this_angle
+
+            # Adjust saturation.
+            if radial_gradient_type == "saturated_center_to_white":
+                # Transition from saturated at center to white.
+                color = _saturated_to_white(color, radius_fraction, saturated_center_to_white_exponent)
+            else:
+                # Transition from partially saturated at center to fully saturated at boundary.
+                color = _light_to_saturated(
+                    color,
+                    radius_fraction,
+                    light_center_to_saturated_saturation_min,
+                    light_center_to_saturated_saturation_max,
                 )
-                # Compute saturation adjustment.
-                # Determine the radius to use for scaling the saturation.
-                if pattern_boundary == 'circle':
-                    # Circle
-                    radius_for_this_angle = radius
-                elif pattern_boundary == 'image_boundary':
-                    # Rectangle
-                    if math.sin(this_angle) == 0:
-                        radius_for_this_angle = abs(half_width / math.cos(this_angle))
-                    elif math.cos(this_angle) == 0:
-                        radius_for_this_angle = abs(half_height / math.sin(this_angle))
-                    else:
-                        radius_for_this_angle = min(
-                            abs(half_width / math.cos(this_angle)), abs(half_height / math.sin(this_angle))
-                        )
-                else:
-                    print(
-                        'ERROR:  In TargetColor.set_image_to_polar_color_bar(), unexpected pattern_boundary = "'
-                        + str(pattern_boundary)
-                    )
-                    assert False  # ?? SCAFFOLDING RCB -- CHANGE THIS TO EXCEPTION.
-                # Add a margin to avoid border points that are above-max color due to numerical roundoff error.
-                radius_tolerance = 2  # Units are pixels
-                radius_for_this_angle += radius_tolerance
-                # Compute radius fraction, the percentage distance of this pixel from the image center to the image boundary.
-                radius_fraction = this_radius / radius_for_this_angle
-
-                # Adjust saturation.
-                # Color components.
-                this_red = color[0]  # /255.0  # ?? SCAFFOLDING RCB -- CONVERT COLOR BAR TO INTERVAL [0,1]
-                this_green = color[1]  # /255.0
-                this_blue = color[2]  # /255.0
-
-                if radial_gradient_type == "saturated_center_to_white":
-                    # Transition from saturated at center to white.
-                    saturation_factor = 1.0 - pow(radius_fraction, saturated_center_to_white_exponent)
-                    if saturation_factor < 0.0:
-                        saturation_factor = 0.0
-                    if saturation_factor > 1.0:
-                        saturation_factor = 0.0
-                    this_red_from_white = 255 - this_red
-                    this_green_from_white = 255 - this_green
-                    this_blue_from_white = 255 - this_blue
-                    this_red_from_white *= saturation_factor
-                    this_green_from_white *= saturation_factor
-                    this_blue_from_white *= saturation_factor
-                    this_red = 255 - this_red_from_white
-                    this_green = 255 - this_green_from_white
-                    this_blue = 255 - this_blue_from_white
-
-                elif radial_gradient_type == "light_center_to_saturated":
-                    # Transition from partially saturated at center to fully saturated at boundary.
-                    saturation_range = (
-                        light_center_to_saturated_saturation_max - light_center_to_saturated_saturation_min
-                    )
-                    saturation_factor = light_center_to_saturated_saturation_min + (radius_fraction * saturation_range)
-                    if saturation_factor < 0.0:
-                        saturation_factor = 0.0
-                    if saturation_factor > 1.0:
-                        saturation_factor = 0.0
-                    if radius_fraction <= 1.0:
-                        ref_red = 255
-                        ref_green = ref_red
-                        ref_blue = ref_red
-                        this_red_from_white = ref_red - this_red
-                        this_green_from_white = ref_green - this_green
-                        this_blue_from_white = ref_blue - this_blue
-                        this_red_from_white *= saturation_factor
-                        this_green_from_white *= saturation_factor
-                        this_blue_from_white *= saturation_factor
-                        this_red = ref_red - this_red_from_white
-                        this_green = ref_green - this_green_from_white
-                        this_blue = ref_blue - this_blue_from_white
-                    else:
-                        this_red = 255
-                        this_green = 255
-                        this_blue = 255
-                else:
-                    print(
-                        'ERROR: In TargetColor.set_image_to_polar_color_bar(), encountered unexpected radial_gradient_type = '
-                        + str(radial_gradient_type)
-                    )
-                    assert False  # ?? SCAFFOLDING RCB -- USE EXCEPTION
 
-                # Set pixel color
-                # ?? SCAFFOLDING RCB -- FIXUP ALL THIS CONFUSION REGARDING WHETHER COLORS ARE OVER [0,1] OR [0,255].
-                self.image[row, col, 0] = (
-                    this_red  # /255.0  # ?? SCAFFOLDING RCB -- CONVERT COLOR BAR TO INTERVAL [0,1]?
-                )
-                self.image[row, col, 1] = this_green  # /255.0
-                self.image[row, col, 2] = this_blue  # /255.0
+            # Set pixel color
+            # ?? SCAFFOLDING RCB -- FIXUP ALL THIS CONFUSION REGARDING WHETHER COLORS ARE OVER [0,1] OR [0,255].
+            # ?? SCAFFOLDING RCB -- CONVERT COLOR BAR TO INTERVAL [0,1]?
+            self.image[start_row:end_row, :, :] = color  # /255.0
 
         # Add fiducial marks.
         if draw_center_fiducial:
@@ -464,22 +438,20 @@ class TargetColor(TargetAbstract):
         """
         # Modify image content.
         n_rows, n_cols = self.rows_cols()
-        for row in range(0, n_rows):
-            for col in range(0, n_cols):
-                # Lookup color.
-                original_red = self.image[row, col, 0]
-                original_green = self.image[row, col, 1]
-                original_blue = self.image[row, col, 2]
-                original_rgb = (original_red, original_green, original_blue)
-                # Compute new color.
-                max_rgb = 255  # ?? SCAFFOLDING RCB -- GET THIS VALUE RATIONALLY.
-                new_red, new_green, new_blue = self.adjust_rgb_color_saturation(
-                    original_rgb, saturation_fraction, max_rgb
-                )
-                # Set pixel color.
-                self.image[row, col, 0] = new_red
-                self.image[row, col, 1] = new_green
-                self.image[row, col, 2] = new_blue
+        for start_row, end_row in _row_blocks(n_rows, n_cols):
+            # Lookup color.
+            original_image = self.image[start_row:end_row].astype(float)
+            original_red = original_image[:, :, 0]
+            original_green = original_image[:, :, 1]
+            original_blue = original_image[:, :, 2]
+            original_rgb = (original_red, original_green, original_blue)
+            # Compute new color.
+            max_rgb = 255  # ?? SCAFFOLDING RCB -- GET THIS VALUE RATIONALLY.
+            new_red, new_green, new_blue = self.adjust_rgb_color_saturation(original_rgb, saturation_fraction, max_rgb)
+            # Set pixel color.
+            self.image[start_row:end_row, :, 0] = new_red
+            self.image[start_row:end_row, :, 1] = new_green
+            self.image[start_row:end_row, :, 2] = new_blue
         # Update pattern description.
         original_description = self.pattern_description
         new_description = original_description + "_sat" + str(saturation_fraction)
@@ -757,10 +729,7 @@ def extend_target_left(
     image = target.image
     new_image = new_target.image
     start_col = new_pixels
-    for row in range(new_n_rows):
-        for col in range(n_cols):
-            for band in range(new_n_bands):
-                new_image[row][start_col + col][band] = image[row][col][band]
+    new_image[:, start_col : start_col + n_cols, :] = image
 
     # Set description.
     if new_target_name == None:
@@ -830,11 +799,7 @@ def extend_target_right(
     # Copy image.
     image = target.image
     new_image = new_target.image
-    start_col = new_pixels
-    for row in range(new_n_rows):
-        for col in range(n_cols):
-            for band in range(new_n_bands):
-                new_image[row][col][band] = image[row][col][band]
+    new_image[:, 0:n_cols, :] = image
 
     # Set description.
     if new_target_name == None:
@@ -912,10 +877,7 @@ def extend_target_top(
     image = target.image
     new_image = new_target.image
     start_row = new_pixels
-    for row in range(n_rows):
-        for col in range(new_n_cols):
-            for band in range(new_n_bands):
-                new_image[start_row + row][col][band] = image[row][col][band]
+    new_image[start_row : start_row + n_rows, :, :] = image
 
     # Set description.
     if new_target_name == None:
@@ -992,10 +954,7 @@ def extend_target_bottom(
     # Copy image.
     image = target.image
     new_image = new_target.image
-    for row in range(n_rows):
-        for col in range(new_n_cols):
-            for band in range(new_n_bands):
-                new_image[row][col][band] = image[row][col][band]
+    new_image[0:n_rows, :, :] = image
 
     # Set description.
     if new_target_name == None:
@@ -1208,19 +1167,13 @@ def splice_targets_left_right(
     # Copy left image.
     left_image = left_target.image
     new_image = new_target.image
-    for row in range(new_n_rows):
-        for col in range(left_n_cols):
-            for band in range(new_n_bands):
-                new_image[row][col][band] = left_image[row][col][band]
+    new_image[:, 0:left_n_cols, :] = left_image
 
     # Copy right image.
     right_image = right_target.image
     new_image = new_target.image
     start_col = left_n_cols + gap
-    for row in range(new_n_rows):
-        for col in range(right_n_cols):
-            for band in range(new_n_bands):
-                new_image[row][start_col + col][band] = right_image[row][col][band]
+    new_image[:, start_col : start_col + right_n_cols, :] = right_image
 
     # Set description.
     if new_target_name == None:
@@ -1333,19 +1286,13 @@ def splice_targets_above_below(
     # Copy above image.
     above_image = above_target.image
     new_image = new_target.image
-    for row in range(above_n_rows):
-        for col in range(new_n_cols):
-            for band in range(new_n_bands):
-                new_image[row][col][band] = above_image[row][col][band]
+    new_image[0:above_n_rows, :, :] = above_image
 
     # Copy below image.
     below_image = below_target.image
     new_image = new_target.image
     start_row = above_n_rows + gap
-    for row in range(below_n_rows):
-        for col in range(new_n_cols):
-            for band in range(new_n_bands):
-                new_image[start_row + row][col][band] = below_image[row][col][band]
+    new_image[start_row : start_row + below_n_rows, :, :] = below_image
 
     # Set description.
     if new_target_name == None:
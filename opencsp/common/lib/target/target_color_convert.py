@@ -7,8 +7,11 @@ Color management.
 
 import math
 
+import numpy as np
+
 import opencsp.common.lib.geometry.Vxyz as Vxyz
 import opencsp.common.lib.geometry.Uxyz as Uxyz
+import opencsp.common.lib.render.color as Color
 
 
 def matlab_color_bar():
@@ -257,6 +260,60 @@ def color_given_value(val, val_min, val_max, color_below_min, color_bar, color_a
         assert False
 
 
+def color_given_values(
+    vals: np.ndarray, val_min, val_max, color_below_min, color_bar, color_above_max, discrete_or_continuous
+) -> np.ndarray:
+    """
+    Array version of color_given_value(), for looking up the colors of many pixels at once.
+
+    The arithmetic is the same as color_given_value(), step for step, so the returned colors are identical to
+    calling color_given_value() on each value.  The below-min and above-max colors can be given either as a
+    Color or as an (R,G,B) sequence.
+
+    Returns an array of shape vals.shape + (3,), containing the [R,G,B] color of each value.
+    """
+    vals = np.asarray(vals, dtype=float)
+    color_bar_rgb = np.array(color_bar, dtype=float)
+    n_colors = len(color_bar)
+
+    if n_colors == 1:
+        colors = np.zeros(vals.shape + (3,))
+        colors[:] = color_bar_rgb[0]
+    else:
+        n_steps = n_colors - 1  # Last block on color bar is not a step.
+        val_step = (val_max - val_min) / n_steps
+        step = (vals - val_min) / val_step
+        # In bounds, step >= 0 and this truncates the same as int().  The indices of out-of-bounds values are clipped
+        # so that they can be looked up, and their colors are replaced below.
+        idx = np.clip(step.astype(int), 0, n_colors - 1)
+        if discrete_or_continuous == 'discrete':
+            colors = color_bar_rgb[idx]
+        elif discrete_or_continuous == 'continuous':
+            # Interpolate color with the color after.  The last color has no color after, and is interpolated with
+            # itself, which leaves it unchanged.
+            color_0 = color_bar_rgb[idx]
+            color_1 = color_bar_rgb[np.minimum(idx + 1, n_colors - 1)]
+            frac = (step - idx)[..., np.newaxis]
+            colors = color_0 + (frac * (color_1 - color_0))
+        else:
+            print(
+                'ERROR: In color_given_values(), encountered unexpected discrete_or_continuous value:',
+                discrete_or_continuous,
+            )
+            assert False
+
+    # Out-of-bounds cases.
+    colors[vals < val_min] = _rgb_given_color(color_below_min)
+    colors[vals > val_max] = _rgb_given_color(color_above_max)
+    return colors
+
+
+def _rgb_given_color(color):
+    if isinstance(color, Color.Color):
+        return color.rgb_255()
+    return color
+
+
 def angle_between_color_vectors(rgb_1, rgb_2):
     rgb_1_uvec = Uxyz.Uxyz(rgb_1)
     rgb_2_uvec = Uxyz.Uxyz(rgb_2)
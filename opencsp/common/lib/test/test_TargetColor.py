@@ -510,6 +510,25 @@ class TestTargetColor(to.TestOutput):
         # Composite image #1.
         self.execute_test_cascade_target_A()
 
+    def test_color_given_values(self) -> None:
+        # The array color lookup must match the per-value color lookup exactly, for every color bar entry and
+        # interpolation fraction, including the end points and out-of-bounds values.
+        color_below_min = (1, 2, 3)
+        color_above_max = (4, 5, 6)
+        vals = np.concatenate([[-0.1, 0.0, 1.0, 1.1], np.linspace(0, 1, 1001), np.random.default_rng(0).random(1000)])
+        for color_bar in [tcc.matlab_color_bar(), tcc.O_color_bar(), [(10, 20, 30)]]:
+            for discrete_or_continuous in ['discrete', 'continuous']:
+                expected = [
+                    tcc.color_given_value(
+                        val, 0, 1, color_below_min, color_bar, color_above_max, discrete_or_continuous
+                    )
+                    for val in vals
+                ]
+                colors = tcc.color_given_values(
+                    vals, 0, 1, color_below_min, color_bar, color_above_max, discrete_or_continuous
+                )
+                np.testing.assert_array_equal(colors, np.array(expected, dtype=float))
+
 
 # MAIN EXECUTION
 
@@ -536,6 +555,7 @@ if __name__ == "__main__":
     test_object.test_extend_target()
     test_object.test_splice_targets_above_below()
     test_object.test_cascade_target_A()
+    test_object.test_color_given_values()
     lt.info('All tests complete.')
     # Cleanup.
     if interactive:
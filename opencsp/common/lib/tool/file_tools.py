@@ -7,16 +7,20 @@ Utilities for file_handling.
 
 import csv
 from datetime import datetime
+import fnmatch
 import glob
 import random
 import os
 import os.path
 
 # import pickle
+import re
 import shutil
 import string
 import tempfile
-from typing import Optional
+import threading
+import time
+from typing import Callable, Iterator, Optional
 
 # try to import as few other opencsp libraries as possible
 import opencsp.common.lib.file.CsvInterface as csvi
@@ -169,9 +173,194 @@ def directory_is_empty(input_dir):
     return True
 
 
+_directory_listing_cache: dict[tuple[str, bool], tuple[dict[str, int], list[tuple[str, str, bool]]]] = {}
+""" Cached directory listings from _list_directory(use_cache=True), by (directory, recursive).
+Each listing is stored with the modification times of the directories it was built from. """
+_directory_listing_cache_lock = threading.Lock()
+_directory_listing_cache_min_age_ns = 2 * 1_000_000_000
+""" Directories modified less than this many nanoseconds ago aren't cached.
+File system timestamps have limited resolution, and a file added right after the
+listing was made might not change the directory's modification time. """
+
+
+def _name_filter(
+    globexp: str = None, extensions: list[str] = None, case_sensitive=True
+) -> Callable[[str], bool] | None:
+    """Returns a function that matches file names against the given glob
+    expression and extensions, or None to match all names."""
+    if globexp == None and extensions == None:
+        return None
+
+    pattern = None
+    if globexp != None:
+        pattern = re.compile(fnmatch.translate(globexp), 0 if case_sensitive else re.IGNORECASE)
+
+    search_extensions = None
+    if extensions != None:
+        search_extensions = set()
+        for ext in extensions:
+            ext = str(ext)
+            ext = ext if ext.startswith(".") else "." + ext
+            search_extensions.add(ext if case_sensitive else ext.lower())
+
+    def matches(name_ext: str) -> bool:
+        if pattern != None and pattern.match(name_ext) == None:
+            return False
+        if search_extensions != None:
+            _, ext = os.path.splitext(name_ext)
+            if (ext if case_sensitive else ext.lower()) not in search_extensions:
+                return False
+        return True
+
+    return matches
+
+
+def _scan_directory(
+    input_dir: str, relative_path: str, recursive: bool, dir_mtimes: dict[str, int] = None
+) -> Iterator[tuple[str, os.DirEntry]]:
+    """Yields (relative path name_ext, entry) for all entries in the input_dir.
+
+    If dir_mtimes is given, then the modification time of every scanned
+    directory is added to it. The modification time is retrieved before
+    scanning, so that any changes made during the scan invalidate it."""
+    if dir_mtimes != None:
+        dir_mtimes[input_dir] = os.stat(input_dir).st_mtime_ns
+
+    with os.scandir(input_dir) as it:
+        for entry in it:
+            if relative_path == "":
+                yield entry.name, entry
+            else:
+                yield os.path.join(relative_path, entry.name), entry
+
+            # Does not follow symbolic links to directories
+            if recursive and entry.is_dir(follow_symlinks=False):
+                sub_relative_path = os.path.join(relative_path, entry.name)
+                yield from _scan_directory(entry.path, sub_relative_path, recursive, dir_mtimes)
+
+
+def _cached_directory_listing(input_dir: str, recursive: bool) -> list[tuple[str, str, bool]]:
+    """Returns the [(relative path name_ext, name_ext, is_file), ...] of all entries in
+    the input_dir, re-scanning the directory only if it (or one of its scanned
+    subdirectories) has been modified since it was last scanned."""
+    key = (norm_path(input_dir, allow_extended_length_path=False), recursive)
+
+    with _directory_listing_cache_lock:
+        cached = _directory_listing_cache.get(key)
+    if cached != None:
+        dir_mtimes, listing = cached
+        try:
+            if all(os.stat(dir_path).st_mtime_ns == mtime for dir_path, mtime in dir_mtimes.items()):
+                return listing
+        except FileNotFoundError:
+            pass
+
+    dir_mtimes: dict[str, int] = {}
+    listing = [
+        (path, entry.name, entry.is_file()) for path, entry in _scan_directory(input_dir, "", recursive, dir_mtimes)
+    ]
+
+    # don't cache directories that might still be in the process of being modified
+    newest_mtime = max(dir_mtimes.values())
+    if time.time_ns() - newest_mtime >= _directory_listing_cache_min_age_ns:
+        with _directory_listing_cache_lock:
+            _directory_listing_cache[key] = (dir_mtimes, listing)
+
+    return listing
+
+
+def clear_directory_cache():
+    """Forgets all cached directory listings, see iterate_directory()."""
+    with _directory_listing_cache_lock:
+        _directory_listing_cache.clear()
+
+
+def _list_directory(
+    input_dir: str, name_filter: Callable[[str], bool] = None, files_only=False, recursive=False, use_cache=False
+) -> Iterator[tuple[str, os.DirEntry | None]]:
+    """Yields the (relative path name_ext, entry) of the matching entries in the
+    input_dir. The entry is None for cached listings."""
+    if use_cache:
+        for path_name_ext, name_ext, is_file in _cached_directory_listing(input_dir, recursive):
+            if files_only and not is_file:
+                continue
+            if name_filter != None and not name_filter(name_ext):
+                continue
+            yield path_name_ext, None
+
+    else:
+        for path_name_ext, entry in _scan_directory(input_dir, "", recursive):
+            if files_only and not entry.is_file():
+                continue
+            if name_filter != None and not name_filter(entry.name):
+                continue
+            yield path_name_ext, entry
+
+
+def iterate_directory(
+    input_dir: str,
+    globexp: str = None,
+    extensions: list[str] = None,
+    files_only=False,
+    recursive=False,
+    case_sensitive=True,
+    use_cache=False,
+) -> Iterator[str]:
+    """Lazily yields the names of the entries in the given directory.
+
+    This is a generator built on os.scandir(), so entries are filtered as the
+    directory is read and no list of the directory contents is built. Whether
+    an entry is a file is taken from the directory entry itself, without
+    another call to the file system for most file systems.
+
+    Example::
+
+        # the first 10 frames, without listing all of the thousands of frames
+        first_frames = itertools.islice(ft.iterate_directory(frames_dir, "*.JPG"), 10)
+
+    Args:
+    -----
+    input_dir: str
+        The directory to list.
+    globexp: str
+        Only yield entries whose name_ext matches this glob expression (see
+        fnmatch), for example "*_frame_*.png". None to match all names.
+        Default None.
+    extensions: list[str]
+        Only yield entries with one of these extensions (with or without
+        leading periods "."). None to match all extensions. Default None.
+    files_only: bool
+        If True, then only yield file entries. Default False.
+    recursive: bool
+        If True, then also yield entries from all subdirectories, as paths
+        relative to the input_dir. Does not follow symbolic links to
+        directories. Default False.
+    case_sensitive: bool
+        If True, then the globexp and extensions matching are case
+        sensitive. Default True.
+    use_cache: bool
+        If True, then use the listing from the last time this directory was
+        read with use_cache=True, if the directory hasn't been modified since.
+        Useful for large directories that are listed many times. Directories
+        that were modified in the last couple of seconds aren't cached, to
+        avoid missing changes that happen faster than the file system
+        timestamp resolution. See also clear_directory_cache(). Default False.
+
+    Yields:
+    -------
+        path_name_ext (str): The name_ext of each matching entry, or the path relative to the input_dir for recursive=True.
+    """
+    name_filter = _name_filter(globexp, extensions, case_sensitive)
+    for path_name_ext, _ in _list_directory(input_dir, name_filter, files_only, recursive, use_cache):
+        yield path_name_ext
+
+
 def count_items_in_directory(
-    input_dir, name_prefix=None, name_suffix=None  # Only entries with names thata start with name_prefix are counted.
-):  # Only entries with names thata end with name_suffix are counted.
+    input_dir,
+    name_prefix=None,  # Only entries with names thata start with name_prefix are counted.
+    name_suffix=None,  # Only entries with names thata end with name_suffix are counted.
+    use_cache=False,  # Count from the cached directory listing, see iterate_directory().
+):
     """
     Counts the number of items in the given directory.
     Does not discriminate between directories, files, or symbolic links -- all are counted.
@@ -195,39 +384,24 @@ def count_items_in_directory(
             RuntimeError,
             'ERROR: In count_items_in_directory(), requested input directory is not a directory: ' + str(input_dir),
         )
-    # Walk the directory contents to determine whether any contents are there.
-    # The standard Unix files "." and ".." don't count as contents.
-    # This test does not construct a list of the entire directory contents, and
-    # thus is faster than using os.listdir().
-    count = 0
+    # Walk the directory contents, without constructing a list of the entire
+    # directory contents. This is faster than using os.listdir().
+    name_prefix = name_prefix if name_prefix != None else ""
+    name_suffix = name_suffix if name_suffix != None else ""
+    is_match = lambda name_ext: name_ext.startswith(name_prefix) and name_ext.endswith(name_suffix)
+    if use_cache:
+        return sum(1 for _, name_ext, _ in _cached_directory_listing(input_dir, False) if is_match(name_ext))
     with os.scandir(input_dir) as it:
-        for entry in it:
-            # Ignore standard Unix files.
-            if (entry.name == '.') or (entry.name == '..'):
-                # Ignore these files.
-                continue
-            # Check prefix and suffix.
-            if (name_prefix == None) or (entry.name.startswith(name_prefix)):
-                prefix_ok = True
-            else:
-                prefix_ok = False
-            # Check suffix.
-            if (name_suffix == None) or (entry.name.endswith(name_suffix)):
-                suffix_ok = True
-            else:
-                suffix_ok = False
-            if (not prefix_ok) or (not suffix_ok):
-                # Ignore these files.
-                continue
-            # Valid entry.
-            count += 1
-    return count
+        return sum(1 for entry in it if is_match(entry.name))
 
 
 def binary_count_items_in_directory(input_dir: str, name_pattern: str, start=1) -> int:
     """Counts the number of items n in a directory by looking for one file at a time.
 
     Starts with file 1, then 3, then 7, ..., then n, then n-n/2+n/4, ..., n.
+    Only useful when the files are known to be numbered without gaps, and
+    when listing the directory is slow, such as on network file systems. See
+    also count_items_in_directory(use_cache=True).
 
     Args:
         input_dir (str): The directory to search in.
@@ -289,7 +463,7 @@ def file_size_pair_size(file_size_pair) -> int:
     return file_size_pair[1]
 
 
-def files_in_directory(input_dir, sort=True, files_only=False, recursive=False):
+def files_in_directory(input_dir, sort=True, files_only=False, recursive=False, use_cache=False):
     """Returns a list [ file1, file2, ...] of files in the given directory.
 
     The returned values include the "name.ext" of the file.
@@ -306,51 +480,17 @@ def files_in_directory(input_dir, sort=True, files_only=False, recursive=False):
         If true, then walk through all files in the given directory and all
         subdirectories. Does not follow symbolic links to directories. Default
         False.
+    use_cache: bool
+        If True, then reuse the listing from the last call with use_cache=True
+        if the directory hasn't changed since. See iterate_directory(). Default
+        False.
 
     Returns:
     --------
         files_name_ext (list[str]): The list of file name_exts (example ["a.csv", "b.csv", ...])
     """
-    scanned_files: list[str] = []
-    file_list: list[str] = []
-
-    if not recursive:
-        # Walk the directory and assemble a list of files.
-        with os.scandir(input_dir) as iter:
-            for entry in iter:
-                # Ignore directories
-                if files_only:
-                    if not entry.is_file():
-                        continue
-
-                # Valid entry.
-                file_name = entry.name
-                scanned_files.append(file_name)
-    else:
-        # Walk the directory and all subdirectories and assemble a list of files.
-        norm_input_dir = norm_path(input_dir)
-        for root, dirnames, file_names_exts in os.walk(norm_input_dir):
-            # remove the front of the path, in order to get the path relative to the input_dir
-            relative_path: str = root.replace(norm_input_dir, "")
-            # don't include any leading ./
-            if relative_path.startswith("./") or relative_path.startswith(".\\"):
-                relative_path = relative_path[2:]
-            # don't include any leading /
-            relative_path = relative_path.lstrip("\\/")
-
-            scanned_files += [os.path.join(relative_path, file_name_ext) for file_name_ext in file_names_exts]
-
-            # Ignore directories
-            if not files_only:
-                scanned_files += [os.path.join(relative_path, dirname) for dirname in dirnames]
-
-    # Ignore standard Unix files.
-    for file_relpath_name_ext in scanned_files:
-        relpath, name, ext = path_components(file_relpath_name_ext)
-        if (name == '.') or (name == '..'):
-            # Ignore these files.
-            continue
-        file_list.append(file_relpath_name_ext)
+    # Walk the directory (and subdirectories) and assemble a list of files.
+    file_list = list(iterate_directory(input_dir, files_only=files_only, recursive=recursive, use_cache=use_cache))
 
     # Sort, if desired.
     if sort:
@@ -368,18 +508,13 @@ def files_in_directory_with_associated_sizes(input_dir, sort=True, follow_symlin
     See also: file_size_pair_name(), file_size_pair_size()
     """
     # Walk the directory and assemble a list of [file, size] pairs.
+    # The stat results are retrieved from the directory entries, which saves a
+    # lookup by path (and on Windows, saves a call to the file system).
     file_size_pair_list: list[tuple[str, int]] = []
-    with os.scandir(input_dir) as it:
-        for entry in it:
-            # Ignore standard Unix files.
-            if (entry.name == '.') or (entry.name == '..'):
-                # Ignore these files.
-                continue
-            # Valid entry.
-            file_name = entry.name
-            stat_result = entry.stat(follow_symlinks=follow_symlinks)
-            file_size = stat_result.st_size
-            file_size_pair_list.append([file_name, file_size])
+    for file_name, entry in _list_directory(input_dir):
+        stat_result = entry.stat(follow_symlinks=follow_symlinks)
+        file_size = stat_result.st_size
+        file_size_pair_list.append([file_name, file_size])
 
     # Sort by filename, if desired.
     if sort:
@@ -390,7 +525,7 @@ def files_in_directory_with_associated_sizes(input_dir, sort=True, follow_symlin
 
 
 def files_in_directory_by_extension(
-    input_dir: str, extensions: list[str], sort=True, case_sensitive=False, recursive=False
+    input_dir: str, extensions: list[str], sort=True, case_sensitive=False, recursive=False, use_cache=False
 ):
     """Generates a list of { ext: [file1, file2, ...], ... }. Only returns the files
     with one of the given extensions.
@@ -409,6 +544,10 @@ def files_in_directory_by_extension(
         If true, then walk through all files in the given directory and all
         subdirectories. Does not follow symbolic links to directories. Default
         False.
+    use_cache: bool
+        If True, then reuse the listing from the last call with use_cache=True
+        if the directory hasn't changed since. See iterate_directory(). Default
+        False.
 
     Returns:
     --------
@@ -417,23 +556,32 @@ def files_in_directory_by_extension(
         For example {  "csv": ["a.csv","b.csv"], "txt": ["foo.txt","bar.txt"]  }
     """
     ret: dict[str, list[str]] = {}
-    search_extensions = {}
+    search_extensions: dict[str, str] = {}
 
     for ext in extensions:
         ext = str(ext)
         ret[ext] = []
-        iext = ext if case_sensitive else ext.lower()
-        if ext.startswith("."):
-            search_extensions[ext] = iext
-        else:
-            search_extensions["." + ext] = iext
-
-    for file in files_in_directory(input_dir, sort, files_only=True, recursive=recursive):
+        iext = ext if ext.startswith(".") else "." + ext
+        iext = iext if case_sensitive else iext.lower()
+        search_extensions[iext] = ext
+
+    # only the files with matching extensions are kept
+    files = iterate_directory(
+        input_dir,
+        extensions=extensions,
+        files_only=True,
+        recursive=recursive,
+        case_sensitive=case_sensitive,
+        use_cache=use_cache,
+    )
+    for file in files:
         _, file_ext = os.path.splitext(file)
         ifile_ext = file_ext if case_sensitive else file_ext.lower()
-        ext = search_extensions.get(ifile_ext)
-        if ext != None:
-            ret[ext].append(file)
+        ret[search_extensions[ifile_ext]].append(file)
+
+    if sort:
+        for ext in ret:
+            ret[ext].sort()
 
     return ret
 
@@ -617,7 +765,8 @@ def directories_in_directory(directory, sort=True):
     """
     Returns a list of all the directory names contained within the input directory.
     """
-    dir_list = [f for f in os.listdir(directory) if os.path.isdir(os.path.join(directory, f))]
+    with os.scandir(directory) as it:
+        dir_list = [entry.name for entry in it if entry.is_dir()]
     if sort:
         dir_list.sort()
     return dir_list
@@ -1,5 +1,8 @@
 from abc import abstractmethod, ABC
+from contextlib import contextmanager
+import hashlib
 import os
+from typing import Callable, Iterator
 
 import h5py
 import numpy as np
@@ -9,21 +12,142 @@ import opencsp.common.lib.tool.image_tools as it
 import opencsp.common.lib.tool.log_tools as lt
 
 
-def save_hdf5_datasets(data: list, datasets: list, file: str):
-    """Saves data to HDF5 file"""
-    with h5py.File(file, 'a') as f:
+class HDF5Session:
+    def __init__(
+        self,
+        file: str,
+        mode: str = 'a',
+        chunks: bool | tuple[int, ...] = None,
+        compression: str = None,
+        compression_opts=None,
+    ):
+        """Keeps one HDF5 file open for many reads and writes.
+
+        Pass this session in place of the file name to save_hdf5_datasets(),
+        load_hdf5_datasets(), or any save_to_hdf()/load_from_hdf() method, to
+        avoid re-opening the file for every call. The dataset creation options
+        given here are used for all datasets saved with this session, unless
+        overridden in the call to save_hdf5_datasets(). For example::
+
+            with HDF5Session(file, 'w', compression='gzip') as session:
+                measurement.save_to_hdf(session, 'Measurement/')
+                calibration.save_to_hdf(session, 'Calibration/')
+
+        Parameters
+        ----------
+        file : str
+            HDF5 file to open.
+        mode : str, optional
+            h5py file mode, by default 'a' (read/write, create if necessary).
+        chunks, compression, compression_opts : optional
+            Default dataset creation options, see save_hdf5_datasets(). By
+            default None (unchunked and uncompressed).
+        """
+        self.file_name = file
+        self.file = h5py.File(file, mode)
+        self.chunks = chunks
+        self.compression = compression
+        self.compression_opts = compression_opts
+
+    def close(self):
+        """Closes the HDF5 file."""
+        self.file.close()
+
+    def __enter__(self) -> 'HDF5Session':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __format__(self, format_spec: str) -> str:
+        # allow sessions to be logged in place of file names
+        return format(self.file_name, format_spec)
+
+
+@contextmanager
+def _open_file(file: str | h5py.File | HDF5Session, mode: str) -> Iterator[h5py.File]:
+    """Opens the given HDF5 file for the duration of the context, or uses the
+    already open file of the given h5py.File or HDF5Session."""
+    if isinstance(file, HDF5Session):
+        yield file.file
+    elif isinstance(file, h5py.File):
+        yield file
+    else:
+        with h5py.File(file, mode) as f:
+            yield f
+
+
+def _dataset_creation_options(d, chunks: bool | tuple[int, ...], compression: str, compression_opts) -> dict:
+    """Chunking and compression only apply to non-empty numeric arrays, not to scalars or strings."""
+    arr = np.asarray(d)
+    if arr.ndim == 0 or arr.size == 0 or arr.dtype.kind not in 'biufc':
+        return {}
+
+    options = {}
+    if isinstance(chunks, tuple):
+        # fit the chunk shape to this dataset, or let h5py choose one for datasets with other dimensions
+        if len(chunks) == arr.ndim:
+            chunks = tuple(int(min(chunk, dim)) for chunk, dim in zip(chunks, arr.shape))
+        else:
+            chunks = True
+    if chunks is not None:
+        options['chunks'] = chunks
+    if compression is not None:
+        options['compression'] = compression
+        if compression_opts is not None:
+            options['compression_opts'] = compression_opts
+    return options
+
+
+def save_hdf5_datasets(
+    data: list,
+    datasets: list,
+    file: str | h5py.File | HDF5Session,
+    chunks: bool | tuple[int, ...] = None,
+    compression: str = None,
+    compression_opts=None,
+):
+    """Saves data to HDF5 file
+
+    Parameters
+    ----------
+    data : list
+        Values to save, one per dataset.
+    datasets : list[str]
+        Dataset names, for example "Folder/Field_1".
+    file : str | h5py.File | HDF5Session
+        HDF5 file to save to. File names are opened in append mode for the
+        duration of this call.
+    chunks : bool | tuple[int, ...], optional
+        Chunk shape for array datasets, or True to let h5py choose. The chunk
+        shape is trimmed to the size of smaller datasets, and h5py chooses the
+        chunk shape for datasets with a different number of dimensions.
+        Chunked datasets can be read partially, see load_hdf5_dataset_slice().
+        By default None (unchunked, unless compressed).
+    compression : str, optional
+        Compression filter for array datasets, such as 'gzip' or 'lzf'. By
+        default None (uncompressed).
+    compression_opts : optional
+        Compression filter options, such as the gzip level 0-9. By default None.
+    """
+    if isinstance(file, HDF5Session):
+        chunks = file.chunks if chunks is None else chunks
+        compression = file.compression if compression is None else compression
+        compression_opts = file.compression_opts if compression_opts is None else compression_opts
+
+    with _open_file(file, 'a') as f:
         # Loop through datasets
         for d, dataset in zip(data, datasets):
             if dataset in f:
                 # Delete dataset if it already exists
                 del f[dataset]
             # Write dataset
-            f.create_dataset(dataset, data=d)
+            f.create_dataset(dataset, data=d, **_dataset_creation_options(d, chunks, compression, compression_opts))
 
 
-def load_hdf5_datasets(datasets: list, file: str):
+def load_hdf5_datasets(datasets: list, file: str | h5py.File | HDF5Session):
     """Loads datasets from HDF5 file"""
-    with h5py.File(file, 'r') as f:
+    with _open_file(file, 'r') as f:
         kwargs: dict[str, str | h5py.Dataset] = {}
         # Loop through fields to retreive
         for dataset in datasets:
@@ -49,6 +173,87 @@ def load_hdf5_datasets(datasets: list, file: str):
     return kwargs
 
 
+def load_hdf5_dataset_slice(dataset: str, file: str | h5py.File | HDF5Session, key) -> np.ndarray:
+    """Loads part of a dataset from HDF5 file, without reading the rest of it.
+
+    Only the chunks of chunked (or compressed) datasets that overlap the
+    requested slice are read from disk.
+
+    Parameters
+    ----------
+    dataset : str
+        Dataset name, for example "Folder/Field_1".
+    file : str | h5py.File | HDF5Session
+        HDF5 file to load from.
+    key : slice | tuple
+        Numpy style index into the dataset, for example np.s_[100:200, :, 3].
+
+    Returns
+    -------
+    np.ndarray
+        The indexed values. Unlike load_hdf5_datasets(), the result is not
+        squeezed.
+    """
+    with _open_file(file, 'r') as f:
+        return f[dataset][key]
+
+
+def load_or_compute_file_datasets(
+    file: str, params, datasets: list[str], compute: Callable[[], list], cache_dir: str = None
+) -> dict:
+    """Computes datasets from the contents of a file, caching them in an HDF5 file.
+
+    The cache file is named by the SHA-256 hash of the contents of the given
+    file and of repr(params), so a cached result is reused for an identical
+    file even if it is renamed or moved. Cache files are written to a
+    temporary file first, so that other processes never see a partially
+    written cache file. Suitable to run in worker processes.
+
+    Parameters
+    ----------
+    file : str
+        Path to the input file, usually an image.
+    params
+        Parameters that the result depends on. Must have a stable repr().
+    datasets : list[str]
+        Names of the datasets that compute() returns.
+    compute : Callable[[], list]
+        Computes the dataset values, one per name in datasets, when they are
+        not cached.
+    cache_dir : str, optional
+        Directory to cache results in, by default None (no caching).
+
+    Returns
+    -------
+    dict
+        The dataset values by name, as returned by compute() or as arrays
+        loaded from the cache.
+    """
+    if cache_dir is None:
+        return dict(zip(datasets, compute()))
+
+    # Hash file contents and parameters
+    hasher = hashlib.sha256()
+    with open(file, 'rb') as f:
+        for chunk in iter(lambda: f.read(2**20), b''):
+            hasher.update(chunk)
+    hasher.update(repr(params).encode())
+    file_cache = os.path.join(cache_dir, hasher.hexdigest() + '.h5')
+
+    # Load from cache
+    if ft.file_exists(file_cache):
+        with _open_file(file_cache, 'r') as f:
+            return {dataset: f[dataset][()] for dataset in datasets}
+
+    # Compute and save to cache
+    data = compute()
+    file_cache_tmp = f'{file_cache}.{os.getpid():d}.tmp'
+    save_hdf5_datasets(data, datasets, file_cache_tmp)
+    os.replace(file_cache_tmp, file_cache)
+
+    return dict(zip(datasets, data))
+
+
 def is_dataset_and_shape(object: h5py.Group | h5py.Dataset) -> tuple[bool, tuple]:
     """Returns whether the given object is an hdf5 dataset and, if it is, then
     also what it's shape is.
@@ -75,12 +280,12 @@ def is_dataset_and_shape(object: h5py.Group | h5py.Dataset) -> tuple[bool, tuple
         return False, tuple()
 
 
-def get_groups_and_datasets(hdf5_path_name_ext: str | h5py.File):
+def get_groups_and_datasets(hdf5_path_name_ext: str | h5py.File | HDF5Session):
     """Get the structure of an HDF5 file, including all group and dataset names, and the dataset shapes.
 
     Parameters
     ----------
-    hdf5_path_name_ext : str | h5py.File
+    hdf5_path_name_ext : str | h5py.File | HDF5Session
         The HDF5 file to parse the structure of.
 
     Returns
@@ -101,10 +306,7 @@ def get_groups_and_datasets(hdf5_path_name_ext: str | h5py.File):
 
     if isinstance(hdf5_path_name_ext, str):
         hdf5_path_name_ext = ft.norm_path(hdf5_path_name_ext)
-        with h5py.File(hdf5_path_name_ext, 'r') as fin:
-            fin.visititems(visitor)
-    else:
-        fin: h5py.File = hdf5_path_name_ext
+    with _open_file(hdf5_path_name_ext, 'r') as fin:
         fin.visititems(visitor)
 
     for name, is_dataset, shape in visited:
@@ -3,10 +3,13 @@ Utilities for managing logs for multi-processing.
 
 """
 
+import atexit
 import logging as log
+import logging.handlers
 import multiprocessing as mp
 import os
 import re
+import signal
 import socket
 import sys
 
@@ -16,6 +19,11 @@ import sys
 
 global_singleprocessing_logger: log.Logger = None
 global_multiprocessing_logger: log.Logger = None
+global_log_queue: "_LogQueue" = None
+""" The queue that log records are sent to, for multiprocessing_logger(use_queue=True). """
+global_log_listener: logging.handlers.QueueListener = None
+""" Writes the records from the global_log_queue to the log file and console, in the process that created it. """
+_global_log_listener_pid: int = None
 
 
 def logger(log_dir_body_ext: str = None, level: int = log.INFO, delete_existing_log: bool = True) -> log.Logger:
@@ -85,7 +93,7 @@ def logger(log_dir_body_ext: str = None, level: int = log.INFO, delete_existing_
     return global_singleprocessing_logger
 
 
-def multiprocessing_logger(log_dir_body_ext=None, level=log.INFO) -> log.Logger:
+def multiprocessing_logger(log_dir_body_ext=None, level=log.INFO, use_queue=False) -> log.Logger:
     """Create a logger for logging across many processes.
 
     For multiprocessing logs, it is recommended that the existing log is deleted by the user or a batch process script.
@@ -96,12 +104,31 @@ def multiprocessing_logger(log_dir_body_ext=None, level=log.INFO) -> log.Logger:
         lt.multiprocessing_logger(experiment_dir() + '/2021-05-13_FastScan2/4_Post/Construction/20210525/1325_NS_U/090c_PredictHeliostats/latest_run.log')
         lt.info('Starting program ' + __file__)
 
+    With use_queue=True, the log file and console are written to by a single
+    listener thread in this process. This process and all of its child
+    processes only put log records onto a queue, which doesn't block on
+    file or console I/O or on the locks of other processes. The queue is
+    created for the default multiprocessing start method. Child processes
+    that are forked inherit the queue. For child processes that are spawned,
+    use queue_logger() as the pool initializer::
+
+        lt.multiprocessing_logger(log_path_name_ext, use_queue=True)
+        with multiprocessing.Pool(initializer=lt.queue_logger, initargs=(lt.get_log_queue(),)) as pool:
+            ...
+
+    Queue mode is opt-in, and only meant for runs where many processes
+    contend for the log file or console. When the processes are CPU-bound,
+    it is slower than the default, because every record is pickled and the
+    listener thread competes with the workers for CPU time.
+
     Args:
         - log_dir_body_ext (str): Fully qualified path to desired log file. None for a stream handler.
         - level (int,optional): Significance threshold for writing messages to this log.
             See https://docs.python.org/3/howto/logging.html
+        - use_queue (bool, optional): Send log records through a queue to a single listener. Only use this when
+            processes contend for the log, see above. Default False.
     """
-    global global_multiprocessing_logger
+    global global_multiprocessing_logger, global_log_queue, global_log_listener, _global_log_listener_pid
 
     # import here instead of at the top of the file to avoid cyclic import issues
     import opencsp.common.lib.tool.file_tools as ft
@@ -126,13 +153,27 @@ def multiprocessing_logger(log_dir_body_ext=None, level=log.INFO) -> log.Logger:
 
     # Set formatter.
     formatter = log.Formatter(f"[%(asctime)s| %(levelname)s| {process_name}] %(message)s")
+    handlers: list[log.Handler] = []
     if log_dir_body_ext is not None:
         handler = log.FileHandler(log_dir_body_ext)
         handler.setFormatter(formatter)
-        global_multiprocessing_logger.addHandler(handler)
+        handlers.append(handler)
 
     # Also log to console
-    _add_stream_handlers(global_multiprocessing_logger, level, formatter)
+    handlers += _stream_handlers(level, formatter)
+
+    if not use_queue:
+        for handler in handlers:
+            global_multiprocessing_logger.addHandler(handler)
+    else:
+        # Write the records from all processes in a single listener thread
+        stop_log_queue_listener()
+        global_log_queue = _LogQueue()
+        global_log_listener = logging.handlers.QueueListener(global_log_queue, *handlers, respect_handler_level=True)
+        _global_log_listener_pid = os.getpid()
+        global_log_listener.start()
+        atexit.register(stop_log_queue_listener)
+        _set_queue_handler(global_multiprocessing_logger, global_log_queue, level)
 
     # # This will make sure you won't have duplicated messages in the output.
     # if not len(global_multiprocessing_logger.handlers):
@@ -145,8 +186,99 @@ def multiprocessing_logger(log_dir_body_ext=None, level=log.INFO) -> log.Logger:
     return global_multiprocessing_logger
 
 
-def _add_stream_handlers(logger_: log.Logger, level: int, formatter: log.Formatter = None) -> None:
-    """Adds streams to the given logger. Prints
+class _LogQueue:
+    """A multiprocessing.SimpleQueue with the interface expected by QueueHandler and QueueListener.
+
+    Records are written to the underlying pipe by the thread that logs them,
+    instead of by a background feeder thread as with multiprocessing.Queue.
+    This way records aren't lost when a process is terminated shortly after
+    logging (such as by Pool.terminate() at the end of a "with Pool() as pool:"
+    block). SIGTERM is held off while a record is being written, so that a
+    terminated process can't leave the queue's write lock acquired."""
+
+    def __init__(self):
+        self._queue = mp.SimpleQueue()
+
+    def put_nowait(self, record: log.LogRecord | None):
+        if not hasattr(signal, "pthread_sigmask"):
+            # Windows: the queue has no write lock
+            self._queue.put(record)
+            return
+
+        prev_mask = signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGTERM])
+        try:
+            self._queue.put(record)
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, prev_mask)
+
+    def get(self, block=True) -> log.LogRecord | None:
+        return self._queue.get()
+
+
+def queue_logger(log_queue: "_LogQueue", level=log.INFO) -> log.Logger:
+    """Log to the given queue from a child process, for loggers created with
+    multiprocessing_logger(use_queue=True).
+
+    Forked child processes inherit the queue logger, so this is only
+    necessary for spawned child processes, usually as the initializer for a
+    multiprocessing.Pool. Once this method is called, then the info(),
+    warn(), and error() methods will send their records to the given queue.
+
+    Args:
+        - log_queue (_LogQueue): The queue from get_log_queue() in the parent process.
+        - level (int,optional): Significance threshold for sending messages to the queue.
+    """
+    global global_multiprocessing_logger
+
+    global_multiprocessing_logger = mp.get_logger()
+    global_multiprocessing_logger.setLevel(level)
+    _set_queue_handler(global_multiprocessing_logger, log_queue, level)
+
+    return global_multiprocessing_logger
+
+
+def get_log_queue() -> "_LogQueue | None":
+    """Returns the queue of multiprocessing_logger(use_queue=True), or None if not logging to a queue."""
+    return global_log_queue
+
+
+def stop_log_queue_listener() -> None:
+    """Writes out any remaining records from the log queue and stops the queue
+    listener of multiprocessing_logger(use_queue=True). Further messages are
+    written directly by this process. Called automatically at exit."""
+    global global_log_queue, global_log_listener, _global_log_listener_pid
+
+    # only the process that started the listener can stop it
+    if global_log_listener is None or _global_log_listener_pid != os.getpid():
+        return
+
+    global_log_listener.stop()
+    if global_multiprocessing_logger is not None:
+        for handler in list(global_multiprocessing_logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                global_multiprocessing_logger.removeHandler(handler)
+        for handler in global_log_listener.handlers:
+            global_multiprocessing_logger.addHandler(handler)
+
+    global_log_queue = None
+    global_log_listener = None
+    _global_log_listener_pid = None
+
+
+def _set_queue_handler(logger_: log.Logger, log_queue: "_LogQueue", level: int) -> None:
+    """Replaces the handlers of the given logger with a single handler that
+    sends records to the given queue."""
+    for handler in list(logger_.handlers):
+        logger_.removeHandler(handler)
+
+    # Records below the level are dropped before they are formatted for the queue
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.setLevel(level)
+    logger_.addHandler(handler)
+
+
+def _stream_handlers(level: int, formatter: log.Formatter = None) -> list[log.Handler]:
+    """Returns handlers for the stdout and stderr streams.
 
     From https://stackoverflow.com/questions/16061641/python-logging-split-between-stdout-and-stderr
     """
@@ -155,13 +287,35 @@ def _add_stream_handlers(logger_: log.Logger, level: int, formatter: log.Formatt
     h1.setLevel(level)
     h1.addFilter(lambda record: record.levelno < log.WARNING)
     h1.setFormatter(formatter)
-    logger_.addHandler(h1)
 
     # stderr: log everything warning and greater (warning, error, critical)
     h2 = log.StreamHandler(sys.stderr)
     h2.setLevel(log.WARNING)
     h2.setFormatter(formatter)
-    logger_.addHandler(h2)
+
+    return [h1, h2]
+
+
+def _add_stream_handlers(logger_: log.Logger, level: int, formatter: log.Formatter = None) -> None:
+    """Adds streams to the given logger. Prints messages less than warning to stdout, and all others to stderr."""
+    for handler in _stream_handlers(level, formatter):
+        logger_.addHandler(handler)
+
+
+def is_enabled_for(level: int) -> bool:
+    """Returns True if messages at the given level would be logged.
+
+    Use this to skip building expensive log messages. For example::
+
+        if lt.is_enabled_for(lt.log.DEBUG):
+            lt.debug(f"In my_function(), corners: {describe_corners(corners)}")
+    """
+    if global_multiprocessing_logger is not None:
+        return global_multiprocessing_logger.isEnabledFor(level)
+    if global_singleprocessing_logger is not None:
+        return global_singleprocessing_logger.isEnabledFor(level)
+    # everything is printed
+    return True
 
 
 def debug(*vargs, **kwargs) -> int:
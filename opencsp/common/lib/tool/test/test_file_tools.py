@@ -50,6 +50,47 @@ class TestFileTools(unittest.TestCase):
         expected = {".a": ["a.a"], ".B": []}
         self.assertDictEqual(expected, files_name_ext)
 
+    def test_files_in_directory_by_extension_case_insensitive(self):
+        files_name_ext = ft.files_in_directory_by_extension(self.data_dir, ["A", ".B"], recursive=True)
+        expected = {"A": ["a.a"], ".B": ["b.b"]}
+        self.assertDictEqual(expected, files_name_ext)
+
+    def test_iterate_directory(self):
+        files_name_ext = ft.iterate_directory(self.data_dir, "*.?", recursive=True)
+        self.assertNotIsInstance(files_name_ext, list)
+        files_name_ext = sorted([f.replace("\\", "/") for f in files_name_ext])
+        self.assertListEqual(["a.a", "b.b", "d/c.c", "d/e/f.f"], files_name_ext)
+
+        files_name_ext = sorted(ft.iterate_directory(self.data_dir, extensions=["a", ".B"], case_sensitive=False))
+        self.assertListEqual(["a.a", "b.b"], files_name_ext)
+
+        files_name_ext = sorted(ft.iterate_directory(self.data_dir, "A*", files_only=True))
+        self.assertListEqual([], files_name_ext)
+
+    def test_directory_cache(self):
+        test_dir = os.path.join(self.out_dir, "test_directory_cache")
+        ft.create_directories_if_necessary(test_dir)
+        ft.delete_files_in_directory(test_dir, "*.tmp")
+        for i in range(10):
+            ft.create_file(os.path.join(test_dir, "%06d.tmp" % i))
+
+        # recently modified directories aren't cached
+        ft.clear_directory_cache()
+        self.assertEqual(ft.count_items_in_directory(test_dir, name_suffix=".tmp", use_cache=True), 10)
+        self.assertEqual(len(ft._directory_listing_cache), 0)
+
+        # pretend that the directory was modified a while ago
+        mtime = time.time() - 10
+        os.utime(test_dir, (mtime, mtime))
+        self.assertEqual(ft.count_items_in_directory(test_dir, name_suffix=".tmp", use_cache=True), 10)
+        self.assertEqual(len(ft._directory_listing_cache), 1)
+        self.assertEqual(len(ft.files_in_directory(test_dir, use_cache=True)), 10)
+
+        # changes to the directory invalidate the cache
+        ft.create_file(os.path.join(test_dir, "%06d.tmp" % 10))
+        self.assertEqual(ft.count_items_in_directory(test_dir, name_suffix=".tmp", use_cache=True), 11)
+        ft.clear_directory_cache()
+
     def test_binary_count_items_in_directory(self):
         test_dir = os.path.join(self.out_dir, "test_binary_count_items_in_directory")
         ft.create_directories_if_necessary(test_dir)
@@ -0,0 +1,93 @@
+import os
+import unittest
+
+import h5py
+import numpy as np
+
+import opencsp.common.lib.tool.file_tools as ft
+import opencsp.common.lib.tool.hdf5_tools as h5
+
+
+class TestHdf5Tools(unittest.TestCase):
+    def setUp(self) -> None:
+        path, _, _ = ft.path_components(__file__)
+        self.out_dir = os.path.join(path, "data", "output", "hdf5_tools")
+        ft.create_directories_if_necessary(self.out_dir)
+
+        self.image = np.tile(np.arange(100, dtype=np.uint16), (80, 1))
+        self.data = [self.image, 1.5, 'name', np.array([1, 2, 3])]
+        self.datasets = ['Images/image', 'Params/value', 'Params/name', 'Params/values']
+
+    def test_session(self):
+        file = os.path.join(self.out_dir, "test_session.h5")
+        with h5.HDF5Session(file, 'w', chunks=(16, 16), compression='gzip') as session:
+            h5.save_hdf5_datasets(self.data[:2], self.datasets[:2], session)
+            h5.save_hdf5_datasets(self.data[2:], self.datasets[2:], session)
+            self.assertEqual(f"{session:s}", file)
+
+        with h5py.File(file, 'r') as f:
+            self.assertEqual(f['Images/image'].chunks, (16, 16))
+            self.assertEqual(f['Images/image'].compression, 'gzip')
+            # scalars and strings can't be chunked or compressed
+            self.assertIsNone(f['Params/value'].compression)
+            self.assertIsNone(f['Params/name'].compression)
+
+        with h5.HDF5Session(file, 'r') as session:
+            loaded = h5.load_hdf5_datasets(self.datasets, session)
+        np.testing.assert_array_equal(loaded['image'], self.image)
+        self.assertEqual(loaded['value'], 1.5)
+        self.assertEqual(loaded['name'], 'name')
+        np.testing.assert_array_equal(loaded['values'], [1, 2, 3])
+
+    def test_defaults_unchanged(self):
+        file = os.path.join(self.out_dir, "test_defaults_unchanged.h5")
+        h5.save_hdf5_datasets(self.data, self.datasets, file)
+        with h5py.File(file, 'r') as f:
+            self.assertIsNone(f['Images/image'].chunks)
+            self.assertIsNone(f['Images/image'].compression)
+
+        _, names_and_shapes = h5.get_groups_and_datasets(file)
+        self.assertIn(('Images/image', (80, 100)), names_and_shapes)
+
+    def test_load_slice(self):
+        file = os.path.join(self.out_dir, "test_load_slice.h5")
+        h5.save_hdf5_datasets(self.data, self.datasets, file, chunks=True, compression='lzf')
+
+        image_slice = h5.load_hdf5_dataset_slice('Images/image', file, np.s_[10:20, 5])
+        np.testing.assert_array_equal(image_slice, self.image[10:20, 5])
+
+    def test_load_or_compute_file_datasets(self):
+        cache_dir = os.path.join(self.out_dir, "load_or_compute_file_datasets")
+        ft.create_directories_if_necessary(cache_dir)
+        for file in ft.files_in_directory(cache_dir, files_only=True):
+            ft.delete_file(os.path.join(cache_dir, file))
+        input_file = os.path.join(self.out_dir, "input.npy")
+        np.save(input_file, self.image)
+
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return [np.load(input_file).sum(axis=0), np.zeros((0, 2))]
+
+        for params in [('a', 1), ('a', 1), ('a', 2)]:
+            data = h5.load_or_compute_file_datasets(input_file, params, ['sums', 'empty'], compute, cache_dir)
+            np.testing.assert_array_equal(data['sums'], self.image.sum(axis=0))
+            self.assertEqual(np.shape(data['empty']), (0, 2))
+        # cached per parameters
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(ft.files_in_directory(cache_dir)), 2)
+
+        # different file contents aren't cached yet
+        np.save(input_file, self.image + 1)
+        data = h5.load_or_compute_file_datasets(input_file, ('a', 1), ['sums', 'empty'], compute, cache_dir)
+        np.testing.assert_array_equal(data['sums'], (self.image + 1).sum(axis=0))
+        self.assertEqual(len(calls), 3)
+
+        # no caching
+        h5.load_or_compute_file_datasets(input_file, ('a', 1), ['sums', 'empty'], compute)
+        self.assertEqual(len(calls), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
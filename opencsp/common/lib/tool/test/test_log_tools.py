@@ -119,6 +119,36 @@ class TestLogTools(unittest.TestCase):
             "Goodbye, world!" in log_contents, f"Can't find goodbye log in log contents:\n\t\"{log_contents}\""
         )
 
+    def _log_queue_logger(self, logname):
+        import multiprocessing
+
+        lt.multiprocessing_logger(logname, use_queue=True)
+        lt.info("Hello, world!")
+        with multiprocessing.Pool(2, initializer=lt.queue_logger, initargs=(lt.get_log_queue(),)) as pool:
+            pool.map(lt.info, ["other process %d" % i for i in range(4)])
+        lt.debug("Goodbye, world!")
+        if lt.is_enabled_for(lt.log.DEBUG):
+            lt.info("Debug enabled")
+        lt.stop_log_queue_listener()
+        lt.info("After stop")
+
+    def test_queue_logger(self):
+        self.proc_exec("_log_queue_logger")
+
+        log_contents = self.get_log_contents()
+        self.assertTrue("Hello, world!" in log_contents, f"Can't find hello log in log contents:\n\t\"{log_contents}\"")
+        for i in range(4):
+            self.assertTrue(
+                f"other process {i}" in log_contents, f"Can't find other log in log contents:\n\t\"{log_contents}\""
+            )
+        self.assertFalse(
+            "Goodbye, world!" in log_contents, "Found goodbye log in log contents when it shouldn't be there"
+        )
+        self.assertFalse("Debug enabled" in log_contents, "Found debug log in log contents when it shouldn't be there")
+        self.assertTrue(
+            "After stop" in log_contents, f"Can't find after stop log in log contents:\n\t\"{log_contents}\""
+        )
+
     def _log_error_and_raise(self, logname):
         lt.logger(logname)
         try: